@@ -2,9 +2,54 @@
 
 from __future__ import annotations
 
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import numpy as np
 import pandas as pd
 
 
+def _long_closes(ohlcv_df: pd.DataFrame) -> pd.DataFrame:
+    """Flat ``date``/``symbol``/``close`` frame from a MultiIndex or flat OHLCV frame.
+
+    ``Ticker`` is accepted for ``Symbol`` (the backtest history layout).
+    Returns an empty frame when a column is missing.
+    """
+    if isinstance(ohlcv_df.index, pd.MultiIndex):
+        df = ohlcv_df.reset_index()
+    else:
+        df = ohlcv_df.copy()
+
+    # Ensure standard column names exist
+    col_map = {}
+    for c in df.columns:
+        cl = str(c).lower()
+        if cl == "date":
+            col_map[c] = "date"
+        elif cl in {"symbol", "ticker"} and "symbol" not in col_map.values():
+            col_map[c] = "symbol"
+        elif cl == "close":
+            col_map[c] = "close"
+    df = df.rename(columns=col_map)
+
+    if "date" not in df.columns or "symbol" not in df.columns or "close" not in df.columns:
+        return pd.DataFrame(columns=["date", "symbol", "close"])
+
+    df = df[["date", "symbol", "close"]].copy()
+    df["date"] = pd.to_datetime(df["date"])
+    df["symbol"] = df["symbol"].astype(str).str.upper()
+    return df
+
+
+def close_panel(ohlcv_df: pd.DataFrame) -> pd.DataFrame:
+    """Date x symbol close prices (last close per date), built once per source frame."""
+    df = _long_closes(ohlcv_df)
+    if df.empty:
+        return pd.DataFrame()
+    return df.pivot_table(index="date", columns="symbol", values="close", aggfunc="last").sort_index()
+
+
 def compute_rolling_correlation(
     ohlcv_df: pd.DataFrame,
     symbols: list[str],
@@ -32,29 +77,8 @@ def compute_rolling_correlation(
         return pd.DataFrame()
 
     # Normalise input: accept both MultiIndex and flat column layouts.
-    if isinstance(ohlcv_df.index, pd.MultiIndex):
-        df = ohlcv_df.reset_index()
-    else:
-        df = ohlcv_df.copy()
-
-    # Ensure standard column names exist
-    col_map = {}
-    for c in df.columns:
-        cl = str(c).lower()
-        if cl == "date":
-            col_map[c] = "date"
-        elif cl == "symbol":
-            col_map[c] = "symbol"
-        elif cl == "close":
-            col_map[c] = "close"
-    df = df.rename(columns=col_map)
-
-    if "date" not in df.columns or "symbol" not in df.columns or "close" not in df.columns:
-        return pd.DataFrame()
-
-    df["date"] = pd.to_datetime(df["date"])
+    df = _long_closes(ohlcv_df)
     symbols_upper = [s.upper() for s in symbols]
-    df["symbol"] = df["symbol"].astype(str).str.upper()
     df = df[df["symbol"].isin(symbols_upper)]
 
     if df.empty:
@@ -84,6 +108,103 @@ def compute_rolling_correlation(
     return corr
 
 
+@dataclass(frozen=True)
+class ReturnsMatrix:
+    """Daily returns over a symbol universe for one as-of date, ready for matrix-vector correlation.
+
+    Windowing, the ``lookback_days // 2`` coverage filter and the returns
+    match compute_rolling_correlation; correlations are Pearson over the
+    dates both symbols have a return (pandas' pairwise-complete ``corr``).
+    """
+
+    symbols: tuple[str, ...]
+    index: dict[str, int]
+    returns: np.ndarray  # dates x symbols, NaN -> 0.0
+    squares: np.ndarray  # returns ** 2
+    valid: np.ndarray  # dates x symbols, 1.0 where a return exists
+
+    @classmethod
+    def from_prices(cls, prices: pd.DataFrame, lookback_days: int = 60, as_of: Any = None) -> "ReturnsMatrix":
+        """From a close_panel, using closes in [as_of - lookback_days, as_of] (as_of defaults to the last date)."""
+        if prices.empty:
+            return cls.empty()
+        end = prices.index.max() if as_of is None else pd.Timestamp(as_of)
+        window = prices.loc[end - pd.Timedelta(days=lookback_days) : end]
+        min_points = lookback_days // 2
+        window = window.loc[:, window.notna().sum() >= min_points]
+        if window.empty or not window.shape[1]:
+            return cls.empty()
+        returns = window.ffill().pct_change(fill_method=None).dropna(how="all")
+        values = returns.to_numpy(dtype=np.float64)
+        valid = np.isfinite(values)
+        values = np.where(valid, values, 0.0)
+        symbols = tuple(str(c) for c in returns.columns)
+        return cls(
+            symbols=symbols,
+            index={sym: i for i, sym in enumerate(symbols)},
+            returns=values,
+            squares=values * values,
+            valid=valid.astype(np.float64),
+        )
+
+    @classmethod
+    def empty(cls) -> "ReturnsMatrix":
+        return cls(symbols=(), index={}, returns=np.empty((0, 0)), squares=np.empty((0, 0)), valid=np.empty((0, 0)))
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self.index
+
+    def correlations(self, symbol: str, others: Iterable[str]) -> dict[str, float]:
+        """Correlation of ``symbol`` with each of ``others`` in the matrix (NaN when undefined)."""
+        i = self.index.get(str(symbol).upper())
+        names = [str(o).upper() for o in others]
+        names = [o for o in names if o in self.index]
+        if i is None or not names:
+            return {}
+        cols = [self.index[o] for o in names]
+        x, m = self.returns[:, i], self.valid[:, i]
+        h, v = self.returns[:, cols], self.valid[:, cols]
+        # Pairwise-complete sums as matrix-vector products (x and h are 0 where missing).
+        n = m @ v
+        sx = x @ v
+        sh = m @ h
+        sxh = x @ h
+        sxx = (x * x) @ v
+        shh = m @ self.squares[:, cols]
+        cov = n * sxh - sx * sh
+        var = (n * sxx - sx * sx) * (n * shh - sh * sh)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = np.where((n >= 2) & (var > 0), cov / np.sqrt(np.where(var > 0, var, 1.0)), np.nan)
+        return dict(zip(names, np.clip(corr, -1.0, 1.0).tolist()))
+
+
+class ReturnsMatrixCache:
+    """Close panel per source frame and the ReturnsMatrix for the latest (as_of, lookback).
+
+    For a backtest walking forward over one history frame: the pivot is built
+    once, and the returns matrix once per date cursor.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._source: pd.DataFrame | None = None
+        self._panel = pd.DataFrame()
+        self._key: tuple | None = None
+        self._matrix = ReturnsMatrix.empty()
+
+    def get(self, ohlcv_df: pd.DataFrame, *, as_of: Any = None, lookback_days: int = 60) -> ReturnsMatrix:
+        with self._lock:
+            if self._source is not ohlcv_df:
+                self._panel = close_panel(ohlcv_df)
+                self._source = ohlcv_df
+                self._key = None
+            key = (None if as_of is None else pd.Timestamp(as_of), int(lookback_days))
+            if key != self._key:
+                self._matrix = ReturnsMatrix.from_prices(self._panel, lookback_days, as_of=as_of)
+                self._key = key
+            return self._matrix
+
+
 def get_sector_exposure(
     open_positions: list[dict],
     candidate_sector: str | None,
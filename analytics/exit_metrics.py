@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
 
 from analytics.schemas import ExitTrade
 from analytics.util import parse_timestamp
 
+if TYPE_CHECKING:
+    from execution_v2.bar_store import IntradayBarStore
+
 
 def _bar_ts_utc(bar: Any) -> datetime | None:
     if isinstance(bar, dict):
@@ -42,46 +47,83 @@ def _bar_high_low(bar: Any) -> tuple[float | None, float | None]:
     return high_val, low_val
 
 
-def compute_mae_mfe(
+def bars_to_arrays(bars: list[Any]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(ts epoch seconds, high, low) for bars with a timestamp, high and low; sorted by ts.
+
+    Timestamps are parsed once per series here so per-trade windows are
+    array slices rather than repeated passes over bar objects.
+    """
+    ts: list[float] = []
+    highs: list[float] = []
+    lows: list[float] = []
+    for bar in bars:
+        bar_ts = _bar_ts_utc(bar)
+        if bar_ts is None:
+            continue
+        high, low = _bar_high_low(bar)
+        if high is None or low is None:
+            continue
+        ts.append(bar_ts.timestamp())
+        highs.append(high)
+        lows.append(low)
+    ts_arr = np.asarray(ts, dtype=np.float64)
+    order = np.argsort(ts_arr, kind="stable")
+    return ts_arr[order], np.asarray(highs, dtype=np.float64)[order], np.asarray(lows, dtype=np.float64)[order]
+
+
+def compute_mae_mfe_arrays(
     *,
     entry_price: float,
-    bars: list[Any],
+    ts: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
     direction: str = "long",
-    entry_ts_utc: str | None = None,
-    exit_ts_utc: str | None = None,
+    start_ts: float | None = None,
+    end_ts: float | None = None,
 ) -> tuple[float | None, float | None]:
-    if entry_price is None or not bars:
+    """MAE/MFE over bars with ts (ascending epoch seconds) within [start_ts, end_ts]."""
+    if entry_price is None or not len(ts):
+        return None, None
+    lo = 0 if start_ts is None else int(np.searchsorted(ts, start_ts, side="left"))
+    hi = len(ts) if end_ts is None else int(np.searchsorted(ts, end_ts, side="right"))
+    if hi <= lo:
         return None, None
     entry = float(entry_price)
-    max_favorable = None
-    max_adverse = None
+    if direction == "long":
+        return float(low[lo:hi].min()) - entry, float(high[lo:hi].max()) - entry
+    return entry - float(high[lo:hi].max()), entry - float(low[lo:hi].min())
+
 
+def _window_ts(entry_ts_utc: str | None, exit_ts_utc: str | None) -> tuple[float | None, float | None]:
     start_ts = parse_timestamp(entry_ts_utc, source_path="entry_ts", entry_index=0) if entry_ts_utc else None
     end_ts = parse_timestamp(exit_ts_utc, source_path="exit_ts", entry_index=0) if exit_ts_utc else None
+    return (
+        start_ts.timestamp() if start_ts else None,
+        end_ts.timestamp() if end_ts else None,
+    )
 
-    for bar in bars:
-        ts = _bar_ts_utc(bar)
-        if ts is None:
-            continue
-        if start_ts and ts < start_ts:
-            continue
-        if end_ts and ts > end_ts:
-            continue
-        high, low = _bar_high_low(bar)
-        if high is None or low is None:
-            continue
-
-        if direction == "long":
-            favorable = high - entry
-            adverse = low - entry
-        else:
-            favorable = entry - low
-            adverse = entry - high
-
-        max_favorable = favorable if max_favorable is None else max(max_favorable, favorable)
-        max_adverse = adverse if max_adverse is None else min(max_adverse, adverse)
 
-    return max_adverse, max_favorable
+def compute_mae_mfe(
+    *,
+    entry_price: float,
+    bars: list[Any],
+    direction: str = "long",
+    entry_ts_utc: str | None = None,
+    exit_ts_utc: str | None = None,
+) -> tuple[float | None, float | None]:
+    if entry_price is None or not bars:
+        return None, None
+    start_ts, end_ts = _window_ts(entry_ts_utc, exit_ts_utc)
+    ts, high, low = bars_to_arrays(bars)
+    return compute_mae_mfe_arrays(
+        entry_price=entry_price,
+        ts=ts,
+        high=high,
+        low=low,
+        direction=direction,
+        start_ts=start_ts,
+        end_ts=end_ts,
+    )
 
 
 def compute_stop_efficiency(
@@ -115,26 +157,56 @@ def _aggregate(values: list[float | None]) -> float | None:
     return sum(vals) / len(vals)
 
 
+def _trade_mae_mfe(
+    trade: ExitTrade,
+    series: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]],
+    price_series_by_symbol: dict[str, list[Any]],
+    bar_store: "IntradayBarStore | None",
+    bar_minutes: int,
+) -> tuple[float | None, float | None]:
+    if trade.entry_price is None:
+        return None, None
+    start_ts, end_ts = _window_ts(trade.entry_ts_utc, trade.exit_ts_utc)
+    if trade.symbol in price_series_by_symbol:
+        arrays = series.get(trade.symbol)
+        if arrays is None:
+            arrays = series[trade.symbol] = bars_to_arrays(price_series_by_symbol[trade.symbol])
+        ts, high, low = arrays
+    elif bar_store is not None and start_ts is not None and end_ts is not None:
+        stored = bar_store.read(trade.symbol, start_ts, end_ts, minutes=bar_minutes)
+        ts, high, low = stored.ts.astype(np.float64), stored.high, stored.low
+    else:
+        return None, None
+    return compute_mae_mfe_arrays(
+        entry_price=trade.entry_price,
+        ts=ts,
+        high=high,
+        low=low,
+        direction=trade.direction,
+        start_ts=start_ts,
+        end_ts=end_ts,
+    )
+
+
 def compute_exit_metrics(
     *,
     trades: list[ExitTrade],
-    price_series_by_symbol: dict[str, list[Any]],
+    price_series_by_symbol: dict[str, list[Any]] | None = None,
+    bar_store: "IntradayBarStore | None" = None,
+    bar_minutes: int = 5,
 ) -> dict[str, Any]:
+    """Per-trade, per-symbol and portfolio exit metrics.
+
+    Bars come from ``price_series_by_symbol`` (parsed once per symbol) or, for
+    symbols not in it, from ``bar_store`` sliced to each trade's window.
+    """
+    price_series_by_symbol = price_series_by_symbol or {}
+    series: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
     trade_rows: list[dict[str, Any]] = []
     per_symbol: dict[str, list[dict[str, Any]]] = {}
 
     for trade in trades:
-        bars = price_series_by_symbol.get(trade.symbol, [])
-        if trade.entry_price is None:
-            mae, mfe = None, None
-        else:
-            mae, mfe = compute_mae_mfe(
-                entry_price=trade.entry_price,
-                bars=bars,
-                direction=trade.direction,
-                entry_ts_utc=trade.entry_ts_utc,
-                exit_ts_utc=trade.exit_ts_utc,
-            )
+        mae, mfe = _trade_mae_mfe(trade, series, price_series_by_symbol, bar_store, bar_minutes)
         efficiency = compute_stop_efficiency(
             entry_price=trade.entry_price,
             exit_price=trade.exit_price,
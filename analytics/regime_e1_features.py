@@ -3,8 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 import os
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
+import numpy as np
 import pandas as pd
 
 from analytics.regime_utils import (
@@ -296,20 +297,63 @@ def compute_regime_features(history: pd.DataFrame, ny_date: str) -> RegimeFeatur
     if breadth_value is None and breadth_reasons:
         reasons.extend(breadth_reasons)
 
+    return _assemble_feature_result(
+        ny_date=ny_date,
+        last_date=last_date,
+        lookbacks=lookbacks,
+        reasons=reasons,
+        history_rows=int(len(df)),
+        available_symbols=lambda: sorted(df["symbol"].unique().tolist()),
+        spy_close=spy_closes.iloc[-1],
+        vol=vol,
+        vol_returns=vol_returns,
+        drawdown=drawdown,
+        drawdown_closes=drawdown_closes,
+        trend=trend,
+        ma_short=ma_short,
+        ma_long=ma_long,
+        breadth_value=breadth_value,
+        breadth_snapshot=breadth_snapshot,
+    )
+
+
+def _lookbacks_snapshot(lookbacks: RegimeLookbacks) -> dict[str, int]:
+    return {
+        "vol": lookbacks.vol,
+        "drawdown": lookbacks.drawdown,
+        "trend_short": lookbacks.trend_short,
+        "trend_long": lookbacks.trend_long,
+        "breadth": lookbacks.breadth,
+        "min_breadth_symbols": lookbacks.min_breadth_symbols,
+    }
+
+
+def _assemble_feature_result(
+    *,
+    ny_date: str,
+    last_date: str,
+    lookbacks: RegimeLookbacks,
+    reasons: list[str],
+    history_rows: int,
+    available_symbols: Callable[[], list[str]],
+    spy_close: float,
+    vol: float | None,
+    vol_returns: list[float],
+    drawdown: float | None,
+    drawdown_closes: list[float],
+    trend: float | None,
+    ma_short: float | None,
+    ma_long: float | None,
+    breadth_value: float | None,
+    breadth_snapshot: dict[str, Any],
+) -> RegimeFeatureResult:
     if reasons:
         inputs_snapshot = {
             "ny_date": ny_date,
             "last_date": last_date,
-            "history_rows": int(len(df)),
-            "available_symbols": sorted(df["symbol"].unique().tolist()),
-            "lookbacks": {
-                "vol": lookbacks.vol,
-                "drawdown": lookbacks.drawdown,
-                "trend_short": lookbacks.trend_short,
-                "trend_long": lookbacks.trend_long,
-                "breadth": lookbacks.breadth,
-                "min_breadth_symbols": lookbacks.min_breadth_symbols,
-            },
+            "history_rows": history_rows,
+            "available_symbols": available_symbols(),
+            "lookbacks": _lookbacks_snapshot(lookbacks),
         }
         return RegimeFeatureResult(
             ok=False,
@@ -318,7 +362,7 @@ def compute_regime_features(history: pd.DataFrame, ny_date: str) -> RegimeFeatur
             inputs_snapshot=inputs_snapshot,
         )
 
-    spy_close = _round(spy_closes.iloc[-1])
+    spy_close = _round(spy_close)
 
     signals = {
         "volatility": {
@@ -352,14 +396,7 @@ def compute_regime_features(history: pd.DataFrame, ny_date: str) -> RegimeFeatur
         "trend_ma_short": ma_short,
         "trend_ma_long": ma_long,
         "breadth": breadth_snapshot,
-        "lookbacks": {
-            "vol": lookbacks.vol,
-            "drawdown": lookbacks.drawdown,
-            "trend_short": lookbacks.trend_short,
-            "trend_long": lookbacks.trend_long,
-            "breadth": lookbacks.breadth,
-            "min_breadth_symbols": lookbacks.min_breadth_symbols,
-        },
+        "lookbacks": _lookbacks_snapshot(lookbacks),
     }
 
     feature_set = RegimeFeatureSet(
@@ -381,6 +418,254 @@ def compute_regime_features(history: pd.DataFrame, ny_date: str) -> RegimeFeatur
     )
 
 
+def _sliding_windows(values: np.ndarray, lookback: int) -> np.ndarray:
+    """Row ``i`` is ``values[i:i + lookback]``; empty when too short."""
+    if len(values) < lookback:
+        return np.empty((0, lookback), dtype=float)
+    return np.lib.stride_tricks.sliding_window_view(values, lookback)
+
+
+@dataclass(frozen=True)
+class _SpyRollingFeatures:
+    """SPY vol / drawdown / trend precomputed for every as-of prefix.
+
+    Index ``k`` of the ``*_by_end`` arrays describes the window that ends
+    at SPY row ``k - 1`` (i.e. the last ``lookback`` rows of ``closes[:k]``).
+    Reductions run over contiguous windows with the same numpy kernels pandas
+    uses, so the rounded values match :func:`compute_regime_features`.
+    """
+
+    dates: pd.DatetimeIndex
+    closes: np.ndarray
+    returns: np.ndarray
+    return_positions: np.ndarray
+    vol_by_end: np.ndarray
+    drawdown_by_end: np.ndarray
+    ma_short_by_end: np.ndarray
+    ma_long_by_end: np.ndarray
+
+    @classmethod
+    def build(cls, spy: pd.DataFrame, lookbacks: RegimeLookbacks) -> "_SpyRollingFeatures":
+        closes = spy["close"].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw_returns = closes[1:] / closes[:-1] - 1.0
+        keep = ~np.isnan(raw_returns)
+        returns = raw_returns[keep]
+        return_positions = np.arange(1, len(closes))[keep]
+
+        def _by_end(values: np.ndarray, lookback: int, reduce: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+            out = np.full(len(values) + 1, np.nan)
+            windows = _sliding_windows(values, lookback)
+            if len(windows):
+                out[lookback:] = reduce(windows)
+            return out
+
+        def _drawdown(windows: np.ndarray) -> np.ndarray:
+            running_max = np.maximum.accumulate(windows, axis=1)
+            return (windows / running_max - 1.0).min(axis=1)
+
+        return cls(
+            dates=pd.DatetimeIndex(spy["date"]),
+            closes=closes,
+            returns=returns,
+            return_positions=return_positions,
+            vol_by_end=_by_end(
+                returns, lookbacks.vol, lambda w: w.std(axis=1, ddof=0) * (252 ** 0.5)
+            ),
+            drawdown_by_end=_by_end(closes, lookbacks.drawdown, _drawdown),
+            ma_short_by_end=_by_end(closes, lookbacks.trend_short, lambda w: w.mean(axis=1)),
+            ma_long_by_end=_by_end(closes, lookbacks.trend_long, lambda w: w.mean(axis=1)),
+        )
+
+
+@dataclass(frozen=True)
+class _BreadthPanel:
+    """Per-symbol above-MA state forward-filled onto the union date axis.
+
+    ``states[row, col]`` is NaN before the symbol's first bar, 0 while it has
+    fewer than ``lookback`` bars, 1 when its last close is below its MA and 2
+    when at or above it.
+    """
+
+    dates: pd.DatetimeIndex
+    symbols: np.ndarray
+    states: np.ndarray
+
+    @classmethod
+    def build(cls, df_sorted: pd.DataFrame, lookback: int) -> "_BreadthPanel":
+        closes = df_sorted["close"].to_numpy(dtype=float)
+        position = df_sorted.groupby("symbol", sort=False).cumcount().to_numpy()
+        row_state = np.zeros(len(df_sorted), dtype=float)
+        windows = _sliding_windows(closes, lookback)
+        if len(windows):
+            ma = np.full(len(closes), np.nan)
+            ma[lookback - 1:] = windows.mean(axis=1)
+            eligible = position >= lookback - 1
+            row_state[eligible] = np.where(closes[eligible] >= ma[eligible], 2.0, 1.0)
+
+        dates = pd.DatetimeIndex(np.unique(df_sorted["date"].to_numpy()))
+        symbol_codes, symbols = pd.factorize(df_sorted["symbol"], sort=True)
+        states = np.full((len(dates), len(symbols)), np.nan)
+        # Rows are sorted by (symbol, date), so the last row per cell wins.
+        states[dates.get_indexer(df_sorted["date"]), symbol_codes] = row_state
+        states = pd.DataFrame(states).ffill().to_numpy()
+        return cls(dates=dates, symbols=np.asarray(symbols), states=states)
+
+    def fraction(
+        self, cutoff: pd.Timestamp, *, min_symbols: int
+    ) -> tuple[float | None, dict[str, Any], str | None]:
+        row = int(self.dates.searchsorted(cutoff, side="right")) - 1
+        if row < 0:
+            return None, {}, "insufficient_breadth_symbols"
+        states = self.states[row]
+        used = states >= 1
+        breadth_symbols = self.symbols[used].tolist()
+        if len(breadth_symbols) < min_symbols:
+            return None, {}, "insufficient_breadth_symbols"
+        above_count = int(np.count_nonzero(states == 2))
+        fraction = above_count / len(breadth_symbols)
+        return _round(fraction), {
+            "method": "above_ma_fraction",
+            "symbols_used": breadth_symbols,
+            "above_ma_count": above_count,
+        }, None
+
+
+def compute_regime_features_batch(
+    history: pd.DataFrame, ny_dates: Iterable[str]
+) -> dict[str, RegimeFeatureResult]:
+    """Compute E1 features for many NY dates from one pass over ``history``.
+
+    Produces the same results as calling :func:`compute_regime_features` once
+    per date, but normalizes and sorts the history once and evaluates the SPY
+    windows and universe breadth as rolling series, so historical backfills
+    scale with the date range rather than with ``dates x history``.
+    """
+    ny_dates = list(ny_dates)
+    lookbacks = _resolve_lookbacks()
+    try:
+        df = _normalize_columns(history)
+    except ValueError:
+        return {
+            ny_date: RegimeFeatureResult(
+                ok=False,
+                feature_set=None,
+                reason_codes=["invalid_history_columns"],
+                inputs_snapshot={"ny_date": ny_date, "history_rows": int(len(history))},
+            )
+            for ny_date in ny_dates
+        }
+
+    df = df.sort_values(["symbol", "date"], kind="mergesort").reset_index(drop=True)
+    all_dates = pd.DatetimeIndex(np.sort(df["date"].to_numpy()))
+    first_seen = df.groupby("symbol", sort=True)["date"].min()
+    spy = _SpyRollingFeatures.build(df[df["symbol"] == "SPY"], lookbacks)
+    breadth_panel = _BreadthPanel.build(df, lookbacks.breadth)
+
+    results: dict[str, RegimeFeatureResult] = {}
+    for ny_date in ny_dates:
+        cutoff = pd.Timestamp(ny_date).normalize()
+        history_rows = int(all_dates.searchsorted(cutoff, side="right"))
+
+        def _available_symbols(cutoff: pd.Timestamp = cutoff) -> list[str]:
+            return first_seen.index[first_seen <= cutoff].tolist()
+
+        if history_rows == 0:
+            results[ny_date] = RegimeFeatureResult(
+                ok=False,
+                feature_set=None,
+                reason_codes=["no_history_for_date"],
+                inputs_snapshot={"ny_date": ny_date, "history_rows": 0},
+            )
+            continue
+
+        spy_rows = int(spy.dates.searchsorted(cutoff, side="right"))
+        if spy_rows == 0:
+            results[ny_date] = RegimeFeatureResult(
+                ok=False,
+                feature_set=None,
+                reason_codes=["missing_symbol_spy"],
+                inputs_snapshot={
+                    "ny_date": ny_date,
+                    "history_rows": history_rows,
+                    "available_symbols": _available_symbols(),
+                },
+            )
+            continue
+
+        reasons: list[str] = []
+        last_date = _to_date_string(spy.dates[spy_rows - 1])
+
+        vol, vol_returns = None, []
+        return_rows = int(np.searchsorted(spy.return_positions, spy_rows, side="left"))
+        if return_rows < lookbacks.vol:
+            reasons.append("insufficient_vol_history")
+        else:
+            vol = _round(spy.vol_by_end[return_rows])
+            vol_returns = [
+                _round(val)
+                for val in spy.returns[return_rows - lookbacks.vol:return_rows].tolist()
+            ]
+
+        drawdown, drawdown_closes = None, []
+        if spy_rows < lookbacks.drawdown:
+            reasons.append("insufficient_drawdown_history")
+        else:
+            drawdown = _round(spy.drawdown_by_end[spy_rows])
+            drawdown_closes = [
+                _round(val)
+                for val in spy.closes[spy_rows - lookbacks.drawdown:spy_rows].tolist()
+            ]
+
+        trend, ma_short, ma_long = None, None, None
+        if spy_rows < lookbacks.trend_long:
+            reasons.append("insufficient_trend_history")
+        elif spy_rows < lookbacks.trend_short:
+            reasons.append("insufficient_trend_short_history")
+        elif spy.ma_long_by_end[spy_rows] == 0:
+            reasons.append("invalid_trend_ma")
+        else:
+            raw_short = spy.ma_short_by_end[spy_rows]
+            raw_long = spy.ma_long_by_end[spy_rows]
+            trend = _round(raw_short / raw_long - 1.0)
+            ma_short, ma_long = _round(raw_short), _round(raw_long)
+
+        breadth_reasons: list[str] = []
+        breadth_value, breadth_snapshot, breadth_reason = breadth_panel.fraction(
+            cutoff, min_symbols=lookbacks.min_breadth_symbols
+        )
+        if breadth_value is None and breadth_reason:
+            breadth_reasons.append(breadth_reason)
+        if breadth_value is None:
+            breadth_value, breadth_snapshot, breadth_reason = _breadth_ratio(
+                df, ny_date, breadth_lookback=lookbacks.breadth
+            )
+            if breadth_value is None and breadth_reason:
+                breadth_reasons.append(breadth_reason)
+        if breadth_value is None and breadth_reasons:
+            reasons.extend(breadth_reasons)
+
+        results[ny_date] = _assemble_feature_result(
+            ny_date=ny_date,
+            last_date=last_date,
+            lookbacks=lookbacks,
+            reasons=reasons,
+            history_rows=history_rows,
+            available_symbols=_available_symbols,
+            spy_close=spy.closes[spy_rows - 1],
+            vol=vol,
+            vol_returns=vol_returns,
+            drawdown=drawdown,
+            drawdown_closes=drawdown_closes,
+            trend=trend,
+            ma_short=ma_short,
+            ma_long=ma_long,
+            breadth_value=breadth_value,
+            breadth_snapshot=breadth_snapshot,
+        )
+    return results
+
+
 def iter_ny_dates(start: str, end: str) -> Iterable[str]:
     start_dt = datetime.fromisoformat(start)
     end_dt = datetime.fromisoformat(end)
@@ -7,7 +7,7 @@ from pathlib import Path
 import pandas as pd
 
 from analytics.regime_e1_classifier import classify_regime
-from analytics.regime_e1_features import compute_regime_features, iter_ny_dates
+from analytics.regime_e1_features import compute_regime_features_batch, iter_ny_dates
 from analytics.regime_e1_schemas import RECORD_TYPE_SIGNAL, RECORD_TYPE_SKIPPED
 from analytics.regime_e1_storage import build_record, write_record
 
@@ -28,7 +28,12 @@ def run_historical(*, repo_root: Path, start: str, end: str, history_path: Path)
         history = _load_history(history_path)
     except FileNotFoundError:
         history = None
-    for ny_date in iter_ny_dates(start, end):
+    ny_dates = list(iter_ny_dates(start, end))
+    # One vectorized pass over the history instead of re-filtering it per date.
+    feature_results = (
+        compute_regime_features_batch(history, ny_dates) if history is not None else {}
+    )
+    for ny_date in ny_dates:
         as_of_utc = _default_as_of_utc(ny_date)
         if history is None:
             payload = {
@@ -43,7 +48,7 @@ def run_historical(*, repo_root: Path, start: str, end: str, history_path: Path)
                 payload=payload,
             )
         else:
-            feature_result = compute_regime_features(history, ny_date)
+            feature_result = feature_results[ny_date]
             if not feature_result.ok or feature_result.feature_set is None:
                 payload = {
                     "reason_codes": feature_result.reason_codes,
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path
@@ -15,6 +14,7 @@ from analytics.regime_e1_schemas import (
     build_regime_id,
     stable_json_dumps,
 )
+from utils import jsonl_ledger
 
 
 @dataclass(frozen=True)
@@ -29,33 +29,11 @@ def ledger_path(repo_root: Path, ny_date: str) -> Path:
     return repo_root / "ledger" / "REGIME_E1" / f"{ny_date}.jsonl"
 
 
-def _load_existing_ids(path: Path) -> set[str]:
-    if not path.exists():
-        return set()
-    existing: set[str] = set()
-    with path.open("r") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
-                logger.warning("Skipping malformed JSON line in %s", path)
-                continue
-            record_type = data.get("record_type")
-            if record_type not in {RECORD_TYPE_SIGNAL, RECORD_TYPE_SKIPPED}:
-                continue
-            regime_id = data.get("regime_id")
-            if regime_id:
-                existing.add(str(regime_id))
-    return existing
-
-
-def _append_record(path: Path, record: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a") as handle:
-        handle.write(stable_json_dumps(record) + "\n")
+def _regime_key(data: dict[str, Any]) -> str | None:
+    if data.get("record_type") not in {RECORD_TYPE_SIGNAL, RECORD_TYPE_SKIPPED}:
+        return None
+    regime_id = data.get("regime_id")
+    return str(regime_id) if regime_id else None
 
 
 def build_record(*, record_type: str, ny_date: str, as_of_utc: str, payload: dict[str, Any]) -> dict[str, Any]:
@@ -77,19 +55,13 @@ def build_record(*, record_type: str, ny_date: str, as_of_utc: str, payload: dic
 
 def write_record(*, repo_root: Path, ny_date: str, record: dict[str, Any]) -> RegimeWriteResult:
     path = ledger_path(repo_root, ny_date)
-    existing = _load_existing_ids(path)
     regime_id = str(record.get("regime_id"))
-    if regime_id in existing:
-        return RegimeWriteResult(
-            ledger_path=str(path),
-            records_written=0,
-            skipped=1,
-            regime_id=regime_id,
-        )
-    _append_record(path, record)
+    written, skipped = jsonl_ledger.append_records(
+        path, [record], key_fn=_regime_key, dumps=stable_json_dumps
+    )
     return RegimeWriteResult(
         ledger_path=str(path),
-        records_written=1,
-        skipped=0,
+        records_written=written,
+        skipped=skipped,
         regime_id=regime_id,
     )
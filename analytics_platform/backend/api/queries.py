@@ -3,7 +3,6 @@ from __future__ import annotations
 import csv
 import json
 from datetime import datetime
-from io import StringIO
 from pathlib import Path
 from typing import Any
 
@@ -383,19 +382,37 @@ def get_strategy_performance(
         order_params.append(book_id)
     order_where = (" WHERE " + " AND ".join(order_clauses)) if order_clauses else ""
 
-    # Batch-fetch all fills and buy counts to avoid N+1 per-strategy queries
-    all_fills = _rows(
+    # Round trips are FIFO-matched at read-model build time. A trade counts
+    # as closed in the window when it was entered on/after start and fully
+    # exited on/before end; entries in the window still held at end are open.
+    trip_clauses: list[str] = []
+    trip_params: list[Any] = []
+    if start:
+        trip_clauses.append("entry_date_ny >= ?")
+        trip_params.append(start)
+    if end:
+        trip_clauses.append("entry_date_ny <= ?")
+        trip_params.append(end)
+    if strategy_id:
+        trip_clauses.append("strategy_id = ?")
+        trip_params.append(strategy_id)
+    if book_id:
+        trip_clauses.append("book_id = ?")
+        trip_params.append(book_id)
+    trip_where = (" WHERE " + " AND ".join(trip_clauses)) if trip_clauses else ""
+    closed_expr = "status = 'closed'" + (" AND exit_date_ny <= ?" if end else "")
+
+    all_trips = _rows(
         conn,
         f"""
-        SELECT strategy_id, symbol, side, filled_qty, filled_avg_price, filled_at,
-               stop_loss, date_ny, status
-        FROM alpaca_order_events
-        {order_where}
-          {"AND" if order_clauses else "WHERE"} filled_qty > 0
-          AND status IN ('filled', 'FILLED', 'partially_filled', 'PARTIALLY_FILLED')
-        ORDER BY strategy_id, filled_at ASC NULLS LAST, date_ny ASC
+        SELECT strategy_id, symbol, entry_price, exit_price, pnl_per_share AS pnl,
+               r_multiple, holding_days,
+               CASE WHEN {closed_expr} THEN 'closed' ELSE 'open' END AS window_status
+        FROM round_trips
+        {trip_where}
+        ORDER BY strategy_id, exit_filled_at ASC NULLS LAST, exit_date_ny ASC, entry_filled_at ASC
         """,
-        order_params,
+        ([end] if end else []) + trip_params,
     )
 
     all_buy_counts = _rows(
@@ -413,71 +430,24 @@ def get_strategy_performance(
         order_params,
     )
 
-    # Group fills by strategy_id
-    fills_by_sid: dict[str, list[dict]] = {}
-    for f in all_fills:
-        sid = f.get("strategy_id") or ""
+    # Group round trips by strategy_id
+    trips_by_sid: dict[str, list[dict]] = {}
+    for t in all_trips:
+        sid = t.get("strategy_id") or ""
         if sid:
-            fills_by_sid.setdefault(sid, []).append(f)
+            trips_by_sid.setdefault(sid, []).append(t)
 
     buy_counts_by_sid = {
         r["strategy_id"]: (r["total_buys"] or 0, r["filled_buys"] or 0)
         for r in all_buy_counts if r.get("strategy_id")
     }
 
-    for sid in sorted(fills_by_sid.keys() | buy_counts_by_sid.keys()):
-        fills = fills_by_sid.get(sid, [])
+    for sid in sorted(trips_by_sid.keys() | buy_counts_by_sid.keys()):
+        trips = trips_by_sid.get(sid, [])
         total_buys, filled_buys = buy_counts_by_sid.get(sid, (0, 0))
 
-        # Pair entries (buy fills) with exits (sell fills) by symbol + time ordering
-        buys_by_symbol: dict[str, list[dict]] = {}
-        sells_by_symbol: dict[str, list[dict]] = {}
-        for f in fills:
-            side = (f.get("side") or "").lower()
-            sym = f.get("symbol") or ""
-            if side == "buy":
-                buys_by_symbol.setdefault(sym, []).append(f)
-            elif side == "sell":
-                sells_by_symbol.setdefault(sym, []).append(f)
-
-        closed_trades: list[dict] = []
-        open_count = 0
-        for sym, buy_list in buys_by_symbol.items():
-            sell_list = sells_by_symbol.get(sym, [])
-            sell_idx = 0
-            for buy in buy_list:
-                if sell_idx < len(sell_list):
-                    sell = sell_list[sell_idx]
-                    sell_idx += 1
-                    entry_price = buy.get("filled_avg_price") or 0
-                    exit_price = sell.get("filled_avg_price") or 0
-                    stop = buy.get("stop_loss")
-                    pnl = exit_price - entry_price
-                    r_multiple = None
-                    if stop is not None and entry_price and entry_price != stop:
-                        risk = abs(entry_price - float(stop))
-                        if risk > 0:
-                            r_multiple = pnl / risk
-                    # Holding days
-                    holding_days = None
-                    if buy.get("date_ny") and sell.get("date_ny"):
-                        try:
-                            from datetime import date as _date
-                            bd = _date.fromisoformat(buy["date_ny"])
-                            sd = _date.fromisoformat(sell["date_ny"])
-                            holding_days = (sd - bd).days
-                        except (ValueError, TypeError):
-                            pass
-                    closed_trades.append({
-                        "symbol": sym,
-                        "entry_price": entry_price,
-                        "exit_price": exit_price,
-                        "pnl": pnl,
-                        "r_multiple": r_multiple,
-                        "holding_days": holding_days,
-                    })
-                else:
-                    open_count += 1
+        closed_trades = [t for t in trips if t["window_status"] == "closed"]
+        open_count = len(trips) - len(closed_trades)
 
         closed_count = len(closed_trades)
         data_sufficient = closed_count >= 5
@@ -792,17 +762,23 @@ EXPORT_TABLES = {
     "schwab_reconciliation": ("schwab_reconciliation", "ny_date"),
     "scan_candidates": ("scan_candidates", "scan_date"),
     "alpaca_order_events": ("alpaca_order_events", "date_ny"),
+    "round_trips": ("round_trips", "entry_date_ny"),
 }
 
 
-def export_dataset_csv(
-    conn,
-    *,
-    dataset: str,
-    start: str | None,
-    end: str | None,
-    limit: int = 10000,
-) -> tuple[str, str]:
+EXPORT_FORMATS = ("csv", "parquet", "arrow")
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+CSV_EXPORT_MAX_ROWS = 100000
+EXPORT_BATCH_ROWS = 50_000
+
+
+def _export_query(
+    dataset: str, start: str | None, end: str | None, limit: int | None
+) -> tuple[str, list[Any]]:
     if dataset not in EXPORT_TABLES:
         raise KeyError(dataset)
     table, date_col = EXPORT_TABLES[dataset]
@@ -823,10 +799,98 @@ def export_dataset_csv(
     if clauses:
         where = " WHERE " + " AND ".join(clauses)
 
-    frame = conn.execute(f"SELECT * FROM {table}{where} LIMIT ?", params + [max(1, min(limit, 100000))]).fetchdf()
-    buffer = StringIO()
-    frame.to_csv(buffer, index=False, quoting=csv.QUOTE_MINIMAL)
-    return f"{dataset}.csv", buffer.getvalue()
+    sql = f"SELECT * FROM {table}{where}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(max(1, limit))
+    return sql, params
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_export(
+    conn,
+    *,
+    dataset: str,
+    fmt: str,
+    start: str | None,
+    end: str | None,
+    limit: int | None = None,
+    batch_rows: int = EXPORT_BATCH_ROWS,
+):
+    """Yield an export encoded as ``fmt`` in chunks, one DuckDB record batch at a time.
+
+    Only one batch is held in memory. CSV is capped at CSV_EXPORT_MAX_ROWS;
+    Parquet (one row group per batch) and Arrow IPC stream exports are
+    unbounded unless ``limit`` is given. Raises KeyError for unknown
+    datasets and ValueError for unknown formats before anything is read;
+    the query itself runs before returning, so DuckDB errors (bad filter,
+    table missing from an older read-model) are raised here too.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unsupported export format: {fmt}")
+    if fmt == "csv":
+        limit = min(limit or CSV_EXPORT_MAX_ROWS, CSV_EXPORT_MAX_ROWS)
+    sql, params = _export_query(dataset, start, end, limit)
+    reader = conn.execute(sql, params).fetch_record_batch(batch_rows)
+
+    def _generate():
+        if fmt == "csv":
+            header = True
+            for batch in reader:
+                yield batch.to_pandas().to_csv(
+                    index=False, header=header, quoting=csv.QUOTE_MINIMAL
+                ).encode("utf-8")
+                header = False
+            if header:
+                yield pd.DataFrame(columns=reader.schema.names).to_csv(index=False).encode("utf-8")
+            return
+
+        sink = _ChunkSink()
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(sink, reader.schema)
+        else:
+            writer = pa.ipc.new_stream(sink, reader.schema)
+        for batch in reader:
+            if fmt == "parquet":
+                writer.write_batch(batch, row_group_size=batch_rows)
+            else:
+                writer.write_batch(batch)
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+    return _generate()
 
 
 # ---------------------------------------------------------------------------
@@ -1272,6 +1336,107 @@ def get_slippage_dashboard(
     }
 
 
+# ---------------------------------------------------------------------------
+# Cycle Latency
+# ---------------------------------------------------------------------------
+
+def get_cycle_latency(conn, start: str | None, end: str | None) -> dict[str, Any]:
+    where, params = _date_clause("ny_date", start, end)
+    kind_joiner = " AND " if where else " WHERE "
+
+    summary = _rows(
+        conn,
+        f"""
+        SELECT
+            COUNT(*) AS cycles,
+            AVG(cycle_total_ms) AS mean_ms,
+            PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY cycle_total_ms) AS p50_ms,
+            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY cycle_total_ms) AS p95_ms,
+            MAX(cycle_total_ms) AS max_ms
+        FROM (
+            SELECT decision_id, MAX(cycle_total_ms) AS cycle_total_ms
+            FROM cycle_latency
+            {where}
+            GROUP BY decision_id
+        )
+        """,
+        params,
+    )
+
+    by_phase = _rows(
+        conn,
+        f"""
+        SELECT name AS phase,
+               COUNT(*) AS cycles,
+               SUM(calls) AS calls,
+               AVG(ms) AS mean_ms,
+               PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY ms) AS p50_ms,
+               PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY ms) AS p95_ms,
+               MAX(ms) AS max_ms
+        FROM cycle_latency
+        {where}{kind_joiner}kind = 'phase'
+        GROUP BY name
+        ORDER BY AVG(ms) DESC
+        """,
+        params,
+    )
+
+    by_api = _rows(
+        conn,
+        f"""
+        SELECT name AS api,
+               SUM(calls) AS calls,
+               SUM(errors) AS errors,
+               SUM(ms) AS total_ms,
+               SUM(ms) / NULLIF(SUM(calls), 0) AS mean_ms
+        FROM cycle_latency
+        {where}{kind_joiner}kind = 'api'
+        GROUP BY name
+        ORDER BY SUM(ms) DESC
+        """,
+        params,
+    )
+
+    slow_calls = _rows(
+        conn,
+        f"""
+        SELECT decision_id, ny_date, ts_utc, name AS api, symbol, ms
+        FROM cycle_latency
+        {where}{kind_joiner}kind = 'slow_call'
+        ORDER BY ms DESC
+        LIMIT 25
+        """,
+        params,
+    )
+
+    trend = _rows(
+        conn,
+        f"""
+        SELECT ny_date,
+               COUNT(*) AS cycles,
+               AVG(cycle_total_ms) AS mean_ms,
+               MAX(cycle_total_ms) AS max_ms
+        FROM (
+            SELECT decision_id, ny_date, MAX(cycle_total_ms) AS cycle_total_ms
+            FROM cycle_latency
+            {where}
+            GROUP BY decision_id, ny_date
+        )
+        GROUP BY ny_date
+        ORDER BY ny_date
+        """,
+        params,
+    )
+
+    return {
+        "summary": summary[0] if summary else {},
+        "by_phase": by_phase,
+        "by_api": by_api,
+        "slow_calls": slow_calls,
+        "trend": trend,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Portfolio Overview / Positions / History
 # ---------------------------------------------------------------------------
@@ -1951,10 +2116,46 @@ def get_trade_analytics(
         params,
     )
 
+    trip_clauses: list[str] = []
+    trip_params: list[Any] = []
+    if start:
+        trip_clauses.append("entry_date_ny >= ?")
+        trip_params.append(start)
+    if end:
+        trip_clauses.append("entry_date_ny <= ?")
+        trip_params.append(end)
+    if strategy_id:
+        trip_clauses.append("strategy_id = ?")
+        trip_params.append(strategy_id)
+    if sid_set:
+        placeholders = ", ".join("?" for _ in sid_set)
+        trip_clauses.append(f"strategy_id IN ({placeholders})")
+        trip_params.extend(sorted(sid_set))
+    trip_where = (" WHERE " + " AND ".join(trip_clauses)) if trip_clauses else ""
+
+    round_trips = _rows(
+        conn,
+        f"""
+        SELECT strategy_id,
+               SUM(CASE WHEN status = 'closed' THEN 1 ELSE 0 END) AS closed_count,
+               SUM(CASE WHEN status = 'open' THEN 1 ELSE 0 END) AS open_count,
+               AVG(CASE WHEN status = 'closed' THEN CASE WHEN pnl_per_share > 0 THEN 1.0 ELSE 0.0 END END) AS win_rate,
+               AVG(r_multiple) AS avg_r_multiple,
+               AVG(holding_days) AS avg_holding_days,
+               SUM(realized_pnl) AS realized_pnl
+        FROM round_trips
+        {trip_where}
+        GROUP BY strategy_id
+        ORDER BY strategy_id
+        """,
+        trip_params,
+    )
+
     return {
         "per_strategy": per_strategy,
         "daily_frequency": daily_frequency,
         "symbol_concentration": symbol_concentration,
+        "round_trips": round_trips,
     }
 
 
@@ -3,11 +3,12 @@ from __future__ import annotations
 import asyncio
 from contextlib import asynccontextmanager
 import contextlib
+import itertools
 from datetime import datetime, timezone
 
 from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
@@ -366,6 +367,16 @@ def create_app(settings: Settings | None = None) -> FastAPI:
             payload = queries.get_slippage_dashboard(conn, start, end, strategy_id)
         return _envelope(runtime, payload)
 
+    @app.get("/api/v1/execution/latency")
+    def execution_latency(
+        start: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+        end: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    ) -> dict:
+        runtime: AnalyticsRuntime = app.state.runtime
+        with connect_ro(runtime.settings.db_path) as conn:
+            payload = queries.get_cycle_latency(conn, start, end)
+        return _envelope(runtime, payload)
+
     @app.get("/api/v1/analytics/trades")
     def analytics_trades(
         start: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
@@ -569,30 +580,80 @@ def create_app(settings: Settings | None = None) -> FastAPI:
             raise HTTPException(status_code=404, detail=f"Trade {trade_id} not found")
         return _envelope(runtime, {"deleted": trade_id})
 
+    def _stream_export(
+        dataset: str,
+        fmt: str,
+        start: str | None,
+        end: str | None,
+        limit: int | None,
+    ) -> StreamingResponse:
+        runtime: AnalyticsRuntime = app.state.runtime
+        # The connection has to outlive this handler: it is closed by the
+        # body generator once the last record batch has been sent, or when
+        # the generator is discarded (client gone before or mid-stream).
+        stack = contextlib.ExitStack()
+        conn = stack.enter_context(connect_ro(runtime.settings.db_path))
+        try:
+            chunks = queries.iter_export(
+                conn,
+                dataset=dataset,
+                fmt=fmt,
+                start=start,
+                end=end,
+                limit=limit,
+            )
+        except KeyError as exc:
+            stack.close()
+            raise HTTPException(status_code=404, detail=f"unknown dataset: {dataset}") from exc
+        except Exception as exc:
+            stack.close()
+            raise HTTPException(status_code=500, detail=f"export failed: {exc}") from exc
+
+        def _body():
+            with stack:
+                yield from chunks
+
+        # Start the body here so the connection is owned by the suspended
+        # generator, and so errors producing the first chunk (which also
+        # carries the CSV header / file preamble) still become HTTP errors.
+        body = _body()
+        try:
+            first = next(body)
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=f"export failed: {exc}") from exc
+
+        return StreamingResponse(
+            itertools.chain([first], body),
+            media_type=queries.EXPORT_MEDIA_TYPES[fmt],
+            headers={"Content-Disposition": f'attachment; filename="{dataset}.{fmt}"'},
+        )
+
     @app.get("/api/v1/exports/{dataset}.csv")
     def export_dataset(
         dataset: str,
         start: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
         end: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
-        limit: int = Query(default=10000, ge=1, le=100000),
-    ) -> Response:
-        runtime: AnalyticsRuntime = app.state.runtime
-        with connect_ro(runtime.settings.db_path) as conn:
-            try:
-                filename, csv_data = queries.export_dataset_csv(
-                    conn,
-                    dataset=dataset,
-                    start=start,
-                    end=end,
-                    limit=limit,
-                )
-            except KeyError as exc:
-                raise HTTPException(status_code=404, detail=f"unknown dataset: {dataset}") from exc
-        return Response(
-            content=csv_data,
-            media_type="text/csv",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-        )
+        limit: int = Query(default=10000, ge=1, le=queries.CSV_EXPORT_MAX_ROWS),
+    ) -> StreamingResponse:
+        return _stream_export(dataset, "csv", start, end, limit)
+
+    @app.get("/api/v1/exports/{dataset}.parquet")
+    def export_dataset_parquet(
+        dataset: str,
+        start: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+        end: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+        limit: int | None = Query(default=None, ge=1),
+    ) -> StreamingResponse:
+        return _stream_export(dataset, "parquet", start, end, limit)
+
+    @app.get("/api/v1/exports/{dataset}.arrow")
+    def export_dataset_arrow(
+        dataset: str,
+        start: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+        end: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+        limit: int | None = Query(default=None, ge=1),
+    ) -> StreamingResponse:
+        return _stream_export(dataset, "arrow", start, end, limit)
 
     @app.get("/")
     def root():
@@ -12,6 +12,11 @@ import pandas as pd
 from analytics_platform.backend.config import Settings
 from analytics_platform.backend.db import connect_rw
 from analytics_platform.backend.models import BuildResult, utc_now_iso
+from analytics_platform.backend.readmodels.round_trips import (
+    ROUND_TRIP_COLUMNS,
+    ROUND_TRIP_DTYPES,
+    build_round_trips,
+)
 
 
 DEFAULT_STRATEGY_ID = "S1_AVWAP_CORE"
@@ -134,6 +139,7 @@ def build_readmodels(settings: Settings) -> BuildResult:
     gate_block_rows: list[dict[str, Any]] = []
     entry_rejection_rows: list[dict[str, Any]] = []
     rejected_symbol_rows: list[dict[str, Any]] = []
+    cycle_latency_rows: list[dict[str, Any]] = []
 
     signal_rows: list[dict[str, Any]] = []
     risk_rows: list[dict[str, Any]] = []
@@ -313,6 +319,54 @@ def build_readmodels(settings: Settings) -> BuildResult:
                     }
                 )
 
+            latency = rec.get("latency") or {}
+            latency_total_ms = float(latency.get("total_ms") or 0.0)
+            for phase_name, phase in sorted((latency.get("phases") or {}).items()):
+                cycle_latency_rows.append(
+                    {
+                        "decision_id": decision_id,
+                        "ny_date": ny_date,
+                        "ts_utc": rec.get("ts_utc"),
+                        "kind": "phase",
+                        "name": str(phase_name),
+                        "symbol": None,
+                        "ms": float(phase.get("ms") or 0.0),
+                        "calls": int(phase.get("calls") or 0),
+                        "errors": 0,
+                        "cycle_total_ms": latency_total_ms,
+                    }
+                )
+            for api_name, api in sorted((latency.get("api_calls") or {}).items()):
+                cycle_latency_rows.append(
+                    {
+                        "decision_id": decision_id,
+                        "ny_date": ny_date,
+                        "ts_utc": rec.get("ts_utc"),
+                        "kind": "api",
+                        "name": str(api_name),
+                        "symbol": None,
+                        "ms": float(api.get("ms") or 0.0),
+                        "calls": int(api.get("count") or 0),
+                        "errors": int(api.get("errors") or 0),
+                        "cycle_total_ms": latency_total_ms,
+                    }
+                )
+            for sample in latency.get("slow_calls") or []:
+                cycle_latency_rows.append(
+                    {
+                        "decision_id": decision_id,
+                        "ny_date": ny_date,
+                        "ts_utc": rec.get("ts_utc"),
+                        "kind": "slow_call",
+                        "name": str(sample.get("api") or ""),
+                        "symbol": str(sample.get("symbol") or "").upper() or None,
+                        "ms": float(sample.get("ms") or 0.0),
+                        "calls": 1,
+                        "errors": 0,
+                        "cycle_total_ms": latency_total_ms,
+                    }
+                )
+
             for intent in intents.get("intents") or []:
                 decision_intent_rows.append(
                     {
@@ -983,6 +1037,8 @@ def build_readmodels(settings: Settings) -> BuildResult:
                     }
                 )
 
+    round_trip_rows = build_round_trips(alpaca_order_rows)
+
     # BENCHMARK PRICES (from cache/ohlcv_history.parquet)
     benchmark_source = sources[14]
     parquet_path = settings.repo_root / "cache" / "ohlcv_history.parquet"
@@ -1048,6 +1104,7 @@ def build_readmodels(settings: Settings) -> BuildResult:
         "decision_gate_blocks": len(gate_block_rows),
         "entry_rejections": len(entry_rejection_rows),
         "entry_rejected_symbols": len(rejected_symbol_rows),
+        "cycle_latency": len(cycle_latency_rows),
         "strategy_signals": len(signal_rows),
         "risk_controls_daily": len(risk_rows),
         "regime_daily": len(regime_rows),
@@ -1068,6 +1125,7 @@ def build_readmodels(settings: Settings) -> BuildResult:
         "schwab_reconciliation": len(schwab_recon_rows),
         "scan_candidates": len(scan_candidate_rows),
         "alpaca_order_events": len(alpaca_order_rows),
+        "round_trips": len(round_trip_rows),
         "benchmark_prices": len(benchmark_rows),
         "freshness_health": len(freshness_rows),
     }
@@ -1141,6 +1199,25 @@ def build_readmodels(settings: Settings) -> BuildResult:
                 ["decision_id", "ny_date", "ts_utc", "symbol", "reason_code"],
             ),
         )
+        _write_table(
+            conn,
+            "cycle_latency",
+            _ensure_columns(
+                cycle_latency_rows,
+                [
+                    "decision_id",
+                    "ny_date",
+                    "ts_utc",
+                    "kind",
+                    "name",
+                    "symbol",
+                    "ms",
+                    "calls",
+                    "errors",
+                    "cycle_total_ms",
+                ],
+            ),
+        )
         _write_table(
             conn,
             "strategy_signals",
@@ -1399,6 +1476,11 @@ def build_readmodels(settings: Settings) -> BuildResult:
                 ],
             ),
         )
+        _write_table(
+            conn,
+            "round_trips",
+            _ensure_columns(round_trip_rows, ROUND_TRIP_COLUMNS).astype(ROUND_TRIP_DTYPES),
+        )
         _write_table(
             conn,
             "benchmark_prices",
@@ -0,0 +1,196 @@
+"""FIFO round-trip matching for Alpaca order fills.
+
+Materialized into the ``round_trips`` read-model table at build time so the
+performance endpoints select finished trades instead of re-pairing every
+fill in ``alpaca_order_events`` on each request.
+
+One row per entry (buy) fill. Sells are matched against the oldest open
+entry lots of the same book / strategy / symbol by quantity; an entry is
+``closed`` once its full quantity has been sold. Exit price is the
+quantity-weighted average of the sells that closed it. Sells with no open
+lot to match (shorts, pre-history positions) are ignored.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import date
+from typing import Any, Iterable
+
+_FILLED_STATUSES = {"filled", "partially_filled"}
+_QTY_EPSILON = 1e-9
+
+ROUND_TRIP_COLUMNS = [
+    "book_id",
+    "strategy_id",
+    "symbol",
+    "status",
+    "qty",
+    "exit_qty",
+    "entry_order_id",
+    "entry_date_ny",
+    "entry_filled_at",
+    "entry_price",
+    "stop_loss",
+    "exit_date_ny",
+    "exit_filled_at",
+    "exit_price",
+    "pnl_per_share",
+    "realized_pnl",
+    "r_multiple",
+    "holding_days",
+]
+
+# pandas dtypes for the materialized table: nullable types so missing values
+# land as SQL NULL, and an empty build still yields typed columns.
+ROUND_TRIP_DTYPES = {
+    **{column: "string" for column in ROUND_TRIP_COLUMNS},
+    **{
+        column: "Float64"
+        for column in (
+            "qty",
+            "exit_qty",
+            "entry_price",
+            "stop_loss",
+            "exit_price",
+            "pnl_per_share",
+            "realized_pnl",
+            "r_multiple",
+        )
+    },
+    "holding_days": "Int64",
+}
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _fills(order_rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Filled buy/sell events, one per order, in fill-time order.
+
+    Orders report cumulative ``filled_qty`` on every status event, so only
+    the most-filled event per (book, order id) is kept.
+    """
+    by_order: dict[tuple[str, str], dict[str, Any]] = {}
+    anonymous: list[dict[str, Any]] = []
+    for row in order_rows:
+        qty = _to_float(row.get("filled_qty"))
+        if not qty or qty <= 0:
+            continue
+        if str(row.get("status") or "").lower() not in _FILLED_STATUSES:
+            continue
+        if str(row.get("side") or "").lower() not in ("buy", "sell"):
+            continue
+        if not row.get("strategy_id"):
+            continue
+        order_id = str(row.get("alpaca_order_id") or "")
+        if not order_id:
+            anonymous.append(row)
+            continue
+        key = (str(row.get("book_id") or ""), order_id)
+        prior = by_order.get(key)
+        if prior is None or qty >= _to_float(prior.get("filled_qty")):
+            by_order[key] = row
+    fills = list(by_order.values()) + anonymous
+    fills.sort(
+        key=lambda r: (r.get("filled_at") is None, r.get("filled_at") or "", r.get("date_ny") or "")
+    )
+    return fills
+
+
+def _holding_days(entry_date: str | None, exit_date: str | None) -> int | None:
+    if not entry_date or not exit_date:
+        return None
+    try:
+        return (date.fromisoformat(exit_date) - date.fromisoformat(entry_date)).days
+    except (TypeError, ValueError):
+        return None
+
+
+def _finish(lot: dict[str, Any]) -> dict[str, Any]:
+    entry = lot["entry"]
+    entry_price = _to_float(entry.get("filled_avg_price")) or 0.0
+    exit_qty = lot["exit_qty"]
+    exit_price = lot["exit_notional"] / exit_qty if exit_qty > 0 else None
+    closed = lot["remaining"] <= _QTY_EPSILON
+    last_exit = lot["last_exit"] or {}
+
+    pnl_per_share = None
+    r_multiple = None
+    if closed and exit_price is not None:
+        pnl_per_share = exit_price - entry_price
+        stop = _to_float(entry.get("stop_loss"))
+        if stop is not None and entry_price and entry_price != stop:
+            risk = abs(entry_price - stop)
+            if risk > 0:
+                r_multiple = pnl_per_share / risk
+
+    return {
+        "book_id": str(entry.get("book_id") or ""),
+        "strategy_id": str(entry.get("strategy_id") or ""),
+        "symbol": str(entry.get("symbol") or ""),
+        "status": "closed" if closed else "open",
+        "qty": lot["qty"],
+        "exit_qty": exit_qty,
+        "entry_order_id": str(entry.get("alpaca_order_id") or ""),
+        "entry_date_ny": entry.get("date_ny") or None,
+        "entry_filled_at": entry.get("filled_at"),
+        "entry_price": entry_price,
+        "stop_loss": _to_float(entry.get("stop_loss")),
+        "exit_date_ny": last_exit.get("date_ny") or None,
+        "exit_filled_at": last_exit.get("filled_at"),
+        "exit_price": exit_price,
+        "pnl_per_share": pnl_per_share,
+        "realized_pnl": (exit_price - entry_price) * exit_qty if exit_price is not None else None,
+        "r_multiple": r_multiple,
+        "holding_days": _holding_days(entry.get("date_ny"), last_exit.get("date_ny")) if closed else None,
+    }
+
+
+def build_round_trips(order_rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """FIFO-match fills into round trips, ordered by book, strategy, entry time."""
+    open_lots: dict[tuple[str, str, str], deque[dict[str, Any]]] = {}
+    lots: list[dict[str, Any]] = []
+    for fill in _fills(order_rows):
+        key = (str(fill.get("book_id") or ""), str(fill["strategy_id"]), str(fill.get("symbol") or ""))
+        qty = _to_float(fill["filled_qty"]) or 0.0
+        if str(fill["side"]).lower() == "buy":
+            lot = {
+                "entry": fill,
+                "qty": qty,
+                "remaining": qty,
+                "exit_qty": 0.0,
+                "exit_notional": 0.0,
+                "last_exit": None,
+            }
+            lots.append(lot)
+            open_lots.setdefault(key, deque()).append(lot)
+            continue
+        price = _to_float(fill.get("filled_avg_price")) or 0.0
+        queue = open_lots.get(key)
+        while queue and qty > _QTY_EPSILON:
+            lot = queue[0]
+            take = min(lot["remaining"], qty)
+            lot["remaining"] -= take
+            lot["exit_qty"] += take
+            lot["exit_notional"] += take * price
+            lot["last_exit"] = fill
+            qty -= take
+            if lot["remaining"] <= _QTY_EPSILON:
+                queue.popleft()
+
+    rows = [_finish(lot) for lot in lots]
+    rows.sort(
+        key=lambda r: (
+            r["book_id"],
+            r["strategy_id"],
+            r["entry_filled_at"] is None,
+            r["entry_filled_at"] or "",
+            r["entry_date_ny"] or "",
+        )
+    )
+    return rows
@@ -102,6 +102,9 @@ export const api = {
   slippage: (args?: { start?: string; end?: string; strategy_id?: string }) =>
     get<KeyValue>(`/api/v1/execution/slippage${toQuery(args ?? {})}`),
 
+  cycleLatency: (args?: { start?: string; end?: string }) =>
+    get<KeyValue>(`/api/v1/execution/latency${toQuery(args ?? {})}`),
+
   tradeAnalytics: (args?: { start?: string; end?: string; strategy_id?: string; book_id?: string }) =>
     get<KeyValue>(`/api/v1/analytics/trades${toQuery(args ?? {})}`),
 
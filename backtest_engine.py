@@ -16,6 +16,7 @@ from analytics import risk_attribution
 from analytics import risk_attribution_rolling
 from analytics import risk_attribution_summary
 from analytics import risk_attribution_slack_summary
+from analytics.correlation_matrix import ReturnsMatrixCache
 import scan_engine
 from config import cfg as default_cfg
 from setup_context import load_setup_rules
@@ -196,9 +197,12 @@ def _compute_correlation_penalty(
     history: pd.DataFrame,
     session_date: pd.Timestamp,
     cfg,
+    returns_cache: ReturnsMatrixCache,
 ) -> float:
     """Compute correlation penalty for a candidate relative to open positions.
 
+    ``returns_cache`` is owned by the calling run, so the close panel is built
+    once per history frame and the returns matrix once per session.
     Returns 0.0 on any failure (fail-open) or when the feature is disabled.
     """
     if not getattr(cfg, "CORRELATION_AWARE_SIZING_ENABLED", False):
@@ -206,37 +210,18 @@ def _compute_correlation_penalty(
     if not positions:
         return 0.0
     try:
-        from analytics.correlation_matrix import compute_rolling_correlation
-        from execution_v2.correlation_sizing import correlation_penalty as _corr_pen
-
-        open_syms = list(positions.keys())
-        all_syms = open_syms + [candidate_symbol]
-        lookback = getattr(cfg, "CORRELATION_LOOKBACK_DAYS", 60)
-
-        # Build OHLCV slice from history for all_syms
-        if isinstance(history.index, pd.MultiIndex):
-            df = history.reset_index()
-        else:
-            df = history.copy()
-
-        # Normalise column names
-        col_map = {}
-        for c in df.columns:
-            cl = str(c).lower()
-            if cl == "date":
-                col_map[c] = "Date"
-            elif cl == "symbol":
-                col_map[c] = "Symbol"
-            elif cl == "close":
-                col_map[c] = "Close"
-        df = df.rename(columns=col_map)
-
-        corr_matrix = compute_rolling_correlation(df, all_syms, lookback_days=lookback)
-        if corr_matrix.empty:
-            return 0.0
+        from execution_v2.correlation_sizing import correlation_penalty_from_returns
 
+        # Closes through the prior session only: the entry fills at today's open.
+        returns = returns_cache.get(
+            history,
+            as_of=pd.Timestamp(session_date).normalize() - pd.Timedelta(days=1),
+            lookback_days=getattr(cfg, "CORRELATION_LOOKBACK_DAYS", 60),
+        )
         threshold = getattr(cfg, "CORRELATION_PENALTY_THRESHOLD", 0.6)
-        return _corr_pen(candidate_symbol, open_syms, corr_matrix, threshold=threshold)
+        return correlation_penalty_from_returns(
+            candidate_symbol, list(positions.keys()), returns, threshold=threshold
+        )
     except Exception as exc:
         print(f"WARN: correlation penalty failed for {candidate_symbol}: {exc}")
         return 0.0
@@ -525,6 +510,7 @@ def run_backtest(  # noqa: C901 — known complexity; entry/exit logic duplicate
     risk_controls_enabled = risk_modulation_enabled()
     drawdown_value, drawdown_threshold, _ = resolve_drawdown_guardrail()
     risk_controls_cache: dict[str, RiskControlResult] = {}
+    correlation_returns = ReturnsMatrixCache()
 
     def _resolve_risk_controls(date_ny: str) -> RiskControlResult | None:
         if not risk_controls_enabled:
@@ -817,6 +803,7 @@ def run_backtest(  # noqa: C901 — known complexity; entry/exit logic duplicate
                     history=history,
                     session_date=session_date,
                     cfg=cfg,
+                    returns_cache=correlation_returns,
                 )
 
                 equity_before = cash + _compute_positions_value(history, positions, session_date)
@@ -1360,6 +1347,7 @@ def run_backtest(  # noqa: C901 — known complexity; entry/exit logic duplicate
                     history=history,
                     session_date=session_date,
                     cfg=cfg,
+                    returns_cache=correlation_returns,
                 )
 
                 equity_before = cash + _compute_positions_value(history, positions, session_date)
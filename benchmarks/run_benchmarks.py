@@ -0,0 +1,418 @@
+"""
+Scan / backtest / read-model benchmark suite on synthetic R3K-scale data.
+
+    python -m benchmarks.run_benchmarks --tickers 500 --years 2
+    python -m benchmarks.run_benchmarks --tickers 3000 --years 5 --only _scan_as_of
+    python -m benchmarks.run_benchmarks --update-baseline
+
+Each case runs in a forked child (where fork is available) so ru_maxrss is a
+per-case peak RSS rather than the high-water mark of the whole session; the
+shared synthetic inputs are built once in the parent, so peak RSS includes
+them. Timings are the best of ``--repeat`` runs.
+
+Results are compared against a baseline JSON keyed by scale (``t500_y2``); a
+case regresses when its time or peak RSS exceeds the baseline by more than
+the tolerance, and the process exits 1. Baselines are machine-specific —
+regenerate with ``--update-baseline`` on the machine doing the comparing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import resource
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from benchmarks import synthetic
+
+BASELINE_SCHEMA_VERSION = 1
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_RSS_TOLERANCE = 0.25
+
+
+@dataclass(frozen=True)
+class Scale:
+    tickers: int
+    years: float
+    seed: int = 7
+
+    @property
+    def key(self) -> str:
+        return f"t{self.tickers}_y{self.years:g}"
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    name: str
+    seconds: float
+    items: int
+    unit: str
+    peak_rss_mb: float
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "throughput": round(self.throughput, 3)}
+
+
+@dataclass(frozen=True)
+class Regression:
+    case: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+@dataclass
+class BenchContext:
+    scale: Scale
+    workdir: Path
+    panel_path: Path
+    history: pd.DataFrame  # (Ticker, Date)-indexed, as backtest_engine loads it
+    frames: dict[str, pd.DataFrame]  # sampled per-ticker Date-indexed frames
+    anchors: dict[str, str | None]
+    sectors: dict[str, str]
+    setup_rules: dict
+    as_of: pd.Timestamp
+    backtest_days: int
+    backtest_tickers: int
+    readmodel_days: int
+    scan_cfg: object
+
+
+def build_context(
+    scale: Scale,
+    workdir: Path,
+    *,
+    sample: int = 200,
+    backtest_days: int = 5,
+    backtest_tickers: int = 200,
+    readmodel_days: int = 60,
+) -> BenchContext:
+    import backtest_engine
+    import scan_engine
+    from config import cfg as default_cfg
+    from setup_context import load_setup_rules
+
+    panel = synthetic.make_ohlcv_panel(scale.tickers, scale.years, seed=scale.seed)
+    repo = synthetic.write_ledger_repo(
+        workdir / "repo", panel, days=readmodel_days, seed=scale.seed
+    )
+    panel_path = repo / "cache" / "ohlcv_history.parquet"
+    history = backtest_engine.load_ohlcv_history(panel_path)
+    tickers = synthetic.make_tickers(scale.tickers)
+    as_of = pd.Timestamp(panel["Date"].max())
+
+    frames = {
+        t: history.loc[t].copy() for t in tickers[: max(1, min(sample, len(tickers)))]
+    }
+    anchors = {}
+    for t, df in frames.items():
+        best = scan_engine.pick_best_anchor(df, "Long", is_weekend=False)
+        anchors[t] = best[0] if best else None
+
+    return BenchContext(
+        scale=scale,
+        workdir=workdir,
+        panel_path=panel_path,
+        history=history,
+        frames=frames,
+        anchors=anchors,
+        sectors=synthetic.sector_map(tickers),
+        setup_rules=load_setup_rules(),
+        as_of=as_of,
+        backtest_days=backtest_days,
+        backtest_tickers=backtest_tickers,
+        readmodel_days=readmodel_days,
+        scan_cfg=default_cfg,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cases: each returns (items processed, unit)
+# ---------------------------------------------------------------------------
+
+
+def _case_build_candidate_row(ctx: BenchContext) -> tuple[int, str]:
+    import scan_engine
+
+    for t, df in ctx.frames.items():
+        scan_engine.build_candidate_row(
+            df, t, ctx.sectors[t], ctx.setup_rules, as_of_dt=ctx.as_of
+        )
+    return len(ctx.frames), "tickers"
+
+
+def _case_pick_best_anchor(ctx: BenchContext) -> tuple[int, str]:
+    import scan_engine
+
+    for df in ctx.frames.values():
+        scan_engine.pick_best_anchor(df, "Long", is_weekend=False)
+    return len(ctx.frames), "tickers"
+
+
+def _case_compute_setup_context(ctx: BenchContext) -> tuple[int, str]:
+    from setup_context import compute_setup_context
+
+    for t, df in ctx.frames.items():
+        compute_setup_context(df, ctx.anchors[t], ctx.setup_rules)
+    return len(ctx.frames), "tickers"
+
+
+def _case_scan_as_of(ctx: BenchContext) -> tuple[int, str]:
+    import backtest_engine
+
+    symbols = sorted(ctx.sectors)
+    backtest_engine._scan_as_of(ctx.history, symbols, ctx.sectors, ctx.as_of, ctx.scan_cfg)
+    return len(symbols), "tickers"
+
+
+def _case_run_backtest(ctx: BenchContext) -> tuple[int, str]:
+    import backtest_engine
+
+    dates = ctx.history.index.get_level_values("Date").unique().sort_values()
+    days = dates[-ctx.backtest_days :]
+    cfg = replace(
+        ctx.scan_cfg,
+        BACKTEST_OHLCV_PATH=str(ctx.panel_path),
+        BACKTEST_OUTPUT_DIR=str(ctx.workdir / "backtests"),
+        BACKTEST_VERBOSE=False,
+        BACKTEST_DEBUG_SAVE_CANDIDATES=False,
+    )
+    universe = sorted(ctx.sectors)[: ctx.backtest_tickers]
+    backtest_engine.run_backtest(cfg, days[0], days[-1], universe_symbols=universe)
+    return len(days), "days"
+
+
+def _case_build_readmodels(ctx: BenchContext) -> tuple[int, str]:
+    from analytics_platform.backend.config import Settings
+    from analytics_platform.backend.readmodels.build_readmodels import build_readmodels
+
+    repo = ctx.workdir / "repo"
+    data_dir = ctx.workdir / "readmodels"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    db_path = data_dir / "analytics.duckdb"
+    db_path.unlink(missing_ok=True)
+    build_readmodels(Settings(repo_root=repo, data_dir=data_dir, db_path=db_path))
+    records = sum(
+        path.read_text(encoding="utf-8").count("\n") for path in (repo / "ledger").rglob("*.jsonl")
+    )
+    return records, "records"
+
+
+CASES: dict[str, Callable[[BenchContext], tuple[int, str]]] = {
+    "build_candidate_row": _case_build_candidate_row,
+    "pick_best_anchor": _case_pick_best_anchor,
+    "compute_setup_context": _case_compute_setup_context,
+    "_scan_as_of": _case_scan_as_of,
+    "run_backtest": _case_run_backtest,
+    "build_readmodels": _case_build_readmodels,
+}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _time_case(name: str, ctx: BenchContext, repeat: int) -> CaseResult:
+    fn = CASES[name]
+    best = float("inf")
+    items, unit = 0, ""
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        items, unit = fn(ctx)
+        best = min(best, time.perf_counter() - t0)
+    return CaseResult(name, round(best, 6), items, unit, round(_peak_rss_mb(), 1))
+
+
+def _child(name: str, ctx: BenchContext, repeat: int, conn) -> None:
+    try:
+        conn.send(("ok", _time_case(name, ctx, repeat)))
+    except BaseException as exc:  # report, don't hang the parent
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def run_case(name: str, ctx: BenchContext, *, repeat: int = 3, isolate: bool = True) -> CaseResult:
+    if not isolate or "fork" not in mp.get_all_start_methods():
+        return _time_case(name, ctx, repeat)
+    mp_ctx = mp.get_context("fork")
+    parent_conn, child_conn = mp_ctx.Pipe(duplex=False)
+    proc = mp_ctx.Process(target=_child, args=(name, ctx, repeat, child_conn))
+    proc.start()
+    child_conn.close()
+    try:
+        status, payload = parent_conn.recv()
+    except EOFError:
+        status, payload = "error", f"benchmark process exited with code {proc.exitcode}"
+    proc.join()
+    if status != "ok":
+        raise RuntimeError(f"benchmark {name} failed: {payload}")
+    return payload
+
+
+def run_suite(
+    ctx: BenchContext,
+    cases: list[str] | None = None,
+    *,
+    repeat: int = 3,
+    isolate: bool = True,
+    log: Callable[[str], None] | None = print,
+) -> list[CaseResult]:
+    results = []
+    for name in cases or list(CASES):
+        if name not in CASES:
+            raise ValueError(f"unknown benchmark case: {name}")
+        # Whole-pipeline cases are too slow to repeat usefully.
+        n = 1 if name in ("run_backtest", "build_readmodels") else repeat
+        result = run_case(name, ctx, repeat=n, isolate=isolate)
+        results.append(result)
+        if log:
+            log(
+                f"{name:<24} {result.seconds:>9.3f}s  "
+                f"{result.throughput:>10.1f} {result.unit}/s  "
+                f"peak_rss={result.peak_rss_mb:.0f}MB"
+            )
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baseline handling
+# ---------------------------------------------------------------------------
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {"schema_version": BASELINE_SCHEMA_VERSION, "scales": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare_to_baseline(
+    results: list[CaseResult],
+    baseline: dict,
+    scale: Scale,
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+    rss_tolerance: float = DEFAULT_RSS_TOLERANCE,
+) -> list[Regression]:
+    cases = baseline.get("scales", {}).get(scale.key, {}).get("cases", {})
+    regressions = []
+    for result in results:
+        ref = cases.get(result.name)
+        if not ref:
+            continue
+        for metric, current, tol in (
+            ("seconds", result.seconds, tolerance),
+            ("peak_rss_mb", result.peak_rss_mb, rss_tolerance),
+        ):
+            base = float(ref.get(metric) or 0.0)
+            if base > 0 and current > base * (1.0 + tol):
+                regressions.append(Regression(result.name, metric, base, current))
+    return regressions
+
+
+def update_baseline(baseline: dict, results: list[CaseResult], scale: Scale) -> dict:
+    entry = baseline.setdefault("scales", {}).setdefault(scale.key, {"cases": {}})
+    entry["tickers"] = scale.tickers
+    entry["years"] = scale.years
+    entry["recorded_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    entry["machine"] = {"python": platform.python_version(), "platform": platform.platform()}
+    entry.setdefault("cases", {}).update({r.name: r.to_dict() for r in results})
+    baseline["schema_version"] = BASELINE_SCHEMA_VERSION
+    return baseline
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark scan/backtest hot paths on synthetic data.")
+    parser.add_argument("--tickers", type=int, default=500, help="Synthetic universe size.")
+    parser.add_argument("--years", type=float, default=2, help="Years of daily history per ticker.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", help="Comma-separated case names (default: all).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per per-ticker case; best is kept.")
+    parser.add_argument("--sample", type=int, default=200, help="Tickers timed by per-ticker cases.")
+    parser.add_argument("--backtest-days", type=int, default=5)
+    parser.add_argument("--backtest-tickers", type=int, default=200)
+    parser.add_argument("--readmodel-days", type=int, default=60)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--rss-tolerance", type=float, default=DEFAULT_RSS_TOLERANCE)
+    parser.add_argument("--no-isolate", action="store_true", help="Run cases in-process.")
+    parser.add_argument("--out", type=Path, help="Write results JSON here.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    scale = Scale(tickers=args.tickers, years=args.years, seed=args.seed)
+    cases = [c.strip() for c in args.only.split(",") if c.strip()] if args.only else None
+
+    with tempfile.TemporaryDirectory(prefix="avwap_bench_") as tmp:
+        t0 = time.perf_counter()
+        ctx = build_context(
+            scale,
+            Path(tmp),
+            sample=args.sample,
+            backtest_days=args.backtest_days,
+            backtest_tickers=args.backtest_tickers,
+            readmodel_days=args.readmodel_days,
+        )
+        print(f"scale={scale.key} setup={time.perf_counter() - t0:.1f}s")
+        results = run_suite(ctx, cases, repeat=args.repeat, isolate=not args.no_isolate)
+
+    if args.out:
+        args.out.write_text(
+            json.dumps(
+                {"scale": scale.key, "results": [r.to_dict() for r in results]},
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        update_baseline(baseline, results, scale)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline updated: {args.baseline} [{scale.key}]")
+        return 0
+
+    if scale.key not in baseline.get("scales", {}):
+        print(f"no baseline for {scale.key} in {args.baseline}; skipping comparison")
+        return 0
+    regressions = compare_to_baseline(
+        results, baseline, scale, tolerance=args.tolerance, rss_tolerance=args.rss_tolerance
+    )
+    for reg in regressions:
+        print(
+            f"REGRESSION {reg.case} {reg.metric}: {reg.current:g} vs baseline {reg.baseline:g} "
+            f"(x{reg.ratio:.2f})"
+        )
+    if not regressions:
+        print("no regressions against baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
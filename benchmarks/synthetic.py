@@ -0,0 +1,189 @@
+"""
+Deterministic synthetic data for the benchmark suite.
+
+make_ohlcv_panel builds a long yfinance-style OHLCV panel (Date, Ticker,
+Open, High, Low, Close, Volume) shaped like the scan history cache: per-ticker
+drift/volatility regimes, overnight gaps with volume spikes (so anchor
+detection has work to do), and business-day dates ending on a fixed session.
+write_ledger_repo lays out the ledger files build_readmodels consumes.
+Same arguments, same bytes: everything is driven by one numpy Generator.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SECTORS = (
+    "Technology",
+    "Health Care",
+    "Financials",
+    "Industrials",
+    "Consumer Discretionary",
+    "Consumer Staples",
+    "Energy",
+    "Materials",
+    "Utilities",
+    "Real Estate",
+    "Communication Services",
+)
+DEFAULT_END = "2025-12-31"
+TRADING_DAYS_PER_YEAR = 252
+
+
+def make_tickers(n: int) -> list[str]:
+    """``n`` distinct alphabetic symbols (valid for scan_engine.is_valid_ticker)."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    out = []
+    for i in range(n):
+        code, k = "", i
+        for _ in range(4):
+            code = letters[k % 26] + code
+            k //= 26
+        out.append("X" + code)
+    return out
+
+
+def sector_map(tickers: list[str]) -> dict[str, str]:
+    return {t: SECTORS[i % len(SECTORS)] for i, t in enumerate(tickers)}
+
+
+def make_ohlcv_panel(
+    n_tickers: int,
+    years: float,
+    *,
+    seed: int = 7,
+    end: str = DEFAULT_END,
+) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_days = max(2, int(round(years * TRADING_DAYS_PER_YEAR)))
+    dates = pd.bdate_range(end=end, periods=n_days)
+    tickers = make_tickers(n_tickers)
+
+    shape = (n_tickers, n_days)
+    drift = rng.normal(0.0004, 0.0008, size=(n_tickers, 1))
+    vol = rng.uniform(0.012, 0.035, size=(n_tickers, 1))
+    # Slow regime swings so trends persist long enough for AVWAP setups.
+    phase = rng.uniform(0, 2 * np.pi, size=(n_tickers, 1))
+    regime = 0.0015 * np.sin(np.arange(n_days) / rng.uniform(40, 120, size=(n_tickers, 1)) + phase)
+    intraday = rng.normal(drift + regime, vol, size=shape)
+    gap_mask = rng.random(shape) < 0.012
+    gaps = np.where(gap_mask, rng.choice([-1.0, 1.0], size=shape) * rng.uniform(0.03, 0.09, size=shape), 0.0)
+    gaps += rng.normal(0.0, 0.003, size=shape)
+    gaps[:, 0] = 0.0
+
+    start_px = rng.uniform(8.0, 250.0, size=(n_tickers, 1))
+    log_close = np.log(start_px) + np.cumsum(gaps + intraday, axis=1)
+    close = np.exp(log_close)
+    prev_close = np.concatenate([start_px, close[:, :-1]], axis=1)
+    open_ = prev_close * np.exp(gaps)
+    wick = np.abs(rng.normal(0.0, 0.6, size=(2,) + shape)) * vol
+    high = np.maximum(open_, close) * (1.0 + wick[0])
+    low = np.minimum(open_, close) * (1.0 - wick[1])
+
+    base_volume = rng.lognormal(mean=13.5, sigma=1.0, size=(n_tickers, 1))
+    volume = base_volume * rng.lognormal(0.0, 0.35, size=shape) * np.where(gap_mask, 2.5, 1.0)
+
+    return pd.DataFrame(
+        {
+            "Date": np.tile(dates.to_numpy(), n_tickers),
+            "Ticker": np.repeat(tickers, n_days),
+            "Open": open_.ravel().round(4),
+            "High": high.ravel().round(4),
+            "Low": low.ravel().round(4),
+            "Close": close.ravel().round(4),
+            "Volume": volume.ravel().round(0),
+        }
+    )
+
+
+def write_ledger_repo(
+    root: Path,
+    panel: pd.DataFrame,
+    *,
+    days: int = 60,
+    orders_per_day: int = 20,
+    seed: int = 7,
+) -> Path:
+    """Write decision, order-event and history-cache inputs for build_readmodels.
+
+    Each day has one portfolio decision with ``orders_per_day`` buy intents;
+    every buy is filled and sold a few sessions later, so the round-trip
+    matcher sees realistic volumes.
+    """
+    rng = np.random.default_rng(seed)
+    decisions_dir = root / "ledger" / "PORTFOLIO_DECISIONS"
+    orders_dir = root / "ledger" / "ALPACA_PAPER"
+    decisions_dir.mkdir(parents=True, exist_ok=True)
+    orders_dir.mkdir(parents=True, exist_ok=True)
+    (root / "state").mkdir(parents=True, exist_ok=True)
+    (root / "cache").mkdir(parents=True, exist_ok=True)
+    panel.to_parquet(root / "cache" / "ohlcv_history.parquet", index=False)
+
+    closes = panel.pivot(index="Date", columns="Ticker", values="Close").iloc[-days:]
+    tickers = list(closes.columns)
+    sessions = [d.strftime("%Y-%m-%d") for d in closes.index]
+    orders_by_day: dict[str, list[dict]] = {day: [] for day in sessions}
+
+    for day_idx, day in enumerate(sessions):
+        picks = rng.choice(len(tickers), size=min(orders_per_day, len(tickers)), replace=False)
+        intents = []
+        for n, col in enumerate(picks):
+            symbol = tickers[col]
+            qty = int(rng.integers(10, 200))
+            entry_px = float(closes.iloc[day_idx, col])
+            intents.append({"strategy_id": "S1_AVWAP_CORE", "symbol": symbol, "qty": qty, "side": "buy"})
+            exit_idx = min(day_idx + int(rng.integers(1, 6)), len(sessions) - 1)
+            for side, idx, px in (
+                ("buy", day_idx, entry_px),
+                ("sell", exit_idx, float(closes.iloc[exit_idx, col])),
+            ):
+                if side == "sell" and exit_idx == day_idx:
+                    continue
+                ts = f"{sessions[idx]}T15:{n % 60:02d}:00+00:00"
+                orders_by_day[sessions[idx]].append(
+                    {
+                        "event_type": "ORDER_STATUS",
+                        "date_ny": sessions[idx],
+                        "ts_utc": ts,
+                        "book_id": "ALPACA_PAPER",
+                        "strategy_id": "S1_AVWAP_CORE",
+                        "intent_id": f"{day}-{symbol}-{side}",
+                        "alpaca_order_id": f"{day}-{symbol}-{side}",
+                        "symbol": symbol,
+                        "qty": qty,
+                        "side": side,
+                        "ref_price": px,
+                        "notional": round(px * qty, 2),
+                        "status": "filled",
+                        "filled_qty": qty,
+                        "filled_avg_price": px,
+                        "filled_at": ts,
+                        "created_at": ts,
+                        "updated_at": ts,
+                        "order_type": "market",
+                        "stop_loss": round(entry_px * 0.95, 2),
+                        "take_profit": round(entry_px * 1.1, 2),
+                    }
+                )
+        decision = {
+            "schema_version": "1.0",
+            "decision_id": f"dec-{day}",
+            "ts_utc": f"{day}T14:35:00+00:00",
+            "ny_date": day,
+            "mode": {"execution_mode": "ALPACA_PAPER", "dry_run_forced": False},
+            "gates": {"live_gate_applied": True, "market": {"is_open": True}, "blocks": []},
+            "intents": {"intent_count": len(intents), "intents": intents},
+            "intents_meta": {"entry_intents_created_count": len(intents)},
+        }
+        (decisions_dir / f"{day}.jsonl").write_text(json.dumps(decision) + "\n", encoding="utf-8")
+
+    for day, rows in orders_by_day.items():
+        if rows:
+            (orders_dir / f"{day}.jsonl").write_text(
+                "\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8"
+            )
+    return root
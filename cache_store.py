@@ -1,4 +1,5 @@
 import os
+import threading
 import time
 import json
 import pandas as pd
@@ -39,6 +40,63 @@ def read_parquet(path: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+# Process-wide {path: ((mtime_ns, size), {ticker: last_close})} cache so
+# latest-price consumers (paper sim fills, status reports) parse the history
+# parquet once per file version instead of once per lookup.
+_LATEST_CLOSES: dict[str, tuple[tuple[int, int], dict[str, float]]] = {}
+_LATEST_CLOSES_LOCK = threading.Lock()
+
+
+def _build_latest_closes(path: str) -> dict[str, float]:
+    try:
+        df = pd.read_parquet(path, engine="pyarrow", columns=["Ticker", "Date", "Close"])
+    except Exception:
+        try:
+            df = pd.read_parquet(path, engine="pyarrow", columns=["Ticker", "Close"])
+        except Exception:
+            return {}
+    if df.empty:
+        return {}
+    df["Ticker"] = df["Ticker"].astype(str).str.upper()
+    if "Date" in df.columns:
+        df = df.sort_values("Date", kind="mergesort")
+    last = df.drop_duplicates(subset=["Ticker"], keep="last")
+    closes = pd.to_numeric(last["Close"], errors="coerce")
+    return {
+        ticker: float(close)
+        for ticker, close in zip(last["Ticker"].tolist(), closes.tolist())
+        if not pd.isna(close)
+    }
+
+
+def latest_closes(path: str) -> dict[str, float]:
+    """
+    Last Close per upper-cased Ticker (by Date) from an OHLCV history parquet.
+
+    Built from a Ticker/Date/Close projection and cached per process, keyed by
+    the file's mtime and size, so repeated lookups are dict hits until the
+    cache file is rewritten. Returns an empty dict if the file is missing or
+    unreadable. Callers must not mutate the returned dict.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return {}
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = os.path.abspath(path)
+    with _LATEST_CLOSES_LOCK:
+        cached = _LATEST_CLOSES.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        closes = _build_latest_closes(path)
+        _LATEST_CLOSES[key] = (version, closes)
+        return closes
+
+
+def latest_close(path: str, symbol: str) -> float | None:
+    return latest_closes(path).get(str(symbol).upper())
+
+
 def write_parquet(df: pd.DataFrame, path: str):
     """
     Optimized write with atomic saving and memory-efficient types.
@@ -34,6 +34,19 @@ class CFG:
     TOP_SECTORS_TO_SCAN: int = 11
     TOP_PER_SECTOR_BY_LIQ: int = 250
     SNAPSHOT_MAX_TICKERS: int = 3000
+    # "network": fetch 45d bars for the universe before the history refresh.
+    # "history": refresh the cache for the whole universe, then build the
+    # snapshot from it (one network pass per scan).
+    LIQUIDITY_SNAPSHOT_SOURCE: str = "network"
+
+    # History refresh: concurrent Alpaca daily-bar requests (200 req/min limit)
+    HISTORY_FETCH_WORKERS: int = 4
+    HISTORY_FETCH_MAX_REQUESTS_PER_MIN: int = 180
+    HISTORY_FETCH_RETRIES: int = 1
+
+    # Scan run report (daily_candidates.report.json) / Prometheus textfile
+    SCAN_REPORT_SLOW_TICKERS: int = 10
+    SCAN_METRICS_PROM_PATH: str = ""  # e.g. /var/lib/node_exporter/textfile/avwap_scan.prom
 
     # AVWAP / Trend
     ANCHOR_LOOKBACK: int = 60
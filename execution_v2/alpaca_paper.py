@@ -12,6 +12,7 @@ from typing import Iterable
 from execution_v2.clocks import ET
 from execution_v2 import book_ids
 from execution_v2 import live_gate
+from utils import jsonl_ledger
 
 
 LEDGER_DIR = Path("ledger") / book_ids.ALPACA_PAPER
@@ -21,34 +22,6 @@ def ledger_path(repo_root: Path, date_ny: str) -> Path:
     return book_ids.ledger_path(repo_root, book_ids.ALPACA_PAPER, date_ny)
 
 
-def _load_existing_event_keys(path: Path) -> set[str]:
-    """Return dedupe keys for events already written.
-
-    Dedupe is based on an event signature (order_id + status/fill fields),
-    not just order_id, so an order can produce multiple append-only ORDER_STATUS
-    events as it transitions (new -> filled, etc.).
-    """
-    existing: set[str] = set()
-    if not path.exists():
-        return existing
-    try:
-        with path.open("r") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                key = _event_dedupe_key(data)
-                if key:
-                    existing.add(key)
-    except Exception:
-        return existing
-    return existing
-
-
 def _normalize_ts(value) -> str | None:
     if value is None:
         return None
@@ -171,23 +144,12 @@ def build_order_event(
 
 
 def append_events(path: Path, events: Iterable[dict]) -> tuple[int, int]:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    existing = _load_existing_event_keys(path)
-    written = 0
-    skipped = 0
-    with path.open("a") as handle:
-        for event in events:
-            key = _event_dedupe_key(event)
-            if not key:
-                skipped += 1
-                continue
-            if key in existing:
-                skipped += 1
-                continue
-            handle.write(json.dumps(event, sort_keys=True, default=str) + "\n")
-            existing.add(key)
-            written += 1
-    return written, skipped
+    return jsonl_ledger.append_records(
+        path,
+        events,
+        key_fn=_event_dedupe_key,
+        dumps=lambda event: json.dumps(event, sort_keys=True, default=str),
+    )
 
 
 def load_caps_ledger(repo_root: Path, date_ny: str) -> live_gate.LiveLedger:
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import math
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Callable, Iterable, Mapping
 
 from execution_v2 import alpaca_paper, book_ids
 from execution_v2.clocks import ET
@@ -21,12 +25,67 @@ class RebalanceOrderResult:
     errors: list[str]
 
 
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_BACKOFF_S = 0.5
+DEFAULT_ACCEPT_TIMEOUT_S = 10.0
+_RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+_PENDING_STATUSES = {"pending_new"}
+
+
+@dataclass
+class _Submission:
+    entry: dict
+    order: Any = None
+    error: str | None = None
+    attempts: int = 0
+
+
 def _get_field(intent: Any, name: str, fallback: Any = None) -> Any:
     if isinstance(intent, Mapping):
         return intent.get(name, fallback)
     return getattr(intent, name, fallback)
 
 
+def _env_number(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _status_code(exc: Exception) -> int | None:
+    """HTTP status of an alpaca APIError or requests HTTPError, if any."""
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    try:
+        return int(status_code)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Transport failures and throttling/5xx responses; never order rejections.
+
+    requests' ConnectionError/Timeout (what alpaca-py raises on network
+    failures) are OSError subclasses, like the builtin ConnectionError and
+    TimeoutError.
+    """
+    status_code = _status_code(exc)
+    if status_code is not None:
+        return status_code in _RETRYABLE_STATUS_CODES
+    return isinstance(exc, OSError)
+
+
+def _order_status(order: Any) -> str:
+    status = str(getattr(order, "status", "") or "").strip().lower()
+    return status.split(".")[-1]
+
+
 class AlpacaRebalanceAdapter:
     """Wraps an Alpaca TradingClient for percentage-based portfolio rebalancing.
 
@@ -35,8 +94,32 @@ class AlpacaRebalanceAdapter:
     minimal changes.
     """
 
-    def __init__(self, trading_client: Any) -> None:
+    def __init__(
+        self,
+        trading_client: Any,
+        *,
+        max_workers: int | None = None,
+        retries: int | None = None,
+        retry_backoff_s: float | None = None,
+        accept_timeout_s: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self._client = trading_client
+        if max_workers is None:
+            max_workers = int(_env_number("ALPACA_REBALANCE_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        if retries is None:
+            retries = int(_env_number("ALPACA_REBALANCE_RETRIES", DEFAULT_RETRIES))
+        if retry_backoff_s is None:
+            retry_backoff_s = _env_number("ALPACA_REBALANCE_RETRY_BACKOFF_S", DEFAULT_RETRY_BACKOFF_S)
+        if accept_timeout_s is None:
+            accept_timeout_s = _env_number("ALPACA_REBALANCE_ACCEPT_TIMEOUT_S", DEFAULT_ACCEPT_TIMEOUT_S)
+        self.max_workers = max(1, int(max_workers))
+        self.retries = max(0, int(retries))
+        self.retry_backoff_s = max(0.0, float(retry_backoff_s))
+        self.accept_timeout_s = max(0.0, float(accept_timeout_s))
+        self._sleep = sleep
+        self._clock = clock
 
     def get_account_equity(self) -> float:
         account = self._client.get_account()
@@ -81,12 +164,13 @@ class AlpacaRebalanceAdapter:
         """Convert percentage-delta intents to Alpaca orders.
 
         - Skips cash_symbol intents (cash is the residual).
-        - Executes SELLs before BUYs.
-        - Records order events via alpaca_paper.append_events().
+        - Executes SELLs before BUYs: all sells are submitted concurrently and
+          must be accepted by the broker (or time out) before the buys go out.
+        - Retries transient submit failures with backoff, reusing the order's
+          client_order_id so a retry can never double-submit.
+        - Records order events via alpaca_paper.append_events(), in intent
+          order (sells then buys) regardless of completion order.
         """
-        from alpaca.trading.requests import MarketOrderRequest
-        from alpaca.trading.enums import OrderSide, TimeInForce
-
         equity = self.get_account_equity()
         intent_list = list(intents)
 
@@ -136,31 +220,27 @@ class AlpacaRebalanceAdapter:
         errors: list[str] = []
         events: list[dict] = []
 
-        for entry in sells + buys:
-            alpaca_side = OrderSide.SELL if entry["side"] == "SELL" else OrderSide.BUY
-            try:
-                order = self._client.submit_order(
-                    MarketOrderRequest(
-                        symbol=entry["symbol"],
-                        qty=entry["shares"],
-                        side=alpaca_side,
-                        time_in_force=TimeInForce.DAY,
-                    )
-                )
-                order_event = alpaca_paper.build_order_event(
-                    intent_id=entry["intent_id"],
-                    symbol=entry["symbol"],
-                    qty=entry["shares"],
-                    ref_price=entry["ref_price"],
-                    order=order,
-                    now_utc=now_utc,
-                )
-                if entry["strategy_id"]:
-                    order_event["strategy_id"] = entry["strategy_id"]
-                events.append(order_event)
-                orders.append(order_event)
-            except Exception as exc:
-                errors.append(f"{entry['symbol']}: {exc}")
+        submissions = self._submit_phase(sells)
+        self._wait_for_acceptance(submissions)
+        submissions += self._submit_phase(buys)
+
+        for sub in submissions:
+            entry = sub.entry
+            if sub.error is not None:
+                errors.append(f"{entry['symbol']}: {sub.error}")
+                continue
+            order_event = alpaca_paper.build_order_event(
+                intent_id=entry["intent_id"],
+                symbol=entry["symbol"],
+                qty=entry["shares"],
+                ref_price=entry["ref_price"],
+                order=sub.order,
+                now_utc=now_utc,
+            )
+            if entry["strategy_id"]:
+                order_event["strategy_id"] = entry["strategy_id"]
+            events.append(order_event)
+            orders.append(order_event)
 
         if events:
             ledger_path = alpaca_paper.ledger_path(repo_root, ny_date)
@@ -174,6 +254,101 @@ class AlpacaRebalanceAdapter:
             errors=errors,
         )
 
+    def _submit_phase(self, entries: list[dict]) -> list[_Submission]:
+        """Submit one phase's orders concurrently; results keep ``entries`` order."""
+        submissions = [_Submission(entry=entry) for entry in entries]
+        if not submissions:
+            return submissions
+        workers = min(self.max_workers, len(submissions))
+        if workers == 1:
+            for sub in submissions:
+                self._submit_with_retry(sub)
+            return submissions
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(self._submit_with_retry, submissions))
+        return submissions
+
+    def _submit_with_retry(self, sub: _Submission) -> None:
+        from alpaca.trading.requests import MarketOrderRequest
+        from alpaca.trading.enums import OrderSide, TimeInForce
+
+        entry = sub.entry
+        client_order_id = uuid.uuid4().hex
+        request = MarketOrderRequest(
+            symbol=entry["symbol"],
+            qty=entry["shares"],
+            side=OrderSide.SELL if entry["side"] == "SELL" else OrderSide.BUY,
+            time_in_force=TimeInForce.DAY,
+            client_order_id=client_order_id,
+        )
+        # After a failed call the order may still have reached the broker, so
+        # each retry first looks it up and resubmits only on a confirmed miss.
+        check_existing = False
+        while True:
+            sub.attempts += 1
+            try:
+                if check_existing:
+                    existing = self._find_by_client_order_id(client_order_id)
+                    if existing is not None:
+                        sub.order = existing
+                        sub.error = None
+                        return
+                    check_existing = False
+                sub.order = self._client.submit_order(request)
+                sub.error = None
+                return
+            except Exception as exc:
+                if check_existing:
+                    sub.error = f"order lookup failed for client_order_id {client_order_id}: {exc}"
+                else:
+                    sub.error = str(exc)
+                if not _is_retryable(exc) or sub.attempts > self.retries:
+                    return
+            check_existing = True
+            if self.retry_backoff_s > 0:
+                self._sleep(self.retry_backoff_s * (2 ** (sub.attempts - 1)))
+
+    def _find_by_client_order_id(self, client_order_id: str) -> Any:
+        """The broker's order for ``client_order_id``; None only when it reports none (404).
+
+        Any other lookup failure is raised so the caller neither resubmits a
+        possibly placed order nor drops it silently.
+        """
+        lookup = getattr(self._client, "get_order_by_client_id", None)
+        if lookup is None:
+            return None
+        try:
+            return lookup(client_order_id)
+        except Exception as exc:
+            if _status_code(exc) == 404:
+                return None
+            raise
+
+    def _wait_for_acceptance(self, submissions: list[_Submission]) -> None:
+        """Poll submitted orders still pending_new until accepted or timed out."""
+        get_order = getattr(self._client, "get_order_by_id", None)
+        pending = [
+            sub for sub in submissions
+            if sub.order is not None and _order_status(sub.order) in _PENDING_STATUSES
+        ]
+        if get_order is None or not pending:
+            return
+        deadline = self._clock() + self.accept_timeout_s
+        poll_s = min(0.25, self.accept_timeout_s) or 0.0
+        while pending and self._clock() < deadline:
+            if poll_s:
+                self._sleep(poll_s)
+            still_pending = []
+            for sub in pending:
+                try:
+                    sub.order = get_order(getattr(sub.order, "id"))
+                except Exception:
+                    still_pending.append(sub)
+                    continue
+                if _order_status(sub.order) in _PENDING_STATUSES:
+                    still_pending.append(sub)
+            pending = still_pending
+
     def send_summary_ticket(
         self,
         intents: Iterable[Any],
@@ -0,0 +1,297 @@
+"""
+Execution V2 – Intraday Bar Store
+
+Responsibilities:
+- Persist the closed intraday bars the execution loop fetches as columnar
+  parquet partitions, one file per timeframe, NY date and symbol:
+  <root>/<minutes>m/<YYYY-MM-DD>/<SYMBOL>.parquet
+  (ts int64 epoch seconds at bar start, float64 open/high/low/close/volume)
+- Serve NumPy slices by symbol and time range (post-trade MAE/MFE, exit
+  metrics, replay) with no network access
+
+Recording is enabled by EXECUTION_BAR_STORE_DIR; unset, nothing is written.
+Writes are fail-open: a failed write is logged and the cycle carries on.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from execution_v2.clocks import ET
+
+ENV_BAR_STORE_DIR = "EXECUTION_BAR_STORE_DIR"
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+DEFAULT_PARTITION_CACHE = 256
+
+
+def _to_epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00")).timestamp()
+    return float(value)
+
+
+def _ny_dates(ts: np.ndarray) -> np.ndarray:
+    local = pd.to_datetime(ts, unit="s", utc=True).tz_convert(ET)
+    return np.asarray(local.strftime("%Y-%m-%d"))
+
+
+@dataclass(frozen=True)
+class BarArrays:
+    """Bars as parallel arrays, ascending by ``ts`` (epoch seconds at bar start)."""
+
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    @classmethod
+    def empty(cls) -> "BarArrays":
+        return cls(np.empty(0, dtype=np.int64), *(np.empty(0) for _ in PRICE_COLUMNS))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "BarArrays":
+        return cls(
+            df["ts"].to_numpy(dtype=np.int64),
+            *(df[col].to_numpy(dtype=np.float64) for col in PRICE_COLUMNS),
+        )
+
+    @classmethod
+    def from_bars(cls, bars: Iterable[dict]) -> "BarArrays":
+        """From MarketData.get_intraday_bars dicts (``ts`` datetime or epoch seconds)."""
+        rows = list(bars)
+        if not rows:
+            return cls.empty()
+        return cls(
+            np.fromiter((int(_to_epoch(bar["ts"])) for bar in rows), dtype=np.int64, count=len(rows)),
+            *(
+                np.fromiter((float(bar.get(col) or 0.0) for bar in rows), dtype=np.float64, count=len(rows))
+                for col in PRICE_COLUMNS
+            ),
+        )
+
+    @classmethod
+    def concat(cls, parts: list["BarArrays"]) -> "BarArrays":
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls(*(np.concatenate([getattr(p, name) for p in parts]) for name in ("ts",) + PRICE_COLUMNS))
+
+    def take(self, index: np.ndarray | slice) -> "BarArrays":
+        return BarArrays(*(getattr(self, name)[index] for name in ("ts",) + PRICE_COLUMNS))
+
+    def between(self, start: Any = None, end: Any = None) -> "BarArrays":
+        """Bars starting within [start, end] (either bound optional)."""
+        lo = 0 if start is None else int(np.searchsorted(self.ts, _to_epoch(start), side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.ts, _to_epoch(end), side="right"))
+        return self.take(slice(lo, max(lo, hi)))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"ts": self.ts, **{col: getattr(self, col) for col in PRICE_COLUMNS}})
+
+
+def _merge(existing: BarArrays, incoming: BarArrays) -> BarArrays:
+    """Union by ts; incoming wins on equal ts (a refetch may correct a bar)."""
+    if not len(existing):
+        order = np.argsort(incoming.ts, kind="stable")
+        merged = incoming.take(order)
+    else:
+        both = BarArrays.concat([existing, incoming])
+        order = np.argsort(both.ts, kind="stable")
+        merged = both.take(order)
+    # Keep the last occurrence of each ts; stable sort keeps incoming after existing.
+    keep = np.ones(len(merged), dtype=bool)
+    keep[:-1] = merged.ts[1:] != merged.ts[:-1]
+    return merged.take(keep)
+
+
+class IntradayBarStore:
+    """Parquet-partitioned intraday bars with a small in-process partition cache."""
+
+    def __init__(self, root: str | Path, *, cache_partitions: int = DEFAULT_PARTITION_CACHE) -> None:
+        self.root = Path(root)
+        self.cache_partitions = max(0, int(cache_partitions))
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._cache: OrderedDict[Path, tuple[tuple[int, int], BarArrays]] = OrderedDict()
+        self._last_recorded: dict[tuple[str, int], tuple[int, np.ndarray]] = {}
+
+    def partition_path(self, symbol: str, ny_date: str, *, minutes: int = 5) -> Path:
+        return self.root / f"{int(minutes)}m" / ny_date / f"{str(symbol).upper()}.parquet"
+
+    # -- reads ---------------------------------------------------------------
+
+    def _load(self, path: Path) -> BarArrays:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return BarArrays.empty()
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == key:
+                self._cache.move_to_end(path)
+                return cached[1]
+        bars = BarArrays.from_frame(pd.read_parquet(path, engine="pyarrow"))
+        self._remember(path, key, bars)
+        return bars
+
+    def _remember(self, path: Path, key: tuple[int, int], bars: BarArrays) -> None:
+        if not self.cache_partitions:
+            return
+        with self._lock:
+            self._cache[path] = (key, bars)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.cache_partitions:
+                self._cache.popitem(last=False)
+
+    def read(self, symbol: str, start: Any, end: Any, *, minutes: int = 5) -> BarArrays:
+        """Bars for ``symbol`` starting within [start, end] (epoch seconds, datetime or ISO string)."""
+        start_ts, end_ts = _to_epoch(start), _to_epoch(end)
+        if end_ts < start_ts:
+            return BarArrays.empty()
+        day = datetime.fromtimestamp(start_ts, ET).date()
+        last = datetime.fromtimestamp(end_ts, ET).date()
+        parts = []
+        while day <= last:
+            parts.append(self._load(self.partition_path(symbol, day.isoformat(), minutes=minutes)))
+            day += timedelta(days=1)
+        return BarArrays.concat(parts).between(start_ts, end_ts)
+
+    def days(self, *, minutes: int = 5) -> list[str]:
+        base = self.root / f"{int(minutes)}m"
+        if not base.is_dir():
+            return []
+        return sorted(p.name for p in base.iterdir() if p.is_dir())
+
+    def symbols(self, ny_date: str, *, minutes: int = 5) -> list[str]:
+        base = self.root / f"{int(minutes)}m" / ny_date
+        if not base.is_dir():
+            return []
+        return sorted(p.stem for p in base.glob("*.parquet"))
+
+    def frame(
+        self,
+        start: Any,
+        end: Any,
+        *,
+        symbols: Optional[Iterable[str]] = None,
+        minutes: int = 5,
+    ) -> pd.DataFrame:
+        """Long frame (symbol, ts as UTC datetime, OHLCV) for replay and ad-hoc analysis."""
+        start_ts, end_ts = _to_epoch(start), _to_epoch(end)
+        if symbols is None:
+            first = datetime.fromtimestamp(start_ts, ET).strftime("%Y-%m-%d")
+            last = datetime.fromtimestamp(end_ts, ET).strftime("%Y-%m-%d")
+            names: set[str] = set()
+            for day in self.days(minutes=minutes):
+                if first <= day <= last:
+                    names.update(self.symbols(day, minutes=minutes))
+            symbols = names
+        frames = []
+        for symbol in sorted({str(s).upper() for s in symbols}):
+            bars = self.read(symbol, start_ts, end_ts, minutes=minutes)
+            if len(bars):
+                df = bars.to_frame()
+                df.insert(0, "symbol", symbol)
+                frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=["symbol", "ts", *PRICE_COLUMNS])
+        out = pd.concat(frames, ignore_index=True)
+        out["ts"] = pd.to_datetime(out["ts"], unit="s", utc=True)
+        return out
+
+    # -- writes --------------------------------------------------------------
+
+    def write(self, symbol: str, bars: BarArrays, *, minutes: int = 5) -> int:
+        """Merge ``bars`` into their NY-date partitions; returns partitions written."""
+        if not len(bars):
+            return 0
+        days = _ny_dates(bars.ts)
+        written = 0
+        for day in np.unique(days):
+            path = self.partition_path(symbol, str(day), minutes=minutes)
+            with self._write_lock:
+                merged = _merge(self._load(path), bars.take(days == day))
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                merged.to_frame().to_parquet(tmp, index=False, engine="pyarrow", compression="snappy")
+                os.replace(tmp, path)
+                stat = path.stat()
+                self._remember(path, (stat.st_mtime_ns, stat.st_size), merged)
+            written += 1
+        return written
+
+    def record(self, symbol: str, bars: list[dict], *, minutes: int = 5, now: Optional[float] = None) -> int:
+        """Store the closed bars of a MarketData fetch not already recorded by this process.
+
+        The forming bar is left out; it is picked up once closed on a later
+        fetch. The newest recorded bar is rewritten when a refetch returns it
+        with different values (a late correction). Fail-open: errors are
+        logged and 0 is returned.
+        """
+        symbol = str(symbol).upper()
+        key = (symbol, int(minutes))
+        try:
+            arrays = BarArrays.from_bars(bars)
+            now_ts = time.time() if now is None else float(now)
+            with self._lock:
+                last = self._last_recorded.get(key)
+            closed = arrays.ts + int(minutes) * 60 <= now_ts
+            if last is not None:
+                last_ts, last_values = last
+                values = np.column_stack([getattr(arrays, col) for col in PRICE_COLUMNS])
+                corrected = (arrays.ts == last_ts) & np.any(values != last_values, axis=1)
+                closed &= (arrays.ts > last_ts) | corrected
+            fresh = arrays.take(closed)
+            if not len(fresh):
+                return 0
+            self.write(symbol, fresh, minutes=minutes)
+            newest = int(np.argmax(fresh.ts))
+            with self._lock:
+                previous = self._last_recorded.get(key)
+                if previous is None or int(fresh.ts[newest]) >= previous[0]:
+                    self._last_recorded[key] = (
+                        int(fresh.ts[newest]),
+                        np.array([getattr(fresh, col)[newest] for col in PRICE_COLUMNS]),
+                    )
+            return len(fresh)
+        except Exception as exc:
+            print(f"WARN: bar store write failed for {symbol} {minutes}m: {type(exc).__name__}: {exc}", flush=True)
+            return 0
+
+
+_STORES: dict[str, IntradayBarStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def bar_store_from_env() -> Optional[IntradayBarStore]:
+    """The process-wide store under EXECUTION_BAR_STORE_DIR, or None when unset."""
+    root = os.getenv(ENV_BAR_STORE_DIR, "").strip()
+    if not root:
+        return None
+    with _STORES_LOCK:
+        store = _STORES.get(root)
+        if store is None:
+            store = _STORES[root] = IntradayBarStore(root)
+        return store
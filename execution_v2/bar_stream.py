@@ -0,0 +1,602 @@
+"""
+Execution V2 – Streaming Intraday Bar Ingestion (optional)
+
+Responsibilities:
+- Consume a websocket-style feed of 1-minute bars and trades
+- Roll them into 5m / 10m / daily bars per symbol, in memory
+- Close a bucket as soon as its final minute bar lands (or after a short grace
+  period when that minute had no prints) and wake the execution loop
+- Serve BOH (last two closed 10m bars), exit stop evaluation (intraday bars)
+  and daily bars from memory, seeded once from REST for the pre-stream history
+
+Symbols are subscribed on first read, so the stream usually joins mid-bucket
+and after the open. The bucket a symbol's first streamed minute lands in is
+partial: it is never served, and REST's bar for it is kept instead. Today's
+daily bar takes its open (and the high/low so far) from REST unless the stream
+covered the session from the open.
+
+Enabled with EXECUTION_MARKET_DATA_MODE=stream. The default remains REST
+polling; any symbol the stream has not produced bars for yet falls through to
+the REST MarketData adapter unchanged. So does any read while the feed thread
+is down or the newest streamed bar is more than one frame (plus
+EXECUTION_STREAM_STALE_GRACE_SEC) old, so a stalled stream never freezes
+BOH or exits on old bars.
+
+This module performs I/O (feed thread) but contains NO strategy logic.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
+
+from execution_v2.boh import Bar10m
+from execution_v2.clocks import ET
+from execution_v2.pivots import DailyBar
+
+
+ENV_MARKET_DATA_MODE = "EXECUTION_MARKET_DATA_MODE"
+ENV_STREAM_FEED = "EXECUTION_STREAM_FEED"
+ENV_STREAM_CLOSE_GRACE_SEC = "EXECUTION_STREAM_CLOSE_GRACE_SEC"
+ENV_STREAM_SETTLE_SEC = "EXECUTION_STREAM_SETTLE_SEC"
+ENV_STREAM_STALE_GRACE_SEC = "EXECUTION_STREAM_STALE_GRACE_SEC"
+
+DEFAULT_FRAMES_MINUTES = (5, 10)
+DEFAULT_CLOSE_GRACE_SEC = 10.0
+DEFAULT_SETTLE_SEC = 2.0
+DEFAULT_STALE_GRACE_SEC = 60.0
+DEFAULT_MAX_BARS_PER_FRAME = 1000
+BOH_FRAME_MINUTES = 10
+
+
+def _to_epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def _ny_date(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=ET).strftime("%Y-%m-%d")
+
+
+def _ny_midnight_ts(ny_date: str) -> float:
+    return datetime.strptime(ny_date, "%Y-%m-%d").replace(tzinfo=ET).timestamp()
+
+
+def _ny_session_open_ts(ny_date: str) -> float:
+    return datetime.strptime(ny_date, "%Y-%m-%d").replace(hour=9, minute=30, tzinfo=ET).timestamp()
+
+
+@dataclass
+class _Bucket:
+    start: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    # Started before the symbol's first streamed minute: minutes are missing.
+    partial: bool = False
+
+    def merge(self, high: float, low: float, close: float, volume: float) -> None:
+        self.high = max(self.high, high)
+        self.low = min(self.low, low)
+        self.close = close
+        self.volume += volume
+
+    def as_dict(self) -> dict:
+        return {
+            "ts": datetime.fromtimestamp(self.start, tz=timezone.utc),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+
+@dataclass
+class _SymbolBars:
+    open_buckets: dict[int, _Bucket] = field(default_factory=dict)
+    closed: dict[int, deque] = field(default_factory=dict)
+    daily: dict[str, _Bucket] = field(default_factory=dict)
+    last_trade: Optional[tuple[float, float]] = None
+    first_minute: Optional[float] = None
+
+
+class BarAggregator:
+    """Thread-safe rolling N-minute and daily bars built from 1-minute bars.
+
+    Minute bars are keyed by their start timestamp (Alpaca convention), and so
+    are the aggregated bars, matching what the REST adapter returns. Trades
+    only advance the clock and record the last print; volume comes from the
+    minute bars so nothing is double counted. The bucket holding a symbol's
+    first streamed minute is kept (so late minutes are still recognised) but
+    flagged partial when that minute is not the bucket's first, and
+    ``closed_bars`` leaves it out.
+    """
+
+    def __init__(
+        self,
+        frames_minutes: Iterable[int] = DEFAULT_FRAMES_MINUTES,
+        *,
+        close_grace_sec: float = DEFAULT_CLOSE_GRACE_SEC,
+        max_bars_per_frame: int = DEFAULT_MAX_BARS_PER_FRAME,
+    ) -> None:
+        self.frames = tuple(sorted({int(m) for m in frames_minutes if int(m) > 0}))
+        self.close_grace_sec = float(close_grace_sec)
+        self.max_bars_per_frame = int(max_bars_per_frame)
+        self._symbols: dict[str, _SymbolBars] = {}
+        self._cond = threading.Condition()
+        self._close_seq = 0
+
+    def _state(self, symbol: str) -> _SymbolBars:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = _SymbolBars(closed={m: deque(maxlen=self.max_bars_per_frame) for m in self.frames})
+            self._symbols[symbol] = state
+        return state
+
+    def _close_bucket(self, state: _SymbolBars, minutes: int) -> None:
+        bucket = state.open_buckets.pop(minutes, None)
+        if bucket is None:
+            return
+        state.closed[minutes].append(bucket)
+        self._close_seq += 1
+
+    def on_bar(
+        self,
+        symbol: str,
+        ts: Any,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> None:
+        symbol = str(symbol).strip().upper()
+        start = _to_epoch(ts)
+        with self._cond:
+            state = self._state(symbol)
+            if state.first_minute is None:
+                state.first_minute = start
+            seq_before = self._close_seq
+            for minutes in self.frames:
+                width = minutes * 60
+                bucket_start = start - (start % width)
+                closed = state.closed[minutes]
+                if closed and bucket_start <= closed[-1].start:
+                    continue  # late minute for a bucket that already closed
+                bucket = state.open_buckets.get(minutes)
+                if bucket is not None and bucket.start != bucket_start:
+                    if bucket_start < bucket.start:
+                        continue
+                    self._close_bucket(state, minutes)
+                    bucket = None
+                if bucket is None:
+                    state.open_buckets[minutes] = _Bucket(
+                        bucket_start,
+                        float(open),
+                        float(high),
+                        float(low),
+                        float(close),
+                        float(volume),
+                        partial=bucket_start < state.first_minute,
+                    )
+                else:
+                    bucket.merge(float(high), float(low), float(close), float(volume))
+                if start + 60 >= bucket_start + width:
+                    # Final minute of the bucket: it is complete now.
+                    self._close_bucket(state, minutes)
+
+            ny_date = _ny_date(start)
+            day = state.daily.get(ny_date)
+            if day is None:
+                state.daily[ny_date] = _Bucket(
+                    _ny_midnight_ts(ny_date), float(open), float(high), float(low), float(close), float(volume)
+                )
+                for stale in [d for d in state.daily if d < ny_date]:
+                    state.daily.pop(stale, None)
+            else:
+                day.merge(float(high), float(low), float(close), float(volume))
+            self._advance_locked(start + 60)
+            if self._close_seq != seq_before:
+                self._cond.notify_all()
+
+    def on_trade(self, symbol: str, ts: Any, price: float, size: float = 0.0) -> None:
+        symbol = str(symbol).strip().upper()
+        now = _to_epoch(ts)
+        with self._cond:
+            self._state(symbol).last_trade = (now, float(price))
+            if self._advance_locked(now):
+                self._cond.notify_all()
+
+    def _advance_locked(self, now_ts: float) -> int:
+        closed = 0
+        for state in self._symbols.values():
+            for minutes, bucket in list(state.open_buckets.items()):
+                if bucket.start + minutes * 60 + self.close_grace_sec <= now_ts:
+                    self._close_bucket(state, minutes)
+                    closed += 1
+        return closed
+
+    def advance(self, now_ts: float) -> int:
+        """Close buckets whose end (plus grace) is at or before ``now_ts``."""
+        with self._cond:
+            closed = self._advance_locked(float(now_ts))
+            if closed:
+                self._cond.notify_all()
+            return closed
+
+    def closed_bars(self, symbol: str, minutes: int) -> list[dict]:
+        """Complete closed ``minutes`` bars for ``symbol`` ordered oldest->newest."""
+        with self._cond:
+            state = self._symbols.get(str(symbol).upper())
+            if state is None or minutes not in state.closed:
+                return []
+            return [bucket.as_dict() for bucket in state.closed[minutes] if not bucket.partial]
+
+    def first_minute(self, symbol: str) -> Optional[float]:
+        """Start of the first minute bar streamed for ``symbol`` (None if none yet)."""
+        with self._cond:
+            state = self._symbols.get(str(symbol).upper())
+            return state.first_minute if state else None
+
+    def daily_bar(self, symbol: str, ny_date: str) -> Optional[DailyBar]:
+        with self._cond:
+            state = self._symbols.get(str(symbol).upper())
+            bucket = state.daily.get(ny_date) if state else None
+            if bucket is None:
+                return None
+            return DailyBar(
+                ts=bucket.start,
+                open=bucket.open,
+                high=bucket.high,
+                low=bucket.low,
+                close=bucket.close,
+            )
+
+    def last_trade(self, symbol: str) -> Optional[tuple[float, float]]:
+        with self._cond:
+            state = self._symbols.get(str(symbol).upper())
+            return state.last_trade if state else None
+
+    def close_seq(self) -> int:
+        with self._cond:
+            return self._close_seq
+
+    def wait_for_close(
+        self,
+        since_seq: int,
+        timeout: float,
+        *,
+        settle_sec: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> bool:
+        """Block until a bar closes after ``since_seq`` or ``timeout`` elapses.
+
+        Symbols' final minute bars arrive spread over a second or two, so after
+        the first close we keep collecting for ``settle_sec`` before returning.
+        Wall-clock time is fed through ``advance`` so quiet symbols still close.
+        """
+        deadline = clock() + max(0.0, float(timeout))
+        with self._cond:
+            while self._close_seq == since_seq:
+                remaining = deadline - clock()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(timeout=min(remaining, 1.0))
+                self._advance_locked(clock())
+            settle_deadline = min(deadline, clock() + max(0.0, float(settle_sec)))
+            while clock() < settle_deadline:
+                self._cond.wait(timeout=settle_deadline - clock())
+            return True
+
+
+class ReplayBarFeed:
+    """Local stand-in for the websocket feed.
+
+    Events are dicts with ``type`` of ``"bar"`` (symbol, ts, open, high, low,
+    close, volume) or ``"trade"`` (symbol, ts, price, size), replayed in order.
+    """
+
+    def __init__(self, events: Iterable[dict]) -> None:
+        self.events = list(events)
+        self.subscribed: set[str] = set()
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        self.subscribed.update(str(s).upper() for s in symbols)
+
+    def start(self, aggregator: BarAggregator) -> None:
+        self.replay(aggregator)
+
+    def is_alive(self) -> bool:
+        return True
+
+    def replay(self, aggregator: BarAggregator) -> None:
+        for event in self.events:
+            kind = event.get("type", "bar")
+            if kind == "trade":
+                aggregator.on_trade(event["symbol"], event["ts"], event["price"], event.get("size", 0.0))
+            else:
+                aggregator.on_bar(
+                    event["symbol"],
+                    event["ts"],
+                    event["open"],
+                    event["high"],
+                    event["low"],
+                    event["close"],
+                    event.get("volume", 0.0),
+                )
+
+    def stop(self) -> None:
+        return None
+
+
+class AlpacaBarFeed:
+    """Alpaca StockDataStream (minute bars + trades) on a daemon thread."""
+
+    def __init__(self, api_key: str, api_secret: str, *, feed: str = "iex") -> None:
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.feed = feed
+        self.subscribed: set[str] = set()
+        self._stream = None
+        self._aggregator: Optional[BarAggregator] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    async def _on_bar(self, bar) -> None:
+        if self._aggregator is not None:
+            self._aggregator.on_bar(bar.symbol, bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+
+    async def _on_trade(self, trade) -> None:
+        if self._aggregator is not None:
+            self._aggregator.on_trade(trade.symbol, trade.timestamp, trade.price, trade.size)
+
+    def start(self, aggregator: BarAggregator) -> None:
+        from alpaca.data.enums import DataFeed
+        from alpaca.data.live import StockDataStream
+
+        self._aggregator = aggregator
+        self._stream = StockDataStream(self.api_key, self.api_secret, feed=DataFeed(self.feed))
+        with self._lock:
+            pending = sorted(self.subscribed)
+        if pending:
+            self._stream.subscribe_bars(self._on_bar, *pending)
+            self._stream.subscribe_trades(self._on_trade, *pending)
+        self._thread = threading.Thread(target=self._stream.run, name="execution-v2-bar-stream", daemon=True)
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        with self._lock:
+            new = sorted({str(s).upper() for s in symbols} - self.subscribed)
+            self.subscribed.update(new)
+        if new and self._stream is not None:
+            self._stream.subscribe_bars(self._on_bar, *new)
+            self._stream.subscribe_trades(self._on_trade, *new)
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+
+
+class StreamingMarketData:
+    """MarketData facade served from streamed bars with REST fallback.
+
+    Pre-stream history (earlier sessions, bars before the stream started) is
+    fetched from the REST adapter once per symbol per NY date and spliced in
+    front of the streamed bars; that includes REST's bar for the partial
+    bucket the stream joined in. Anything not overridden here is delegated to
+    the fallback adapter.
+    """
+
+    def __init__(self, stream: "BarStream", fallback: Any) -> None:
+        self._stream = stream
+        self._fallback = fallback
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fallback, name)
+
+    def get_intraday_bars(self, symbol: str, minutes: int = 5, lookback_days: int = 3) -> list[dict]:
+        self._stream.subscribe([symbol])
+        streamed = self._stream.live_closed_bars(symbol, minutes)
+        if not streamed:
+            return self._fallback.get_intraday_bars(symbol, minutes=minutes, lookback_days=lookback_days)
+        seed = self._stream.seed(
+            ("intraday", symbol, minutes, lookback_days),
+            lambda: self._fallback.get_intraday_bars(symbol, minutes=minutes, lookback_days=lookback_days),
+        )
+        first_streamed = streamed[0]["ts"]
+        bars = [bar for bar in seed if bar["ts"] < first_streamed] + streamed
+        store = getattr(self._fallback, "bar_store", None)
+        if store is not None:
+            store.record(symbol, bars, minutes=minutes)
+        return bars
+
+    def get_last_two_closed_10m(self, symbol: str) -> list[Bar10m]:
+        lookback_days = getattr(getattr(self._fallback, "cfg", None), "intraday_lookback_days", 5)
+        self._stream.subscribe([symbol])
+        if not self._stream.live_closed_bars(symbol, BOH_FRAME_MINUTES):
+            return self._fallback.get_last_two_closed_10m(symbol)
+        bars = self.get_intraday_bars(symbol, minutes=BOH_FRAME_MINUTES, lookback_days=lookback_days)
+        if len(bars) < 2:
+            return []
+        return [
+            Bar10m(
+                ts=bar["ts"].timestamp(),
+                open=bar["open"],
+                high=bar["high"],
+                low=bar["low"],
+                close=bar["close"],
+                volume=bar["volume"],
+            )
+            for bar in bars[-2:]
+        ]
+
+    def get_daily_bars(self, symbol: str, lookback_days: Optional[int] = None) -> list[DailyBar]:
+        self._stream.subscribe([symbol])
+        today = _ny_date(time.time())
+        today_bar = self._stream.aggregator.daily_bar(symbol, today)
+
+        def _fetch() -> list[DailyBar]:
+            if lookback_days is None:
+                return self._fallback.get_daily_bars(symbol)
+            return self._fallback.get_daily_bars(symbol, lookback_days=lookback_days)
+
+        if today_bar is None or not self._stream.feed_alive():
+            return _fetch()
+        seed = self._stream.seed(("daily", symbol, lookback_days), _fetch)
+        history = [bar for bar in seed if _ny_date(bar.ts) < today]
+        first_minute = self._stream.aggregator.first_minute(symbol)
+        if first_minute is not None and first_minute > _ny_session_open_ts(today):
+            # Stream joined after the open; the seed was fetched after the first
+            # streamed minute, so REST's bar for today covers the gap.
+            rest_today = [bar for bar in seed if _ny_date(bar.ts) == today]
+            if not rest_today:
+                return _fetch()
+            head = rest_today[-1]
+            today_bar = DailyBar(
+                ts=today_bar.ts,
+                open=head.open,
+                high=max(head.high, today_bar.high),
+                low=min(head.low, today_bar.low),
+                close=today_bar.close,
+            )
+        return history + [today_bar]
+
+
+class BarStream:
+    """Aggregator + feed + per-day REST seeds, shared across run_once cycles."""
+
+    def __init__(
+        self,
+        aggregator: BarAggregator,
+        feed: Any,
+        *,
+        settle_sec: float = DEFAULT_SETTLE_SEC,
+        stale_grace_sec: float = DEFAULT_STALE_GRACE_SEC,
+    ) -> None:
+        self.aggregator = aggregator
+        self.feed = feed
+        self.settle_sec = float(settle_sec)
+        self.stale_grace_sec = float(stale_grace_sec)
+        self._feed_down_warned = False
+        self._seeds: dict[tuple, tuple[str, Any]] = {}
+        self._seeds_lock = threading.Lock()
+        self._seen_seq = 0
+
+    def start(self) -> None:
+        self.feed.start(self.aggregator)
+
+    def stop(self) -> None:
+        self.feed.stop()
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        self.feed.subscribe(symbols)
+
+    def feed_alive(self) -> bool:
+        is_alive = getattr(self.feed, "is_alive", None)
+        alive = True if is_alive is None else bool(is_alive())
+        if not alive and not self._feed_down_warned:
+            print("WARN: bar stream feed is not running; serving REST market data", flush=True)
+        self._feed_down_warned = not alive
+        return alive
+
+    def live_closed_bars(self, symbol: str, minutes: int, *, now_ts: Optional[float] = None) -> list[dict]:
+        """Streamed closed bars, or [] (serve REST) when the feed is down or stale.
+
+        Stale: the newest closed bar ended more than one frame plus
+        ``stale_grace_sec`` ago, i.e. at least one expected close is missing.
+        """
+        bars = self.aggregator.closed_bars(symbol, minutes)
+        if not bars or not self.feed_alive():
+            return []
+        now = time.time() if now_ts is None else float(now_ts)
+        newest_end = _to_epoch(bars[-1]["ts"]) + minutes * 60
+        if now - newest_end > minutes * 60 + self.stale_grace_sec:
+            return []
+        return bars
+
+    def seed(self, key: tuple, fetch: Callable[[], Any]) -> Any:
+        today = _ny_date(time.time())
+        with self._seeds_lock:
+            cached = self._seeds.get(key)
+            if cached is not None and cached[0] == today:
+                return cached[1]
+        value = fetch()
+        with self._seeds_lock:
+            self._seeds[key] = (today, value)
+        return value
+
+    def market_data(self, fallback: Any) -> StreamingMarketData:
+        return StreamingMarketData(self, fallback)
+
+    def wait_for_bar_close(self, timeout: float) -> bool:
+        """Sleep until the next bar close (or ``timeout``); True if woken early."""
+        woke = self.aggregator.wait_for_close(self._seen_seq, timeout, settle_sec=self.settle_sec)
+        self._seen_seq = self.aggregator.close_seq()
+        return woke
+
+
+_ACTIVE_STREAM: Optional[BarStream] = None
+
+
+def stream_mode_enabled() -> bool:
+    return os.getenv(ENV_MARKET_DATA_MODE, "poll").strip().lower() == "stream"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except (TypeError, ValueError):
+        return default
+
+
+def set_active_stream(stream: Optional[BarStream]) -> None:
+    global _ACTIVE_STREAM
+    _ACTIVE_STREAM = stream
+
+
+def active_stream() -> Optional[BarStream]:
+    return _ACTIVE_STREAM
+
+
+def wrap_market_data(md: Any) -> Any:
+    """Return a streaming facade over ``md`` when a stream is active."""
+    stream = _ACTIVE_STREAM
+    if stream is None or md is None:
+        return md
+    return stream.market_data(md)
+
+
+def start_from_env() -> Optional[BarStream]:
+    """Start the Alpaca bar stream if EXECUTION_MARKET_DATA_MODE=stream."""
+    if not stream_mode_enabled():
+        return None
+    key = os.getenv("APCA_API_KEY_ID") or os.getenv("ALPACA_API_KEY") or ""
+    sec = os.getenv("APCA_API_SECRET_KEY") or os.getenv("ALPACA_API_SECRET_KEY") or ""
+    if not key or not sec:
+        raise RuntimeError("Missing Alpaca API credentials in environment")
+    aggregator = BarAggregator(close_grace_sec=_env_float(ENV_STREAM_CLOSE_GRACE_SEC, DEFAULT_CLOSE_GRACE_SEC))
+    feed = AlpacaBarFeed(key, sec, feed=os.getenv(ENV_STREAM_FEED, "iex").strip().lower() or "iex")
+    stream = BarStream(
+        aggregator,
+        feed,
+        settle_sec=_env_float(ENV_STREAM_SETTLE_SEC, DEFAULT_SETTLE_SEC),
+        stale_grace_sec=_env_float(ENV_STREAM_STALE_GRACE_SEC, DEFAULT_STALE_GRACE_SEC),
+    )
+    stream.start()
+    set_active_stream(stream)
+    return stream
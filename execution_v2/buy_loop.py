@@ -5,9 +5,14 @@ Schedules entry intents from scan candidates using BOH + regime gating.
 
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 import hashlib
+import heapq
 import importlib
+import itertools
 import os
 from pathlib import Path
 import time
@@ -64,6 +69,19 @@ _KNOWN_REJECTION_REASONS = {
     REASON_OTHER_REJECTED,
 }
 
+# Daily returns for correlation-aware sizing, shared across cycles of a day
+# (execution_v2.correlation_sizing is imported lazily, so this is too).
+_CORRELATION_RETURNS = None
+
+
+def _correlation_returns_cache():
+    global _CORRELATION_RETURNS
+    if _CORRELATION_RETURNS is None:
+        from execution_v2.correlation_sizing import DailyReturnsCache
+
+        _CORRELATION_RETURNS = DailyReturnsCache()
+    return _CORRELATION_RETURNS
+
 
 @dataclass
 class EntryRejectionTelemetry:
@@ -118,6 +136,9 @@ class EntryRejectionTelemetry:
         return payload
 
 
+DEFAULT_EVAL_MAX_WORKERS = 4
+
+
 class BuyLoopConfig:
     """
     Configuration for buy-loop operations.
@@ -131,8 +152,14 @@ class BuyLoopConfig:
         candidate_ttl_sec: int = 6 * 60 * 60,
         sizing_cfg: SizingConfig | None = None,
         rvol_min: float = 0.8,
+        candidate_cache: CandidateCache | None = None,
+        eval_max_workers: int | None = None,
     ) -> None:
         self.candidates_csv = candidates_csv
+        self.candidate_cache = candidate_cache
+        if eval_max_workers is None:
+            eval_max_workers = _optional_env_int("BUY_LOOP_EVAL_MAX_WORKERS") or DEFAULT_EVAL_MAX_WORKERS
+        self.eval_max_workers = max(1, int(eval_max_workers))
         self.entry_delay_min_sec = entry_delay_min_sec
         self.entry_delay_max_sec = entry_delay_max_sec
         self.candidate_ttl_sec = candidate_ttl_sec
@@ -232,9 +259,8 @@ def _deterministic_delay(
     return float(min_sec) + u * (float(max_sec) - float(min_sec))
 
 
-def _load_candidates(
-    path: str, *, rejection_telemetry: EntryRejectionTelemetry | None = None
-) -> list[Candidate]:
+def _parse_candidate_rows(path: str) -> list[tuple[str, Candidate | None]]:
+    """Parse the candidates CSV into (symbol, Candidate or None-if-invalid) rows."""
     p = Path(path)
     if not p.exists():
         return []
@@ -248,8 +274,8 @@ def _load_candidates(
     if missing:
         raise ValueError(f"Candidates file missing required columns: {sorted(missing)}")
 
-    candidates: list[Candidate] = []
-    for _, row in df.iterrows():
+    rows: list[tuple[str, Candidate | None]] = []
+    for row in df.to_dict("records"):
         symbol = str(row["Symbol"]).strip().upper()
         strategy_cell = row.get("Strategy_ID", None)
         if strategy_cell is None or pd.isna(strategy_cell):
@@ -257,14 +283,8 @@ def _load_candidates(
         else:
             raw_strategy_id = str(strategy_cell).strip()
             strategy_id = raw_strategy_id or DEFAULT_STRATEGY_ID
-        if rejection_telemetry is not None:
-            rejection_telemetry.record_candidate()
         if not symbol:
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(
-                    symbol,
-                    REASON_INVALID_CANDIDATE_ROW,
-                )
+            rows.append((symbol, None))
             continue
 
         direction = str(row.get("Direction", "Long")).strip().title()
@@ -281,38 +301,89 @@ def _load_candidates(
             anchor = str(row["Anchor"])
 
         if entry_level <= 0 or stop_loss <= 0 or target_r2 <= 0:
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(
-                    symbol,
-                    REASON_INVALID_CANDIDATE_ROW,
-                )
+            rows.append((symbol, None))
             continue
         if stop_loss >= target_r2:
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(
-                    symbol,
-                    REASON_INVALID_CANDIDATE_ROW,
-                )
+            rows.append((symbol, None))
             continue
 
-        candidates.append(
-            Candidate(
-                symbol=symbol,
-                strategy_id=strategy_id,
-                direction=direction,
-                entry_level=entry_level,
-                stop_loss=stop_loss,
-                target_r2=target_r2,
-                target_r1=target_r1,
-                dist_pct=dist_pct,
-                price=price,
-                anchor=anchor,
+        rows.append(
+            (
+                symbol,
+                Candidate(
+                    symbol=symbol,
+                    strategy_id=strategy_id,
+                    direction=direction,
+                    entry_level=entry_level,
+                    stop_loss=stop_loss,
+                    target_r2=target_r2,
+                    target_r1=target_r1,
+                    dist_pct=dist_pct,
+                    price=price,
+                    anchor=anchor,
+                ),
             )
         )
+    return rows
+
 
+def _candidates_from_rows(
+    rows: list[tuple[str, Candidate | None]],
+    *,
+    rejection_telemetry: EntryRejectionTelemetry | None = None,
+) -> list[Candidate]:
+    candidates: list[Candidate] = []
+    for symbol, cand in rows:
+        if rejection_telemetry is not None:
+            rejection_telemetry.record_candidate()
+            if cand is None:
+                rejection_telemetry.record_rejected(symbol, REASON_INVALID_CANDIDATE_ROW)
+        if cand is not None:
+            candidates.append(cand)
     return candidates
 
 
+def _load_candidates(
+    path: str, *, rejection_telemetry: EntryRejectionTelemetry | None = None
+) -> list[Candidate]:
+    return _candidates_from_rows(_parse_candidate_rows(path), rejection_telemetry=rejection_telemetry)
+
+
+class CandidateCache:
+    """
+    Parsed candidates CSV that is re-read only when the file's mtime or size
+    changes. Owned by a long-lived execution session so polling cycles do not
+    re-parse an unchanged watchlist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.loads = 0
+        self._key: tuple[int, int] | None = None
+        self._rows: list[tuple[str, Candidate | None]] = []
+
+    def stat_key(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def rows(self) -> list[tuple[str, Candidate | None]]:
+        key = self.stat_key()
+        if key is None:
+            self._key, self._rows = None, []
+            return []
+        if key != self._key:
+            self._rows = _parse_candidate_rows(self.path)
+            self._key = key
+            self.loads += 1
+        return self._rows
+
+    def load(self, *, rejection_telemetry: EntryRejectionTelemetry | None = None) -> list[Candidate]:
+        return _candidates_from_rows(self.rows(), rejection_telemetry=rejection_telemetry)
+
+
 def load_candidates(path: str) -> list[Candidate]:
     return _load_candidates(path)
 
@@ -327,24 +398,174 @@ def ingest_watchlist_as_candidates(
     Inserts scan candidates into the candidates table.
     """
     now_ts = time.time()
-    candidates = _load_candidates(cfg.candidates_csv, rejection_telemetry=rejection_telemetry)
-    for cand in candidates:
-        store.upsert_candidate(
-            symbol=cand.symbol,
-            first_seen_ts=now_ts,
-            expires_ts=now_ts + cfg.candidate_ttl_sec,
-            pivot_level=cand.entry_level,
-            notes=f"scan:{cand.anchor or 'n/a'}",
-        )
+    cache = getattr(cfg, "candidate_cache", None)
+    if cache is not None and cache.path == cfg.candidates_csv:
+        candidates = cache.load(rejection_telemetry=rejection_telemetry)
+    else:
+        candidates = _load_candidates(cfg.candidates_csv, rejection_telemetry=rejection_telemetry)
+    rows = [
+        {
+            "symbol": cand.symbol,
+            "first_seen_ts": now_ts,
+            "expires_ts": now_ts + cfg.candidate_ttl_sec,
+            "pivot_level": cand.entry_level,
+            "notes": f"scan:{cand.anchor or 'n/a'}",
+        }
+        for cand in candidates
+    ]
+    if hasattr(store, "upsert_candidates_many"):
+        store.upsert_candidates_many(rows)
+    else:
+        for row in rows:
+            store.upsert_candidate(**row)
     return candidates
 
 
+def _existing_entry_intent_symbols(store, symbols: set[str]) -> set[str]:
+    if hasattr(store, "get_entry_intents_for"):
+        return set(store.get_entry_intents_for(symbols))
+    return {symbol for symbol in symbols if store.get_entry_intent(symbol) is not None}
+
+
+def _put_entry_intents(store, intents: list[EntryIntent]) -> None:
+    if not intents:
+        return
+    batch = getattr(store, "batch", None)
+    if batch is None:
+        for intent in intents:
+            store.put_entry_intent(intent)
+        return
+    with batch():
+        for intent in intents:
+            store.put_entry_intent(intent)
+
+
 def _iter_active_candidates(candidates: Iterable[Candidate], active_symbols: set[str]) -> Iterable[Candidate]:
     for cand in candidates:
         if cand.symbol in active_symbols:
             yield cand
 
 
+@dataclass
+class _BohProbe:
+    """Market-data outcome for one candidate, gathered before the merge pass."""
+    bars: list = field(default_factory=list)
+    boh: object | None = None
+    engaged: bool = False
+    rechecks: int = 0
+    confirmed_on_recheck: bool = False
+    vol_profile: object | None = None
+    vol_error: Exception | None = None
+    error: Exception | None = None
+
+
+def _probe_step(md, cand: Candidate, probe: _BohProbe, edge_window: EdgeWindowConfig, rvol_min: float) -> bool:
+    """
+    One BOH check for ``cand`` (the initial one or an edge-window recheck).
+    Returns True when another recheck should be scheduled. Runs on a worker
+    thread; each probe is only touched by one step at a time.
+    """
+    try:
+        first = probe.boh is None and not probe.engaged
+        if not first:
+            probe.rechecks += 1
+        bars = md.get_last_two_closed_10m(cand.symbol)
+        probe.bars = bars
+        if len(bars) != 2:
+            return not first and probe.rechecks < max(edge_window.rechecks, 0)
+        probe.boh = boh_confirmed_option2(bars, cand.entry_level)
+        if probe.boh.confirmed:
+            probe.confirmed_on_recheck = not first
+            if rvol_min > 0:
+                try:
+                    probe.vol_profile = md.get_session_volume_profile(cand.symbol)
+                except Exception as exc:
+                    probe.vol_error = exc
+            return False
+        if first:
+            probe.engaged = edge_window.enabled and _is_near_pivot(
+                bars[-1], cand.entry_level, edge_window.proximity_pct
+            )
+        return probe.engaged and probe.rechecks < max(edge_window.rechecks, 0)
+    except Exception as exc:
+        probe.error = exc
+        return False
+
+
+def _likely_accepted(probe: _BohProbe, rvol_min: float) -> bool:
+    if probe.error is not None or probe.boh is None or not getattr(probe.boh, "confirmed", False):
+        return False
+    vol_profile = probe.vol_profile
+    return not (rvol_min > 0 and vol_profile is not None and vol_profile.rvol < rvol_min)
+
+
+def _probe_candidates(
+    candidates: list[Candidate],
+    md,
+    *,
+    edge_window: EdgeWindowConfig,
+    edge_clock: EdgeWindowClock,
+    rvol_min: float,
+    max_workers: int,
+    max_accepts: int | None = None,
+) -> dict[str, _BohProbe]:
+    """
+    Fetch 10m bars (and RVOL for confirmed names) for candidates on a bounded
+    thread pool, in candidate order, once per symbol. Edge-window rechecks are
+    timers on a heap keyed by due time rather than inline sleeps, so a
+    near-pivot symbol no longer delays the candidates after it.
+
+    With ``max_accepts`` (the open position slots), no new symbol is probed
+    once that many finished probes look acceptable; the merge pass probes any
+    later candidate it still reaches on demand.
+    """
+    by_symbol: dict[str, Candidate] = {}
+    for cand in candidates:
+        by_symbol.setdefault(cand.symbol, cand)
+    probes: dict[str, _BohProbe] = {}
+    unprobed = deque(by_symbol)
+    if not unprobed or (max_accepts is not None and max_accepts <= 0):
+        return probes
+    workers = max(1, min(max_workers, len(unprobed)))
+    likely_accepted = 0
+    seq = itertools.count()
+    timers: list[tuple[float, int, str]] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+
+        def _submit(symbol: str) -> None:
+            future = pool.submit(_probe_step, md, by_symbol[symbol], probes[symbol], edge_window, rvol_min)
+            in_flight[future] = symbol
+
+        while True:
+            while (
+                unprobed
+                and len(in_flight) < workers
+                and (max_accepts is None or likely_accepted < max_accepts)
+            ):
+                symbol = unprobed.popleft()
+                probes[symbol] = _BohProbe()
+                _submit(symbol)
+            if not in_flight and not timers:
+                break
+            now = edge_clock.now()
+            while timers and timers[0][0] <= now:
+                _submit(heapq.heappop(timers)[2])
+            if in_flight:
+                timeout = max(0.0, timers[0][0] - now) if timers else None
+                done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol = in_flight.pop(future)
+                    if future.result():
+                        due = edge_clock.now() + max(edge_window.delay_sec, 0.0)
+                        heapq.heappush(timers, (due, next(seq), symbol))
+                    elif _likely_accepted(probes[symbol], rvol_min):
+                        likely_accepted += 1
+            elif timers:
+                edge_clock.sleep(max(0.0, timers[0][0] - now))
+    return probes
+
+
 def evaluate_and_create_entry_intents(
     store,
     md,
@@ -356,9 +577,13 @@ def evaluate_and_create_entry_intents(
     edge_report: EdgeWindowReport | None = None,
     edge_clock: EdgeWindowClock | None = None,
     rejection_telemetry: EntryRejectionTelemetry | None = None,
+    profiler=None,
 ) -> int:
     """
     Evaluate scan candidates and create entry intents for BOH-confirmed names.
+
+    ``profiler`` (a cycle_profiler.CycleProfiler) receives the candidate_ingest,
+    boh_eval, sizing and intent_write phase timings when given.
     """
     if edge_window is None:
         edge_window = EdgeWindowConfig()
@@ -410,66 +635,100 @@ def evaluate_and_create_entry_intents(
         )
         risk_controls = result.controls
         risk_controls_result = result
-    candidates = ingest_watchlist_as_candidates(
-        store,
-        cfg,
-        rejection_telemetry=rejection_telemetry,
-    )
-    active_symbols = set(store.list_active_candidates(now_ts))
+    with _profile_phase(profiler, "candidate_ingest"):
+        candidates = ingest_watchlist_as_candidates(
+            store,
+            cfg,
+            rejection_telemetry=rejection_telemetry,
+        )
+        active_symbols = set(store.list_active_candidates(now_ts))
 
+        # One read for existing intents and one write transaction for the new
+        # ones (flushed in the finally) instead of per-symbol round trips.
+        intent_symbols = _existing_entry_intent_symbols(
+            store, {cand.symbol for cand in candidates if cand.symbol in active_symbols}
+        )
+    pending_intents: list[EntryIntent] = []
+    # Market data for every candidate still in play is gathered concurrently;
+    # the pass below then runs in candidate order so intent creation and
+    # risk-control accounting are the same as a sequential evaluation.
+    with _profile_phase(profiler, "boh_eval"):
+        probes = _probe_candidates(
+            [
+                cand
+                for cand in _iter_active_candidates(candidates, active_symbols)
+                if cand.direction == "Long" and cand.symbol not in intent_symbols
+            ],
+            md,
+            edge_window=edge_window,
+            edge_clock=edge_clock,
+            rvol_min=cfg.rvol_min,
+            max_workers=cfg.eval_max_workers,
+            max_accepts=(
+                int(risk_controls.max_positions) - projected_positions_count
+                if risk_controls is not None and risk_controls.max_positions is not None
+                else None
+            ),
+        )
     created = 0
-    for cand in _iter_active_candidates(candidates, active_symbols):
-        if cand.direction != "Long":
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(cand.symbol, REASON_OTHER_REJECTED)
-            continue
-        if store.get_entry_intent(cand.symbol) is not None:
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(cand.symbol, REASON_EXISTING_OPEN_ORDERS)
-            continue
-        if (
-            risk_controls is not None
-            and risk_controls.max_positions is not None
-            and projected_positions_count >= int(risk_controls.max_positions)
-        ):
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(cand.symbol, REASON_RISK_CONTROLS_BLOCKED)
-            continue
-
-        bars = md.get_last_two_closed_10m(cand.symbol)
-        if len(bars) != 2:
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(cand.symbol, REASON_MISSING_MARKET_DATA)
-            continue
-
-        boh = boh_confirmed_option2(bars, cand.entry_level)
-        if not boh.confirmed and edge_window.enabled:
-            if _is_near_pivot(bars[-1], cand.entry_level, edge_window.proximity_pct):
-                if edge_report is not None:
-                    edge_report.mark_engaged(cand.symbol)
-                for _ in range(max(edge_window.rechecks, 0)):
-                    if edge_report is not None:
-                        edge_report.mark_recheck()
-                    if edge_window.delay_sec > 0:
-                        edge_clock.sleep(edge_window.delay_sec)
-                    bars = md.get_last_two_closed_10m(cand.symbol)
-                    if len(bars) != 2:
-                        continue
-                    boh = boh_confirmed_option2(bars, cand.entry_level)
-                    if boh.confirmed:
-                        if edge_report is not None:
-                            edge_report.mark_confirmed(cand.symbol)
-                        break
-        if not boh.confirmed:
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(cand.symbol, REASON_BOH_NOT_CONFIRMED)
-            continue
-
-        # Relative volume gate (fail-open)
-        if cfg.rvol_min > 0:
-            try:
-                vol_profile = md.get_session_volume_profile(cand.symbol)
-                if vol_profile is not None and vol_profile.rvol < cfg.rvol_min:
+    sizing_t0 = time.perf_counter()
+    try:
+        for cand in _iter_active_candidates(candidates, active_symbols):
+            if cand.direction != "Long":
+                if rejection_telemetry is not None:
+                    rejection_telemetry.record_rejected(cand.symbol, REASON_OTHER_REJECTED)
+                continue
+            if cand.symbol in intent_symbols:
+                if rejection_telemetry is not None:
+                    rejection_telemetry.record_rejected(cand.symbol, REASON_EXISTING_OPEN_ORDERS)
+                continue
+            if (
+                risk_controls is not None
+                and risk_controls.max_positions is not None
+                and projected_positions_count >= int(risk_controls.max_positions)
+            ):
+                if rejection_telemetry is not None:
+                    rejection_telemetry.record_rejected(cand.symbol, REASON_RISK_CONTROLS_BLOCKED)
+                continue
+
+            probe = probes.get(cand.symbol)
+            if probe is None:
+                # Not prefetched: the open slots looked filled by earlier candidates.
+                probe = _probe_candidates(
+                    [cand],
+                    md,
+                    edge_window=edge_window,
+                    edge_clock=edge_clock,
+                    rvol_min=cfg.rvol_min,
+                    max_workers=1,
+                )[cand.symbol]
+                probes[cand.symbol] = probe
+            if probe.error is not None:
+                raise probe.error
+            if probe.boh is None:
+                if rejection_telemetry is not None:
+                    rejection_telemetry.record_rejected(cand.symbol, REASON_MISSING_MARKET_DATA)
+                continue
+
+            bars = probe.bars
+            boh = probe.boh
+            if probe.engaged and edge_report is not None:
+                edge_report.mark_engaged(cand.symbol)
+                for _ in range(probe.rechecks):
+                    edge_report.mark_recheck()
+                if probe.confirmed_on_recheck:
+                    edge_report.mark_confirmed(cand.symbol)
+            if not boh.confirmed:
+                if rejection_telemetry is not None:
+                    rejection_telemetry.record_rejected(cand.symbol, REASON_BOH_NOT_CONFIRMED)
+                continue
+
+            # Relative volume gate (fail-open)
+            if cfg.rvol_min > 0:
+                vol_profile = probe.vol_profile
+                if probe.vol_error is not None:
+                    print(f"WARN: rvol check failed for {cand.symbol} (fail-open): {probe.vol_error}")
+                elif vol_profile is not None and vol_profile.rvol < cfg.rvol_min:
                     print(
                         f"RVOL_REJECT symbol={cand.symbol} rvol={vol_profile.rvol:.3f} "
                         f"min={cfg.rvol_min:.2f}"
@@ -477,213 +736,217 @@ def evaluate_and_create_entry_intents(
                     if rejection_telemetry is not None:
                         rejection_telemetry.record_rejected(cand.symbol, REASON_LOW_RVOL)
                     continue
-            except Exception as exc:
-                print(f"WARN: rvol check failed for {cand.symbol} (fail-open): {exc}")
 
-        bar_close = None
-        try:
-            bar_close = float(bars[-1].close)
-        except Exception:
             bar_close = None
-        price_for_sizing = cand.price
-        if bar_close is not None and bar_close > 0:
-            price_for_sizing = bar_close
-            if cand.price > 0:
-                pct_diff = abs(bar_close - cand.price) / cand.price
-                if pct_diff >= 0.03:
-                    print(
-                        "SIZING_PRICE_DRIFT "
-                        f"symbol={cand.symbol} csv_price={cand.price} "
-                        f"bar_close={bar_close} pct={pct_diff:.4f}"
-                    )
-
-        # Phase 5: Correlation-aware sizing (fail-open)
-        corr_penalty_value = 0.0
-        if getattr(scan_cfg, "CORRELATION_AWARE_SIZING_ENABLED", False):
             try:
-                from execution_v2.correlation_sizing import correlation_penalty as _corr_pen, check_sector_cap
-                _corr_mod = importlib.import_module("analytics.correlation_matrix")
-                compute_rolling_correlation = _corr_mod.compute_rolling_correlation
-
-                open_syms = [
-                    str(getattr(pos, "symbol", "")).upper()
-                    for pos in current_positions
-                ]
-                if open_syms:
-                    # Build position dicts for sector cap check
-                    open_pos_dicts = [
-                        {
-                            "symbol": str(getattr(pos, "symbol", "")).upper(),
-                            "notional": abs(
-                                float(getattr(pos, "avg_price", 0.0))
-                                * float(getattr(pos, "size_shares", 0.0))
-                            ),
-                        }
+                bar_close = float(bars[-1].close)
+            except Exception:
+                bar_close = None
+            price_for_sizing = cand.price
+            if bar_close is not None and bar_close > 0:
+                price_for_sizing = bar_close
+                if cand.price > 0:
+                    pct_diff = abs(bar_close - cand.price) / cand.price
+                    if pct_diff >= 0.03:
+                        print(
+                            "SIZING_PRICE_DRIFT "
+                            f"symbol={cand.symbol} csv_price={cand.price} "
+                            f"bar_close={bar_close} pct={pct_diff:.4f}"
+                        )
+
+            # Phase 5: Correlation-aware sizing (fail-open)
+            corr_penalty_value = 0.0
+            if getattr(scan_cfg, "CORRELATION_AWARE_SIZING_ENABLED", False):
+                try:
+                    from execution_v2.correlation_sizing import check_sector_cap, correlation_penalty_from_returns
+
+                    open_syms = [
+                        str(getattr(pos, "symbol", "")).upper()
                         for pos in current_positions
                     ]
-                    # Sector cap check
-                    sector_map = getattr(scan_cfg, "_sector_map", {})
-                    cand_sector = sector_map.get(cand.symbol, "")
-                    if cand_sector:
-                        allowed, reason = check_sector_cap(
-                            candidate_sector=cand_sector,
-                            open_positions=open_pos_dicts,
-                            sector_map=sector_map,
-                            max_sector_pct=getattr(scan_cfg, "MAX_SECTOR_EXPOSURE_PCT", 0.3),
-                            gross_exposure=gross_exposure,
-                        )
-                        if not allowed:
-                            print(f"CORRELATION_BLOCK symbol={cand.symbol} {reason}")
-                            if rejection_telemetry is not None:
-                                rejection_telemetry.record_rejected(cand.symbol, REASON_SECTOR_CAP_BLOCKED)
-                            continue
-
-                    # Compute correlation penalty
-                    daily_bars_for_corr = md.get_daily_bars(cand.symbol)
-                    if daily_bars_for_corr is not None and hasattr(daily_bars_for_corr, "__len__") and len(daily_bars_for_corr) > 0:
+                    if open_syms:
+                        # Build position dicts for sector cap check
+                        open_pos_dicts = [
+                            {
+                                "symbol": str(getattr(pos, "symbol", "")).upper(),
+                                "notional": abs(
+                                    float(getattr(pos, "avg_price", 0.0))
+                                    * float(getattr(pos, "size_shares", 0.0))
+                                ),
+                            }
+                            for pos in current_positions
+                        ]
+                        # Sector cap check
+                        sector_map = getattr(scan_cfg, "_sector_map", {})
+                        cand_sector = sector_map.get(cand.symbol, "")
+                        if cand_sector:
+                            allowed, reason = check_sector_cap(
+                                candidate_sector=cand_sector,
+                                open_positions=open_pos_dicts,
+                                sector_map=sector_map,
+                                max_sector_pct=getattr(scan_cfg, "MAX_SECTOR_EXPOSURE_PCT", 0.3),
+                                gross_exposure=gross_exposure,
+                            )
+                            if not allowed:
+                                print(f"CORRELATION_BLOCK symbol={cand.symbol} {reason}")
+                                if rejection_telemetry is not None:
+                                    rejection_telemetry.record_rejected(cand.symbol, REASON_SECTOR_CAP_BLOCKED)
+                                continue
+
+                        # Compute correlation penalty from the day's cached returns
+                        # matrix: daily bars are fetched once per symbol per day.
                         try:
-                            all_syms = open_syms + [cand.symbol]
-                            # Try to build OHLCV DataFrame from available bars
-                            ohlcv_frames = []
-                            for sym in all_syms:
-                                sym_bars = md.get_daily_bars(sym)
-                                if sym_bars is not None and hasattr(sym_bars, "__len__") and len(sym_bars) > 0:
-                                    if isinstance(sym_bars, pd.DataFrame):
-                                        frame = sym_bars.copy()
-                                        frame["Symbol"] = sym
-                                        ohlcv_frames.append(frame)
-                            if ohlcv_frames:
-                                ohlcv_df = pd.concat(ohlcv_frames, ignore_index=True)
-                                lookback = getattr(scan_cfg, "CORRELATION_LOOKBACK_DAYS", 60)
-                                corr_matrix = compute_rolling_correlation(ohlcv_df, all_syms, lookback_days=lookback)
-                                if not corr_matrix.empty:
-                                    threshold = getattr(scan_cfg, "CORRELATION_PENALTY_THRESHOLD", 0.6)
-                                    corr_penalty_value = _corr_pen(
-                                        cand.symbol, open_syms, corr_matrix,
-                                        threshold=threshold,
-                                    )
+                            # Every BOH-confirmed candidate at once, so the matrix is
+                            # built once per cycle rather than once per candidate.
+                            corr_universe = open_syms + [cand.symbol] + [
+                                sym
+                                for sym, p in probes.items()
+                                if p.boh is not None and p.boh.confirmed
+                            ]
+                            returns = _correlation_returns_cache().matrix(
+                                md,
+                                corr_universe,
+                                ny_date=entry_day,
+                                lookback_days=getattr(scan_cfg, "CORRELATION_LOOKBACK_DAYS", 60),
+                            )
+                            corr_penalty_value = correlation_penalty_from_returns(
+                                cand.symbol,
+                                open_syms,
+                                returns,
+                                threshold=getattr(scan_cfg, "CORRELATION_PENALTY_THRESHOLD", 0.6),
+                            )
                         except Exception as exc:
                             print(f"WARN: correlation penalty computation failed for {cand.symbol}: {exc}")
-            except Exception as exc:
-                print(f"WARN: correlation-aware sizing failed for {cand.symbol}: {exc}")
-
-        base_size = compute_size_shares(
-            account_equity=account_equity,
-            price=price_for_sizing,
-            dist_pct=abs(cand.dist_pct),
-            cfg=cfg.sizing_cfg,
-            correlation_penalty=corr_penalty_value,
-        )
-        if base_size <= 0:
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(cand.symbol, REASON_OTHER_REJECTED)
-            continue
-        size = base_size
-        if risk_controls is not None:
-            size = adjust_order_quantity(
-                base_qty=base_size,
-                price=price_for_sizing,
+                except Exception as exc:
+                    print(f"WARN: correlation-aware sizing failed for {cand.symbol}: {exc}")
+
+            base_size = compute_size_shares(
                 account_equity=account_equity,
-                risk_controls=risk_controls,
-                gross_exposure=gross_exposure,
-                min_qty=None,
+                price=price_for_sizing,
+                dist_pct=abs(cand.dist_pct),
+                cfg=cfg.sizing_cfg,
+                correlation_penalty=corr_penalty_value,
             )
-            if os.getenv("E3_RISK_ATTRIBUTION_WRITE", "0").strip() == "1" and risk_controls_result is not None:
-                try:
-                    risk_attribution = importlib.import_module("analytics.risk_attribution")
-                except Exception as exc:
-                    print(f"WARN: risk attribution import failed for {cand.symbol}: {exc}")
-                else:
+            if base_size <= 0:
+                if rejection_telemetry is not None:
+                    rejection_telemetry.record_rejected(cand.symbol, REASON_OTHER_REJECTED)
+                continue
+            size = base_size
+            if risk_controls is not None:
+                size = adjust_order_quantity(
+                    base_qty=base_size,
+                    price=price_for_sizing,
+                    account_equity=account_equity,
+                    risk_controls=risk_controls,
+                    gross_exposure=gross_exposure,
+                    min_qty=None,
+                )
+                if os.getenv("E3_RISK_ATTRIBUTION_WRITE", "0").strip() == "1" and risk_controls_result is not None:
                     try:
-                        throttle = risk_controls_result.throttle or {}
-                        throttle_regime_label = throttle.get("regime_label")
-                        throttle_policy_ref = risk_attribution.resolve_throttle_policy_reference(
-                            repo_root=repo_root,
-                            ny_date=ny_date,
-                            source=risk_controls_result.source,
-                        )
-                        event = risk_attribution.build_attribution_event(
-                            date_ny=ny_date,
-                            symbol=cand.symbol,
-                            baseline_qty=base_size,
-                            modulated_qty=size,
-                            price=cand.price,
-                            account_equity=account_equity,
-                            gross_exposure=gross_exposure,
-                            risk_controls=risk_controls,
-                            risk_control_reasons=risk_controls_result.reasons,
-                            throttle_source=risk_controls_result.source,
-                            throttle_regime_label=throttle_regime_label,
-                            throttle_policy_ref=throttle_policy_ref,
-                            drawdown=drawdown_value,
-                            drawdown_threshold=drawdown_threshold,
-                            min_qty=None,
-                            source="execution_v2.buy_loop",
-                        )
-                        risk_attribution.write_attribution_event(event)
+                        risk_attribution = importlib.import_module("analytics.risk_attribution")
                     except Exception as exc:
-                        print(f"WARN: risk attribution write failed for {cand.symbol}: {exc}")
-        if size <= 0:
-            if rejection_telemetry is not None:
-                reason = REASON_RISK_CONTROLS_BLOCKED if risk_controls is not None else REASON_OTHER_REJECTED
-                rejection_telemetry.record_rejected(cand.symbol, reason)
-            continue
-
-        daily_bars = md.get_daily_bars(cand.symbol)
-        # Intentionally uses structural stop from daily bars rather than cand.stop_loss
-        # from the scan CSV — the structural stop adapts to current market structure.
-        stop_price = exits.compute_stop_price(
-            daily_bars,
-            entry_day=entry_day,
-            buffer_dollars=exit_cfg.stop_buffer_dollars,
-        )
-        if stop_price is None:
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(cand.symbol, REASON_MISSING_MARKET_DATA)
-            continue
-        if not exits.validate_risk(cand.price, stop_price, exit_cfg.max_risk_per_share):
-            if rejection_telemetry is not None:
-                rejection_telemetry.record_rejected(cand.symbol, REASON_OTHER_REJECTED)
-            continue
-
-        deterministic_delay = (
-            os.getenv("DRY_RUN", "0").strip() == "1"
-            or os.getenv("EXECUTION_V2_DETERMINISTIC_DELAY", "0").strip() == "1"
-        )
-        if deterministic_delay:
-            delay = _deterministic_delay(
-                ny_date=entry_day,
+                        print(f"WARN: risk attribution import failed for {cand.symbol}: {exc}")
+                    else:
+                        try:
+                            throttle = risk_controls_result.throttle or {}
+                            throttle_regime_label = throttle.get("regime_label")
+                            throttle_policy_ref = risk_attribution.resolve_throttle_policy_reference(
+                                repo_root=repo_root,
+                                ny_date=ny_date,
+                                source=risk_controls_result.source,
+                            )
+                            event = risk_attribution.build_attribution_event(
+                                date_ny=ny_date,
+                                symbol=cand.symbol,
+                                baseline_qty=base_size,
+                                modulated_qty=size,
+                                price=cand.price,
+                                account_equity=account_equity,
+                                gross_exposure=gross_exposure,
+                                risk_controls=risk_controls,
+                                risk_control_reasons=risk_controls_result.reasons,
+                                throttle_source=risk_controls_result.source,
+                                throttle_regime_label=throttle_regime_label,
+                                throttle_policy_ref=throttle_policy_ref,
+                                drawdown=drawdown_value,
+                                drawdown_threshold=drawdown_threshold,
+                                min_qty=None,
+                                source="execution_v2.buy_loop",
+                            )
+                            risk_attribution.write_attribution_event(event)
+                        except Exception as exc:
+                            print(f"WARN: risk attribution write failed for {cand.symbol}: {exc}")
+            if size <= 0:
+                if rejection_telemetry is not None:
+                    reason = REASON_RISK_CONTROLS_BLOCKED if risk_controls is not None else REASON_OTHER_REJECTED
+                    rejection_telemetry.record_rejected(cand.symbol, reason)
+                continue
+
+            daily_bars = md.get_daily_bars(cand.symbol)
+            # Intentionally uses structural stop from daily bars rather than cand.stop_loss
+            # from the scan CSV — the structural stop adapts to current market structure.
+            stop_price = exits.compute_stop_price(
+                daily_bars,
+                entry_day=entry_day,
+                buffer_dollars=exit_cfg.stop_buffer_dollars,
+            )
+            if stop_price is None:
+                if rejection_telemetry is not None:
+                    rejection_telemetry.record_rejected(cand.symbol, REASON_MISSING_MARKET_DATA)
+                continue
+            if not exits.validate_risk(cand.price, stop_price, exit_cfg.max_risk_per_share):
+                if rejection_telemetry is not None:
+                    rejection_telemetry.record_rejected(cand.symbol, REASON_OTHER_REJECTED)
+                continue
+
+            deterministic_delay = (
+                os.getenv("DRY_RUN", "0").strip() == "1"
+                or os.getenv("EXECUTION_V2_DETERMINISTIC_DELAY", "0").strip() == "1"
+            )
+            if deterministic_delay:
+                delay = _deterministic_delay(
+                    ny_date=entry_day,
+                    symbol=cand.symbol,
+                    min_sec=cfg.entry_delay_min_sec,
+                    max_sec=cfg.entry_delay_max_sec,
+                )
+            else:
+                delay = random.uniform(cfg.entry_delay_min_sec, cfg.entry_delay_max_sec)
+            intent = EntryIntent(
+                strategy_id=cand.strategy_id,
                 symbol=cand.symbol,
-                min_sec=cfg.entry_delay_min_sec,
-                max_sec=cfg.entry_delay_max_sec,
+                pivot_level=cand.entry_level,
+                boh_confirmed_at=boh.confirm_bar_ts or now_ts,
+                scheduled_entry_at=now_ts + delay,
+                size_shares=size,
+                stop_loss=stop_price,
+                take_profit=cand.target_r2,
+                ref_price=bars[-1].close,
+                dist_pct=cand.dist_pct,
+                target_r1=cand.target_r1,
             )
-        else:
-            delay = random.uniform(cfg.entry_delay_min_sec, cfg.entry_delay_max_sec)
-        intent = EntryIntent(
-            strategy_id=cand.strategy_id,
-            symbol=cand.symbol,
-            pivot_level=cand.entry_level,
-            boh_confirmed_at=boh.confirm_bar_ts or now_ts,
-            scheduled_entry_at=now_ts + delay,
-            size_shares=size,
-            stop_loss=stop_price,
-            take_profit=cand.target_r2,
-            ref_price=bars[-1].close,
-            dist_pct=cand.dist_pct,
-            target_r1=cand.target_r1,
-        )
-        store.put_entry_intent(intent)
-        if created_intents is not None:
-            created_intents.append(intent)
-        created += 1
-        projected_positions_count += 1
-        gross_exposure += float(size) * float(price_for_sizing)
-        if rejection_telemetry is not None:
-            rejection_telemetry.record_accepted()
+            pending_intents.append(intent)
+            intent_symbols.add(cand.symbol)
+            if created_intents is not None:
+                created_intents.append(intent)
+            created += 1
+            projected_positions_count += 1
+            gross_exposure += float(size) * float(price_for_sizing)
+            if rejection_telemetry is not None:
+                rejection_telemetry.record_accepted()
 
+    finally:
+        if profiler is not None:
+            profiler.add_time("sizing", time.perf_counter() - sizing_t0)
+        with _profile_phase(profiler, "intent_write"):
+            _put_entry_intents(store, pending_intents)
     return created
 
 
+def _profile_phase(profiler, name: str):
+    return profiler.phase(name) if profiler is not None else nullcontext()
+
+
 def _is_near_pivot(bar, pivot_level: float, proximity_pct: float) -> bool:
     if pivot_level <= 0:
         return False
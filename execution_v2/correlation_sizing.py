@@ -2,8 +2,21 @@
 
 from __future__ import annotations
 
+import importlib
+import math
+import threading
+from typing import Any
+
+import numpy as np
 import pandas as pd
 
+from execution_v2.clocks import ET
+
+
+def _returns_matrix_cls():
+    # analytics is loaded at call time; execution_v2 keeps no static analytics imports.
+    return importlib.import_module("analytics.correlation_matrix").ReturnsMatrix
+
 
 def correlation_penalty(
     candidate_symbol: str,
@@ -39,6 +52,10 @@ def correlation_penalty(
         for pos in open_positions
         if pos in corr_matrix.columns
     ]
+    return _penalty_from_abs_corrs(corrs, threshold, max_penalty)
+
+
+def _penalty_from_abs_corrs(corrs: list[float], threshold: float, max_penalty: float) -> float:
     if not corrs:
         return 0.0
 
@@ -52,6 +69,92 @@ def correlation_penalty(
     return min(excess * max_penalty, max_penalty)
 
 
+def correlation_penalty_from_returns(
+    candidate_symbol: str,
+    open_positions: list[str],
+    returns: Any,
+    threshold: float = 0.6,
+    max_penalty: float = 0.5,
+) -> float:
+    """correlation_penalty over a cached analytics ReturnsMatrix: one matrix-vector pass per candidate.
+
+    Pairs without a defined correlation (too little overlap, flat prices) are
+    left out of the average instead of turning it into NaN.
+    """
+    corrs = returns.correlations(candidate_symbol, open_positions)
+    return _penalty_from_abs_corrs(
+        [abs(c) for c in corrs.values() if math.isfinite(c)], threshold, max_penalty
+    )
+
+
+def _daily_closes(bars: Any, before_ny_date: str) -> pd.Series:
+    """Closes of completed sessions (NY date < ``before_ny_date``) from MarketData daily bars.
+
+    Accepts the live ``list[DailyBar]`` (epoch-second ``ts``, or the same as
+    dicts) or a frame with
+    a date/timestamp column (or index) and ``close``.
+    """
+    if isinstance(bars, pd.DataFrame):
+        frame = bars.reset_index()
+        cols = {str(c).lower(): c for c in frame.columns}
+        date_col = next((cols[c] for c in ("date", "timestamp", "ts", "index") if c in cols), None)
+        if date_col is None or "close" not in cols:
+            return pd.Series(dtype=float)
+        raw = frame[date_col]
+        dates = pd.to_datetime(raw, unit="s", utc=True) if pd.api.types.is_numeric_dtype(raw) else pd.to_datetime(raw)
+        closes = frame[cols["close"]].to_numpy(dtype=float)
+    else:
+        rows = [
+            (bar.get("ts"), bar.get("close")) if isinstance(bar, dict) else (getattr(bar, "ts", None), getattr(bar, "close", None))
+            for bar in bars or []
+        ]
+        rows = [(ts, close) for ts, close in rows if ts is not None and close is not None]
+        if not rows:
+            return pd.Series(dtype=float)
+        dates = pd.to_datetime([float(ts) for ts, _ in rows], unit="s", utc=True)
+        closes = np.asarray([float(c) for _, c in rows], dtype=float)
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_convert(ET).tz_localize(None)
+    series = pd.Series(closes, index=index.normalize())
+    series = series[~series.index.duplicated(keep="last")].sort_index()
+    return series[series.index < pd.Timestamp(before_ny_date)]
+
+
+class DailyReturnsCache:
+    """Per-NY-date daily closes by symbol and the ReturnsMatrix over them.
+
+    Each symbol's daily bars are fetched once per day; the matrix is rebuilt
+    only when the symbol set grows, so per-candidate sizing reuses it.
+    Only completed sessions are used, so the matrix is fixed for the day.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ny_date: str | None = None
+        self._closes: dict[str, pd.Series] = {}
+        self._key: tuple | None = None
+        self._matrix = None
+
+    def matrix(self, md, symbols: list[str], *, ny_date: str, lookback_days: int = 60):
+        with self._lock:
+            if self._ny_date != ny_date:
+                self._ny_date = ny_date
+                self._closes = {}
+                self._key = None
+            missing = sorted({str(s).upper() for s in symbols} - set(self._closes))
+        fetched = {sym: _daily_closes(md.get_daily_bars(sym), ny_date) for sym in missing}
+        with self._lock:
+            if self._ny_date == ny_date:
+                self._closes.update(fetched)
+            key = (frozenset(self._closes), int(lookback_days))
+            if key != self._key:
+                prices = pd.DataFrame({sym: closes for sym, closes in self._closes.items() if len(closes)})
+                self._matrix = _returns_matrix_cls().from_prices(prices.sort_index(), lookback_days)
+                self._key = key
+            return self._matrix
+
+
 def check_sector_cap(
     candidate_sector: str | None,
     open_positions: list[dict],
@@ -0,0 +1,137 @@
+"""
+Per-cycle latency profile for execution_main.run_once.
+
+CycleProfiler collects wall time per cycle phase (store init, purge, client
+setup, market clock, candidate ingest, BOH evaluation, sizing, exits, sell
+loop, arbitration, order submit, trims, ledger writes, state flush), counts
+and times every broker / market-data call made through instrumented clients,
+and keeps the slowest calls as samples. run_once embeds ``to_dict()`` in the
+portfolio decision record under ``latency``; build_readmodels flattens it
+into the ``cycle_latency`` table.
+
+Phases may be entered from worker threads (the buy loop probes candidates
+concurrently), so all mutation goes through one lock. Phase time is summed
+wall time per entry, so concurrent entries can add up to more than the cycle.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+SCHEMA_VERSION = 1
+DEFAULT_SLOW_CALLS = 10
+
+
+class CycleProfiler:
+    def __init__(self, *, slow_calls: int = DEFAULT_SLOW_CALLS, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._t0 = clock()
+        self._lap_t = self._t0
+        self._lock = threading.Lock()
+        self.phases: dict[str, dict[str, float]] = {}
+        self.api_calls: dict[str, dict[str, float]] = {}
+        self.slow_calls = max(0, int(slow_calls))
+        self._slowest: list[tuple[float, int, str, str | None]] = []  # min-heap of the N slowest
+        self._seq = 0
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            entry = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += float(seconds)
+            entry["calls"] += int(calls)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t0 = self._clock()
+        try:
+            yield
+        finally:
+            self.add_time(name, self._clock() - t0)
+
+    def lap(self, name: str) -> None:
+        """Charge the time since the previous lap (or construction) to ``name``."""
+        now = self._clock()
+        with self._lock:
+            elapsed, self._lap_t = now - self._lap_t, now
+        self.add_time(name, elapsed)
+
+    def record_call(self, api: str, seconds: float, *, symbol: str | None = None, ok: bool = True) -> None:
+        with self._lock:
+            entry = self.api_calls.setdefault(api, {"count": 0, "seconds": 0.0, "errors": 0})
+            entry["count"] += 1
+            entry["seconds"] += float(seconds)
+            if not ok:
+                entry["errors"] += 1
+            if not self.slow_calls:
+                return
+            self._seq += 1
+            item = (float(seconds), -self._seq, api, symbol)
+            if len(self._slowest) < self.slow_calls:
+                heapq.heappush(self._slowest, item)
+            elif item > self._slowest[0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def instrument(self, target: Any, prefix: str) -> Any:
+        """Wrap ``target`` so each public method call is counted as ``prefix.method``."""
+        if target is None or isinstance(target, _TimedClient):
+            return target
+        return _TimedClient(target, prefix, self)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            total = self._clock() - self._t0
+            return {
+                "schema_version": SCHEMA_VERSION,
+                "total_ms": _ms(total),
+                "phases": {
+                    name: {"ms": _ms(v["seconds"]), "calls": int(v["calls"])}
+                    for name, v in self.phases.items()
+                },
+                "api_calls": {
+                    api: {"count": int(v["count"]), "ms": _ms(v["seconds"]), "errors": int(v["errors"])}
+                    for api, v in sorted(self.api_calls.items())
+                },
+                "slow_calls": [
+                    {"api": api, "symbol": symbol, "ms": _ms(seconds)}
+                    for seconds, _seq, api, symbol in sorted(self._slowest, reverse=True)
+                ],
+            }
+
+
+class _TimedClient:
+    """Attribute proxy that times public method calls on the wrapped client."""
+
+    def __init__(self, target: Any, prefix: str, profiler: CycleProfiler) -> None:
+        self._target = target
+        self._prefix = prefix
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        api = f"{self._prefix}.{name}"
+        profiler = self._profiler
+
+        def _timed(*args, **kwargs):
+            symbol = kwargs.get("symbol")
+            if symbol is None and args and isinstance(args[0], str):
+                symbol = args[0]
+            t0 = profiler._clock()
+            ok = False
+            try:
+                result = attr(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                profiler.record_call(api, profiler._clock() - t0, symbol=symbol, ok=ok)
+
+        return _timed
+
+
+def _ms(seconds: float) -> float:
+    return round(float(seconds) * 1000.0, 3)
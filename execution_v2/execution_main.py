@@ -24,7 +24,7 @@ from alerts.slack import (
     maybe_send_heartbeat,
     maybe_send_daily_summary,
 )
-from execution_v2 import buy_loop, exits, sell_loop, state_machine
+from execution_v2 import bar_stream, buy_loop, exits, sell_loop, state_machine
 from execution_v2 import live_gate
 from execution_v2 import config_check as _config_check
 from execution_v2 import alpaca_paper
@@ -33,6 +33,7 @@ from execution_v2 import book_ids
 from execution_v2 import book_router
 from execution_v2 import paper_sim
 from execution_v2 import clocks
+from execution_v2 import cycle_profiler
 from execution_v2 import portfolio_decisions
 from execution_v2 import portfolio_decision_enforce
 from execution_v2 import portfolio_arbiter
@@ -43,6 +44,7 @@ from execution_v2 import portfolio_s2_enforcement
 from execution_v2 import strategy_sleeves
 from execution_v2 import entry_suppression
 from execution_v2.orders import generate_idempotency_key, build_marketable_limit, SlippageConfig
+from execution_v2.session import ExecutionSession
 from execution_v2.state_store import StateStore
 from execution_v2.strategy_registry import DEFAULT_STRATEGY_ID
 from utils.atomic_write import atomic_write_text
@@ -392,6 +394,16 @@ def _snapshot_candidates_csv(path: str) -> dict:
     return {"path": abs_path, "mtime_utc": mtime_utc, "row_count": row_count}
 
 
+def _cycle_candidates_snapshot(cfg, session: ExecutionSession | None) -> dict:
+    if session is None:
+        return _snapshot_candidates_csv(cfg.candidates_csv)
+    key = session.candidates.stat_key()
+    if key is None or key != session.candidates_snapshot_key or session.candidates_snapshot is None:
+        session.candidates_snapshot = _snapshot_candidates_csv(cfg.candidates_csv)
+        session.candidates_snapshot_key = key
+    return dict(session.candidates_snapshot)
+
+
 def _iso_utc(ts: float | int | None) -> str | None:
     if ts is None:
         return None
@@ -1141,7 +1153,12 @@ def _finalize_portfolio_enforcement(
     )
 
 
-def run_once(cfg) -> None:
+def run_once(cfg, session: ExecutionSession | None = None) -> None:
+    """Run one execution cycle.
+
+    With a ``session`` (the polling loop in main), the state store, clients,
+    parsed candidates and DB sanity check are reused across cycles.
+    """
     if not hasattr(cfg, "project"):
         cfg.project = "RAEC 401k" if cfg.execution_mode == "SCHWAB_401K_MANUAL" else "AVWAP"
     if cfg.execution_mode == "ALPACA_PAPER":
@@ -1151,9 +1168,12 @@ def run_once(cfg) -> None:
         if not api_key or not api_secret or not base_url:
             _log("ERROR: Missing Alpaca API credentials in environment")
             raise RuntimeError("Missing Alpaca API credentials in environment")
+    profiler = cycle_profiler.CycleProfiler()
     decision_ts_utc = datetime.now(timezone.utc)
     cycle_now_ts = decision_ts_utc.timestamp()
-    candidates_snapshot = _snapshot_candidates_csv(cfg.candidates_csv)
+    if session is not None:
+        session.cycles += 1
+    candidates_snapshot = _cycle_candidates_snapshot(cfg, session)
     repo_root = Path(getattr(cfg, "base_dir", "") or os.getenv("AVWAP_REPO_ROOT", "") or Path(__file__).resolve().parents[1]).resolve()
     decision_record = _init_decision_record(cfg, candidates_snapshot, decision_ts_utc, repo_root)
     candidates_fresh, candidates_fresh_reason = _resolve_candidates_freshness(
@@ -1182,6 +1202,7 @@ def run_once(cfg) -> None:
     entry_delay_after_open_message: str | None = None
     symbol_state_store: state_machine.SymbolExecutionStateStore | None = None
     consumed_entries_store: state_machine.ConsumedEntriesStore | None = None
+    trims_t0: float | None = None
     entry_intent_ttl_sec = _resolve_entry_intent_ttl_sec()
     entry_intent_reschedule_on_gate = _resolve_entry_intent_reschedule_on_gate()
     decision_record["inputs"]["entry_intent_lifecycle"] = {
@@ -1213,7 +1234,10 @@ def run_once(cfg) -> None:
         f"mtime_utc={db_meta['db_mtime_utc']}"
     )
     active_db_path = Path(str(db_meta["db_path_abs"]))
-    if active_db_path.as_posix().endswith("/data/execution_v2.sqlite"):
+    if session is not None and not session.db_sanity_due(cycle_now_ts):
+        if session.db_sanity_check is not None:
+            decision_record["inputs"]["db_sanity_check"] = session.db_sanity_check
+    elif active_db_path.as_posix().endswith("/data/execution_v2.sqlite"):
         alternate_db_path = (repo_root / "execution_v2.sqlite").resolve()
         if alternate_db_path != active_db_path and alternate_db_path.exists():
             active_snapshot = _sqlite_db_snapshot(active_db_path, now_ts=decision_ts_utc.timestamp())
@@ -1243,6 +1267,8 @@ def run_once(cfg) -> None:
                 "alternate": alternate_snapshot,
                 "mismatch": mismatch,
             }
+            if session is not None:
+                session.db_sanity_check = decision_record["inputs"]["db_sanity_check"]
             if mismatch:
                 _warn_once(
                     f"db_split_brain:{active_db_path}:{alternate_db_path}",
@@ -1257,9 +1283,18 @@ def run_once(cfg) -> None:
                     f"active_total={active_total} alt_total={alternate_total}"
                 )
 
+    if session is not None and session.db_sanity_due(cycle_now_ts):
+        session.db_sanity_checked_at = cycle_now_ts
+    profiler.lap("prelude")
+
     try:
         try:
-            store = StateStore(cfg.db_path)
+            store = session.store if session is not None else None
+            if store is None:
+                with profiler.phase("store_init"):
+                    store = StateStore(cfg.db_path)
+                if session is not None:
+                    session.store = store
         except Exception as exc:
             errors.append(
                 {
@@ -1291,7 +1326,8 @@ def run_once(cfg) -> None:
         }
         if hasattr(store, "purge_stale_entry_intents"):
             try:
-                raw = store.purge_stale_entry_intents(cycle_now_ts, entry_intent_ttl_sec)
+                with profiler.phase("purge"):
+                    raw = store.purge_stale_entry_intents(cycle_now_ts, entry_intent_ttl_sec)
                 if isinstance(raw, dict):
                     purge_stats.update(raw)
             except Exception as exc:
@@ -1328,10 +1364,12 @@ def run_once(cfg) -> None:
             )
         if cfg.entry_delay_min_sec > cfg.entry_delay_max_sec:
             cfg.entry_delay_min_sec, cfg.entry_delay_max_sec = cfg.entry_delay_max_sec, cfg.entry_delay_min_sec
+        candidate_cache = session.candidates if session is not None else None
         buy_cfg = buy_loop.BuyLoopConfig(
             candidates_csv=cfg.candidates_csv,
             entry_delay_min_sec=cfg.entry_delay_min_sec,
             entry_delay_max_sec=cfg.entry_delay_max_sec,
+            candidate_cache=candidate_cache,
         )
         edge_window_cfg = buy_loop.EdgeWindowConfig.from_env()
         edge_report = buy_loop.EdgeWindowReport()
@@ -1341,16 +1379,18 @@ def run_once(cfg) -> None:
         _record_one_shot_meta(decision_record, one_shot_cfg)
 
         def _evaluate_entry_candidates(account_equity: float) -> int:
-            created = buy_loop.evaluate_and_create_entry_intents(
-                store,
-                md,
-                buy_cfg,
-                account_equity,
-                created_intents=entry_intents_created,
-                edge_window=edge_window_cfg,
-                edge_report=edge_report,
-                rejection_telemetry=entry_rejection_telemetry,
-            )
+            with profiler.phase("entry_eval"):
+                created = buy_loop.evaluate_and_create_entry_intents(
+                    store,
+                    md,
+                    buy_cfg,
+                    account_equity,
+                    created_intents=entry_intents_created,
+                    edge_window=edge_window_cfg,
+                    edge_report=edge_report,
+                    rejection_telemetry=entry_rejection_telemetry,
+                    profiler=profiler,
+                )
             _record_entry_rejections_meta(
                 decision_record,
                 telemetry=entry_rejection_telemetry,
@@ -1387,7 +1427,10 @@ def run_once(cfg) -> None:
             _log(f"WARNING: failed to log Alpaca env ({type(exc).__name__}: {exc})")
         # --------------------------------------------
 
-        if cfg.execution_mode not in {"PAPER_SIM", "DRY_RUN"}:
+        clients_t0 = time.perf_counter()
+        if session is not None and session.clients_ready:
+            trading_client, md = session.trading_client, session.market_data
+        elif cfg.execution_mode not in {"PAPER_SIM", "DRY_RUN"}:
             book_id = book_ids.resolve_book_id(cfg.execution_mode)
             if book_id == book_ids.SCHWAB_401K_MANUAL:
                 trading_client = book_router.select_trading_client(book_id)
@@ -1403,7 +1446,7 @@ def run_once(cfg) -> None:
                 except Exception as exc:
                     _log(f"ERROR: failed to initialize trading client: {type(exc).__name__}: {exc}")
                     raise
-                md = market_data_from_env()
+                md = bar_stream.wrap_market_data(market_data_from_env())
         else:
             trading_client = None
             md = None
@@ -1416,6 +1459,12 @@ def run_once(cfg) -> None:
                     return []
 
             md = _NoMarketData()
+        if session is not None and not session.clients_ready:
+            session.set_clients(trading_client, md)
+        profiler.add_time("clients", time.perf_counter() - clients_t0)
+        # The session keeps the raw clients; this cycle talks through timed proxies.
+        trading_client = profiler.instrument(trading_client, "broker")
+        md = profiler.instrument(md, "md")
         # Diagnostics: confirm which candidates CSV execution will use (observability only).
         try:
             p = candidates_snapshot.get("path", cfg.candidates_csv)
@@ -1425,7 +1474,8 @@ def run_once(cfg) -> None:
         except Exception:
             pass
         
-        market_is_open, now_et, clock_source, ledger_path = _market_open(cfg, trading_client, repo_root)
+        with profiler.phase("market_clock"):
+            market_is_open, now_et, clock_source, ledger_path = _market_open(cfg, trading_client, repo_root)
         decision_record["gates"]["market"]["is_open"] = market_is_open
         decision_record["gates"]["market"]["clock_source"] = clock_source
         entry_delay_minutes = _resolve_entry_delay_after_open_minutes()
@@ -1652,21 +1702,26 @@ def run_once(cfg) -> None:
             if trading_client is None:
                 _log("EXIT: skipping (no trading_client)")
             else:
-                exits.manage_positions(
-                    trading_client=trading_client,
-                    md=md,
-                    cfg=exits.ExitConfig.from_env(),
-                    repo_root=repo_root,
-                    dry_run=cfg.dry_run,
-                    log=_log,
-                    entry_delay_active=entry_delay_after_open_active,
-                )
-                try:
-                    sell_loop.evaluate_positions(
-                        store,
-                        trading_client,
-                        sell_loop.SellLoopConfig(candidates_csv=cfg.candidates_csv),
+                with profiler.phase("exits"):
+                    exits.manage_positions(
+                        trading_client=trading_client,
+                        md=md,
+                        cfg=exits.ExitConfig.from_env(),
+                        repo_root=repo_root,
+                        dry_run=cfg.dry_run,
+                        log=_log,
+                        entry_delay_active=entry_delay_after_open_active,
                     )
+                try:
+                    with profiler.phase("sell_loop"):
+                        sell_loop.evaluate_positions(
+                            store,
+                            trading_client,
+                            sell_loop.SellLoopConfig(
+                                candidates_csv=cfg.candidates_csv,
+                                candidate_cache=candidate_cache,
+                            ),
+                        )
                 except Exception as exc:
                     _log(f"WARNING: sell loop evaluation failed ({type(exc).__name__}: {exc})")
 
@@ -1734,21 +1789,26 @@ def run_once(cfg) -> None:
             if trading_client is None:
                 _log("EXIT: skipping (no trading_client)")
             else:
-                exits.manage_positions(
-                    trading_client=trading_client,
-                    md=md,
-                    cfg=exits.ExitConfig.from_env(),
-                    repo_root=repo_root,
-                    dry_run=cfg.dry_run,
-                    log=_log,
-                    entry_delay_active=entry_delay_after_open_active,
-                )
-                try:
-                    sell_loop.evaluate_positions(
-                        store,
-                        trading_client,
-                        sell_loop.SellLoopConfig(candidates_csv=cfg.candidates_csv),
+                with profiler.phase("exits"):
+                    exits.manage_positions(
+                        trading_client=trading_client,
+                        md=md,
+                        cfg=exits.ExitConfig.from_env(),
+                        repo_root=repo_root,
+                        dry_run=cfg.dry_run,
+                        log=_log,
+                        entry_delay_active=entry_delay_after_open_active,
                     )
+                try:
+                    with profiler.phase("sell_loop"):
+                        sell_loop.evaluate_positions(
+                            store,
+                            trading_client,
+                            sell_loop.SellLoopConfig(
+                                candidates_csv=cfg.candidates_csv,
+                                candidate_cache=candidate_cache,
+                            ),
+                        )
                 except Exception as exc:
                     _log(f"WARNING: sell loop evaluation failed ({type(exc).__name__}: {exc})")
 
@@ -1853,6 +1913,7 @@ def run_once(cfg) -> None:
             open_positions_by_strategy=open_positions_by_strategy,
             existing_symbols=sorted(state_symbols),
         )
+        arbitration_t0 = time.perf_counter()
         # Phase S1 arbitration per docs/ROADMAP.md: trade intents -> portfolio decision gate.
         trade_intents = [
             portfolio_intents.trade_intent_from_entry_intent(intent)
@@ -2039,6 +2100,7 @@ def run_once(cfg) -> None:
                 )
                 approved_intents = []
                 s2_blocked = True
+        profiler.add_time("arbitration", time.perf_counter() - arbitration_t0)
         _update_intents_meta(
             decision_record,
             created_intents=entry_intents_created,
@@ -2090,9 +2152,10 @@ def run_once(cfg) -> None:
                 caps, "max_notional_per_symbol", None
             )
 
-        symbol_state_store = state_machine.SymbolExecutionStateStore(
-            date_ny=decision_record["ny_date"],
+        symbol_state_store = state_machine.symbol_state_store_from_env(
+            decision_record["ny_date"],
             state_dir=_state_dir(),
+            db=store,
         )
         consumed_entries_store = state_machine.ConsumedEntriesStore(
             date_ny=decision_record["ny_date"],
@@ -2102,13 +2165,14 @@ def run_once(cfg) -> None:
             try:
                 open_positions = trading_client.get_all_positions()
                 open_symbols = [getattr(pos, "symbol", "") for pos in open_positions]
+                position_states = store.list_positions_by_symbol()
                 entry_fill_ts = {}
                 for pos in open_positions:
                     symbol = str(getattr(pos, "symbol", "")).upper()
                     if not symbol:
                         continue
                     strategy_id = DEFAULT_STRATEGY_ID
-                    pos_state = store.get_position(symbol)
+                    pos_state = position_states.get(symbol)
                     if pos_state is not None:
                         strategy_id = pos_state.strategy_id
                     record = store.get_entry_fill(
@@ -2344,7 +2408,8 @@ def run_once(cfg) -> None:
                     continue
 
                 try:
-                    order_id = _submit_market_entry(trading_client, intent, dry_run=False)
+                    with profiler.phase("order_submit"):
+                        order_id = _submit_market_entry(trading_client, intent, dry_run=False)
                     order_id_str = str(order_id) if order_id is not None else None
                     store.record_order_once(
                         key,
@@ -2421,7 +2486,8 @@ def run_once(cfg) -> None:
                         order=order_info,
                         now_utc=now_utc,
                     )
-                    written, skipped = alpaca_paper.append_events(ledger_path, [event])
+                    with profiler.phase("ledger_writes"):
+                        written, skipped = alpaca_paper.append_events(ledger_path, [event])
                     # ALPACA_PAPER observability: bounded post-submit refresh for near-instant fills
                     # Append-only: if broker state materially changes (new -> filled), append a second ORDER_STATUS event.
                     def _evt_sig(evt: dict) -> tuple:
@@ -2450,7 +2516,8 @@ def run_once(cfg) -> None:
                                 )
                                 _sig1 = _evt_sig(refreshed_event)
                                 if _sig1 != _sig0:
-                                    alpaca_paper.append_events(ledger_path, [refreshed_event])
+                                    with profiler.phase("ledger_writes"):
+                                        alpaca_paper.append_events(ledger_path, [refreshed_event])
                                     # If filled_qty transitions 0 -> >0, record fill + OPEN transition (best-effort)
                                     try:
                                         if float(_sig0[1]) <= 0 and float(refreshed_event.get("filled_qty") or 0) > 0:
@@ -2678,7 +2745,8 @@ def run_once(cfg) -> None:
                     continue
 
             try:
-                order_id = _submit_market_entry(trading_client, intent, effective_dry_run)
+                with profiler.phase("order_submit"):
+                    order_id = _submit_market_entry(trading_client, intent, effective_dry_run)
                 order_id_str = str(order_id) if order_id is not None else None
                 _log(f"SUBMITTED {intent.symbol}: qty={intent.size_shares} order_id={order_id}")
                 if order_id == "dry-run-skipped":
@@ -2796,10 +2864,12 @@ def run_once(cfg) -> None:
             context=enforcement_context,
             project=cfg.project,
         )
+        trims_t0 = time.perf_counter()
         trim_intents = store.pop_trim_intents()
         if not trim_intents:
             return
 
+        position_states = store.list_positions_by_symbol()
         for intent in trim_intents:
             symbol = str(intent["symbol"]).upper()
             if symbol_state_store:
@@ -2837,7 +2907,7 @@ def run_once(cfg) -> None:
                 total_qty = int(float(position.qty))
             except Exception:
                 continue
-            state = store.get_position(symbol)
+            state = position_states.get(symbol)
             stop_price = None
             if state is not None:
                 stop_price = state.stop_price
@@ -2926,7 +2996,8 @@ def run_once(cfg) -> None:
                         order=order_info,
                         now_utc=now_utc,
                     )
-                    written, skipped = alpaca_paper.append_events(ledger_path, [event])
+                    with profiler.phase("ledger_writes"):
+                        written, skipped = alpaca_paper.append_events(ledger_path, [event])
                     # ALPACA_PAPER observability: bounded post-submit refresh for near-instant fills
                     # Append-only: if broker state materially changes (new -> filled), append a second ORDER_STATUS event.
                     def _evt_sig(evt: dict) -> tuple:
@@ -2955,7 +3026,8 @@ def run_once(cfg) -> None:
                                 )
                                 _sig1 = _evt_sig(refreshed_event)
                                 if _sig1 != _sig0:
-                                    alpaca_paper.append_events(ledger_path, [refreshed_event])
+                                    with profiler.phase("ledger_writes"):
+                                        alpaca_paper.append_events(ledger_path, [refreshed_event])
                                     lp = str(ledger_path.resolve())
                                     if lp not in ledgers_written:
                                         ledgers_written.append(lp)
@@ -3033,6 +3105,20 @@ def run_once(cfg) -> None:
         )
         raise
     finally:
+        if symbol_state_store is not None and symbol_state_store.write_behind:
+            # Write-behind modes persist the cycle's transitions here, once.
+            try:
+                with profiler.phase("state_flush"):
+                    symbol_state_store.flush()
+            except Exception as exc:
+                errors.append(
+                    {
+                        "where": "symbol_state_flush",
+                        "message": str(exc),
+                        "exception_type": type(exc).__name__,
+                    }
+                )
+                _log(f"ERROR: failed to persist symbol execution state ({type(exc).__name__}: {exc})")
         skipped_actions = decision_record.get("actions", {}).get("skipped", []) or []
         skip_reason_counts = _summarize_skip_reasons(skipped_actions)
         lifecycle_reason_counts = (
@@ -3043,6 +3129,9 @@ def run_once(cfg) -> None:
             skip_reason_counts[reason] = skip_reason_counts.get(reason, 0) + int(count)
         decision_record["actions"]["skipped_reason_counts"] = skip_reason_counts
         decision_record.setdefault("intents_meta", {})["skip_reason_counts"] = skip_reason_counts
+        if trims_t0 is not None:
+            profiler.add_time("trims", time.perf_counter() - trims_t0)
+        decision_record["latency"] = profiler.to_dict()
         market_is_open = decision_record.get("gates", {}).get("market", {}).get("is_open")
         is_material = _is_material_cycle(decision_record, cfg, market_is_open)
         if is_material:
@@ -3140,10 +3229,29 @@ def main() -> None:
         _log("Execution V2 run_once complete.")
         return
 
+    stream = None
+    try:
+        stream = bar_stream.start_from_env()
+    except Exception as exc:
+        _log(f"WARNING: bar stream unavailable; falling back to REST polling ({type(exc).__name__}: {exc})")
+    if stream is not None:
+        _log("Execution V2 market data mode: stream (cycles wake on bar close)")
+
+    session = ExecutionSession.from_cfg(cfg)
+    try:
+        _run_loop(cfg, session, stream)
+    finally:
+        session.close()
+
+
+def _run_loop(cfg, session: ExecutionSession, stream) -> None:
     while True:
         try:
-            run_once(cfg)
+            run_once(cfg, session)
         except Exception as exc:
+            # Reopen the state store and rebuild the clients next cycle rather
+            # than reuse a connection left mid-transaction or a broken client.
+            session.reset()
             _log(f"ERROR: unexpected exception: {exc}")
             slack_alert(
                 "ERROR",
@@ -3158,8 +3266,11 @@ def main() -> None:
         if cfg.run_once:
             slack_alert("execution_v2: --run-once enabled; exiting after single cycle.")
             break
-        
-        time.sleep(resolve_poll_seconds(cfg))
+
+        if stream is not None:
+            stream.wait_for_bar_close(resolve_poll_seconds(cfg))
+        else:
+            time.sleep(resolve_poll_seconds(cfg))
 
 
 if __name__ == "__main__":
@@ -643,6 +643,120 @@ def _get_open_orders_for_symbol(trading_client, symbol: str):
                 continue
         return out
 
+
+_OPEN_ORDERS_PAGE_LIMIT = 500
+_OPEN_ORDERS_MAX_PAGES = 20
+
+
+def _list_open_orders(trading_client) -> list:
+    """Fetch every OPEN order in as few requests as possible.
+
+    Pages backwards through submitted_at (Alpaca returns newest first and caps
+    a page at 500) so a large order book does not hide the stops we need.
+    Falls back to an unfiltered get_orders() when request objects are not
+    available, mirroring _get_open_orders_for_symbol.
+    """
+    try:
+        from alpaca.trading.requests import GetOrdersRequest
+        from alpaca.trading.enums import QueryOrderStatus
+    except Exception:
+        return [o for o in trading_client.get_orders() if _is_open_status(_order_status(o))]
+
+    orders: list = []
+    seen: set[str] = set()
+    until = None
+    for _ in range(_OPEN_ORDERS_MAX_PAGES):
+        req = GetOrdersRequest(
+            status=QueryOrderStatus.OPEN,
+            limit=_OPEN_ORDERS_PAGE_LIMIT,
+            until=until,
+        )
+        try:
+            page = list(trading_client.get_orders(filter=req))
+        except TypeError:
+            try:
+                page = list(trading_client.get_orders(req))
+            except TypeError:
+                return [o for o in trading_client.get_orders() if _is_open_status(_order_status(o))]
+        for order in page:
+            order_id = str(_order_attr(order, "id", "") or "")
+            if order_id and order_id in seen:
+                continue
+            if order_id:
+                seen.add(order_id)
+            orders.append(order)
+        if len(page) < _OPEN_ORDERS_PAGE_LIMIT:
+            break
+        stamps = [ts for ts in (_order_timestamp(o) for o in page) if ts is not None]
+        if not stamps:
+            break
+        oldest = datetime.fromtimestamp(min(stamps), tz=timezone.utc)
+        if until is not None and oldest >= until:
+            break
+        until = oldest
+    return orders
+
+
+class OpenOrdersSnapshot:
+    """Open orders for one exit cycle, fetched once and indexed by (symbol, side).
+
+    Stop reads and reconciliation share the snapshot instead of issuing a
+    get_orders() per position. A symbol is invalidated after this cycle
+    cancels or submits one of its orders; its next read goes back to the
+    broker for that symbol only. If the bulk fetch fails, every read uses
+    the per-symbol path.
+    """
+
+    def __init__(self, trading_client) -> None:
+        self._client = trading_client
+        self._by_key: dict[tuple[str, str], list] | None = None
+        self._loaded = False
+        self._refreshed: dict[str, list] = {}
+        self._stale: set[str] = set()
+        self.requests = 0
+
+    def _load(self) -> None:
+        self._loaded = True
+        self.requests += 1
+        try:
+            orders = _list_open_orders(self._client)
+        except Exception:
+            self._by_key = None
+            return
+        by_key: dict[tuple[str, str], list] = {}
+        for order in orders:
+            by_key.setdefault((_order_symbol(order), _order_side(order)), []).append(order)
+        self._by_key = by_key
+
+    def orders_for(self, symbol: str, side: str | None = None) -> list:
+        sym = str(symbol or "").upper()
+        if not self._loaded:
+            self._load()
+        if self._by_key is None or sym in self._stale:
+            self._stale.discard(sym)
+            self.requests += 1
+            self._refreshed[sym] = _get_open_orders_for_symbol(self._client, sym)
+        if sym in self._refreshed:
+            orders = self._refreshed[sym]
+            if side is None:
+                return list(orders)
+            return [o for o in orders if _order_side(o) == side]
+        if side is not None:
+            return list(self._by_key.get((sym, side), []))
+        return [o for (s, _), group in self._by_key.items() if s == sym for o in group]
+
+    def invalidate(self, symbol: str) -> None:
+        sym = str(symbol or "").upper()
+        self._refreshed.pop(sym, None)
+        self._stale.add(sym)
+
+
+def _open_orders_for_symbol(trading_client, symbol: str, open_orders: OpenOrdersSnapshot | None) -> list:
+    if open_orders is None:
+        return _get_open_orders_for_symbol(trading_client, symbol)
+    return open_orders.orders_for(symbol)
+
+
 def reconcile_stop_order(
     *,
     trading_client,
@@ -651,12 +765,13 @@ def reconcile_stop_order(
     desired_stop: float,
     log: Callable[[str], None] | None = None,
     append_event: Callable[[dict], None] | None = None,
+    open_orders: OpenOrdersSnapshot | None = None,
 ) -> ExitPositionState:
     log = log or (lambda msg: None)
     append_event = append_event or (lambda event: None)
 
-    open_orders = _get_open_orders_for_symbol(trading_client, state.symbol)
-    sell_orders = [o for o in open_orders if _order_side(o) == "sell" and _is_open_status(_order_status(o)) and _order_symbol(o) == state.symbol.upper()]
+    symbol_orders = _open_orders_for_symbol(trading_client, state.symbol, open_orders)
+    sell_orders = [o for o in symbol_orders if _order_side(o) == "sell" and _is_open_status(_order_status(o)) and _order_symbol(o) == state.symbol.upper()]
 
     matching_orders = [
         order
@@ -690,8 +805,10 @@ def reconcile_stop_order(
             continue
 
     if mismatched_stops:
-        open_orders = _get_open_orders_for_symbol(trading_client, state.symbol)
-        sell_orders = [o for o in open_orders if _order_side(o) == "sell" and _is_open_status(_order_status(o)) and _order_symbol(o) == state.symbol.upper()]
+        if open_orders is not None:
+            open_orders.invalidate(state.symbol)
+        symbol_orders = _open_orders_for_symbol(trading_client, state.symbol, open_orders)
+        sell_orders = [o for o in symbol_orders if _order_side(o) == "sell" and _is_open_status(_order_status(o)) and _order_symbol(o) == state.symbol.upper()]
 
     for order in sell_orders:
         if _matching_stop_order(order, state.symbol, desired_qty, desired_stop):
@@ -734,6 +851,8 @@ def reconcile_stop_order(
             state.stop_order_id = str(_order_attr(preferred, "id", "")) or state.stop_order_id
         return state
 
+    if open_orders is not None:
+        open_orders.invalidate(state.symbol)
     try:
         order = _submit_stop_order(trading_client, state.symbol, desired_qty, desired_stop)
     except APIError as exc:
@@ -773,9 +892,10 @@ def _read_existing_stop(
     *,
     desired_qty: Optional[int] = None,
     desired_stop: Optional[float] = None,
+    open_orders: OpenOrdersSnapshot | None = None,
 ) -> Optional[float]:
     try:
-        orders = _get_open_orders_for_symbol(trading_client, symbol)
+        orders = _open_orders_for_symbol(trading_client, symbol, open_orders)
     except Exception:
         return None
     stop_orders = []
@@ -820,6 +940,9 @@ def manage_positions(
         log(f"EXIT: positions unavailable ({type(exc).__name__}: {exc})")
         return
 
+    # One open-orders fetch for the whole cycle (loaded on first use).
+    open_orders = OpenOrdersSnapshot(trading_client)
+
     for pos in positions:
         symbol = str(getattr(pos, "symbol", "")).upper()
         if not symbol:
@@ -842,6 +965,7 @@ def manage_positions(
             symbol,
             desired_qty=qty,
             desired_stop=None,
+            open_orders=open_orders,
         )
 
         # If we're in the post-open entry-delay window and a stop already exists for full qty,
@@ -905,6 +1029,7 @@ def manage_positions(
                 symbol,
                 desired_qty=qty,
                 desired_stop=candidate_stop,
+                open_orders=open_orders,
             )
 
         if allow_trailing:
@@ -1020,6 +1145,7 @@ def manage_positions(
                 desired_stop=desired_stop,
                 log=log,
                 append_event=_append_legacy,
+                open_orders=open_orders,
             )
         except Exception as exc:
             log(f"EXIT: reconcile failed for {symbol} ({type(exc).__name__}: {exc})")
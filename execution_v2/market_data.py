@@ -4,6 +4,8 @@ Execution V2 – Market Data Adapter (Alpaca)
 Responsibilities:
 - Fetch completed DAILY bars (for pivots + global regime)
 - Fetch last two CLOSED 10-minute bars (for BOH)
+- Serve session relative volume (rvol) from a cached 5-minute volume matrix
+- Record closed intraday bars to the local bar store (EXECUTION_BAR_STORE_DIR)
 - Provide staleness/basic sanity checks
 
 This module performs I/O but contains NO strategy logic.
@@ -16,22 +18,16 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import pandas as pd
+
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
+from execution_v2.bar_store import IntradayBarStore, bar_store_from_env
 from execution_v2.pivots import DailyBar
 from execution_v2.boh import Bar10m
-
-
-@dataclass(frozen=True)
-class VolumeProfile:
-    """Session volume profile for rvol gating."""
-    today_cumulative: float
-    avg_cumulative: float
-    rvol: float
-    sample_days: int
-    bar_count_today: int
+from execution_v2.rvol_profile import RvolMatrixCache, VolumeProfile
 
 
 @dataclass(frozen=True)
@@ -44,9 +40,11 @@ class MarketDataConfig:
 
 
 class MarketData:
-    def __init__(self, cfg: MarketDataConfig) -> None:
+    def __init__(self, cfg: MarketDataConfig, bar_store: Optional[IntradayBarStore] = None) -> None:
         self.cfg = cfg
         self.client = StockHistoricalDataClient(cfg.api_key, cfg.api_secret)
+        self.rvol = RvolMatrixCache(self._volume_bars_5m)
+        self.bar_store = bar_store if bar_store is not None else bar_store_from_env()
 
     def get_daily_bars(self, symbol: str, lookback_days: Optional[int] = None) -> list[DailyBar]:
         days = lookback_days or self.cfg.daily_lookback_days
@@ -118,6 +116,7 @@ class MarketData:
         """
         Return intraday bars ordered oldest->newest using Alpaca StockBarsRequest.
         Avoid pandas in the public surface by returning simple dicts.
+        Closed bars are also recorded to ``self.bar_store`` when configured.
         """
         start = datetime.now(timezone.utc) - timedelta(days=lookback_days)
         req = StockBarsRequest(
@@ -143,9 +142,25 @@ class MarketData:
                     "volume": float(r["volume"]),
                 }
             )
+        if self.bar_store is not None:
+            self.bar_store.record(symbol, out, minutes=minutes)
         return out
 
 
+    def _volume_bars_5m(self, symbol: str, start: datetime):
+        """Bar start times (UTC epoch ns) and volumes of 5-minute bars since *start*."""
+        req = StockBarsRequest(
+            symbol_or_symbols=symbol,
+            timeframe=TimeFrame(5, TimeFrameUnit.Minute),
+            start=start,
+        )
+        bars = self.client.get_stock_bars(req).df
+        if bars is None or bars.empty:
+            return [], []
+        df = bars.reset_index()
+        ts = pd.to_datetime(df["timestamp"], utc=True)
+        return ts.dt.as_unit("ns").astype("int64").to_numpy(), df["volume"].to_numpy(dtype=float)
+
     def get_session_volume_profile(
         self,
         symbol: str,
@@ -153,59 +168,14 @@ class MarketData:
     ) -> Optional[VolumeProfile]:
         """Compute relative volume (rvol) for *symbol*.
 
-        Fetches 5-minute bars over *lookback_days*, groups by NY date, and
-        computes cumulative volume up to the current time of day.  Averages
-        historical days' cumulative volume at the same time → rvol = today / avg.
+        Cumulative 5-minute volume today up to the current time of day, over
+        the average of the same quantity across the last *lookback_days*
+        (calendar days, plus two).  Served from ``self.rvol``: the history
+        matrix is fetched once per NY day and today's bars incrementally.
 
         Returns None if insufficient data (fail-open).
         """
-        from zoneinfo import ZoneInfo
-
-        bars = self.get_intraday_bars(symbol, minutes=5, lookback_days=lookback_days + 2)
-        if not bars:
-            return None
-
-        et = ZoneInfo("America/New_York")
-        now_et = datetime.now(et)
-        today_str = now_et.strftime("%Y-%m-%d")
-        cutoff_time = now_et.time()
-
-        # Group bars by NY date and compute cumulative volume up to cutoff time
-        daily_cumvol: dict[str, float] = {}
-        for bar in bars:
-            ts = bar["ts"]
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            bar_et = ts.astimezone(et)
-            bar_date = bar_et.strftime("%Y-%m-%d")
-            bar_time = bar_et.time()
-            if bar_time <= cutoff_time:
-                daily_cumvol[bar_date] = daily_cumvol.get(bar_date, 0.0) + bar["volume"]
-
-        today_vol = daily_cumvol.pop(today_str, None)
-        if today_vol is None or not daily_cumvol:
-            return None
-
-        hist_vols = list(daily_cumvol.values())
-        avg_vol = sum(hist_vols) / len(hist_vols) if hist_vols else 0.0
-        if avg_vol <= 0:
-            return None
-
-        rvol = today_vol / avg_vol
-
-        today_bars = sum(
-            1 for bar in bars
-            if bar["ts"].astimezone(et).strftime("%Y-%m-%d") == today_str
-            and bar["ts"].astimezone(et).time() <= cutoff_time
-        )
-
-        return VolumeProfile(
-            today_cumulative=today_vol,
-            avg_cumulative=round(avg_vol, 2),
-            rvol=round(rvol, 4),
-            sample_days=len(hist_vols),
-            bar_count_today=today_bars,
-        )
+        return self.rvol.profile(symbol, lookback_days=lookback_days)
 
 
 def from_env() -> MarketData:
@@ -7,12 +7,12 @@ from __future__ import annotations
 import csv
 import hashlib
 import importlib.util
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable
 
 from execution_v2.clocks import ET
+from utils import jsonl_ledger
 from utils.atomic_write import atomic_write_text
 
 
@@ -61,36 +61,10 @@ def _latest_close_from_cache(repo_root: Path, symbol: str) -> float | None:
     if importlib.util.find_spec("cache_store") is None:
         return None
 
-    import pandas as pd  # type: ignore
     import cache_store as cs
 
     history_path = repo_root / cs.HISTORY_PATH
-    if not history_path.exists():
-        return None
-
-    df = cs.read_parquet(str(history_path))
-    if df is None or df.empty:
-        return None
-
-    df = df.copy()
-    if "Ticker" not in df.columns or "Close" not in df.columns:
-        return None
-
-    df["Ticker"] = df["Ticker"].astype(str).str.upper()
-    symbol_df = df[df["Ticker"] == symbol]
-    if symbol_df.empty:
-        return None
-
-    if "Date" in symbol_df.columns:
-        symbol_df = symbol_df.sort_values("Date")
-    close_value = symbol_df["Close"].iloc[-1]
-    if pd.isna(close_value):
-        return None
-
-    try:
-        return float(close_value)
-    except (TypeError, ValueError):
-        return None
+    return cs.latest_close(str(history_path), symbol)
 
 
 def _intent_qty(intent) -> int:
@@ -126,28 +100,16 @@ def _hash_intent_id(date_ny: str, symbol: str, side: str, qty: int, price: float
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def _load_existing_intent_ids(ledger_path: Path) -> set[str]:
-    existing_ids: set[str] = set()
-    if not ledger_path.exists():
-        return existing_ids
+def _fill_intent_key(data: dict) -> str | None:
+    intent_id = data.get("intent_id")
+    return str(intent_id) if intent_id else None
+
 
+def _load_existing_intent_ids(ledger_path: Path) -> set[str]:
     try:
-        with ledger_path.open("r") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                intent_id = data.get("intent_id")
-                if intent_id:
-                    existing_ids.add(str(intent_id))
+        return jsonl_ledger.load_keys(ledger_path, _fill_intent_key)
     except Exception:
-        return existing_ids
-
-    return existing_ids
+        return set()
 
 
 def _read_jsonl_lines(ledger_path: Path) -> list[str]:
@@ -231,9 +193,7 @@ def simulate_fills(
         existing_ids.add(intent_id)
 
     if fills:
-        with ledger_path.open("a", encoding="utf-8") as f:
-            for fill in fills:
-                f.write(json.dumps(fill, sort_keys=True) + "\n")
+        jsonl_ledger.append_records(ledger_path, fills, key_fn=_fill_intent_key)
 
     return fills
 
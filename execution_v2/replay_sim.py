@@ -0,0 +1,897 @@
+"""
+Execution V2 – Deterministic Intraday Replay
+
+Responsibilities:
+- Drive the real run_once loop (buy loop, arbitration, submission, exits, sell
+  loop) over recorded 5-minute bars on a simulated clock
+- ReplayMarketData: MarketData stand-in serving only bars closed by the clock
+  (10m and daily bars are rolled up from the 5m bars once, vectorized)
+- ReplayTradingClient: in-memory broker filling limit buys, market orders and
+  sell stops against the same bars
+- replay_days: one isolated run per NY date, days in parallel processes; or,
+  with ``carry_over``, consecutive days in order sharing the execution state
+  dir and the broker's cash, positions and open GTC orders, so positions
+  opened on one day are managed (stops, exits) on the next
+
+Time is simulated by swapping the ``time`` / ``datetime`` names of loaded
+execution_v2 (and portfolio) modules for clock-backed shims while a day runs;
+``time.sleep`` advances the clock instead of blocking, so a session replays as
+fast as the CPU allows. Because the swap is process-wide, every day runs in
+its own fresh process.
+
+Without ``carry_over`` each day starts flat: a position still open at the
+close is reported in ``open_positions`` but never exited, so multi-day
+holds are not simulated.
+
+exit_simulator.simulate_exit and paper_sim.simulate_fills remain the
+single-position / end-of-day models; this module replays whole sessions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import multiprocessing
+import os
+import random
+import sys
+import time
+import types
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from execution_v2.bar_store import IntradayBarStore
+from execution_v2.boh import Bar10m
+from execution_v2.clocks import ET, REG_CLOSE, REG_OPEN, snapshot_at
+from execution_v2.pivots import DailyBar
+from execution_v2.rvol_profile import RvolMatrixCache, VolumeProfile
+
+DEFAULT_CYCLE_SEC = 300
+DEFAULT_SETTLE_SEC = 2.0
+DEFAULT_EQUITY = 100_000.0
+DEFAULT_HISTORY_DAYS = 45
+DEFAULT_PATCH_PREFIXES = ("execution_v2", "portfolio")
+BAR_SEC = 300
+
+_REAL_TIME = time
+_REAL_DATETIME = datetime
+
+
+# ---------------------------------------------------------------------------
+# Simulated clock
+# ---------------------------------------------------------------------------
+
+
+class ReplayClock:
+    """Epoch-seconds clock; ``sleep`` advances it instead of blocking."""
+
+    def __init__(self, now: float) -> None:
+        self.now = float(now)
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += max(0.0, float(seconds))
+
+    def advance_to(self, ts: float) -> None:
+        self.now = max(self.now, float(ts))
+
+
+class _ReplayTime(types.ModuleType):
+    def __init__(self, clock: ReplayClock) -> None:
+        super().__init__("time")
+        self._clock = clock
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_REAL_TIME, name)
+
+    def time(self) -> float:
+        return self._clock.now
+
+    def monotonic(self) -> float:
+        return self._clock.now
+
+    def sleep(self, seconds: float) -> None:
+        self._clock.sleep(seconds)
+
+
+class _ReplayDatetimeMeta(type):
+    def __instancecheck__(cls, obj: Any) -> bool:
+        return isinstance(obj, _REAL_DATETIME)
+
+    def __subclasscheck__(cls, sub: type) -> bool:
+        return issubclass(sub, _REAL_DATETIME)
+
+
+def _replay_datetime(clock: ReplayClock) -> type:
+    class ReplayDatetime(_REAL_DATETIME, metaclass=_ReplayDatetimeMeta):
+        @classmethod
+        def now(cls, tz=None):
+            return _REAL_DATETIME.fromtimestamp(clock.now, tz)
+
+        @classmethod
+        def utcnow(cls):
+            return _REAL_DATETIME.fromtimestamp(clock.now, timezone.utc).replace(tzinfo=None)
+
+    return ReplayDatetime
+
+
+@contextlib.contextmanager
+def patched_time(clock: ReplayClock, prefixes: Sequence[str] = DEFAULT_PATCH_PREFIXES) -> Iterator[None]:
+    """Point the ``time`` / ``datetime`` names of matching loaded modules at ``clock``."""
+    fake_time = _ReplayTime(clock)
+    fake_datetime = _replay_datetime(clock)
+    saved: list[tuple[types.ModuleType, str, Any]] = []
+    for name, module in list(sys.modules.items()):
+        if module is None or module is sys.modules.get(__name__):
+            continue
+        if not any(name == p or name.startswith(p + ".") for p in prefixes):
+            continue
+        for attr, real, fake in (("time", _REAL_TIME, fake_time), ("datetime", _REAL_DATETIME, fake_datetime)):
+            if getattr(module, attr, None) is real:
+                saved.append((module, attr, real))
+                setattr(module, attr, fake)
+    try:
+        yield
+    finally:
+        for module, attr, real in saved:
+            setattr(module, attr, real)
+
+
+# ---------------------------------------------------------------------------
+# Bars
+# ---------------------------------------------------------------------------
+
+
+def load_bars(path: str | Path, *, start: Any = None, end: Any = None) -> pd.DataFrame:
+    """Read 5-minute bars into columns symbol, ts, open, high, low, close, volume.
+
+    ``path`` is a parquet/CSV file (Alpaca's ``timestamp`` or a ``ts`` column,
+    bar start UTC, any capitalisation of the OHLCV names) or a bar_store root
+    directory, read for [start, end] (epoch seconds or datetimes).
+    """
+    path = Path(path)
+    if path.is_dir():
+        store = IntradayBarStore(path, cache_partitions=0)
+        days = store.days()
+        if not days:
+            return normalize_bars(store.frame(0, 0))
+        if start is None:
+            start = _session_bounds(days[0])[0] - 86400
+        if end is None:
+            end = _session_bounds(days[-1])[1] + 86400
+        return normalize_bars(store.frame(start, end))
+    frame = pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+    return normalize_bars(frame)
+
+
+def normalize_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    df = frame.reset_index() if not isinstance(frame.index, pd.RangeIndex) else frame.copy()
+    df.columns = [str(c).lower() for c in df.columns]
+    if "ts" not in df.columns:
+        df = df.rename(columns={"timestamp": "ts", "ticker": "symbol"})
+    df["symbol"] = df["symbol"].astype(str).str.upper()
+    df["ts"] = pd.to_datetime(df["ts"], utc=True)
+    for col in ("open", "high", "low", "close", "volume"):
+        df[col] = df[col].astype(float)
+    return df[["symbol", "ts", "open", "high", "low", "close", "volume"]].sort_values(
+        ["symbol", "ts"], kind="stable", ignore_index=True
+    )
+
+
+@dataclass(frozen=True)
+class _Series:
+    start: np.ndarray  # bar start, epoch seconds
+    end: np.ndarray  # bar close, epoch seconds
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def closed_count(self, now: float) -> int:
+        return int(np.searchsorted(self.end, now, side="right"))
+
+
+def _series(df: pd.DataFrame, frame_sec: np.ndarray | int) -> _Series:
+    start = df["start"].to_numpy(dtype=float)
+    return _Series(
+        start=start,
+        end=start + frame_sec,
+        open=df["open"].to_numpy(dtype=float),
+        high=df["high"].to_numpy(dtype=float),
+        low=df["low"].to_numpy(dtype=float),
+        close=df["close"].to_numpy(dtype=float),
+        volume=df["volume"].to_numpy(dtype=float),
+    )
+
+
+def _rollup(df: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    return (
+        df.groupby(keys, sort=True)
+        .agg(
+            start=("start", "min"),
+            open=("open", "first"),
+            high=("high", "max"),
+            low=("low", "min"),
+            close=("close", "last"),
+            volume=("volume", "sum"),
+        )
+        .reset_index()
+    )
+
+
+# ---------------------------------------------------------------------------
+# Market data
+# ---------------------------------------------------------------------------
+
+
+class ReplayMarketData:
+    """MarketData over recorded 5m bars; only bars closed at ``clock.now`` are visible.
+
+    Daily bars are the 5m bars rolled up per NY date and are served for
+    completed sessions only.
+    """
+
+    def __init__(self, bars: pd.DataFrame, clock: ReplayClock) -> None:
+        self.clock = clock
+        df = normalize_bars(bars)
+        df["start"] = df["ts"].astype("int64").to_numpy() // 10**9
+        local = df["ts"].dt.tz_convert(ET)
+        df["ny_date"] = local.dt.strftime("%Y-%m-%d")
+        self._frames: dict[int, dict[str, _Series]] = {5: {}, 10: {}}
+        self._daily: dict[str, tuple[np.ndarray, _Series]] = {}
+        df["bucket10"] = df["start"] // 600
+        ten = _rollup(df, ["symbol", "bucket10"])
+        ten["start"] = ten["bucket10"] * 600
+        daily = _rollup(df, ["symbol", "ny_date"])
+        for symbol, group in df.groupby("symbol", sort=False):
+            self._frames[5][symbol] = _series(group, BAR_SEC)
+        for symbol, group in ten.groupby("symbol", sort=False):
+            self._frames[10][symbol] = _series(group, 600)
+        for symbol, group in daily.groupby("symbol", sort=False):
+            self._daily[symbol] = (group["ny_date"].to_numpy(), _series(group, 0))
+        self.rvol = RvolMatrixCache(self._volume_bars_5m, clock=clock.time)
+
+    @property
+    def symbols(self) -> list[str]:
+        return sorted(self._frames[5])
+
+    def bars_5m(self, symbol: str) -> Optional[_Series]:
+        return self._frames[5].get(str(symbol).upper())
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        series = self.bars_5m(symbol)
+        if series is None:
+            return None
+        n = series.closed_count(self.clock.now)
+        return float(series.close[n - 1]) if n else None
+
+    def _closed(self, symbol: str, minutes: int, lookback_days: int | None) -> tuple[Optional[_Series], int, int]:
+        series = self._frames.get(minutes, {}).get(str(symbol).upper())
+        if series is None:
+            return None, 0, 0
+        hi = series.closed_count(self.clock.now)
+        lo = 0
+        if lookback_days is not None:
+            lo = int(np.searchsorted(series.start, self.clock.now - lookback_days * 86400, side="left"))
+        return series, lo, hi
+
+    def get_last_two_closed_10m(self, symbol: str) -> list[Bar10m]:
+        series, _, hi = self._closed(symbol, 10, None)
+        if series is None or hi < 2:
+            return []
+        return [
+            Bar10m(
+                ts=float(series.start[i]),
+                open=float(series.open[i]),
+                high=float(series.high[i]),
+                low=float(series.low[i]),
+                close=float(series.close[i]),
+                volume=float(series.volume[i]),
+            )
+            for i in (hi - 2, hi - 1)
+        ]
+
+    def get_intraday_bars(self, symbol: str, minutes: int = 5, lookback_days: int = 3) -> list[dict]:
+        series, lo, hi = self._closed(symbol, minutes, lookback_days)
+        if series is None:
+            return []
+        return [
+            {
+                "ts": _REAL_DATETIME.fromtimestamp(float(series.start[i]), timezone.utc),
+                "open": float(series.open[i]),
+                "high": float(series.high[i]),
+                "low": float(series.low[i]),
+                "close": float(series.close[i]),
+                "volume": float(series.volume[i]),
+            }
+            for i in range(lo, hi)
+        ]
+
+    def get_daily_bars(self, symbol: str, lookback_days: Optional[int] = None) -> list[DailyBar]:
+        entry = self._daily.get(str(symbol).upper())
+        if entry is None:
+            return []
+        days, series = entry
+        today = _REAL_DATETIME.fromtimestamp(self.clock.now, ET).strftime("%Y-%m-%d")
+        hi = int(np.searchsorted(days, today, side="left"))
+        lo = 0
+        if lookback_days is not None:
+            lo = max(0, int(np.searchsorted(series.start, self.clock.now - lookback_days * 86400, side="left")))
+        return [
+            DailyBar(
+                ts=float(series.start[i]),
+                open=float(series.open[i]),
+                high=float(series.high[i]),
+                low=float(series.low[i]),
+                close=float(series.close[i]),
+            )
+            for i in range(lo, hi)
+        ]
+
+    def get_session_volume_profile(self, symbol: str, lookback_days: int = 20) -> Optional[VolumeProfile]:
+        return self.rvol.profile(str(symbol).upper(), lookback_days=lookback_days)
+
+    def _volume_bars_5m(self, symbol: str, start: datetime):
+        series = self.bars_5m(symbol)
+        if series is None:
+            return [], []
+        hi = series.closed_count(self.clock.now)
+        lo = min(hi, int(np.searchsorted(series.start, start.timestamp(), side="left")))
+        return (series.start[lo:hi] * 10**9).astype(np.int64), series.volume[lo:hi]
+
+
+# ---------------------------------------------------------------------------
+# Broker
+# ---------------------------------------------------------------------------
+
+
+class ReplayOrderNotFound(LookupError):
+    pass
+
+
+def _enum_value(value: Any) -> str:
+    value = getattr(value, "value", value)
+    text = str(value or "").strip().lower()
+    return text.split(".")[-1]
+
+
+@dataclass(frozen=True)
+class ReplayCarry:
+    """Broker state handed from one replayed session to the next."""
+
+    cash: float
+    positions: dict[str, dict[str, float]]
+    open_orders: tuple[SimpleNamespace, ...] = ()
+    seq: int = 0
+
+
+class ReplayTradingClient:
+    """In-memory broker for replay.
+
+    Fill model: market and marketable limit orders fill at the last closed 5m
+    close when submitted; resting limit buys fill on a later bar whose low
+    reaches the limit, at min(open, limit); sell stops fill on a later bar
+    whose low reaches the stop, at min(open, stop). DAY orders expire at the
+    close. Orders only match bars that started at or after their submission.
+    """
+
+    def __init__(
+        self,
+        md: ReplayMarketData,
+        clock: ReplayClock,
+        *,
+        equity: float = DEFAULT_EQUITY,
+        carry: Optional[ReplayCarry] = None,
+    ) -> None:
+        self.md = md
+        self.clock = clock
+        self.cash = float(equity) if carry is None else float(carry.cash)
+        self.positions: dict[str, dict[str, float]] = (
+            {} if carry is None else {sym: dict(pos) for sym, pos in carry.positions.items()}
+        )
+        self.orders: dict[str, SimpleNamespace] = (
+            {} if carry is None else {order.id: copy.copy(order) for order in carry.open_orders}
+        )
+        self.fills: list[dict] = []
+        self.realized_pnl = 0.0
+        self._seq = 0 if carry is None else int(carry.seq)
+        self._processed_until = clock.now
+
+    # -- account / positions -------------------------------------------------
+
+    def get_clock(self):
+        now = _REAL_DATETIME.fromtimestamp(self.clock.now, timezone.utc)
+        snap = snapshot_at(now.astimezone(ET))
+        return SimpleNamespace(is_open=snap.market_open, timestamp=now, next_open=None, next_close=None)
+
+    def _mark(self, symbol: str, fallback: float) -> float:
+        price = self.md.last_price(symbol)
+        return float(price) if price is not None else float(fallback)
+
+    def get_account(self):
+        equity = self.cash + sum(
+            pos["qty"] * self._mark(sym, pos["avg_entry_price"]) for sym, pos in self.positions.items()
+        )
+        return SimpleNamespace(equity=str(round(equity, 2)), buying_power=str(round(self.cash, 2)), cash=str(self.cash))
+
+    def _position(self, symbol: str, pos: dict[str, float]):
+        price = self._mark(symbol, pos["avg_entry_price"])
+        return SimpleNamespace(
+            symbol=symbol,
+            qty=str(int(pos["qty"])),
+            qty_available=str(int(pos["qty"])),
+            side="long",
+            avg_entry_price=str(pos["avg_entry_price"]),
+            current_price=str(price),
+            market_value=str(price * pos["qty"]),
+            entry_ts=pos["entry_ts"],
+        )
+
+    def get_all_positions(self):
+        return [self._position(sym, pos) for sym, pos in sorted(self.positions.items())]
+
+    def get_open_position(self, symbol: str):
+        sym = str(symbol).upper()
+        pos = self.positions.get(sym)
+        if pos is None:
+            raise ReplayOrderNotFound(f"position does not exist: {sym}")
+        return self._position(sym, pos)
+
+    # -- orders --------------------------------------------------------------
+
+    def submit_order(self, order_data=None, **kwargs):
+        req = order_data if order_data is not None else SimpleNamespace(**kwargs)
+        self._seq += 1
+        now = _REAL_DATETIME.fromtimestamp(self.clock.now, timezone.utc)
+        order_type = _enum_value(getattr(req, "type", None) or getattr(req, "order_type", None))
+        if not order_type:
+            name = type(req).__name__.lower()
+            order_type = "stop" if "stop" in name else "limit" if "limit" in name else "market"
+        order = SimpleNamespace(
+            id=f"replay-{self._seq:06d}",
+            client_order_id=getattr(req, "client_order_id", None) or f"replay-coid-{self._seq:06d}",
+            symbol=str(getattr(req, "symbol", "")).upper(),
+            side=_enum_value(getattr(req, "side", "buy")),
+            order_type=order_type,
+            type=order_type,
+            qty=str(int(float(getattr(req, "qty", 0) or 0))),
+            limit_price=getattr(req, "limit_price", None),
+            stop_price=getattr(req, "stop_price", None),
+            time_in_force=_enum_value(getattr(req, "time_in_force", "day")),
+            status="new",
+            filled_qty="0",
+            filled_avg_price=None,
+            created_at=now,
+            submitted_at=now,
+            updated_at=now,
+            filled_at=None,
+        )
+        self.orders[order.id] = order
+        if order_type in {"market", "limit"}:
+            price = self.md.last_price(order.symbol)
+            if price is not None and (
+                order_type == "market"
+                or (order.side == "buy" and price <= float(order.limit_price))
+                or (order.side == "sell" and price >= float(order.limit_price))
+            ):
+                self._fill(order, price, self.clock.now, reason="submit")
+        return order
+
+    def get_orders(self, filter=None):
+        status = _enum_value(getattr(filter, "status", None)) or "open"
+        symbols = {str(s).upper() for s in (getattr(filter, "symbols", None) or [])}
+        side = _enum_value(getattr(filter, "side", None))
+        until = getattr(filter, "until", None)
+        limit = getattr(filter, "limit", None)
+        out = []
+        for order in sorted(self.orders.values(), key=lambda o: (o.submitted_at, o.id), reverse=True):
+            is_open = order.status == "new"
+            if (status == "open" and not is_open) or (status == "closed" and is_open):
+                continue
+            if symbols and order.symbol not in symbols:
+                continue
+            if side and order.side != side:
+                continue
+            if until is not None and order.submitted_at >= until:
+                continue
+            out.append(order)
+        return out[: int(limit)] if limit else out
+
+    def get_order_by_id(self, order_id):
+        order = self.orders.get(str(order_id))
+        if order is None:
+            raise ReplayOrderNotFound(f"order not found: {order_id}")
+        return order
+
+    def get_order_by_client_id(self, client_id):
+        for order in self.orders.values():
+            if order.client_order_id == client_id:
+                return order
+        raise ReplayOrderNotFound(f"order not found: {client_id}")
+
+    def cancel_order_by_id(self, order_id) -> None:
+        order = self.get_order_by_id(order_id)
+        if order.status == "new":
+            order.status = "canceled"
+            order.updated_at = _REAL_DATETIME.fromtimestamp(self.clock.now, timezone.utc)
+
+    def close_position(self, symbol_or_asset_id, close_options=None):
+        pos = self.get_open_position(symbol_or_asset_id)
+        for order in self.get_orders(SimpleNamespace(status="open", symbols=[pos.symbol], side="sell")):
+            self.cancel_order_by_id(order.id)
+        return self.submit_order(SimpleNamespace(symbol=pos.symbol, qty=pos.qty, side="sell", type="market"))
+
+    # -- matching ------------------------------------------------------------
+
+    def _fill(self, order: SimpleNamespace, price: float, ts: float, *, reason: str) -> None:
+        qty = float(order.qty)
+        symbol = order.symbol
+        if order.side == "sell":
+            pos = self.positions.get(symbol)
+            qty = min(qty, pos["qty"]) if pos else 0.0
+            if qty <= 0:
+                order.status = "canceled"
+                return
+            self.realized_pnl += (price - pos["avg_entry_price"]) * qty
+            pos["qty"] -= qty
+            if pos["qty"] <= 0:
+                del self.positions[symbol]
+            self.cash += price * qty
+        else:
+            pos = self.positions.setdefault(symbol, {"qty": 0.0, "avg_entry_price": 0.0, "entry_ts": ts})
+            pos["avg_entry_price"] = (pos["avg_entry_price"] * pos["qty"] + price * qty) / (pos["qty"] + qty)
+            pos["qty"] += qty
+            self.cash -= price * qty
+        when = _REAL_DATETIME.fromtimestamp(ts, timezone.utc)
+        order.status = "filled"
+        order.filled_qty = str(int(qty))
+        order.filled_avg_price = str(round(price, 4))
+        order.filled_at = when
+        order.updated_at = when
+        self.fills.append(
+            {
+                "ts": when.isoformat(),
+                "symbol": symbol,
+                "side": order.side,
+                "qty": int(qty),
+                "price": round(price, 4),
+                "order_type": order.order_type,
+                "order_id": order.id,
+                "reason": reason,
+            }
+        )
+
+    def process_bars(self, now: float) -> int:
+        """Match resting orders against 5m bars that closed since the last call."""
+        since, self._processed_until = self._processed_until, float(now)
+        fills_before = len(self.fills)
+        resting = [o for o in self.orders.values() if o.status == "new"]
+        for order in sorted(resting, key=lambda o: (o.submitted_at, o.id)):
+            series = self.md.bars_5m(order.symbol)
+            if series is None:
+                continue
+            lo = max(
+                int(np.searchsorted(series.end, since, side="right")),
+                int(np.searchsorted(series.start, order.submitted_at.timestamp(), side="left")),
+            )
+            hi = series.closed_count(now)
+            if lo >= hi:
+                continue
+            if order.order_type == "stop" and order.side == "sell":
+                level = float(order.stop_price)
+            elif order.order_type == "limit" and order.side == "buy":
+                level = float(order.limit_price)
+            else:
+                continue
+            hits = np.nonzero(series.low[lo:hi] <= level)[0]
+            if hits.size:
+                i = lo + int(hits[0])
+                self._fill(order, min(float(series.open[i]), level), float(series.end[i]), reason=order.order_type)
+        return len(self.fills) - fills_before
+
+    def expire_day_orders(self) -> None:
+        for order in self.orders.values():
+            if order.status == "new" and order.time_in_force == "day":
+                order.status = "expired"
+
+    def carry(self) -> ReplayCarry:
+        """Cash, positions and still-open (GTC) orders for the next session."""
+        return ReplayCarry(
+            cash=self.cash,
+            positions={sym: dict(pos) for sym, pos in self.positions.items()},
+            open_orders=tuple(copy.copy(o) for o in self.orders.values() if o.status == "new"),
+            seq=self._seq,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Day driver
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ReplayDayResult:
+    ny_date: str
+    cycles: int
+    fills: list[dict]
+    open_positions: dict[str, dict[str, float]]
+    realized_pnl: float
+    equity_end: float
+    wall_s: float
+    errors: list[str] = field(default_factory=list)
+    carry: Optional[ReplayCarry] = None
+
+
+@dataclass(frozen=True)
+class ReplayJob:
+    ny_date: str
+    bars_path: str
+    candidates_csv: str
+    out_dir: str
+    equity: float = DEFAULT_EQUITY
+    cycle_sec: int = DEFAULT_CYCLE_SEC
+    history_days: int = DEFAULT_HISTORY_DAYS
+    env: tuple[tuple[str, str], ...] = ()
+    state_dir: str = ""
+
+
+def _session_bounds(ny_date: str) -> tuple[float, float]:
+    day = date.fromisoformat(ny_date)
+    open_ts = _REAL_DATETIME.combine(day, REG_OPEN, tzinfo=ET).timestamp()
+    close_ts = _REAL_DATETIME.combine(day, REG_CLOSE, tzinfo=ET).timestamp()
+    return open_ts, close_ts
+
+
+def cycle_times(ny_date: str, cycle_sec: int = DEFAULT_CYCLE_SEC, settle_sec: float = DEFAULT_SETTLE_SEC) -> list[float]:
+    """Cycle start times for one session: just after each ``cycle_sec`` bar close, open to close."""
+    open_ts, close_ts = _session_bounds(ny_date)
+    step = max(1, int(cycle_sec))
+    return [open_ts + k * step + settle_sec for k in range(int((close_ts - open_ts) // step))]
+
+
+@contextlib.contextmanager
+def _chdir(path: Path) -> Iterator[None]:
+    # contextlib.chdir needs Python 3.11.
+    saved = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(saved)
+
+
+@contextlib.contextmanager
+def _scoped_env(values: dict[str, str]) -> Iterator[None]:
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, old in saved.items():
+            if old is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = old
+
+
+def _replay_cfg(workdir: Path, candidates_csv: Path, cycle_sec: int, state_dir: Path) -> SimpleNamespace:
+    return SimpleNamespace(
+        base_dir=str(workdir),
+        candidates_csv=str(candidates_csv),
+        entry_delay_min_sec=0,
+        entry_delay_max_sec=0,
+        db_path=str(state_dir / "execution_v2.sqlite"),
+        execution_mode="ALPACA_PAPER",
+        dry_run=False,
+        poll_seconds=cycle_sec,
+        ignore_market_hours=False,
+        project="REPLAY",
+    )
+
+
+def replay_day(
+    ny_date: str,
+    bars: pd.DataFrame,
+    candidates_csv: str | Path,
+    out_dir: str | Path,
+    *,
+    equity: float = DEFAULT_EQUITY,
+    cycle_sec: int = DEFAULT_CYCLE_SEC,
+    env: dict[str, str] | None = None,
+    carry: Optional[ReplayCarry] = None,
+    state_dir: str | Path | None = None,
+) -> ReplayDayResult:
+    """Replay one NY session through run_once in this process.
+
+    ``bars`` must hold the day's 5m bars plus whatever history the rules look
+    back over (daily pivots, rvol). Artifacts (ledgers, decision records,
+    run.log) land in ``out_dir``; the state DB and state files in
+    ``state_dir`` (default ``out_dir/state``). Strategy configuration (live
+    caps, S2 sleeves, exit settings) comes from the process environment as in
+    production; ``env`` overrides it for this day only.
+
+    To continue from the previous session, pass its ``result.carry`` and the
+    same ``state_dir``; ``equity`` is then ignored.
+    """
+    from execution_v2 import execution_main
+    from execution_v2.session import ExecutionSession
+
+    t0 = _REAL_TIME.perf_counter()
+    workdir = Path(out_dir).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    open_ts, close_ts = _session_bounds(ny_date)
+    day_candidates = workdir / "daily_candidates.csv"
+    day_candidates.write_bytes(Path(candidates_csv).read_bytes())
+    scan_ts = open_ts - 2 * 3600
+    os.utime(day_candidates, (scan_ts, scan_ts))
+
+    bars = normalize_bars(bars)
+    clock = ReplayClock(open_ts)
+    md = ReplayMarketData(bars[bars["ts"] < pd.Timestamp(close_ts, unit="s", tz="UTC")], clock)
+    broker = ReplayTradingClient(md, clock, equity=equity, carry=carry)
+    state_path = Path(state_dir).resolve() if state_dir else workdir / "state"
+    state_path.mkdir(parents=True, exist_ok=True)
+    cfg = _replay_cfg(workdir, day_candidates, cycle_sec, state_path)
+    replay_env = {
+        "AVWAP_STATE_DIR": str(state_path),
+        "AVWAP_BASE_DIR": str(workdir),
+        "APCA_API_KEY_ID": "replay",
+        "APCA_API_SECRET_KEY": "replay",
+        "APCA_API_BASE_URL": execution_main.PAPER_BASE_URL,
+        "SLACK_WEBHOOK_URL": "",
+        "EXECUTION_MARKET_DATA_MODE": "poll",
+    }
+    replay_env.update(env or {})
+    errors: list[str] = []
+    cycles = 0
+    random.seed(ny_date)
+    session = ExecutionSession.from_cfg(cfg)
+    session.set_clients(broker, md)
+    with _scoped_env(replay_env), patched_time(clock), _chdir(workdir), open(
+        workdir / "run.log", "w", encoding="utf-8"
+    ) as log, contextlib.redirect_stdout(log):
+        try:
+            for ts in cycle_times(ny_date, cycle_sec):
+                clock.advance_to(ts)
+                broker.process_bars(clock.now)
+                try:
+                    execution_main.run_once(cfg, session)
+                except Exception as exc:  # keep replaying; the day result carries the error
+                    errors.append(f"{_REAL_DATETIME.fromtimestamp(ts, ET).strftime('%H:%M')} {type(exc).__name__}: {exc}")
+                cycles += 1
+            clock.advance_to(close_ts)
+            broker.process_bars(clock.now)
+            broker.expire_day_orders()
+        finally:
+            session.close()
+    account = broker.get_account()
+    return ReplayDayResult(
+        ny_date=ny_date,
+        cycles=cycles,
+        fills=list(broker.fills),
+        open_positions={sym: dict(pos) for sym, pos in broker.positions.items()},
+        realized_pnl=round(broker.realized_pnl, 2),
+        equity_end=float(account.equity),
+        wall_s=round(_REAL_TIME.perf_counter() - t0, 3),
+        errors=errors,
+        carry=broker.carry(),
+    )
+
+
+def _run_job(job: ReplayJob, carry: Optional[ReplayCarry] = None) -> ReplayDayResult:
+    open_ts, close_ts = _session_bounds(job.ny_date)
+    bars = load_bars(job.bars_path, start=open_ts - job.history_days * 86400, end=close_ts)
+    since = pd.Timestamp(open_ts - job.history_days * 86400, unit="s", tz="UTC")
+    return replay_day(
+        job.ny_date,
+        bars[bars["ts"] >= since],
+        job.candidates_csv,
+        job.out_dir,
+        equity=job.equity,
+        cycle_sec=job.cycle_sec,
+        env=dict(job.env),
+        carry=carry,
+        state_dir=job.state_dir or None,
+    )
+
+
+def replay_days(
+    jobs: Sequence[ReplayJob],
+    *,
+    max_workers: int | None = None,
+    carry_over: bool = False,
+) -> list[ReplayDayResult]:
+    """Replay each job's day in its own fresh process; results in job order.
+
+    ``carry_over`` replays the jobs in order, one at a time, each day starting
+    from the previous day's broker state and a shared state dir (the jobs'
+    ``state_dir``, else ``<first out_dir>/../state``).
+    """
+    if not jobs:
+        return []
+    # maxtasksperchild=1: a fresh process per day, so patched module state
+    # and per-process caches never leak between days.
+    if carry_over:
+        shared = jobs[0].state_dir or str(Path(jobs[0].out_dir).resolve().parent / "state")
+        results: list[ReplayDayResult] = []
+        carry: Optional[ReplayCarry] = None
+        with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+            for job in jobs:
+                result = pool.apply(_run_job, (replace(job, state_dir=job.state_dir or shared), carry))
+                carry = result.carry
+                results.append(result)
+        return results
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    with multiprocessing.Pool(processes=workers, maxtasksperchild=1) as pool:
+        return pool.map(_run_job, jobs, chunksize=1)
+
+
+def _session_dates(start: str, end: str) -> list[str]:
+    days = pd.bdate_range(start, end)
+    return [d.strftime("%Y-%m-%d") for d in days]
+
+
+def _parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Execution V2 - replay run_once over recorded 5m bars")
+    parser.add_argument("--bars", required=True, help="5m bars parquet/CSV (symbol, timestamp|ts, OHLCV) or bar store directory")
+    parser.add_argument(
+        "--candidates",
+        required=True,
+        help="Candidates CSV path; '{date}' is replaced with each NY date (YYYY-MM-DD)",
+    )
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--out-dir", default="replay_runs")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--equity", type=float, default=DEFAULT_EQUITY)
+    parser.add_argument("--cycle-sec", type=int, default=DEFAULT_CYCLE_SEC)
+    parser.add_argument(
+        "--carry-over",
+        action="store_true",
+        help="Replay days in order, carrying positions, open GTC orders and execution state to the next day",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_args(argv)
+    jobs = []
+    for ny_date in _session_dates(args.start, args.end):
+        candidates = args.candidates.replace("{date}", ny_date)
+        if not Path(candidates).exists():
+            print(f"{ny_date}: no candidates file ({candidates}); skipped")
+            continue
+        jobs.append(
+            ReplayJob(
+                ny_date=ny_date,
+                bars_path=str(Path(args.bars).resolve()),
+                candidates_csv=str(Path(candidates).resolve()),
+                out_dir=str(Path(args.out_dir).resolve() / ny_date),
+                equity=args.equity,
+                cycle_sec=args.cycle_sec,
+            )
+        )
+    total_pnl = 0.0
+    for result in replay_days(jobs, max_workers=args.workers, carry_over=args.carry_over):
+        total_pnl += result.realized_pnl
+        print(
+            f"{result.ny_date}: cycles={result.cycles} fills={len(result.fills)} "
+            f"realized_pnl={result.realized_pnl:.2f} open={sorted(result.open_positions)} "
+            f"errors={len(result.errors)} wall_s={result.wall_s:.2f}"
+        )
+    print(f"days={len(jobs)} realized_pnl={total_pnl:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+"""
+Execution V2 – Relative Volume Matrix Cache
+
+Responsibilities:
+- Hold, per symbol, the 5-minute volume history as a (NY day x time-of-day
+  slot) matrix, built once per NY date from one REST fetch
+- Keep today's per-slot volume and refresh it incrementally (only bars since
+  the last one seen, at most once per slot)
+- Answer rvol at the current slot from precomputed per-slot sums
+
+MarketData.get_session_volume_profile used to refetch the whole lookback and
+walk every bar in Python on each call. The numbers here are the same: a day
+contributes the volume of its bars starting at or before the current time of
+day, and history days without such a bar are left out of the average.
+
+This module contains NO I/O of its own; bars come from the ``fetch`` callable.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from execution_v2.clocks import ET
+
+SLOT_SEC = 300
+SLOTS_PER_DAY = 86400 // SLOT_SEC
+
+# fetch(symbol, start_utc) -> (bar start timestamps as UTC epoch ns, volumes)
+BarFetch = Callable[[str, datetime], "tuple[np.ndarray, np.ndarray]"]
+
+
+@dataclass(frozen=True)
+class VolumeProfile:
+    """Session volume profile for rvol gating."""
+    today_cumulative: float
+    avg_cumulative: float
+    rvol: float
+    sample_days: int
+    bar_count_today: int
+
+
+@dataclass
+class _SymbolMatrix:
+    ny_date: str
+    lookback_days: int
+    matrix: np.ndarray  # history days x slots, volume per 5m bar
+    hist_sum: np.ndarray  # per slot: sum over days of cumulative volume through the slot
+    hist_days: np.ndarray  # per slot: history days with a bar at or before the slot
+    today_vol: np.ndarray
+    today_bars: np.ndarray
+    today_cum: np.ndarray
+    today_count: np.ndarray
+    last_today_ns: int | None
+    refreshed_slot: int
+
+
+def _ny_days_and_slots(ts_ns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    local = pd.DatetimeIndex(pd.to_datetime(ts_ns, utc=True)).tz_convert(ET)
+    midnight = local.normalize()
+    slots = ((local - midnight).total_seconds().to_numpy() // SLOT_SEC).astype(np.int64)
+    days = np.asarray(midnight.strftime("%Y-%m-%d"))
+    return days, np.clip(slots, 0, SLOTS_PER_DAY - 1)
+
+
+def _slot_of(now_et: datetime) -> int:
+    seconds = now_et.hour * 3600 + now_et.minute * 60 + now_et.second
+    return min(SLOTS_PER_DAY - 1, seconds // SLOT_SEC)
+
+
+class RvolMatrixCache:
+    """Per-symbol day x slot volume matrices shared across calls and threads."""
+
+    def __init__(self, fetch: BarFetch, *, clock: Callable[[], float] = time.time) -> None:
+        self._fetch = fetch
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._matrices: dict[str, _SymbolMatrix] = {}
+        self.fetches = 0
+
+    def profile(self, symbol: str, lookback_days: int = 20) -> Optional[VolumeProfile]:
+        now_et = datetime.fromtimestamp(self._clock(), tz=ET)
+        today = now_et.strftime("%Y-%m-%d")
+        slot = _slot_of(now_et)
+        with self._lock:
+            entry = self._matrices.get(symbol)
+        if entry is None or entry.ny_date != today or entry.lookback_days != lookback_days:
+            start = now_et.astimezone(timezone.utc) - timedelta(days=lookback_days + 2)
+            entry = self._build(symbol, today, lookback_days, slot, *self._fetch_bars(symbol, start))
+            with self._lock:
+                self._matrices[symbol] = entry
+        elif entry.refreshed_slot != slot:
+            with self._lock:
+                last_ns = entry.last_today_ns
+            if last_ns is None:
+                start = datetime.strptime(today, "%Y-%m-%d").replace(tzinfo=ET).astimezone(timezone.utc)
+            else:
+                start = datetime.fromtimestamp(last_ns / 1e9, tz=timezone.utc)
+            ts_ns, volumes = self._fetch_bars(symbol, start)
+            with self._lock:
+                self._merge_today(entry, today, ts_ns, volumes)
+                entry.refreshed_slot = slot
+        with self._lock:
+            return self._lookup(entry, slot)
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        with self._lock:
+            if symbol is None:
+                self._matrices.clear()
+            else:
+                self._matrices.pop(symbol, None)
+
+    def _fetch_bars(self, symbol: str, start: datetime) -> tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            self.fetches += 1
+        ts_ns, volumes = self._fetch(symbol, start)
+        return np.asarray(ts_ns, dtype=np.int64), np.asarray(volumes, dtype=float)
+
+    def _build(
+        self,
+        symbol: str,
+        today: str,
+        lookback_days: int,
+        slot: int,
+        ts_ns: np.ndarray,
+        volumes: np.ndarray,
+    ) -> _SymbolMatrix:
+        days, slots = _ny_days_and_slots(ts_ns)
+        hist = days != today
+        hist_days, day_idx = np.unique(days[hist], return_inverse=True)
+        matrix = np.zeros((len(hist_days), SLOTS_PER_DAY))
+        present = np.zeros((len(hist_days), SLOTS_PER_DAY), dtype=bool)
+        np.add.at(matrix, (day_idx, slots[hist]), volumes[hist])
+        present[day_idx, slots[hist]] = True
+        first_slot = np.where(present.any(axis=1), present.argmax(axis=1), SLOTS_PER_DAY)
+        entry = _SymbolMatrix(
+            ny_date=today,
+            lookback_days=lookback_days,
+            matrix=matrix,
+            hist_sum=matrix.cumsum(axis=1).sum(axis=0),
+            hist_days=np.cumsum(np.bincount(first_slot, minlength=SLOTS_PER_DAY + 1)[:SLOTS_PER_DAY]),
+            today_vol=np.zeros(SLOTS_PER_DAY),
+            today_bars=np.zeros(SLOTS_PER_DAY, dtype=np.int64),
+            today_cum=np.zeros(SLOTS_PER_DAY),
+            today_count=np.zeros(SLOTS_PER_DAY, dtype=np.int64),
+            last_today_ns=None,
+            refreshed_slot=slot,
+        )
+        self._merge_today(entry, today, ts_ns[~hist], volumes[~hist], days=days[~hist], slots=slots[~hist])
+        return entry
+
+    @staticmethod
+    def _merge_today(
+        entry: _SymbolMatrix,
+        today: str,
+        ts_ns: np.ndarray,
+        volumes: np.ndarray,
+        *,
+        days: np.ndarray | None = None,
+        slots: np.ndarray | None = None,
+    ) -> None:
+        if not len(ts_ns):
+            return
+        if days is None or slots is None:
+            days, slots = _ny_days_and_slots(ts_ns)
+        mask = days == today
+        if not mask.any():
+            return
+        # Assignment, not addition: the refresh refetches the last bar seen,
+        # which may have been partial the first time.
+        entry.today_vol[slots[mask]] = volumes[mask]
+        entry.today_bars[slots[mask]] = 1
+        entry.today_cum = np.cumsum(entry.today_vol)
+        entry.today_count = np.cumsum(entry.today_bars)
+        entry.last_today_ns = int(ts_ns[mask].max())
+
+    @staticmethod
+    def _lookup(entry: _SymbolMatrix, slot: int) -> Optional[VolumeProfile]:
+        bar_count_today = int(entry.today_count[slot])
+        sample_days = int(entry.hist_days[slot])
+        if bar_count_today == 0 or sample_days == 0:
+            return None
+        avg_vol = float(entry.hist_sum[slot]) / sample_days
+        if avg_vol <= 0:
+            return None
+        today_vol = float(entry.today_cum[slot])
+        return VolumeProfile(
+            today_cumulative=today_vol,
+            avg_cumulative=round(avg_vol, 2),
+            rvol=round(today_vol / avg_vol, 4),
+            sample_days=sample_days,
+            bar_count_today=bar_count_today,
+        )
@@ -6,7 +6,7 @@ Evaluates positions for trim / stop logic using R1/R2 levels.
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from execution_v2 import buy_loop
 from execution_v2.config_types import PositionState, StopMode
@@ -20,10 +20,15 @@ class SellLoopConfig:
     r2_trim_pct: float = 0.5
     trail_move_fraction: float = 0.5
     breakeven_on_r1: bool = True
+    candidate_cache: buy_loop.CandidateCache | None = field(default=None, compare=False)
 
 
 def _candidate_map(cfg: SellLoopConfig) -> dict[str, buy_loop.Candidate]:
-    candidates = buy_loop.load_candidates(cfg.candidates_csv)
+    cache = cfg.candidate_cache
+    if cache is not None and cache.path == cfg.candidates_csv:
+        candidates = cache.load()
+    else:
+        candidates = buy_loop.load_candidates(cfg.candidates_csv)
     return {c.symbol: c for c in candidates}
 
 
@@ -41,6 +46,7 @@ def evaluate_positions(store, trading_client, cfg: SellLoopConfig) -> None:
         return
 
     positions = trading_client.get_all_positions()
+    position_states = store.list_positions_by_symbol()
     now_ts = time.time()
 
     for pos in positions:
@@ -54,7 +60,7 @@ def evaluate_positions(store, trading_client, cfg: SellLoopConfig) -> None:
         except Exception:
             continue
 
-        existing = store.get_position(symbol)
+        existing = position_states.get(symbol)
         if existing is None:
             stop_price = candidate.stop_loss
             high_water = current_price
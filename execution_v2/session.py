@@ -0,0 +1,88 @@
+"""
+Execution V2 – Long-lived execution session
+
+main() owns one ExecutionSession for the life of the polling loop and hands
+it to every run_once cycle, so per-cycle setup is paid once: the StateStore
+connection (PRAGMAs + migration check), the trading and market-data clients,
+the parsed candidates CSV (re-read only when its mtime/size changes) and the
+split-brain DB sanity check (re-run at most every db_sanity_interval_sec).
+run_once(cfg) without a session keeps the original build-everything-per-cycle
+behaviour.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from execution_v2.buy_loop import CandidateCache
+from execution_v2.state_store import StateStore
+
+DEFAULT_DB_SANITY_INTERVAL_SEC = 900.0
+
+
+def _db_sanity_interval_from_env() -> float:
+    raw = (os.getenv("EXECUTION_DB_SANITY_INTERVAL_SEC") or "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else DEFAULT_DB_SANITY_INTERVAL_SEC
+    except ValueError:
+        return DEFAULT_DB_SANITY_INTERVAL_SEC
+
+
+@dataclass
+class ExecutionSession:
+    candidates_csv: str
+    db_path: str
+    db_sanity_interval_sec: float = field(default_factory=_db_sanity_interval_from_env)
+    store: StateStore | None = None
+    clients_ready: bool = False
+    trading_client: Any = None
+    market_data: Any = None
+    candidates: CandidateCache = field(init=False)
+    candidates_snapshot: dict | None = None
+    candidates_snapshot_key: tuple[int, int] | None = None
+    db_sanity_check: dict | None = None
+    db_sanity_checked_at: float | None = None
+    cycles: int = 0
+
+    def __post_init__(self) -> None:
+        self.candidates = CandidateCache(self.candidates_csv)
+
+    @classmethod
+    def from_cfg(cls, cfg) -> "ExecutionSession":
+        return cls(candidates_csv=cfg.candidates_csv, db_path=cfg.db_path)
+
+    def db_sanity_due(self, now_ts: float) -> bool:
+        if self.db_sanity_checked_at is None:
+            return True
+        return now_ts - self.db_sanity_checked_at >= self.db_sanity_interval_sec
+
+    def set_clients(self, trading_client: Any, market_data: Any) -> None:
+        self.trading_client = trading_client
+        self.market_data = market_data
+        self.clients_ready = True
+
+    def reset_store(self) -> None:
+        """Drop the cached connection so the next cycle reopens it."""
+        store, self.store = self.store, None
+        if store is not None:
+            try:
+                store.close()
+            except Exception:
+                pass
+
+    def reset_clients(self) -> None:
+        """Drop the cached clients so the next cycle rebuilds them (dead HTTP
+        session, expired credentials)."""
+        self.trading_client = None
+        self.market_data = None
+        self.clients_ready = False
+
+    def reset(self) -> None:
+        """Drop everything a failed cycle may have left broken."""
+        self.reset_store()
+        self.reset_clients()
+
+    def close(self) -> None:
+        self.reset()
@@ -1,5 +1,5 @@
 """
-Execution V2 – Symbol execution state machine (JSON persisted).
+Execution V2 – Symbol execution state machine (JSON or SQLite persisted).
 """
 from __future__ import annotations
 
@@ -77,17 +77,47 @@ class SymbolExecutionSnapshot:
         return cls(date_ny=date_ny, updated_ts_utc=updated_ts_utc, symbols=symbols)
 
 
+SYMBOL_STATE_PERSIST_ENV = "EXECUTION_SYMBOL_STATE_PERSIST"
+SYMBOL_STATE_PERSIST_MODES = ("immediate", "cycle", "sqlite")
+
+
 class SymbolExecutionStateStore:
-    def __init__(self, date_ny: str, state_dir: Path | None = None) -> None:
+    """Per-day symbol state, persisted to JSON or to the StateStore DB.
+
+    By default every save() atomically rewrites the day's JSON file. With
+    write_behind=True, save() only leaves the touched symbols in a dirty set
+    and flush() persists them once per cycle. With db (a StateStore), flush()
+    upserts just the dirty symbols in a single transaction instead of
+    rewriting the file. Both backends commit atomically, so a crash leaves
+    the last flushed state intact.
+    """
+
+    def __init__(
+        self,
+        date_ny: str,
+        state_dir: Path | None = None,
+        *,
+        write_behind: bool = False,
+        db=None,
+    ) -> None:
         self.date_ny = date_ny
         self.state_dir = state_dir or _state_dir()
         self.path = self.state_dir / f"symbol_execution_state_{date_ny}.json"
         self.snapshot = SymbolExecutionSnapshot.empty(date_ny)
+        self.write_behind = write_behind
+        self.db = db
+        self._dirty: set[str] = set()
         self._loaded = False
 
     def load(self) -> None:
         if self._loaded:
             return
+        if self.db is not None:
+            rows = self.db.load_symbol_execution_states(self.date_ny)
+            if rows:
+                self.snapshot = SymbolExecutionSnapshot.from_dict({"symbols": rows}, self.date_ny)
+                self._loaded = True
+                return
         self.state_dir.mkdir(parents=True, exist_ok=True)
         if not self.path.exists():
             self._loaded = True
@@ -99,14 +129,35 @@ class SymbolExecutionStateStore:
             self._loaded = True
             return
         self.snapshot = SymbolExecutionSnapshot.from_dict(payload, self.date_ny)
+        if self.db is not None:
+            # Carry state written by the JSON backend earlier today into the DB.
+            self._dirty.update(self.snapshot.symbols)
         self._loaded = True
 
     def save(self) -> None:
-        self.state_dir.mkdir(parents=True, exist_ok=True)
+        if self.write_behind:
+            return
+        self.flush()
+
+    def flush(self) -> None:
         now_utc = datetime.now(timezone.utc).isoformat()
+        if self.db is not None:
+            if not self._dirty:
+                return
+            self.db.upsert_symbol_execution_states(
+                self.date_ny,
+                {sym: self.snapshot.symbols[sym].to_dict() for sym in sorted(self._dirty)},
+            )
+            self.snapshot.updated_ts_utc = now_utc
+            self._dirty.clear()
+            return
+        if self.write_behind and not self._dirty:
+            return
+        self.state_dir.mkdir(parents=True, exist_ok=True)
         self.snapshot.updated_ts_utc = now_utc
         payload = json.dumps(self.snapshot.to_dict(), sort_keys=True)
         atomic_write_text(self.path, payload)
+        self._dirty.clear()
 
     def get(self, symbol: str) -> SymbolExecutionState:
         self.load()
@@ -121,6 +172,7 @@ class SymbolExecutionStateStore:
         self.load()
         key = str(symbol or "").upper()
         self.snapshot.symbols[key] = state
+        self._dirty.add(key)
 
     def transition(
         self,
@@ -250,6 +302,36 @@ class ConsumedEntriesStore:
 _state_dir = state_dir
 
 
+def symbol_state_store_from_env(
+    date_ny: str,
+    *,
+    state_dir: Path | None = None,
+    db=None,
+) -> SymbolExecutionStateStore:
+    """Build the store for EXECUTION_SYMBOL_STATE_PERSIST.
+
+    immediate (default): rewrite the JSON file on every save().
+    cycle: write-behind JSON, one rewrite per flush().
+    sqlite: write-behind per-symbol upserts into the StateStore DB.
+    """
+    mode = os.getenv(SYMBOL_STATE_PERSIST_ENV, "immediate").strip().lower() or "immediate"
+    if mode not in SYMBOL_STATE_PERSIST_MODES:
+        print(
+            f"[state_machine] WARN: unknown {SYMBOL_STATE_PERSIST_ENV}={mode!r}; using immediate",
+            flush=True,
+        )
+        mode = "immediate"
+    if mode == "sqlite" and not hasattr(db, "upsert_symbol_execution_states"):
+        print("[state_machine] WARN: sqlite symbol state needs a StateStore; using cycle", flush=True)
+        mode = "cycle"
+    return SymbolExecutionStateStore(
+        date_ny,
+        state_dir=state_dir,
+        write_behind=mode != "immediate",
+        db=db if mode == "sqlite" else None,
+    )
+
+
 def resolve_entry_fill_ts_utc(entry_fill_record) -> str | None:
     if entry_fill_record is None:
         return None
@@ -6,22 +6,56 @@ Supports entry intents, positions, candidates, trim intents, and order idempoten
 """
 
 from __future__ import annotations
+import json
 import sqlite3
 import time
-from typing import Optional, List
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, List
 
 from execution_v2.config_types import EntryIntent, PositionState, StopMode
 
-SCHEMA_VERSION = 8
+SCHEMA_VERSION = 9
+# Stay well under SQLITE_MAX_VARIABLE_NUMBER for IN (...) lookups.
+_IN_CHUNK = 500
 
 class StateStore:
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
         self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
         self.conn.row_factory = sqlite3.Row
+        self._batch_depth = 0
         self._pragma()
         self._migrate()
 
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextmanager
+    def batch(self) -> Iterator["StateStore"]:
+        """
+        Group writes into one transaction (one WAL commit instead of one per
+        statement). Nested batches join the outermost one; an exception rolls
+        the whole batch back.
+        """
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE;")
+        self._batch_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth = 0
+            cur.execute("ROLLBACK;")
+            raise
+        self._batch_depth = 0
+        cur.execute("COMMIT;")
+
     def _pragma(self) -> None:
         cur = self.conn.cursor()
         cur.execute("PRAGMA journal_mode=WAL;")
@@ -48,6 +82,9 @@ class StateStore:
             if v < 8:
                 self._migrate_to_v8()
                 v = 8
+            if v < 9:
+                self._migrate_to_v9()
+                v = 9
             if v != SCHEMA_VERSION:
                 self._reset_schema()
                 self._create_schema_v1()
@@ -61,6 +98,7 @@ class StateStore:
         cur.execute("DROP TABLE IF EXISTS order_submissions;")
         cur.execute("DROP TABLE IF EXISTS trim_intents;")
         cur.execute("DROP TABLE IF EXISTS entry_fills;")
+        cur.execute("DROP TABLE IF EXISTS symbol_execution_state;")
         cur.execute("DELETE FROM meta WHERE key='schema_version';")
         cur.execute("INSERT INTO meta(key,value) VALUES('schema_version', ?);", (str(SCHEMA_VERSION),))
 
@@ -160,6 +198,16 @@ class StateStore:
             PRIMARY KEY (date_ny, strategy_id, symbol)
         );
         """)
+        # Symbol execution state (state_machine write-behind backend)
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS symbol_execution_state (
+            date_ny TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            state_json TEXT NOT NULL,
+            updated_ts REAL NOT NULL,
+            PRIMARY KEY (date_ny, symbol)
+        );
+        """)
         cur.execute("CREATE INDEX IF NOT EXISTS idx_trim_intents_sym ON trim_intents(symbol);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_candidates_expires ON candidates(expires_ts);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_intents_sched ON entry_intents(scheduled_entry_at);")
@@ -207,6 +255,19 @@ class StateStore:
             pass  # Column already exists
         cur.execute("UPDATE meta SET value=? WHERE key='schema_version';", ("8",))
 
+    def _migrate_to_v9(self) -> None:
+        cur = self.conn.cursor()
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS symbol_execution_state (
+            date_ny TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            state_json TEXT NOT NULL,
+            updated_ts REAL NOT NULL,
+            PRIMARY KEY (date_ny, symbol)
+        );
+        """)
+        cur.execute("UPDATE meta SET value=? WHERE key='schema_version';", ("9",))
+
     # -------------------------
     # Candidates
     # -------------------------
@@ -221,6 +282,35 @@ class StateStore:
             notes=excluded.notes
         """, (symbol, first_seen_ts, expires_ts, pivot_level, notes))
 
+    def upsert_candidates_many(self, candidates: Iterable[dict]) -> int:
+        """
+        Bulk upsert_candidate in one transaction. Each item carries the
+        upsert_candidate keyword arguments (symbol, first_seen_ts, expires_ts,
+        optional pivot_level and notes).
+        """
+        rows = [
+            (
+                c["symbol"],
+                c["first_seen_ts"],
+                c["expires_ts"],
+                c.get("pivot_level"),
+                c.get("notes", ""),
+            )
+            for c in candidates
+        ]
+        if not rows:
+            return 0
+        with self.batch():
+            self.conn.executemany("""
+            INSERT INTO candidates(symbol, first_seen_ts, expires_ts, pivot_level, notes)
+            VALUES(?,?,?,?,?)
+            ON CONFLICT(symbol) DO UPDATE SET
+                expires_ts=excluded.expires_ts,
+                pivot_level=COALESCE(excluded.pivot_level, candidates.pivot_level),
+                notes=excluded.notes
+            """, rows)
+        return len(rows)
+
     def list_active_candidates(self, now_ts: float) -> List[str]:
         cur = self.conn.cursor()
         cur.execute("SELECT symbol FROM candidates WHERE expires_ts >= ? ORDER BY symbol;", (now_ts,))
@@ -259,12 +349,8 @@ class StateStore:
             intent.target_r1,
         ))
 
-    def get_entry_intent(self, symbol: str) -> Optional[EntryIntent]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM entry_intents WHERE symbol=?;", (symbol,))
-        r = cur.fetchone()
-        if r is None:
-            return None
+    @staticmethod
+    def _row_to_entry_intent(r: sqlite3.Row) -> EntryIntent:
         target_r1 = None
         try:
             target_r1 = r["target_r1"]
@@ -284,32 +370,34 @@ class StateStore:
             target_r1=target_r1,
         )
 
-    def pop_due_entry_intents(self, now_ts: float) -> List[EntryIntent]:
+    def get_entry_intent(self, symbol: str) -> Optional[EntryIntent]:
         cur = self.conn.cursor()
-        cur.execute("SELECT * FROM entry_intents WHERE scheduled_entry_at <= ? ORDER BY scheduled_entry_at ASC;", (now_ts,))
-        rows = cur.fetchall()
-        cur.execute("DELETE FROM entry_intents WHERE scheduled_entry_at <= ?;", (now_ts,))
-        result = []
-        for r in rows:
-            target_r1 = None
-            try:
-                target_r1 = r["target_r1"]
-            except (IndexError, KeyError):
-                pass
-            result.append(EntryIntent(
-                strategy_id=r["strategy_id"],
-                symbol=r["symbol"],
-                pivot_level=r["pivot_level"],
-                boh_confirmed_at=r["boh_confirmed_at"],
-                scheduled_entry_at=r["scheduled_entry_at"],
-                size_shares=r["size_shares"],
-                stop_loss=r["stop_loss"],
-                take_profit=r["take_profit"],
-                ref_price=r["ref_price"],
-                dist_pct=r["dist_pct"],
-                target_r1=target_r1,
-            ))
-        return result
+        cur.execute("SELECT * FROM entry_intents WHERE symbol=?;", (symbol,))
+        r = cur.fetchone()
+        if r is None:
+            return None
+        return self._row_to_entry_intent(r)
+
+    def get_entry_intents_for(self, symbols: Iterable[str]) -> dict[str, EntryIntent]:
+        """Entry intents for ``symbols`` keyed by symbol (absent symbols omitted)."""
+        wanted = sorted(set(symbols))
+        out: dict[str, EntryIntent] = {}
+        cur = self.conn.cursor()
+        for i in range(0, len(wanted), _IN_CHUNK):
+            chunk = wanted[i : i + _IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cur.execute(f"SELECT * FROM entry_intents WHERE symbol IN ({placeholders});", chunk)
+            for r in cur.fetchall():
+                out[r["symbol"]] = self._row_to_entry_intent(r)
+        return out
+
+    def pop_due_entry_intents(self, now_ts: float) -> List[EntryIntent]:
+        with self.batch():
+            cur = self.conn.cursor()
+            cur.execute("SELECT * FROM entry_intents WHERE scheduled_entry_at <= ? ORDER BY scheduled_entry_at ASC;", (now_ts,))
+            rows = cur.fetchall()
+            cur.execute("DELETE FROM entry_intents WHERE scheduled_entry_at <= ?;", (now_ts,))
+        return [self._row_to_entry_intent(r) for r in rows]
 
     def count_due_entry_intents(self, now_ts: float) -> int:
         cur = self.conn.cursor()
@@ -393,12 +481,8 @@ class StateStore:
             trimmed_r2=excluded.trimmed_r2
         """, (ps.strategy_id, ps.symbol, ps.size_shares, ps.avg_price, ps.pivot_level, ps.r1_level, ps.r2_level, ps.stop_mode.value, ps.last_update_ts, ps.stop_price, ps.high_water, ps.last_boh_level, ps.invalidation_count, int(ps.trimmed_r1), int(ps.trimmed_r2)))
 
-    def get_position(self, symbol: str) -> Optional[PositionState]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM positions WHERE symbol=?;", (symbol,))
-        r = cur.fetchone()
-        if r is None:
-            return None
+    @staticmethod
+    def _row_to_position(r: sqlite3.Row) -> PositionState:
         return PositionState(
             strategy_id=r["strategy_id"],
             symbol=r["symbol"],
@@ -417,27 +501,22 @@ class StateStore:
             trimmed_r2=bool(r["trimmed_r2"])
         )
 
+    def get_position(self, symbol: str) -> Optional[PositionState]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM positions WHERE symbol=?;", (symbol,))
+        r = cur.fetchone()
+        if r is None:
+            return None
+        return self._row_to_position(r)
+
     def list_positions(self) -> List[PositionState]:
         cur = self.conn.cursor()
         cur.execute("SELECT * FROM positions ORDER BY symbol;")
-        rows = cur.fetchall()
-        return [PositionState(
-            strategy_id=r["strategy_id"],
-            symbol=r["symbol"],
-            size_shares=r["size_shares"],
-            avg_price=r["avg_price"],
-            pivot_level=r["pivot_level"],
-            r1_level=r["r1_level"],
-            r2_level=r["r2_level"],
-            stop_mode=StopMode(r["stop_mode"]),
-            last_update_ts=r["last_update_ts"],
-            stop_price=r["stop_price"],
-            high_water=r["high_water"],
-            last_boh_level=r["last_boh_level"],
-            invalidation_count=r["invalidation_count"],
-            trimmed_r1=bool(r["trimmed_r1"]),
-            trimmed_r2=bool(r["trimmed_r2"])
-        ) for r in rows]
+        return [self._row_to_position(r) for r in cur.fetchall()]
+
+    def list_positions_by_symbol(self) -> dict[str, PositionState]:
+        """All positions keyed by symbol, in one query."""
+        return {ps.symbol: ps for ps in self.list_positions()}
 
     def delete_position(self, symbol: str) -> None:
         cur = self.conn.cursor()
@@ -565,3 +644,34 @@ class StateStore:
             (date_ny, strategy_id, symbol),
         )
         return cur.fetchone()
+
+    # -------------------------
+    # Symbol execution state
+    # -------------------------
+    def upsert_symbol_execution_states(self, date_ny: str, states: dict[str, dict]) -> None:
+        """Upsert per-symbol state payloads for one NY date in a single transaction."""
+        if not states:
+            return
+        now = time.time()
+        with self.batch():
+            self.conn.executemany(
+                """
+                INSERT INTO symbol_execution_state(date_ny, symbol, state_json, updated_ts)
+                VALUES(?,?,?,?)
+                ON CONFLICT(date_ny, symbol) DO UPDATE SET
+                    state_json=excluded.state_json,
+                    updated_ts=excluded.updated_ts;
+                """,
+                [
+                    (date_ny, symbol, json.dumps(payload, sort_keys=True), now)
+                    for symbol, payload in states.items()
+                ],
+            )
+
+    def load_symbol_execution_states(self, date_ny: str) -> dict[str, dict]:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT symbol, state_json FROM symbol_execution_state WHERE date_ny=? ORDER BY symbol;",
+            (date_ny,),
+        )
+        return {r["symbol"]: json.loads(r["state_json"]) for r in cur.fetchall()}
@@ -0,0 +1,251 @@
+"""
+Pipelined daily-bar fetcher for the scan history cache.
+
+run_scan's refresh/backfill used to issue one 200-symbol StockBarsRequest at
+a time and merge each result into the cache before sending the next. Here a
+bounded thread pool keeps up to ``max_workers`` requests in flight, gated by a
+sliding-window rate limiter (Alpaca allows 200 requests/minute), while the
+calling thread parses completed responses as they arrive. Failed batches are
+recorded individually and retried as a group after the first pass.
+
+FakeStockBarsClient serves bars from a local panel so the pipeline can be
+exercised without network access.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, Iterable, Sequence
+
+import pandas as pd
+from alpaca.data.requests import StockBarsRequest
+from alpaca.data.timeframe import TimeFrame
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 180
+DEFAULT_RETRIES = 1
+DEFAULT_RETRY_BACKOFF_S = 2.0
+
+
+@dataclass(frozen=True)
+class BarBatch:
+    kind: str  # refresh | backfill | benchmark
+    symbols: tuple[str, ...]
+    start: datetime
+
+
+@dataclass(frozen=True)
+class BatchFailure:
+    batch: BarBatch
+    attempts: int
+    error: str
+
+
+@dataclass(frozen=True)
+class BatchTiming:
+    batch: BarBatch
+    attempt: int
+    seconds: float  # request wall time on the worker, including rate-limit waits
+    ok: bool
+
+
+@dataclass
+class FetchResult:
+    bars: pd.DataFrame
+    failures: list[BatchFailure] = field(default_factory=list)
+    requests: int = 0
+    timings: list[BatchTiming] = field(default_factory=list)
+
+
+def make_batches(kind: str, symbols: Sequence[str], start: datetime, batch_size: int) -> list[BarBatch]:
+    return [
+        BarBatch(kind=kind, symbols=tuple(symbols[i : i + batch_size]), start=start)
+        for i in range(0, len(symbols), batch_size)
+    ]
+
+
+class RateLimiter:
+    """Blocks so that at most ``max_calls`` acquisitions happen per ``period`` seconds."""
+
+    def __init__(
+        self,
+        max_calls: int,
+        period: float = 60.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_calls = max(1, int(max_calls))
+        self.period = float(period)
+        self._clock = clock
+        self._sleep = sleep
+        self._calls: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            while True:
+                now = self._clock()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                self._sleep(self._calls[0] + self.period - now)
+
+
+def _request_bars(data_client, batch: BarBatch, limiter: RateLimiter) -> pd.DataFrame | None:
+    limiter.acquire()
+    req = StockBarsRequest(
+        symbol_or_symbols=list(batch.symbols), timeframe=TimeFrame.Day, start=batch.start
+    )
+    return data_client.get_stock_bars(req).df
+
+
+def _timed_request(
+    data_client, batch: BarBatch, limiter: RateLimiter
+) -> tuple[pd.DataFrame | None, BaseException | None, float]:
+    t0 = time.perf_counter()
+    try:
+        return _request_bars(data_client, batch, limiter), None, time.perf_counter() - t0
+    except Exception as exc:
+        return None, exc, time.perf_counter() - t0
+
+
+def fetch_bars(
+    data_client,
+    batches: Sequence[BarBatch],
+    *,
+    parse: Callable[[pd.DataFrame], pd.DataFrame],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_requests_per_minute: int = DEFAULT_MAX_REQUESTS_PER_MINUTE,
+    retries: int = DEFAULT_RETRIES,
+    retry_backoff_s: float = DEFAULT_RETRY_BACKOFF_S,
+    limiter: RateLimiter | None = None,
+    on_batch_done: Callable[[BarBatch], None] | None = None,
+) -> FetchResult:
+    """Fetch ``batches`` concurrently; parse each response on the calling thread.
+
+    Returns the parsed bars concatenated in batch order (so the result does
+    not depend on completion order), the batches still failing after
+    ``retries`` extra rounds, and one timing entry per request.
+    """
+    limiter = limiter or RateLimiter(max_requests_per_minute, 60.0)
+    frames: dict[int, pd.DataFrame] = {}
+    errors: dict[int, str] = {}
+    attempts = [0] * len(batches)
+    pending = list(range(len(batches)))
+    requests = 0
+    timings: list[BatchTiming] = []
+
+    for round_no in range(max(0, retries) + 1):
+        if not pending:
+            break
+        if round_no and retry_backoff_s > 0:
+            time.sleep(retry_backoff_s * round_no)
+        failed: list[int] = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {
+                pool.submit(_timed_request, data_client, batches[i], limiter): i for i in pending
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                attempts[i] += 1
+                requests += 1
+                raw, error, elapsed = future.result()
+                try:
+                    if error is not None:
+                        raise error
+                    parsed = parse(raw) if raw is not None and not raw.empty else None
+                except Exception as exc:
+                    errors[i] = f"{type(exc).__name__}: {exc}"
+                    failed.append(i)
+                    timings.append(BatchTiming(batches[i], attempts[i], elapsed, ok=False))
+                    continue
+                timings.append(BatchTiming(batches[i], attempts[i], elapsed, ok=True))
+                errors.pop(i, None)
+                if parsed is not None and not parsed.empty:
+                    frames[i] = parsed
+                if on_batch_done is not None:
+                    on_batch_done(batches[i])
+        pending = sorted(failed)
+
+    bars = (
+        pd.concat([frames[i] for i in sorted(frames)], ignore_index=True)
+        if frames
+        else pd.DataFrame()
+    )
+    failures = [
+        BatchFailure(batch=batches[i], attempts=attempts[i], error=errors[i]) for i in pending
+    ]
+    return FetchResult(bars=bars, failures=failures, requests=requests, timings=timings)
+
+
+class FakeStockBarsClient:
+    """Local stand-in for StockHistoricalDataClient.get_stock_bars.
+
+    Serves daily bars from a yfinance-style panel (Ticker, Date, Open, High,
+    Low, Close, Volume) in Alpaca's (symbol, timestamp) MultiIndex layout.
+    Requests touching ``fail_symbols`` raise for their first ``fail_times``
+    attempts (forever when None). Records calls and peak concurrency.
+    """
+
+    def __init__(
+        self,
+        panel: pd.DataFrame,
+        *,
+        latency_s: float = 0.0,
+        fail_symbols: Iterable[str] = (),
+        fail_times: int | None = 1,
+    ) -> None:
+        self.panel = panel
+        self.latency_s = latency_s
+        self.fail_symbols = {str(s).upper() for s in fail_symbols}
+        self.fail_times = fail_times
+        self.calls: list[tuple[tuple[str, ...], datetime]] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._failures: dict[tuple[str, ...], int] = {}
+        self._lock = threading.Lock()
+
+    def get_stock_bars(self, req) -> SimpleNamespace:
+        symbols = req.symbol_or_symbols
+        symbols = tuple([symbols] if isinstance(symbols, str) else symbols)
+        with self._lock:
+            self.calls.append((symbols, req.start))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency_s:
+                time.sleep(self.latency_s)
+            if self.fail_symbols.intersection(symbols):
+                with self._lock:
+                    count = self._failures.get(symbols, 0)
+                    self._failures[symbols] = count + 1
+                if self.fail_times is None or count < self.fail_times:
+                    raise ConnectionError(f"simulated failure for {','.join(symbols)}")
+            start = pd.Timestamp(req.start).tz_localize(None) if req.start is not None else None
+            sub = self.panel[self.panel["Ticker"].isin(symbols)]
+            if start is not None:
+                sub = sub[sub["Date"] >= start]
+            df = sub.rename(
+                columns={
+                    "Ticker": "symbol",
+                    "Date": "timestamp",
+                    "Open": "open",
+                    "High": "high",
+                    "Low": "low",
+                    "Close": "close",
+                    "Volume": "volume",
+                }
+            )
+            return SimpleNamespace(df=df.set_index(["symbol", "timestamp"]))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
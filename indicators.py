@@ -154,6 +154,83 @@ def trend_strength_series(
     score = (slope_pct * 2.0) + (adx_series * 0.7 * slope_sign) - (vol_ratio * 10.0)
     return score
 
+def trend_strength_scores(
+    panel: pd.DataFrame,
+    sma_len: int = 50,
+    slope_lookback: int = 10,
+    adx_len: int = 14,
+    atr_len: int = 14,
+    atr_window: int = 120,
+) -> pd.Series:
+    """
+    trend_strength_score for every ticker of a long OHLC panel (Ticker/Date
+    columns) in one pass of grouped rolling/ewm ops. Returns a Series indexed
+    by Ticker; tickers without enough history score NaN.
+    """
+    if panel is None or panel.empty:
+        return pd.Series(dtype=float)
+
+    df = panel.sort_values(["Ticker", "Date"], kind="mergesort").reset_index(drop=True)
+    keys = df["Ticker"]
+    g = df.groupby(keys, sort=False, observed=True)
+
+    def _rolling_mean(s: pd.Series, n: int) -> pd.Series:
+        return s.groupby(keys, sort=False, observed=True).rolling(n).mean().droplevel(0)
+
+    def _wilder(s: pd.Series, n: int) -> pd.Series:
+        return (
+            s.groupby(keys, sort=False, observed=True)
+            .ewm(alpha=1 / n, adjust=False, min_periods=n)
+            .mean()
+            .droplevel(0)
+        )
+
+    close, high, low = df["Close"], df["High"], df["Low"]
+    prev_close = g["Close"].shift(1)
+    tr = pd.concat([
+        (high - low).abs(),
+        (high - prev_close).abs(),
+        (low - prev_close).abs(),
+    ], axis=1).max(axis=1)
+
+    sma_series = _rolling_mean(close, sma_len)
+    sma_prev = sma_series.groupby(keys, sort=False, observed=True).shift(slope_lookback)
+
+    up_move = g["High"].diff()
+    down_move = -g["Low"].diff()
+    plus_dm = pd.Series(np.where((up_move > down_move) & (up_move > 0), up_move, 0.0), index=df.index)
+    minus_dm = pd.Series(np.where((down_move > up_move) & (down_move > 0), down_move, 0.0), index=df.index)
+    atr_n = _wilder(tr, adx_len)
+    plus_di = 100 * _wilder(plus_dm, adx_len) / atr_n
+    minus_di = 100 * _wilder(minus_dm, adx_len) / atr_n
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di).replace(0, np.nan)
+    adx_series = _wilder(dx, adx_len)
+
+    atr_pct = (_rolling_mean(tr, atr_len) / close) * 100.0
+    atr_pct_p50 = (
+        atr_pct.groupby(keys, sort=False, observed=True).rolling(atr_window).quantile(0.5).droplevel(0)
+    )
+
+    last = pd.DataFrame(
+        {
+            "Ticker": keys,
+            "sma": sma_series,
+            "sma_prev": sma_prev,
+            "adx": adx_series,
+            "atr_pct": atr_pct,
+            "atr_pct_p50": atr_pct_p50,
+        }
+    ).drop_duplicates("Ticker", keep="last").set_index("Ticker")
+
+    slope_pct = (last["sma"] - last["sma_prev"]) / last["sma_prev"].abs() * 100.0
+    slope_pct = slope_pct.where(last["sma_prev"] != 0)
+    vol_ratio = (last["atr_pct"] / last["atr_pct_p50"]).where(
+        last["atr_pct_p50"].notna() & (last["atr_pct_p50"] != 0), 1.0
+    )
+    slope_sign = np.sign(slope_pct)
+    score = (slope_pct * 2.0) + (last["adx"] * 0.7 * slope_sign) - (vol_ratio * 10.0)
+    return score.astype(float)
+
 def get_pivot_targets(df: pd.DataFrame):
     """
     Calculates Daily R1 and R2 based on the previous session's H/L/C.
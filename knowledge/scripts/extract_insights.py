@@ -153,9 +153,12 @@ def main(db: str, source: Optional[str], min_score: float, min_score_universe: f
         insight_id = f"i_{sha12(source_id + '|' + block_id + '|' + sent)}"
         con.execute(
           """
-          INSERT OR REPLACE INTO atomic_insights
+          INSERT INTO atomic_insights
             (insight_id, source_id, block_id, ordinal, insight_type, timeframe, topic, text, confidence, score)
           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+          ON CONFLICT(insight_id) DO UPDATE SET
+            ordinal=excluded.ordinal, insight_type=excluded.insight_type, timeframe=excluded.timeframe,
+            topic=excluded.topic, text=excluded.text, confidence=excluded.confidence, score=excluded.score
           """,
           (insight_id, source_id, block_id, int(ordinal), itype, tf, topic, sent, confidence, float(sc)),
         )
@@ -147,8 +147,11 @@ def insert_blocks(con: sqlite3.Connection, source_id: str, chunks: list[str]) ->
     block_id = f"yb_{source_id}_{i:06d}"
     con.execute(
       """
-      INSERT OR REPLACE INTO raw_blocks (block_id, source_id, ordinal, ts_start, ts_end, text)
+      INSERT INTO raw_blocks (block_id, source_id, ordinal, ts_start, ts_end, text)
       VALUES (?, ?, ?, NULL, NULL, ?)
+      ON CONFLICT(block_id) DO UPDATE SET
+        source_id=excluded.source_id, ordinal=excluded.ordinal,
+        ts_start=excluded.ts_start, ts_end=excluded.ts_end, text=excluded.text
       """,
       (block_id, source_id, i, text),
     )
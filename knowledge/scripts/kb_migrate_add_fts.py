@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import sqlite3
+
+DB_DEFAULT = "knowledge/kb.sqlite"
+
+# content table -> FTS5 index over its text column (external content, so the
+# text is stored once; triggers keep the index in sync with every write).
+FTS_TABLES = {
+  "raw_blocks": "raw_blocks_fts",
+  "normalized_blocks": "normalized_blocks_fts",
+  "atomic_insights": "atomic_insights_fts",
+}
+
+FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+  text,
+  content='{table}',
+  content_rowid='rowid',
+  tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+  INSERT INTO {fts}(rowid, text) VALUES (new.rowid, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+  INSERT INTO {fts}({fts}, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF text ON {table} BEGIN
+  INSERT INTO {fts}({fts}, rowid, text) VALUES ('delete', old.rowid, old.text);
+  INSERT INTO {fts}(rowid, text) VALUES (new.rowid, new.text);
+END;
+
+INSERT INTO {fts}({fts}) VALUES ('rebuild');
+"""
+
+def main(db_path: str) -> None:
+  con = sqlite3.connect(db_path)
+  try:
+    existing = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    for table, fts in FTS_TABLES.items():
+      if table not in existing:
+        print(f"Skipped {fts}: {table} does not exist (run its migration first)")
+        continue
+      con.executescript(FTS_SQL.format(table=table, fts=fts))
+      con.commit()
+      print(f"Migration complete: {fts}")
+  finally:
+    con.close()
+
+if __name__ == "__main__":
+  import argparse
+  ap = argparse.ArgumentParser()
+  ap.add_argument("--db", default=DB_DEFAULT)
+  args = ap.parse_args()
+  main(args.db)
@@ -7,16 +7,83 @@ from textwrap import shorten
 
 DB_DEFAULT = "knowledge/kb.sqlite"
 
+# --table -> (content table, FTS5 index from kb_migrate_add_fts.py, id column)
+TABLES = {
+  "raw": ("raw_blocks", "raw_blocks_fts", "block_id"),
+  "normalized": ("normalized_blocks", "normalized_blocks_fts", "norm_id"),
+  "insights": ("atomic_insights", "atomic_insights_fts", "insight_id"),
+}
+
+def fts_query(q: str) -> str:
+  """Quote each term so user input is matched literally (implicit AND)."""
+  return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+def ranked_rows(
+  con: sqlite3.Connection,
+  table_key: str,
+  match: str,
+  source: str | None,
+  source_type: str | None,
+  limit: int,
+) -> list[tuple]:
+  table, fts, id_col = TABLES[table_key]
+  exists = con.execute(
+    "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (fts,)
+  ).fetchone()
+  if not exists:
+    raise SystemExit(f"{fts} not found; run knowledge/scripts/kb_migrate_add_fts.py first")
+
+  joins = ""
+  where = [f"{fts} MATCH ?"]
+  params: list = [match]
+  if source:
+    where.append("t.source_id = ?")
+    params.append(source)
+  if source_type:
+    joins = "JOIN sources s ON s.source_id = t.source_id"
+    where.append("s.source_type = ?")
+    params.append(source_type)
+  params.append(limit)
+
+  # bm25() is lower-is-better; snippet() marks hits with [] around a ~16 token window.
+  return con.execute(
+    f"""
+    SELECT t.{id_col}, t.source_id, t.ordinal,
+           snippet({fts}, 0, '[', ']', '…', 16) AS snip,
+           bm25({fts}) AS rank
+    FROM {fts}
+    JOIN {table} t ON t.rowid = {fts}.rowid
+    {joins}
+    WHERE {" AND ".join(where)}
+    ORDER BY rank
+    LIMIT ?
+    """,
+    params,
+  ).fetchall()
+
 def main() -> None:
   ap = argparse.ArgumentParser(description="Query KB raw_blocks by keyword/source.")
   ap.add_argument("--db", default=DB_DEFAULT)
   ap.add_argument("--q", required=True, help="keyword (case-insensitive substring match)")
   ap.add_argument("--source", default=None, help="source_id filter (e.g., yt_jalxRNlYCmA)")
   ap.add_argument("--limit", type=int, default=25)
+  ap.add_argument("--ranked", action="store_true", help="full-text search ordered by BM25, with snippets")
+  ap.add_argument("--table", choices=sorted(TABLES), default="raw", help="table to search in --ranked mode")
+  ap.add_argument("--source-type", default=None, help="--ranked only: source type filter (youtube | blog)")
+  ap.add_argument("--match", action="store_true", help="--ranked only: pass --q through as FTS5 query syntax")
   args = ap.parse_args()
 
   con = sqlite3.connect(args.db)
   try:
+    if args.ranked:
+      match = args.q if args.match else fts_query(args.q)
+      rows = ranked_rows(con, args.table, match, args.source, args.source_type, args.limit)
+      for row_id, source_id, ordinal, snip, rank in rows:
+        preview = shorten(snip.replace("\n", " "), width=200, placeholder="…")
+        print(f"{row_id} | {source_id} | #{ordinal} | bm25={rank:.2f} | {preview}")
+      print(f"\nrows={len(rows)}")
+      return
+
     q = f"%{args.q.lower()}%"
     if args.source:
       rows = con.execute(
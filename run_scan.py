@@ -1,3 +1,4 @@
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
@@ -7,6 +8,18 @@ from dotenv import load_dotenv
 from alerts.slack import slack_alert
 from config import cfg
 import scan_engine
+import scan_metrics
+
+
+def _write_scan_report(report: scan_metrics.ScanRunReport, candidates_path: Path) -> None:
+    report_path = report.write_json(scan_metrics.report_path_for(candidates_path))
+    print(f"[scan-report] wrote {report_path}")
+    prom_path = str(getattr(cfg, "SCAN_METRICS_PROM_PATH", "") or "").strip()
+    if prom_path:
+        try:
+            report.write_prometheus(prom_path)
+        except OSError as exc:
+            print(f"[scan-report] prometheus write failed ({prom_path}): {exc}")
 
 
 def main() -> None:
@@ -16,7 +29,20 @@ def main() -> None:
     OUT_PATH = BASE_DIR / "daily_candidates.csv"
     watchlist_path = BASE_DIR / "tradingview_watchlist.txt"
 
-    out = scan_engine.run_scan(cfg)
+    report = scan_metrics.ScanRunReport(
+        slow_tickers=int(getattr(cfg, "SCAN_REPORT_SLOW_TICKERS", scan_metrics.DEFAULT_SLOW_TICKERS))
+    )
+    # The diag counters are process-wide; the report gets this run's delta.
+    diag_before = Counter(scan_engine.PBT_DIAG)
+    gates_before = Counter(scan_engine.SCAN_GATE_DIAG)
+    try:
+        out = scan_engine.run_scan(cfg, report=report)
+    except Exception:
+        if report.status == "running":
+            report.gates.update(scan_engine.SCAN_GATE_DIAG - gates_before)
+        report.finish("error", counters=scan_engine.PBT_DIAG - diag_before)
+        _write_scan_report(report, OUT_PATH)
+        raise
 
     # Sort all candidates by quality
     if not out.empty:
@@ -30,6 +56,7 @@ def main() -> None:
     print(f"[watchlist] wrote {n} symbols -> {watchlist_path}")
 
     print(f"\nDEBUG: Scan finished. Found {len(out)} total candidates. Wrote: {OUT_PATH}")
+    _write_scan_report(report, OUT_PATH)
 
     scan_date = datetime.now(pytz.timezone("America/New_York")).date()
     if not out.empty:
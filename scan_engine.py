@@ -1,6 +1,7 @@
 import csv
 import json
 import os
+import time
 import warnings
 from collections import Counter
 from datetime import date, datetime, timedelta
@@ -17,6 +18,8 @@ from dotenv import load_dotenv
 from tqdm import tqdm
 
 import cache_store as cs
+import history_fetch
+import scan_metrics
 from anchors import anchored_vwap, get_anchor_candidates
 from config import cfg as default_cfg
 from indicators import (
@@ -26,6 +29,7 @@ from indicators import (
     slope_last,
     sma,
     trend_strength_score,
+    trend_strength_scores,
 )
 from setup_context import compute_setup_context, load_setup_rules
 from universe import load_universe
@@ -33,10 +37,18 @@ from universe import load_universe
 # --- Global Config & Tracking ---
 BAD_TICKERS: set[str] = set()
 PBT_DIAG = Counter()
+# Outcome of every build_candidate_row call, keyed by the gate that rejected it.
+SCAN_GATE_DIAG = Counter()
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 EARNINGS_CACHE_PATH = Path("cache/earnings_cache.json")
 
+_HISTORY_FETCH_ERROR_KEYS = {
+    "refresh": "history_refresh_errors",
+    "backfill": "history_backfill_errors",
+    "benchmark": "benchmark_refresh_errors",
+}
+
 # ALGO TWEAK CONFIGS
 ADV_MIN_SHARES = 400000  # Minimum 400k shares avg daily volume
 ATR_MIN_DOLLARS = 0.50   # Minimum $0.50 average daily range
@@ -337,6 +349,39 @@ def pick_best_anchor(
     return (*best, confluence)
 
 
+SNAPSHOT_COLUMNS = ["Ticker", "AvgDollarVol20", "Sector", "TrendScore"]
+SNAPSHOT_LOOKBACK_DAYS = 45
+SNAPSHOT_MIN_BARS = 15
+
+
+def _snapshot_tickers(universe: pd.DataFrame, exclude: set[str]) -> list[str]:
+    return [
+        t.upper()
+        for t in universe["Ticker"].tolist()
+        if is_valid_ticker(t) and t not in exclude
+    ]
+
+
+def _rank_snapshot(snap: pd.DataFrame, is_weekend: bool) -> pd.DataFrame:
+    cfg = _cfg()
+    if snap.empty:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+    if is_weekend:
+        return snap.sort_values("AvgDollarVol20", ascending=False).head(
+            cfg.SNAPSHOT_MAX_TICKERS
+        )
+    sector_rank = (
+        snap.groupby("Sector", observed=True)["TrendScore"]
+        .mean()
+        .sort_values(ascending=False)
+        .head(cfg.TOP_SECTORS_TO_SCAN)
+        .index
+    )
+    return snap[snap["Sector"].isin(sector_rank)].sort_values(
+        "AvgDollarVol20", ascending=False
+    ).head(cfg.SNAPSHOT_MAX_TICKERS)
+
+
 def build_liquidity_snapshot(
     universe: pd.DataFrame,
     data_client: StockHistoricalDataClient,
@@ -345,14 +390,10 @@ def build_liquidity_snapshot(
     cfg = _cfg()
     exclude = bad_tickers if bad_tickers is not None else BAD_TICKERS
     is_weekend = datetime.now().weekday() >= 5
-    tickers = [
-        t.upper()
-        for t in universe["Ticker"].tolist()
-        if is_valid_ticker(t) and t not in exclude
-    ]
+    tickers = _snapshot_tickers(universe, exclude)
     rows = []
     batch_size = 100
-    start_date = datetime.now() - timedelta(days=45)
+    start_date = datetime.now() - timedelta(days=SNAPSHOT_LOOKBACK_DAYS)
 
     for i in tqdm(range(0, len(tickers), batch_size), desc="Snapshot"):
         batch = tickers[i : i + batch_size]
@@ -366,7 +407,7 @@ def build_liquidity_snapshot(
             df_all = standardize_alpaca_to_yf(bars_data.df)
             for t in batch:
                 sub = df_all[df_all["Ticker"] == t].copy()
-                if len(sub) < 15:
+                if len(sub) < SNAPSHOT_MIN_BARS:
                     continue
 
                 # TWEAK 3: Share Volume floor
@@ -390,23 +431,72 @@ def build_liquidity_snapshot(
                 )
         except Exception:
             continue
-    snap = pd.DataFrame(rows)
-    if snap.empty:
-        return pd.DataFrame(columns=["Ticker", "AvgDollarVol20", "Sector", "TrendScore"])
-    if is_weekend:
-        return snap.sort_values("AvgDollarVol20", ascending=False).head(
-            cfg.SNAPSHOT_MAX_TICKERS
-        )
-    sector_rank = (
-        snap.groupby("Sector", observed=True)["TrendScore"]
-        .mean()
-        .sort_values(ascending=False)
-        .head(cfg.TOP_SECTORS_TO_SCAN)
-        .index
+    return _rank_snapshot(pd.DataFrame(rows), is_weekend)
+
+
+def liquidity_snapshot_from_history(
+    universe: pd.DataFrame,
+    history: pd.DataFrame | None,
+    bad_tickers: set[str] | None = None,
+    now: datetime | None = None,
+) -> pd.DataFrame:
+    """Liquidity snapshot computed from the (already refreshed) history panel.
+
+    Same filters and ranking as build_liquidity_snapshot, but ADV and dollar
+    volume come from one groupby over the last SNAPSHOT_LOOKBACK_DAYS of the
+    cache instead of a network pass. TrendScore uses each ticker's full cached
+    history, since the 45-day window is too short for the 50-bar SMA.
+    """
+    cfg = _cfg()
+    exclude = bad_tickers if bad_tickers is not None else BAD_TICKERS
+    now = now or datetime.now()
+    is_weekend = now.weekday() >= 5
+    if history is None or history.empty:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+
+    tickers = set(_snapshot_tickers(universe, exclude))
+    panel = history[history["Ticker"].isin(tickers)].sort_values(
+        ["Ticker", "Date"], kind="mergesort"
     )
-    return snap[snap["Sector"].isin(sector_rank)].sort_values(
-        "AvgDollarVol20", ascending=False
-    ).head(cfg.SNAPSHOT_MAX_TICKERS)
+    recent = panel[panel["Date"] >= pd.Timestamp(now - timedelta(days=SNAPSHOT_LOOKBACK_DAYS))]
+    if recent.empty:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+
+    grouped = recent.groupby("Ticker", observed=True)
+    stats = pd.DataFrame(
+        {
+            "bars": grouped["Date"].size(),
+            "avg_vol_shares": recent.groupby("Ticker", observed=True).tail(20)
+            .groupby("Ticker", observed=True)["Volume"]
+            .mean(),
+            "AvgDollarVol20": (recent["Close"] * recent["Volume"])
+            .groupby(recent["Ticker"], observed=True)
+            .mean(),
+        }
+    )
+    min_dv = 10_000_000 if is_weekend else cfg.MIN_AVG_DOLLAR_VOL
+    stats = stats[
+        (stats["bars"] >= SNAPSHOT_MIN_BARS)
+        & (stats["avg_vol_shares"] >= ADV_MIN_SHARES)
+        & (stats["AvgDollarVol20"] >= min_dv)
+    ]
+    if stats.empty:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+
+    keep = stats.index.astype(str)
+    scores = trend_strength_scores(panel[panel["Ticker"].isin(keep)])
+    sector_by_ticker = dict(
+        zip(universe["Ticker"].astype(str).str.upper(), universe["Sector"])
+    )
+    snap = pd.DataFrame(
+        {
+            "Ticker": keep,
+            "AvgDollarVol20": stats["AvgDollarVol20"].to_numpy(dtype=float),
+            "Sector": [sector_by_ticker.get(t) for t in keep],
+            "TrendScore": scores.reindex(keep).to_numpy(dtype=float),
+        }
+    )
+    return _rank_snapshot(snap, is_weekend)
 
 
 def compute_sector_relative_strength(
@@ -581,27 +671,32 @@ def build_candidate_row(
     sector_rs: float | None = None,
 ) -> dict | None:
     if df.empty:
+        SCAN_GATE_DIAG["empty_history"] += 1
         return None
 
     if as_of_dt is not None:
         df = df.loc[:as_of_dt].copy()
 
     if df.empty or len(df) < 80:
+        SCAN_GATE_DIAG["insufficient_bars"] += 1
         return None
 
     is_weekend = _infer_is_weekend(as_of_dt)
 
     if not is_weekend and not check_weekly_alignment(df):
+        SCAN_GATE_DIAG["weekly_alignment"] += 1
         return None
 
     gates = shannon_quality_gates(df, direction, is_weekend=is_weekend)
     if not gates:
+        SCAN_GATE_DIAG["quality_gates"] += 1
         return None
 
     df = df.copy()
 
     best = pick_best_anchor(df, direction, is_weekend=is_weekend)
     if not best:
+        SCAN_GATE_DIAG["no_anchor"] += 1
         return None
 
     name, av, avs, trend_score, dist, anchor_date, confluence = best
@@ -638,6 +733,7 @@ def build_candidate_row(
         structural_stop = max(structural_stop, av * 1.015)
     r1, r2 = get_pivot_targets(df)
     setup_ctx = compute_setup_context(df, name, setup_rules)
+    SCAN_GATE_DIAG["candidate"] += 1
     return {
         "SchemaVersion": 1,
         "ScanDate": _candidate_scan_date(as_of_dt),
@@ -675,11 +771,26 @@ def build_candidate_row(
     }
 
 
-def run_scan(scan_cfg, as_of_dt: datetime | None = None) -> pd.DataFrame:
+def run_scan(
+    scan_cfg,
+    as_of_dt: datetime | None = None,
+    *,
+    report: scan_metrics.ScanRunReport | None = None,
+) -> pd.DataFrame:
     global BAD_TICKERS
     global _ACTIVE_CFG
 
     _ACTIVE_CFG = scan_cfg
+    if report is None:
+        report = scan_metrics.ScanRunReport(
+            slow_tickers=int(getattr(scan_cfg, "SCAN_REPORT_SLOW_TICKERS", scan_metrics.DEFAULT_SLOW_TICKERS))
+        )
+    diag_before = Counter(PBT_DIAG)
+    gates_before = Counter(SCAN_GATE_DIAG)
+
+    def _finish(status: str) -> None:
+        report.gates.update(SCAN_GATE_DIAG - gates_before)
+        report.finish(status, counters=PBT_DIAG - diag_before)
 
     load_dotenv()
     data_client = StockHistoricalDataClient(
@@ -688,30 +799,46 @@ def run_scan(scan_cfg, as_of_dt: datetime | None = None) -> pd.DataFrame:
     setup_rules = load_setup_rules()
 
     # TWEAK 1: Market Regime Check
-    if not get_market_regime(data_client):
+    with report.stage("regime_check"):
+        regime_ok = get_market_regime(data_client)
+    if not regime_ok:
         print(
             "⚠️ Market Regime Bearish (SPY < 200 SMA). Skipping scan to protect capital."
         )
+        _finish("skipped_bearish_regime")
         return _build_candidates_dataframe([])
 
     is_weekend = _infer_is_weekend(as_of_dt)
     if is_weekend:
         scan_cfg.TOP_SECTORS_TO_SCAN, scan_cfg.SNAPSHOT_MAX_TICKERS = 11, 3000
 
-    BAD_TICKERS = load_bad_tickers()
-    universe = load_universe()
+    with report.stage("universe_load"):
+        BAD_TICKERS = load_bad_tickers()
+        universe = load_universe()
+    report.info["universe_size"] = len(universe)
 
-    snap = build_liquidity_snapshot(universe, data_client, bad_tickers=BAD_TICKERS)
-    filtered = snap["Ticker"].tolist()
+    snapshot_from_history = (
+        str(getattr(scan_cfg, "LIQUIDITY_SNAPSHOT_SOURCE", "network")).strip().lower() == "history"
+    )
+    report.info["snapshot_source"] = "history" if snapshot_from_history else "network"
+    if snapshot_from_history:
+        # The snapshot is built after the refresh below, so refresh every candidate.
+        snap = None
+        filtered = _snapshot_tickers(universe, BAD_TICKERS)
+    else:
+        with report.stage("liquidity_snapshot"):
+            snap = build_liquidity_snapshot(universe, data_client, bad_tickers=BAD_TICKERS)
+        filtered = snap["Ticker"].tolist()
 
     # Sector relative strength
     sector_rs_map: dict[str, float] = {}
     if getattr(scan_cfg, "SECTOR_RS_ENABLED", True):
-        sector_rs_map = compute_sector_relative_strength(
-            data_client,
-            sector_etfs=getattr(scan_cfg, "SECTOR_ETFS", None),
-            lookback_days=int(getattr(scan_cfg, "SECTOR_RS_LOOKBACK_DAYS", 20)),
-        )
+        with report.stage("sector_rs"):
+            sector_rs_map = compute_sector_relative_strength(
+                data_client,
+                sector_etfs=getattr(scan_cfg, "SECTOR_ETFS", None),
+                lookback_days=int(getattr(scan_cfg, "SECTOR_RS_LOOKBACK_DAYS", 20)),
+            )
 
     # --- TEST MODE: limit scan universe for faster iteration ---
     TEST_MODE = os.getenv("TEST_MODE", "0") == "1"
@@ -722,7 +849,8 @@ def run_scan(scan_cfg, as_of_dt: datetime | None = None) -> pd.DataFrame:
         filtered = filtered[:TEST_MAX_TICKERS]
 
     hist_path = Path("cache") / "ohlcv_history.parquet"
-    history = cs.read_parquet(str(hist_path))
+    with report.stage("history_read"):
+        history = cs.read_parquet(str(hist_path))
     batch_size = 200
     benchmark_tickers = [t for t in BENCHMARK_TICKERS if t not in set(filtered)]
     now_dt = datetime.now()
@@ -760,83 +888,105 @@ def run_scan(scan_cfg, as_of_dt: datetime | None = None) -> pd.DataFrame:
             else:
                 benchmark_refresh.append(ticker)
 
-    # Refresh tickers that already have sufficient history (short window)
+    # Refresh tickers that already have sufficient history (short window),
+    # backfill missing/short ones (long window); requests run concurrently.
     refresh_tickers = [t for t in filtered if t not in set(backfill_tickers)]
     refresh_tickers.extend(benchmark_refresh)
-    for i in tqdm(range(0, len(refresh_tickers), batch_size), desc="History Refresh"):
-        batch = refresh_tickers[i : i + batch_size]
-        try:
-            req = StockBarsRequest(
-                symbol_or_symbols=batch, timeframe=TimeFrame.Day, start=hist_start
-            )
-            raw_new = data_client.get_stock_bars(req).df
-            if raw_new is not None and not raw_new.empty:
-                newdata = standardize_alpaca_to_yf(raw_new)
-                history = cs.upsert_history(history, newdata)
-        except Exception:
-            PBT_DIAG["history_refresh_errors"] += 1
-            continue
-
-    # Backfill tickers missing or with insufficient bars (long window)
-    for i in tqdm(range(0, len(backfill_tickers), batch_size), desc="History Backfill"):
-        batch = backfill_tickers[i : i + batch_size]
-        try:
-            req = StockBarsRequest(
-                symbol_or_symbols=batch, timeframe=TimeFrame.Day, start=long_start
-            )
-            raw_new = data_client.get_stock_bars(req).df
-            if raw_new is not None and not raw_new.empty:
-                newdata = standardize_alpaca_to_yf(raw_new)
-                history = cs.upsert_history(history, newdata)
-        except Exception:
-            PBT_DIAG["history_backfill_errors"] += 1
-            continue
-
+    batches = (
+        history_fetch.make_batches("refresh", refresh_tickers, hist_start, batch_size)
+        + history_fetch.make_batches("backfill", backfill_tickers, long_start, batch_size)
+    )
     if benchmark_backfill:
-        try:
-            req = StockBarsRequest(
-                symbol_or_symbols=benchmark_backfill,
-                timeframe=TimeFrame.Day,
-                start=long_start,
-            )
-            raw_new = data_client.get_stock_bars(req).df
-            if raw_new is not None and not raw_new.empty:
-                newdata = standardize_alpaca_to_yf(raw_new)
-                history = cs.upsert_history(history, newdata)
-        except Exception:
-            PBT_DIAG["benchmark_refresh_errors"] += 1
+        batches.append(
+            history_fetch.BarBatch(kind="benchmark", symbols=tuple(benchmark_backfill), start=long_start)
+        )
+    with report.stage("history_fetch"), tqdm(total=len(batches), desc="History Refresh") as bar:
+        fetched = history_fetch.fetch_bars(
+            data_client,
+            batches,
+            parse=standardize_alpaca_to_yf,
+            max_workers=int(getattr(scan_cfg, "HISTORY_FETCH_WORKERS", history_fetch.DEFAULT_MAX_WORKERS)),
+            max_requests_per_minute=int(
+                getattr(
+                    scan_cfg,
+                    "HISTORY_FETCH_MAX_REQUESTS_PER_MIN",
+                    history_fetch.DEFAULT_MAX_REQUESTS_PER_MINUTE,
+                )
+            ),
+            retries=int(getattr(scan_cfg, "HISTORY_FETCH_RETRIES", history_fetch.DEFAULT_RETRIES)),
+            on_batch_done=lambda _batch: bar.update(1),
+        )
+    for timing in fetched.timings:
+        report.record_batch(
+            timing.batch.kind,
+            len(timing.batch.symbols),
+            timing.seconds,
+            attempt=timing.attempt,
+            ok=timing.ok,
+        )
+    if not fetched.bars.empty:
+        with report.stage("history_merge"):
+            history = cs.upsert_history(history, fetched.bars)
+    for failure in fetched.failures:
+        PBT_DIAG[_HISTORY_FETCH_ERROR_KEYS[failure.batch.kind]] += 1
+        print(
+            f"History {failure.batch.kind} batch failed after {failure.attempts} attempts "
+            f"({len(failure.batch.symbols)} symbols, first={failure.batch.symbols[0]}): {failure.error}"
+        )
 
     ## Persist AFTER refresh
-    os.makedirs(hist_path.parent, exist_ok=True)
-    cs.write_parquet(history, str(hist_path))
+    with report.stage("history_write"):
+        os.makedirs(hist_path.parent, exist_ok=True)
+        cs.write_parquet(history, str(hist_path))
     print(f"Saved history cache: {hist_path} | rows={0 if history is None else len(history):,}")
 
+    if snapshot_from_history:
+        with report.stage("liquidity_snapshot"):
+            snap = liquidity_snapshot_from_history(universe, history, bad_tickers=BAD_TICKERS)
+        filtered = snap["Ticker"].tolist()
+    report.info["tickers_to_scan"] = len(filtered)
+
+    clock = time.perf_counter
     results = []
-    for t in tqdm(filtered, desc="Scanning"):
-        if is_near_earnings_cached(t):
-            continue
+    with report.stage("scan_loop"):
+        for t in tqdm(filtered, desc="Scanning"):
+            t0 = clock()
+            near_earnings = is_near_earnings_cached(t)
+            t1 = clock()
+            report.add_time("earnings_checks", t1 - t0)
+            if near_earnings:
+                report.gates["near_earnings"] += 1
+                continue
 
-        d_filtered = history[history["Ticker"] == t].copy()
-        if d_filtered.empty or len(d_filtered) < 80:
-            continue
-        df = d_filtered.set_index("Date").sort_index()
-
-        sector = snap.loc[snap["Ticker"] == t, "Sector"].values[0]
-        row = build_candidate_row(
-            df,
-            t,
-            sector,
-            setup_rules,
-            as_of_dt=as_of_dt,
-            direction="Long",
-            sector_rs=sector_rs_map.get(sector),
-        )
-        if row:
-            results.append(row)
+            d_filtered = history[history["Ticker"] == t].copy()
+            if d_filtered.empty or len(d_filtered) < 80:
+                report.gates["insufficient_history"] += 1
+                continue
+            df = d_filtered.set_index("Date").sort_index()
+
+            sector = snap.loc[snap["Ticker"] == t, "Sector"].values[0]
+            t2 = clock()
+            row = build_candidate_row(
+                df,
+                t,
+                sector,
+                setup_rules,
+                as_of_dt=as_of_dt,
+                direction="Long",
+                sector_rs=sector_rs_map.get(sector),
+            )
+            t3 = clock()
+            report.add_time("ticker_slice", t2 - t1)
+            report.add_time("candidate_rows", t3 - t2)
+            report.record_ticker(t, t3 - t0)
+            if row:
+                results.append(row)
 
     candidates = _build_candidates_dataframe(results)
+    report.info["candidates"] = len(candidates)
 
     if getattr(scan_cfg, "CROSS_SECTIONAL_ENABLED", False) and not candidates.empty:
+        cross_sectional_t0 = time.perf_counter()
         from analytics.cross_sectional import apply_cross_sectional_scoring
         features = getattr(scan_cfg, "CROSS_SECTIONAL_FEATURES", ["TrendScore", "Entry_DistPct", "AVWAP_Slope"])
         top_decile = float(getattr(scan_cfg, "CROSS_SECTIONAL_TOP_DECILE", 0.1))
@@ -845,18 +995,20 @@ def run_scan(scan_cfg, as_of_dt: datetime | None = None) -> pd.DataFrame:
             candidates, features=features, top_decile=top_decile, hard_floor_trend=hard_floor,
         )
         candidates["SchemaVersion"] = 2
+        report.add_time("cross_sectional", time.perf_counter() - cross_sectional_t0)
 
         if getattr(scan_cfg, "FEATURE_STORE_WRITE_ENABLED", False):
             try:
                 from feature_store.writers import write_cross_sectional_distributions
                 scan_date = candidates["ScanDate"].iloc[0] if not candidates.empty else None
                 if scan_date:
-                    write_cross_sectional_distributions(
-                        base_dir=Path(getattr(scan_cfg, "FEATURE_STORE_DIR", "feature_store")),
-                        date_str=scan_date,
-                        candidates_df=candidates,
-                        features=features,
-                    )
+                    with report.stage("feature_store_write"):
+                        write_cross_sectional_distributions(
+                            base_dir=Path(getattr(scan_cfg, "FEATURE_STORE_DIR", "feature_store")),
+                            date_str=scan_date,
+                            candidates_df=candidates,
+                            features=features,
+                        )
             except Exception:
                 import logging
                 logging.getLogger(__name__).warning(
@@ -868,6 +1020,7 @@ def run_scan(scan_cfg, as_of_dt: datetime | None = None) -> pd.DataFrame:
                 candidates[col] = np.nan
 
     if getattr(scan_cfg, "FEATURE_STORE_WRITE_ENABLED", False) and results:
+        feature_store_t0 = time.perf_counter()
         try:
             from feature_store.store import FeatureStore
             store = FeatureStore(
@@ -896,7 +1049,9 @@ def run_scan(scan_cfg, as_of_dt: datetime | None = None) -> pd.DataFrame:
             logging.getLogger(__name__).warning(
                 "Feature store write failed (fail-open)", exc_info=True
             )
+        report.add_time("feature_store_write", time.perf_counter() - feature_store_t0)
 
+    _finish("ok")
     return candidates.reindex(columns=CANDIDATE_COLUMNS)
 
 
@@ -0,0 +1,241 @@
+"""
+Structured run report for scan_engine.run_scan.
+
+ScanRunReport collects wall time per stage (regime check, universe load,
+liquidity snapshot, each history batch, parquet write, scan loop, earnings
+checks, cross-sectional scoring, feature-store writes), gate rejection
+counts, per-ticker timings (summary quantiles plus the slowest tickers) and
+the PBT_DIAG error counters. run_scan.py writes it as JSON next to
+daily_candidates.csv and, when SCAN_METRICS_PROM_PATH is set, as a
+Prometheus text-format file for node_exporter's textfile collector.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Mapping
+
+SCHEMA_VERSION = 1
+DEFAULT_SLOW_TICKERS = 10
+METRIC_PREFIX = "avwap_scan"
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _quantile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class ScanRunReport:
+    def __init__(self, *, slow_tickers: int = DEFAULT_SLOW_TICKERS, clock=time.perf_counter) -> None:
+        self._clock = clock
+        self._t0 = clock()
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.finished_at: str | None = None
+        self.status = "running"
+        self.stages: dict[str, dict[str, float]] = {}
+        self.batches: list[dict] = []
+        self.gates: Counter = Counter()
+        self.counters: dict[str, int] = {}
+        self.info: dict[str, object] = {}
+        self.slow_tickers = max(0, int(slow_tickers))
+        self._ticker_seconds: list[float] = []
+        self._slowest: list[tuple[float, str]] = []  # min-heap of the N slowest
+
+    def add_time(self, stage: str, seconds: float, calls: int = 1) -> None:
+        entry = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += float(seconds)
+        entry["calls"] += int(calls)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = self._clock()
+        try:
+            yield
+        finally:
+            self.add_time(name, self._clock() - t0)
+
+    def record_batch(self, kind: str, symbols: int, seconds: float, *, attempt: int, ok: bool) -> None:
+        self.batches.append(
+            {
+                "kind": kind,
+                "symbols": int(symbols),
+                "seconds": round(float(seconds), 6),
+                "attempt": int(attempt),
+                "ok": bool(ok),
+            }
+        )
+
+    def record_ticker(self, ticker: str, seconds: float) -> None:
+        self._ticker_seconds.append(seconds)
+        if not self.slow_tickers:
+            return
+        item = (seconds, ticker)
+        if len(self._slowest) < self.slow_tickers:
+            heapq.heappush(self._slowest, item)
+        elif item > self._slowest[0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def finish(self, status: str = "ok", counters: Mapping[str, int] | None = None) -> None:
+        self.status = status
+        self.finished_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.info["duration_s"] = round(self._clock() - self._t0, 6)
+        if counters is not None:
+            self.counters = {k: int(v) for k, v in counters.items()}
+
+    def ticker_summary(self) -> dict:
+        values = sorted(self._ticker_seconds)
+        summary = {
+            "count": len(values),
+            "total_s": round(sum(values), 6),
+            "max_s": round(values[-1], 6) if values else 0.0,
+        }
+        for q in _QUANTILES:
+            summary[f"p{int(q * 100)}_s"] = round(_quantile(values, q), 6)
+        return summary
+
+    def to_dict(self) -> dict:
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "status": self.status,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "info": dict(self.info),
+            "stages": {
+                name: {"seconds": round(v["seconds"], 6), "calls": int(v["calls"])}
+                for name, v in self.stages.items()
+            },
+            "history_batches": list(self.batches),
+            "gates": dict(sorted(self.gates.items())),
+            "counters": dict(sorted(self.counters.items())),
+            "tickers": self.ticker_summary(),
+            "slowest_tickers": [
+                {"ticker": t, "seconds": round(s, 6)} for s, t in sorted(self._slowest, reverse=True)
+            ],
+        }
+
+    def to_prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        lines: list[str] = []
+
+        def _family(name: str, kind: str, help_text: str, samples: list[tuple[dict, float]]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{_labels(labels)} {_num(value)}")
+
+        duration = float(self.info.get("duration_s", 0.0) or 0.0)
+        _family("duration_seconds", "gauge", "Wall time of the last scan run.", [({}, duration)])
+        _family(
+            "success",
+            "gauge",
+            "1 when the last scan run finished with status ok.",
+            [({"status": self.status}, 1.0 if self.status == "ok" else 0.0)],
+        )
+        _family(
+            "last_run_timestamp_seconds",
+            "gauge",
+            "Unix time the last scan run finished.",
+            [({}, time.time())],
+        )
+        _family(
+            "stage_seconds",
+            "gauge",
+            "Wall time per run_scan stage.",
+            [({"stage": k}, v["seconds"]) for k, v in self.stages.items()],
+        )
+        _family(
+            "stage_calls",
+            "gauge",
+            "Times each run_scan stage was entered.",
+            [({"stage": k}, v["calls"]) for k, v in self.stages.items()],
+        )
+        _family(
+            "gate_total",
+            "gauge",
+            "Tickers per scan gate outcome.",
+            [({"gate": k}, v) for k, v in sorted(self.gates.items())],
+        )
+        _family(
+            "diag_total",
+            "gauge",
+            "PBT_DIAG error counters.",
+            [({"counter": k}, v) for k, v in sorted(self.counters.items())],
+        )
+        batch_totals: dict[str, list[float]] = {}
+        for b in self.batches:
+            agg = batch_totals.setdefault(b["kind"], [0.0, 0.0, 0.0])
+            agg[0] += 1
+            agg[1] += b["seconds"]
+            agg[2] += 0 if b["ok"] else 1
+        _family(
+            "history_batch_requests",
+            "gauge",
+            "History fetch requests per batch kind.",
+            [({"kind": k}, v[0]) for k, v in batch_totals.items()],
+        )
+        _family(
+            "history_batch_seconds",
+            "gauge",
+            "Summed request time per history batch kind.",
+            [({"kind": k}, v[1]) for k, v in batch_totals.items()],
+        )
+        _family(
+            "history_batch_failures",
+            "gauge",
+            "Failed history fetch requests per batch kind.",
+            [({"kind": k}, v[2]) for k, v in batch_totals.items()],
+        )
+        summary = self.ticker_summary()
+        _family(
+            "ticker_seconds",
+            "summary",
+            "Per-ticker candidate evaluation time.",
+            [({"quantile": str(q)}, summary[f"p{int(q * 100)}_s"]) for q in _QUANTILES],
+        )
+        lines.append(f"{prefix}_ticker_seconds_sum {_num(summary['total_s'])}")
+        lines.append(f"{prefix}_ticker_seconds_count {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: Path | str) -> Path:
+        return _atomic_write(Path(path), json.dumps(self.to_dict(), indent=2, sort_keys=True) + "\n")
+
+    def write_prometheus(self, path: Path | str) -> Path:
+        return _atomic_write(Path(path), self.to_prometheus())
+
+
+def report_path_for(candidates_path: Path | str) -> Path:
+    """daily_candidates.csv -> daily_candidates.report.json (same directory)."""
+    path = Path(candidates_path)
+    return path.with_name(f"{path.stem}.report.json")
+
+
+def _labels(labels: Mapping[str, object]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        text = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{text}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _num(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(round(value, 6))
+
+
+def _atomic_write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+    return path
@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 from statistics import stdev
+from typing import Mapping
 
 from analytics.regime_transition import RegimeTransitionDetector
 from data.prices import PriceProvider, get_default_price_provider
@@ -232,6 +233,59 @@ def run_single_backtest(
     )
 
 
+# ---------------------------------------------------------------------------
+# Equity-curve metrics
+# ---------------------------------------------------------------------------
+
+def summarize_equity_curve(
+    equity_curve: list[tuple[date, float, float]], initial_capital: float
+) -> dict[str, float]:
+    """Headline metrics (return, CAGR, vol, Sharpe, max DD) for an equity curve."""
+    if not equity_curve:
+        return {}
+    final_equity = equity_curve[-1][1]
+    max_drawdown = min(dd for _, _, dd in equity_curve)
+    total_return = (final_equity / initial_capital) - 1.0
+    n_years = len(equity_curve) / 252
+    cagr = (final_equity / initial_capital) ** (1 / max(n_years, 0.01)) - 1.0 if n_years > 0 else 0.0
+
+    # Annualized vol from equity curve
+    eq_returns = []
+    for i in range(1, len(equity_curve)):
+        eq_returns.append(equity_curve[i][1] / equity_curve[i - 1][1] - 1)
+    ann_vol = stdev(eq_returns) * math.sqrt(252) if len(eq_returns) > 1 else 0.0
+    sharpe = cagr / ann_vol if ann_vol > 0 else 0.0
+    return {
+        "final_equity": final_equity,
+        "total_return": total_return,
+        "cagr": cagr,
+        "ann_vol": ann_vol,
+        "sharpe": sharpe,
+        "max_drawdown": max_drawdown,
+        "n_trading_days": len(equity_curve),
+    }
+
+
+def combine_equity_curves(
+    sub_results: Mapping[str, BacktestResult],
+    trading_days: list[date],
+    initial_capital: float,
+) -> list[tuple[date, float, float]]:
+    """Sum sub-strategy equity curves day by day (coordinator book)."""
+    combined_curve: list[tuple[date, float, float]] = []
+    combined_peak = initial_capital
+    for i in range(len(trading_days)):
+        combined_eq = 0.0
+        for result in sub_results.values():
+            curve = result.equity_curve
+            if i < len(curve):
+                combined_eq += curve[i][1]
+        combined_peak = max(combined_peak, combined_eq)
+        dd = (combined_eq / combined_peak) - 1.0
+        combined_curve.append((trading_days[i], combined_eq, dd))
+    return combined_curve
+
+
 # ---------------------------------------------------------------------------
 # Results printing
 # ---------------------------------------------------------------------------
@@ -326,19 +380,14 @@ def print_backtest_results(
         print("No equity curve data.")
         return
 
-    final_equity = equity_curve[-1][1]
-    max_drawdown = min(dd for _, _, dd in equity_curve)
-    total_return = (final_equity / initial_capital) - 1.0
-    n_days = len(equity_curve)
-    n_years = n_days / 252
-    cagr = (final_equity / initial_capital) ** (1 / max(n_years, 0.01)) - 1.0 if n_years > 0 else 0.0
-
-    # Annualized vol from equity curve
-    eq_returns = []
-    for i in range(1, len(equity_curve)):
-        eq_returns.append(equity_curve[i][1] / equity_curve[i - 1][1] - 1)
-    ann_vol = stdev(eq_returns) * math.sqrt(252) if len(eq_returns) > 1 else 0.0
-    sharpe = cagr / ann_vol if ann_vol > 0 else 0.0
+    metrics = summarize_equity_curve(equity_curve, initial_capital)
+    final_equity = metrics["final_equity"]
+    max_drawdown = metrics["max_drawdown"]
+    total_return = metrics["total_return"]
+    n_days = metrics["n_trading_days"]
+    cagr = metrics["cagr"]
+    ann_vol = metrics["ann_vol"]
+    sharpe = metrics["sharpe"]
 
     # Monthly return stats
     monthly_rets = [v - 1.0 for v in result.monthly_returns.values()]
@@ -461,30 +510,14 @@ def run_coordinator_backtest(
         sub_results[key] = result
 
     # Combine equity curves
-    combined_curve: list[tuple[date, float, float]] = []
-    combined_peak = initial_capital
-    for i in range(len(trading_days)):
-        combined_eq = 0.0
-        for key in strategies:
-            curve = sub_results[key].equity_curve
-            if i < len(curve):
-                combined_eq += curve[i][1]
-        combined_peak = max(combined_peak, combined_eq)
-        dd = (combined_eq / combined_peak) - 1.0
-        combined_curve.append((trading_days[i], combined_eq, dd))
-
-    final_equity = combined_curve[-1][1] if combined_curve else initial_capital
-    max_drawdown = min(dd for _, _, dd in combined_curve) if combined_curve else 0.0
-
-    total_return = (final_equity / initial_capital) - 1.0
-    n_years = len(trading_days) / 252
-    cagr = (final_equity / initial_capital) ** (1 / max(n_years, 0.01)) - 1.0 if n_years > 0 else 0.0
-
-    eq_returns = []
-    for i in range(1, len(combined_curve)):
-        eq_returns.append(combined_curve[i][1] / combined_curve[i - 1][1] - 1)
-    ann_vol = stdev(eq_returns) * math.sqrt(252) if len(eq_returns) > 1 else 0.0
-    sharpe = cagr / ann_vol if ann_vol > 0 else 0.0
+    combined_curve = combine_equity_curves(sub_results, trading_days, initial_capital)
+    metrics = summarize_equity_curve(combined_curve, initial_capital)
+    final_equity = metrics["final_equity"]
+    max_drawdown = metrics["max_drawdown"]
+    total_return = metrics["total_return"]
+    cagr = metrics["cagr"]
+    ann_vol = metrics["ann_vol"]
+    sharpe = metrics["sharpe"]
 
     # Monthly returns
     monthly_returns: dict[str, float] = {}
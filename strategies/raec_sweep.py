@@ -0,0 +1,357 @@
+"""Parameter sweeps for the RAEC v6 and 401(k) backtests.
+
+Loads prices once, fans each grid configuration out to a process pool and
+writes one comparison table for the whole sweep:
+
+- prices are fetched a single time in the parent and handed to every
+  worker as a read-only FixturePriceProvider (inherited copy-on-write
+  where the platform forks; pickled once per worker otherwise)
+- each configuration is an independent backtest (no shared mutable state)
+- results land in <out>/summary_table.csv and <out>/leaderboard.json,
+  mirroring backtest_sweep's comparison outputs
+
+Sweep spec (JSON/YAML, same shape as backtest_sweep):
+    {"base_params": {...}, "grid": {"param": [v1, v2, ...], ...}}
+
+Parameter names per target:
+- v6: starting_cash, top_k.<STRATEGY_ID>,
+  allocator.<allocate kwarg>, overlay.<apply_overlay kwarg>
+- v3 / v4 / v5: initial_capital and numeric StrategyConfig fields
+- coordinator: initial_capital, split.<v3|v4|v5>, <v3|v4|v5>.<StrategyConfig field>
+
+Usage:
+    venv/bin/python -m strategies.raec_sweep --target v6 \\
+        --start 2022-01-01 --end 2026-06-01 --sweep sweeps/v6.yaml \\
+        --out backtests/raec_v6_sweep/ --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+from backtest_sweep import expand_grid, load_sweep_spec
+from data.prices import FixturePriceProvider, PriceProvider, get_default_price_provider
+from strategies import raec_401k_backtest as bt401k
+from strategies.raec_401k_base import StrategyConfig
+from strategies.raec_401k_coordinator import DEFAULT_CAPITAL_SPLIT
+from strategies.raec_v6 import backtest_runner as v6
+from utils.atomic_write import atomic_write_csv, atomic_write_json
+
+TARGETS = ("v6", "v3", "v4", "v5", "coordinator")
+
+_401K_STRATEGY_IDS = {
+    "v3": "RAEC_401K_V3",
+    "v4": "RAEC_401K_V4",
+    "v5": "RAEC_401K_V5",
+}
+
+# run_backtest takes rebalance_threshold_pct but does not apply it yet; it is
+# left out so a sweep over it cannot return identical rows per value.
+V6_RUN_PARAMS = {"starting_cash"}
+V6_ALLOCATOR_PARAMS = {
+    "turnover_damper_per_day",
+    "per_symbol_cap",
+    "correlation_threshold",
+    "correlation_lookback",
+}
+V6_OVERLAY_PARAMS = {"target_vol_multiplier", "floor_exposure", "ceiling_exposure"}
+
+# StrategyConfig fields that make sense to sweep (numeric knobs only).
+STRATEGY_CONFIG_PARAMS = {
+    f.name for f in fields(StrategyConfig) if f.type in ("int", "float")
+}
+
+LEADERBOARD_METRICS = {
+    "total_return": "desc",
+    "cagr": "desc",
+    "sharpe": "desc",
+    # Drawdowns are <= 0; the shallowest ranks first.
+    "max_drawdown": "desc",
+}
+
+# Set in each worker by _init_worker.
+_WORKER_PROVIDER: FixturePriceProvider | None = None
+
+
+# ---------------------------------------------------------------------------
+# Parameter handling
+# ---------------------------------------------------------------------------
+
+def _validate_params(target: str, params: dict[str, Any]) -> None:
+    if target not in TARGETS:
+        raise ValueError(f"Unknown sweep target {target!r}; expected one of {TARGETS}")
+    for key in params:
+        prefix, _, name = key.partition(".")
+        if target == "v6":
+            ok = (
+                key in V6_RUN_PARAMS
+                or (prefix == "top_k" and name in v6.DEFAULT_TOP_K)
+                or (prefix == "allocator" and name in V6_ALLOCATOR_PARAMS)
+                or (prefix == "overlay" and name in V6_OVERLAY_PARAMS)
+            )
+        elif target == "coordinator":
+            ok = (
+                key == "initial_capital"
+                or (prefix == "split" and name in _401K_STRATEGY_IDS)
+                or (prefix in _401K_STRATEGY_IDS and name in STRATEGY_CONFIG_PARAMS)
+            )
+        else:
+            ok = key == "initial_capital" or key in STRATEGY_CONFIG_PARAMS
+        if not ok:
+            raise ValueError(f"Unsupported sweep parameter for {target}: {key}")
+
+
+def build_configs(target: str, spec: dict) -> list[dict[str, Any]]:
+    """Expand a sweep spec into the ordered list of parameter dicts."""
+    base = dict(spec.get("base_params") or {})
+    configs = [{**base, **combo} for combo in expand_grid(spec.get("grid") or {})]
+    for params in configs:
+        _validate_params(target, params)
+    return configs
+
+
+# ---------------------------------------------------------------------------
+# Price loading
+# ---------------------------------------------------------------------------
+
+def _401k_strategies() -> dict[str, Any]:
+    from strategies.raec_401k_registry import get
+    # Ensure sub-strategy modules are imported (triggers registration)
+    from strategies import raec_401k_v3, raec_401k_v4, raec_401k_v5  # noqa: F401
+
+    return {key: get(sid) for key, sid in _401K_STRATEGY_IDS.items()}
+
+
+def sweep_symbols(target: str) -> list[str]:
+    """Every symbol a backtest for `target` reads prices for."""
+    if target == "v6":
+        return list(v6._BT_SYMBOLS)
+    keys = list(_401K_STRATEGY_IDS) if target == "coordinator" else [target]
+    strategies = _401k_strategies()
+    symbols: set[str] = {"VTI", "QQQ", "BIL"}
+    for key in keys:
+        strat = strategies[key]
+        symbols.update(strat.DEFAULT_UNIVERSE)
+        symbols.add(strat.FALLBACK_CASH_SYMBOL)
+    return sorted(symbols)
+
+
+def load_prices(
+    symbols: list[str], provider: PriceProvider | None = None
+) -> dict[str, list[tuple[date, float]]]:
+    """Fetch each symbol once (10y yfinance by default) into plain lists."""
+    src = provider or get_default_price_provider(".", period="10y")
+    series: dict[str, list[tuple[date, float]]] = {}
+    for sym in sorted({s.upper() for s in symbols}):
+        data = src.get_daily_close_series(sym)
+        if data:
+            series[sym] = list(data)
+        else:
+            print(f"[sweep] WARN: no data for {sym}; skipping.")
+    return series
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+def _init_worker(series: dict[str, list[tuple[date, float]]]) -> None:
+    global _WORKER_PROVIDER
+    _WORKER_PROVIDER = FixturePriceProvider(series)
+
+
+def _run_v6(params: dict[str, Any], start: date, end: date) -> dict[str, Any]:
+    grouped: dict[str, dict[str, Any]] = {"top_k": {}, "allocator": {}, "overlay": {}}
+    run_kwargs: dict[str, Any] = {}
+    for key, value in params.items():
+        prefix, _, name = key.partition(".")
+        if name:
+            grouped[prefix][name] = value
+        else:
+            run_kwargs[key] = value
+    summary = v6.run_backtest(
+        start=start,
+        end=end,
+        provider=_WORKER_PROVIDER,
+        top_k=grouped["top_k"],
+        allocator_params=grouped["allocator"],
+        overlay_params=grouped["overlay"],
+        **run_kwargs,
+    )
+    return {
+        key: summary.get(key)
+        for key in (
+            "end_equity",
+            "total_return",
+            "cagr",
+            "sharpe",
+            "max_drawdown",
+            "realized_vol_annualized",
+            "n_trades",
+            "spy_total_return",
+            "alpha_vs_spy",
+            "deflated_sharpe_p_value",
+            "cpcv_mean_oos_sharpe",
+        )
+    }
+
+
+def _run_401k(target: str, params: dict[str, Any], start: date, end: date) -> dict[str, Any]:
+    strategies = _401k_strategies()
+    keys = list(_401K_STRATEGY_IDS) if target == "coordinator" else [target]
+    initial_capital = float(params.get("initial_capital", 100_000.0))
+    split = (
+        {key: float(params.get(f"split.{key}", DEFAULT_CAPITAL_SPLIT[key])) for key in keys}
+        if target == "coordinator"
+        else {target: 1.0}
+    )
+
+    sub_results: dict[str, bt401k.BacktestResult] = {}
+    for key in keys:
+        prefix = f"{key}." if target == "coordinator" else ""
+        overrides = {
+            name[len(prefix):]: value
+            for name, value in params.items()
+            if name.startswith(prefix) and name[len(prefix):] in STRATEGY_CONFIG_PARAMS
+        }
+        base = strategies[key]
+        strategy = type(base)(replace(base.config, **overrides)) if overrides else base
+        result = bt401k.run_single_backtest(
+            strategy=strategy,
+            start_date=start.isoformat(),
+            end_date=end.isoformat(),
+            initial_capital=initial_capital * split[key],
+            provider=_WORKER_PROVIDER,
+        )
+        if result is None:
+            return {}
+        sub_results[key] = result
+
+    trading_days = [d for d, _, _ in next(iter(sub_results.values())).equity_curve]
+    curve = bt401k.combine_equity_curves(sub_results, trading_days, initial_capital)
+    metrics = bt401k.summarize_equity_curve(curve, initial_capital)
+    metrics["rebalance_count"] = sum(r.rebalance_count for r in sub_results.values())
+    return metrics
+
+
+def _run_config(
+    target: str, params: dict[str, Any], start: date, end: date
+) -> dict[str, Any]:
+    if target == "v6":
+        return _run_v6(params, start, end)
+    return _run_401k(target, params, start, end)
+
+
+# ---------------------------------------------------------------------------
+# Comparison outputs
+# ---------------------------------------------------------------------------
+
+def build_leaderboard(rows: list[dict[str, Any]], top_n: int = 5) -> dict:
+    leaderboard = {}
+    for metric, direction in LEADERBOARD_METRICS.items():
+        filtered = [row for row in rows if row.get(metric) is not None]
+        sign = -1.0 if direction == "desc" else 1.0
+        filtered.sort(key=lambda r: (sign * float(r[metric]), r["run_id"]))
+        leaderboard[metric] = [
+            {"run_id": row["run_id"], "value": row[metric]} for row in filtered[:top_n]
+        ]
+    return leaderboard
+
+
+def _mp_context():
+    # Fork shares the parent's loaded prices copy-on-write.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def run_sweep(
+    *,
+    target: str,
+    start: date,
+    end: date,
+    spec: dict,
+    out_dir: Path | None = None,
+    max_workers: int | None = None,
+    prices: dict[str, list[tuple[date, float]]] | None = None,
+    progress: Callable[[str], None] | None = print,
+) -> list[dict[str, Any]]:
+    """Run every configuration in `spec` for `target`; return one row per run.
+
+    `prices` (symbol -> [(date, close)]) skips the download, e.g. to reuse
+    one load across several sweeps. `max_workers=1` runs in-process.
+    """
+    configs = build_configs(target, spec)
+    if prices is None:
+        prices = load_prices(sweep_symbols(target))
+
+    args = [(target, params, start, end) for params in configs]
+    if max_workers == 1 or len(configs) <= 1:
+        _init_worker(prices)
+        results = [_run_config(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=_mp_context(),
+            initializer=_init_worker,
+            initargs=(prices,),
+        ) as pool:
+            results = list(pool.map(_run_config, *zip(*args)))
+
+    rows: list[dict[str, Any]] = []
+    for idx, (params, metrics) in enumerate(zip(configs, results)):
+        row = {"run_id": f"run_{idx:03d}", **params, **metrics}
+        rows.append(row)
+        if progress is not None:
+            progress(
+                f"[sweep] {row['run_id']} total_return={row.get('total_return')} "
+                f"sharpe={row.get('sharpe')} params={params}"
+            )
+
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_csv(pd.DataFrame(rows), out_dir / "summary_table.csv")
+        atomic_write_json(build_leaderboard(rows), out_dir / "leaderboard.json")
+        atomic_write_json(
+            {
+                "target": target,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "spec": spec,
+            },
+            out_dir / "sweep_spec.json",
+        )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run RAEC v6 / 401(k) backtest sweeps.")
+    parser.add_argument("--target", required=True, choices=TARGETS)
+    parser.add_argument("--start", required=True, type=date.fromisoformat)
+    parser.add_argument("--end", required=True, type=date.fromisoformat)
+    parser.add_argument("--sweep", required=True, type=Path, help="Sweep spec JSON/YAML.")
+    parser.add_argument("--out", required=True, type=Path)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size.")
+    args = parser.parse_args()
+    rows = run_sweep(
+        target=args.target,
+        start=args.start,
+        end=args.end,
+        spec=load_sweep_spec(args.sweep),
+        out_dir=args.out,
+        max_workers=args.workers,
+    )
+    print(f"[sweep] {len(rows)} runs -> {args.out / 'summary_table.csv'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -24,9 +24,9 @@ import argparse
 import json
 import math
 from dataclasses import asdict
-from datetime import date, timedelta
+from datetime import date
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Mapping, Sequence
 
 from analytics.cpcv import generate_cpcv_splits
 from analytics.deflated_sharpe import deflated_sharpe_ratio
@@ -36,15 +36,16 @@ from strategies.raec_v6.allocator import allocate
 from strategies.raec_v6.overlay import apply_overlay
 from strategies.raec_v6.shadow_book import ShadowBook
 from strategies.raec_v6.signal_state import SignalState
-from strategies.raec_v6.signals.credit_spread import compute_credit_spread_signal
+from strategies.raec_v6.signals._series import closes_with_ends, trailing
+from strategies.raec_v6.signals.credit_spread import compute_credit_spread_signal_series
 from strategies.raec_v6.signals.cross_asset_trend import (
     REPRESENTATIVES,
-    compute_cross_asset_trend,
+    compute_cross_asset_trend_series,
 )
-from strategies.raec_v6.signals.regime_label import classify_from_spy_closes
-from strategies.raec_v6.signals.vix_implied import compute_vix_implied
-from strategies.raec_v6.signals.vol_percentile import compute_vol_percentile
-from strategies.raec_v6.signals.yield_curve import compute_yield_curve_signal
+from strategies.raec_v6.signals.regime_label import classify_series_from_spy
+from strategies.raec_v6.signals.vix_implied import compute_vix_implied_series
+from strategies.raec_v6.signals.vol_percentile import compute_vol_percentile_series
+from strategies.raec_v6.signals.yield_curve import compute_yield_curve_signal_series
 from strategies.raec_v6.strategies.bond_carry import BondCarry
 from strategies.raec_v6.strategies.crisis_alpha import CrisisAlpha
 from strategies.raec_v6.strategies.cross_asset_trend import CrossAssetTrend
@@ -89,6 +90,15 @@ _BT_SYMBOLS: tuple[str, ...] = tuple(
 )
 
 
+# Default top_k per strategy_id for the strategies that take one.
+DEFAULT_TOP_K: Mapping[str, int] = {
+    "V6_CROSS_ASSET_TREND": 4,
+    "V6_EQUITY_LEV_MOMENTUM": 5,
+    "V6_SECTOR_RS": 4,
+    "V6_THEMATIC_CONVICTION": 3,
+}
+
+
 def _prefetch_prices(
     symbols: Iterable[str], period: str = "10y"
 ) -> FixturePriceProvider:
@@ -138,8 +148,14 @@ def _daily_returns_window(
     return rs
 
 
-def _spy_realized_vol_60d(provider: FixturePriceProvider, asof: date) -> float:
-    rs = _daily_returns_window(provider, "SPY", asof, 60)
+def _realized_vol_60d(closes: list[float]) -> float:
+    """Annualized vol of the last 60 daily returns in `closes` (0.0 if <20)."""
+    closes = closes[-61:]
+    rs = [
+        closes[i] / closes[i - 1] - 1.0
+        for i in range(1, len(closes))
+        if closes[i - 1] > 0
+    ]
     if len(rs) < 20:
         return 0.0
     mean = sum(rs) / len(rs)
@@ -149,10 +165,45 @@ def _spy_realized_vol_60d(provider: FixturePriceProvider, asof: date) -> float:
     return math.sqrt(var) * math.sqrt(252)
 
 
-def _is_trading_day(provider: FixturePriceProvider, asof: date) -> bool:
-    """SPY traded on this date in the cache."""
+def _trading_days(provider: FixturePriceProvider, start: date, end: date) -> list[date]:
+    """Dates in [start, end] on which SPY traded in the cache."""
     series = provider.get_daily_close_series("SPY")
-    return any(d == asof for d, _ in series)
+    return sorted({d for d, _ in series if start <= d <= end})
+
+
+def build_signal_panel(
+    provider: FixturePriceProvider, dates: Sequence[date]
+) -> dict[date, SignalState]:
+    """Precompute the SignalState for every date in `dates`.
+
+    Uses the batched series form of each signal, so each symbol's history
+    is read once for the whole range instead of once per day. Values match
+    building the state per date from the scalar signal functions.
+    """
+    dates = list(dates)
+    trend = compute_cross_asset_trend_series(provider, dates)
+    vol_pct = compute_vol_percentile_series(provider, ["SPY"], dates)
+    yc_signal = compute_yield_curve_signal_series(provider, dates)
+    cs_signal = compute_credit_spread_signal_series(provider, dates)
+    vix = compute_vix_implied_series(provider, dates)
+    regime = classify_series_from_spy(provider, dates)
+    spy_closes, spy_ends = closes_with_ends(provider, "SPY", dates)
+
+    panel: dict[date, SignalState] = {}
+    for asof, spy_end in zip(dates, spy_ends):
+        regime_label, regime_conf = regime[asof]
+        panel[asof] = SignalState(
+            asof_date=asof,
+            regime_label=regime_label,
+            regime_confidence=regime_conf,
+            cross_asset_trend=trend[asof],
+            vol_percentile_252d=vol_pct[asof],
+            spy_realized_vol_60d=_realized_vol_60d(trailing(spy_closes, spy_end, 61)),
+            vix_implied=vix[asof] or 0.0,
+            yield_curve_signal=yc_signal[asof],
+            credit_spread_signal=cs_signal[asof],
+        )
+    return panel
 
 
 def run_backtest(
@@ -162,18 +213,32 @@ def run_backtest(
     starting_cash: float = 230_000.0,
     rebalance_threshold_pct: float = 5.0,  # L1 drift threshold for trade
     out_dir: Path | None = None,
+    provider: FixturePriceProvider | None = None,
+    top_k: Mapping[str, int] | None = None,
+    allocator_params: Mapping[str, float] | None = None,
+    overlay_params: Mapping[str, float] | None = None,
 ) -> dict:
-    """Run the v6 backtest. Returns a summary dict; writes CSV/JSON if out_dir given."""
-    provider = _prefetch_prices(_BT_SYMBOLS)
+    """Run the v6 backtest. Returns a summary dict; writes CSV/JSON if out_dir given.
+
+    `provider` defaults to a fresh yfinance prefetch of _BT_SYMBOLS; sweeps
+    pass one preloaded provider to every run. `top_k` overrides
+    DEFAULT_TOP_K by strategy_id; `allocator_params` / `overlay_params` are
+    forwarded as keyword overrides to allocate() / apply_overlay().
+    """
+    if provider is None:
+        provider = _prefetch_prices(_BT_SYMBOLS)
+    k = {**DEFAULT_TOP_K, **(top_k or {})}
+    allocator_params = dict(allocator_params or {})
+    overlay_params = dict(overlay_params or {})
     book = ShadowBook(starting_cash=starting_cash, slippage_bps=5.0)
     spy_curve: list[float] = []  # SPY equity curve for benchmark
     spy_shares: float | None = None
 
     strategies = [
-        CrossAssetTrend(top_k=4),
-        EquityLeveragedMomentum(top_k=5),
-        SectorRelativeStrength(top_k=4),
-        ThematicConviction(top_k=3),
+        CrossAssetTrend(top_k=k["V6_CROSS_ASSET_TREND"]),
+        EquityLeveragedMomentum(top_k=k["V6_EQUITY_LEV_MOMENTUM"]),
+        SectorRelativeStrength(top_k=k["V6_SECTOR_RS"]),
+        ThematicConviction(top_k=k["V6_THEMATIC_CONVICTION"]),
         BondCarry(),
         CryptoTrend(),
         CrisisAlpha(),
@@ -193,17 +258,13 @@ def run_backtest(
     # Walk trading days. We rebalance daily but the shadow book's
     # min_trade_pct filter will skip noise; we ADDITIONALLY skip trade
     # passes when L1 drift between current and target is < threshold.
-    asof = start
+    trading_days = _trading_days(provider, start, end)
+    signal_panel = build_signal_panel(provider, trading_days)
     record: list[dict] = []
-    while asof <= end:
-        if not _is_trading_day(provider, asof):
-            asof += timedelta(days=1)
-            continue
-
+    for asof in trading_days:
         # SPY benchmark: full equity to SPY on day 1, then MTM only.
         spy_px = _close_at(provider, "SPY", asof)
         if spy_px is None or spy_px <= 0:
-            asof += timedelta(days=1)
             continue
         if spy_shares is None:
             spy_shares = starting_cash / spy_px
@@ -227,30 +288,10 @@ def run_backtest(
                 r += w * symbol_daily_returns.get(sym, 0.0)
             strategy_returns[sid].append(r)
 
-        # Build signals.
-        trend = compute_cross_asset_trend(provider, asof)
-        spy_vol = _spy_realized_vol_60d(provider, asof)
-        # Vol percentile for SPY (used by EquityLeveragedMomentum + CrisisAlpha gates).
-        vol_pct = compute_vol_percentile(provider, ["SPY"], asof)
-        # Cross-asset structural signals.
-        yc_signal = compute_yield_curve_signal(provider, asof)
-        cs_signal = compute_credit_spread_signal(provider, asof)
-        vix_v = compute_vix_implied(provider, asof) or 0.0
-        # Regime label (lightweight, matches E1 classifier thresholds).
-        spy_series = provider.get_daily_close_series("SPY")
-        spy_closes_at = [c for d, c in spy_series if d <= asof]
-        regime_label, regime_conf = classify_from_spy_closes(spy_closes_at)
-        state = SignalState(
-            asof_date=asof,
-            regime_label=regime_label,
-            regime_confidence=regime_conf,
-            cross_asset_trend=trend,
-            vol_percentile_252d=vol_pct,
-            spy_realized_vol_60d=spy_vol,
-            vix_implied=vix_v,
-            yield_curve_signal=yc_signal,
-            credit_spread_signal=cs_signal,
-        )
+        # Signals (precomputed for the whole range).
+        state = signal_panel[asof]
+        spy_vol = state.spy_realized_vol_60d
+        vix_v = state.vix_implied
 
         # Call strategies.
         outputs: dict[str, object] = {}
@@ -284,6 +325,7 @@ def run_backtest(
             has_live_history=has_history,
             prior_shares=prior_strategy_shares,
             strategy_returns=strategy_returns,
+            **allocator_params,
         )
         prior_strategy_shares = dict(alloc.strategy_shares)
         prior_contributions = {
@@ -302,6 +344,7 @@ def run_backtest(
             per_symbol_daily_returns=per_symbol_returns,
             equity_curve=book.equity_curve,
             dd_breaker_currently_active=dd_breaker_active,
+            **overlay_params,
         )
         dd_breaker_active = overlay.dd_breaker_active
 
@@ -350,7 +393,6 @@ def run_backtest(
             "strategy_shares": dict(alloc.strategy_shares),
             "n_positions": len(step.positions),
         })
-        asof += timedelta(days=1)
 
     summary = book.summary()
     if spy_curve:
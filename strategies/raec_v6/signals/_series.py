@@ -0,0 +1,33 @@
+"""Date alignment shared by the batched ("series") signal forms.
+
+The per-date signal functions re-filter a symbol's full close history on
+every call, which dominates a multi-year backtest. The series forms load
+each symbol once and bisect every as-of date into it; the trailing window
+for a date is then ``closes[end - lookback:end]``, the same list the
+per-date function builds, so the two forms return identical values.
+
+Price providers return series in ascending date order.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import date
+from typing import Sequence
+
+from data.prices import PriceProvider
+
+
+def closes_with_ends(
+    provider: PriceProvider, symbol: str, dates: Sequence[date]
+) -> tuple[list[float], list[int]]:
+    """Return ``(closes, ends)`` where ``ends[i]`` counts closes dated ≤ ``dates[i]``."""
+    series = provider.get_daily_close_series(symbol)
+    days = [d for d, _ in series]
+    closes = [c for _, c in series]
+    return closes, [bisect_right(days, asof) for asof in dates]
+
+
+def trailing(closes: list[float], end: int, lookback: int) -> list[float]:
+    """``[c for d, c in series if d <= asof][-lookback:]`` given ``end``."""
+    return closes[max(0, end - lookback) : end]
@@ -17,8 +17,10 @@ Used by:
 from __future__ import annotations
 
 from datetime import date
+from typing import Sequence
 
 from data.prices import PriceProvider
+from strategies.raec_v6.signals._series import closes_with_ends, trailing
 
 
 def _closes_up_to(provider: PriceProvider, sym: str, asof: date, n: int = 280) -> list[float]:
@@ -41,8 +43,24 @@ def compute_credit_spread_signal(
 ) -> float | None:
     """Return signed credit-spread direction signal (positive = spreads
     tightening / credit favorable), or None if insufficient data."""
-    hyg = _closes_up_to(provider, "HYG", asof)
-    ief = _closes_up_to(provider, "IEF", asof)
+    return _signal_from_closes(
+        _closes_up_to(provider, "HYG", asof), _closes_up_to(provider, "IEF", asof)
+    )
+
+
+def compute_credit_spread_signal_series(
+    provider: PriceProvider, dates: Sequence[date]
+) -> dict[date, float | None]:
+    """Batched form of compute_credit_spread_signal for every date in `dates`."""
+    hyg, hyg_ends = closes_with_ends(provider, "HYG", dates)
+    ief, ief_ends = closes_with_ends(provider, "IEF", dates)
+    return {
+        asof: _signal_from_closes(trailing(hyg, h_end, 280), trailing(ief, i_end, 280))
+        for asof, h_end, i_end in zip(dates, hyg_ends, ief_ends)
+    }
+
+
+def _signal_from_closes(hyg: list[float], ief: list[float]) -> float | None:
     if len(hyg) < 130 or len(ief) < 130:
         return None
     hyg_3mo = _return_over(hyg, 63)
@@ -19,9 +19,10 @@ from __future__ import annotations
 
 import math
 from datetime import date
-from typing import Mapping
+from typing import Mapping, Sequence
 
 from data.prices import PriceProvider
+from strategies.raec_v6.signals._series import closes_with_ends, trailing
 
 
 # Representative ETF for each asset class. Strict — every class that we
@@ -46,8 +47,11 @@ REPRESENTATIVES: Mapping[str, str] = {
 }
 
 
+_MAX_LOOKBACK = 280
+
+
 def _closes_up_to(
-    provider: PriceProvider, symbol: str, asof: date, max_lookback: int = 280
+    provider: PriceProvider, symbol: str, asof: date, max_lookback: int = _MAX_LOOKBACK
 ) -> list[float]:
     series = provider.get_daily_close_series(symbol)
     if not series:
@@ -100,3 +104,22 @@ def compute_cross_asset_trend(
         if score is not None and math.isfinite(score):
             out[asset_class] = score
     return out
+
+
+def compute_cross_asset_trend_series(
+    provider: PriceProvider,
+    dates: Sequence[date],
+) -> dict[date, dict[str, float]]:
+    """Batched form of compute_cross_asset_trend for every date in `dates`.
+
+    Each representative's history is loaded once; values are identical to
+    calling compute_cross_asset_trend per date.
+    """
+    out: dict[date, dict[str, float]] = {asof: {} for asof in dates}
+    for asset_class, sym in REPRESENTATIVES.items():
+        closes, ends = closes_with_ends(provider, sym, dates)
+        for asof, end in zip(dates, ends):
+            score = _trend_score(trailing(closes, end, _MAX_LOOKBACK))
+            if score is not None and math.isfinite(score):
+                out[asof][asset_class] = score
+    return out
@@ -19,6 +19,10 @@ from __future__ import annotations
 
 import math
 from datetime import date
+from typing import Sequence
+
+from data.prices import PriceProvider
+from strategies.raec_v6.signals._series import closes_with_ends, trailing
 
 
 VOL_HIGH = 0.30
@@ -31,6 +35,10 @@ BREADTH_STRONG = 0.55
 BREADTH_WEAK = 0.45
 NEUTRAL_BREADTH = 0.50
 
+# Longest window any feature reads (drawdown peak); older closes never
+# change the label, so the series form only passes this much history.
+_MAX_LOOKBACK = 252
+
 
 def _annualized_vol(closes: list[float], window: int = 20) -> float:
     if len(closes) < window + 1:
@@ -118,3 +126,18 @@ def classify_from_spy_closes(closes: list[float]) -> tuple[str, float]:
         return ("RISK_ON", confidence)
 
     return ("NEUTRAL", 0.4)
+
+
+def classify_series_from_spy(
+    provider: PriceProvider, dates: Sequence[date], symbol: str = "SPY"
+) -> dict[date, tuple[str, float]]:
+    """Batched classify_from_spy_closes for every date in `dates`.
+
+    Equivalent to classifying ``[c for d, c in series if d <= asof]`` per
+    date without rebuilding that list each day.
+    """
+    closes, ends = closes_with_ends(provider, symbol, dates)
+    return {
+        asof: classify_from_spy_closes(trailing(closes, end, _MAX_LOOKBACK))
+        for asof, end in zip(dates, ends)
+    }
@@ -15,8 +15,10 @@ Used by:
 from __future__ import annotations
 
 from datetime import date
+from typing import Sequence
 
 from data.prices import PriceProvider
+from strategies.raec_v6.signals._series import closes_with_ends
 
 
 def _last_close_at_or_before(
@@ -35,7 +37,21 @@ def compute_vix_implied(provider: PriceProvider, asof: date) -> float | None:
     """Return VIX as a decimal annualized vol (e.g. VIX 20 → 0.20), or
     None if no data.
     """
-    vix = _last_close_at_or_before(provider, "^VIX", asof)
+    return _to_decimal(_last_close_at_or_before(provider, "^VIX", asof))
+
+
+def compute_vix_implied_series(
+    provider: PriceProvider, dates: Sequence[date]
+) -> dict[date, float | None]:
+    """Batched form of compute_vix_implied for every date in `dates`."""
+    closes, ends = closes_with_ends(provider, "^VIX", dates)
+    return {
+        asof: _to_decimal(closes[end - 1] if end else None)
+        for asof, end in zip(dates, ends)
+    }
+
+
+def _to_decimal(vix: float | None) -> float | None:
     if vix is None or vix <= 0:
         return None
     return vix / 100.0
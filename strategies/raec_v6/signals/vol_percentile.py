@@ -15,13 +15,18 @@ from __future__ import annotations
 
 import math
 from datetime import date
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from data.prices import PriceProvider
+from strategies.raec_v6.signals._series import closes_with_ends, trailing
+
+_MAX_LOOKBACK = 320
+_HISTORY = 252
+_WINDOW = 20
 
 
 def _closes_up_to(
-    provider: PriceProvider, symbol: str, asof: date, max_lookback: int = 320
+    provider: PriceProvider, symbol: str, asof: date, max_lookback: int = _MAX_LOOKBACK
 ) -> list[float]:
     series = provider.get_daily_close_series(symbol)
     if not series:
@@ -73,16 +78,55 @@ def compute_vol_percentile(
     for symbol in symbols:
         sym = symbol.upper()
         closes = _closes_up_to(provider, sym, asof)
-        returns = _daily_returns(closes)
-        vols = _rolling_vol_20d(returns)
-        if len(vols) < 252:
-            continue
-        current = vols[-1]
-        history = vols[-252:]
-        if current <= 0:
-            out[sym] = 0.0
-            continue
-        # Percentile of `current` within `history`. Use rank /n; ties go up.
-        rank = sum(1 for v in history if v <= current)
-        out[sym] = rank / len(history)
+        pct = _percentile(_rolling_vol_20d(_daily_returns(closes)))
+        if pct is not None:
+            out[sym] = pct
     return out
+
+
+def compute_vol_percentile_series(
+    provider: PriceProvider,
+    symbols: Iterable[str],
+    dates: Sequence[date],
+) -> dict[date, dict[str, float]]:
+    """Batched form of compute_vol_percentile for every date in `dates`.
+
+    The rolling 20d vol path is computed once per symbol over its full
+    history and each date ranks its trailing 252 vols, giving the same
+    values as the per-date function. A history with a non-positive close
+    (where _daily_returns drops a return and shifts windows) falls back to
+    the per-date window for that symbol.
+    """
+    out: dict[date, dict[str, float]] = {asof: {} for asof in dates}
+    for symbol in symbols:
+        sym = symbol.upper()
+        closes, ends = closes_with_ends(provider, sym, dates)
+        if all(c > 0 for c in closes):
+            vols = _rolling_vol_20d(_daily_returns(closes))
+            for asof, end in zip(dates, ends):
+                # vols[j] is the window ending at close index j + 20; the
+                # per-date form needs 272 closes for 252 vols.
+                if end < _HISTORY + _WINDOW:
+                    continue
+                pct = _percentile(vols[end - _HISTORY - _WINDOW : end - _WINDOW])
+                if pct is not None:
+                    out[asof][sym] = pct
+        else:
+            for asof, end in zip(dates, ends):
+                window = trailing(closes, end, _MAX_LOOKBACK)
+                pct = _percentile(_rolling_vol_20d(_daily_returns(window)))
+                if pct is not None:
+                    out[asof][sym] = pct
+    return out
+
+
+def _percentile(vols: list[float]) -> float | None:
+    if len(vols) < _HISTORY:
+        return None
+    current = vols[-1]
+    history = vols[-_HISTORY:]
+    if current <= 0:
+        return 0.0
+    # Percentile of `current` within `history`. Use rank /n; ties go up.
+    rank = sum(1 for v in history if v <= current)
+    return rank / len(history)
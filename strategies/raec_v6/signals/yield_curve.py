@@ -16,8 +16,10 @@ Used by:
 from __future__ import annotations
 
 from datetime import date
+from typing import Sequence
 
 from data.prices import PriceProvider
+from strategies.raec_v6.signals._series import closes_with_ends, trailing
 
 
 def _closes_up_to(provider: PriceProvider, sym: str, asof: date, n: int = 280) -> list[float]:
@@ -39,8 +41,24 @@ def compute_yield_curve_signal(
     provider: PriceProvider, asof: date
 ) -> float | None:
     """Return signed yield-curve signal or None if insufficient data."""
-    tlt = _closes_up_to(provider, "TLT", asof)
-    shy = _closes_up_to(provider, "SHY", asof)
+    return _signal_from_closes(
+        _closes_up_to(provider, "TLT", asof), _closes_up_to(provider, "SHY", asof)
+    )
+
+
+def compute_yield_curve_signal_series(
+    provider: PriceProvider, dates: Sequence[date]
+) -> dict[date, float | None]:
+    """Batched form of compute_yield_curve_signal for every date in `dates`."""
+    tlt, tlt_ends = closes_with_ends(provider, "TLT", dates)
+    shy, shy_ends = closes_with_ends(provider, "SHY", dates)
+    return {
+        asof: _signal_from_closes(trailing(tlt, t_end, 280), trailing(shy, s_end, 280))
+        for asof, t_end, s_end in zip(dates, tlt_ends, shy_ends)
+    }
+
+
+def _signal_from_closes(tlt: list[float], shy: list[float]) -> float | None:
     if len(tlt) < 130 or len(shy) < 130:
         return None
     tlt_3mo = _return_over(tlt, 63)
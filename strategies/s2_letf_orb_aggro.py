@@ -10,8 +10,9 @@ import json
 import os
 from pathlib import Path
 import tempfile
-from typing import Any
+from typing import Any, Callable, Iterable
 
+import numpy as np
 import pandas as pd
 
 from execution_v2 import book_ids
@@ -269,24 +270,8 @@ def _evaluate_symbol(
 ) -> dict[str, Any]:
     series = symbol_frame[symbol_frame["Date"] <= pd.Timestamp(asof_date)].copy()
     series = series.sort_values("Date").reset_index(drop=True)
-    min_required = max(
-        cfg.sma_slow + 1,
-        cfg.ret_medium_lookback + 1,
-        cfg.breakout_lookback + 1,
-        cfg.atr_lookback + 2,
-        70,
-    )
-    reasons: list[str] = []
-    if len(series) < min_required:
-        reasons.append("insufficient_history")
-        return {
-            "symbol": symbol,
-            "eligible": False,
-            "selected": False,
-            "score": None,
-            "reason_codes": reasons,
-            "metrics": {"history_rows": int(len(series))},
-        }
+    if len(series) < _min_required_rows(cfg):
+        return _insufficient_history(symbol, len(series))
 
     close = float(series["Close"].iloc[-1])
     sma_fast = float(series["Close"].tail(cfg.sma_fast).mean())
@@ -296,8 +281,59 @@ def _evaluate_symbol(
     ret_medium = (close / float(series["Close"].iloc[-(cfg.ret_medium_lookback + 1)])) - 1.0
     tr = _true_range(series)
     atr = float(tr.tail(cfg.atr_lookback).mean())
-    atr_pct = atr / close if close > 0 else 0.0
     adv20 = float((series["Close"] * series["Volume"]).tail(20).mean())
+    return _evaluation_from_metrics(
+        symbol,
+        cfg,
+        history_rows=int(len(series)),
+        close=close,
+        sma_fast=sma_fast,
+        sma_slow=sma_slow,
+        high_breakout=high_breakout,
+        ret_short=ret_short,
+        ret_medium=ret_medium,
+        atr=atr,
+        adv20=adv20,
+    )
+
+
+def _min_required_rows(cfg: StrategyConfig) -> int:
+    return max(
+        cfg.sma_slow + 1,
+        cfg.ret_medium_lookback + 1,
+        cfg.breakout_lookback + 1,
+        cfg.atr_lookback + 2,
+        70,
+    )
+
+
+def _insufficient_history(symbol: str, history_rows: int) -> dict[str, Any]:
+    return {
+        "symbol": symbol,
+        "eligible": False,
+        "selected": False,
+        "score": None,
+        "reason_codes": ["insufficient_history"],
+        "metrics": {"history_rows": int(history_rows)},
+    }
+
+
+def _evaluation_from_metrics(
+    symbol: str,
+    cfg: StrategyConfig,
+    *,
+    history_rows: int,
+    close: float,
+    sma_fast: float,
+    sma_slow: float,
+    high_breakout: float,
+    ret_short: float,
+    ret_medium: float,
+    atr: float,
+    adv20: float,
+) -> dict[str, Any]:
+    reasons: list[str] = []
+    atr_pct = atr / close if close > 0 else 0.0
     breakout_ratio = close / high_breakout if high_breakout > 0 else 0.0
 
     hard_gates = {
@@ -383,7 +419,7 @@ def _evaluate_symbol(
             "adv20": round(adv20, 2),
             "breakout_ratio": round(breakout_ratio, 6),
             "entry_dist_pct": round(entry_dist_pct, 6),
-            "history_rows": int(len(series)),
+            "history_rows": int(history_rows),
             "signal_passes": signal_passes,
             "min_signal_gates": int(cfg.min_signal_gates),
         },
@@ -391,6 +427,138 @@ def _evaluate_symbol(
     }
 
 
+def _rolling_within_symbol(
+    values: np.ndarray,
+    position: np.ndarray,
+    window: int,
+    reduce: Callable[[np.ndarray], np.ndarray],
+) -> np.ndarray:
+    """Reduce the trailing ``window`` rows ending at each row, per symbol.
+
+    ``values`` is the concatenation of every symbol's date-sorted rows and
+    ``position`` the row's index within its symbol; windows that would reach
+    into the previous symbol are masked to NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        out[window - 1:] = reduce(windows)
+    out[position < window - 1] = np.nan
+    return out
+
+
+def _lagged_within_symbol(values: np.ndarray, position: np.ndarray, lag: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) > lag:
+        out[lag:] = values[:-lag]
+    out[position < lag] = np.nan
+    return out
+
+
+def build_metric_panel(frame: pd.DataFrame, cfg: StrategyConfig) -> pd.DataFrame:
+    """Compute the S2 gate metrics for every (Ticker, Date) row in one pass.
+
+    Row ``i`` carries the metrics ``_evaluate_symbol`` would compute with the
+    as-of date set to that row's date. Windowed reductions use the same numpy
+    kernels as the per-symbol pandas path, so values match bit for bit.
+    """
+    ordered = frame.sort_values(["Ticker", "Date"], kind="mergesort").reset_index(drop=True)
+    position = ordered.groupby("Ticker", sort=False).cumcount().to_numpy()
+    close = ordered["Close"].to_numpy(dtype=float)
+    high = ordered["High"].to_numpy(dtype=float)
+    low = ordered["Low"].to_numpy(dtype=float)
+    dollar_volume = close * ordered["Volume"].to_numpy(dtype=float)
+
+    prev_close = _lagged_within_symbol(close, position, 1)
+    true_range = np.fmax(
+        np.abs(high - low),
+        np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)),
+    )
+
+    def _mean(windows: np.ndarray) -> np.ndarray:
+        return windows.mean(axis=1)
+
+    def _max(windows: np.ndarray) -> np.ndarray:
+        return windows.max(axis=1)
+
+    return pd.DataFrame(
+        {
+            "Ticker": ordered["Ticker"].to_numpy(),
+            "Date": ordered["Date"].to_numpy(),
+            "history_rows": position + 1,
+            "close": close,
+            "sma_fast": _rolling_within_symbol(close, position, cfg.sma_fast, _mean),
+            "sma_slow": _rolling_within_symbol(close, position, cfg.sma_slow, _mean),
+            "high_breakout": _rolling_within_symbol(high, position, cfg.breakout_lookback, _max),
+            "ret_short": close
+            / _lagged_within_symbol(close, position, cfg.ret_short_lookback)
+            - 1.0,
+            "ret_medium": close
+            / _lagged_within_symbol(close, position, cfg.ret_medium_lookback)
+            - 1.0,
+            "atr": _rolling_within_symbol(true_range, position, cfg.atr_lookback, _mean),
+            "adv20": _rolling_within_symbol(dollar_volume, position, 20, _mean),
+        }
+    )
+
+
+def evaluate_panel(
+    frame: pd.DataFrame,
+    asof_dates: Iterable[date],
+    cfg: StrategyConfig,
+) -> dict[date, list[dict[str, Any]]]:
+    """Evaluate every symbol in ``frame`` as of each date in ``asof_dates``.
+
+    Equivalent to calling ``_evaluate_symbol`` per symbol and date, but the
+    metrics are computed once for the whole history, which makes multi-date
+    signal replay practical. Evaluations are ordered by symbol.
+    """
+    panel = build_metric_panel(frame, cfg)
+    min_required = _min_required_rows(cfg)
+    metric_columns = [
+        "close",
+        "sma_fast",
+        "sma_slow",
+        "high_breakout",
+        "ret_short",
+        "ret_medium",
+        "atr",
+        "adv20",
+    ]
+    symbols = [
+        (str(symbol), int(rows[0]), int(rows[-1]) + 1)
+        for symbol, rows in panel.groupby("Ticker", sort=True).indices.items()
+    ]
+    dates = pd.DatetimeIndex(panel["Date"])
+    cutoffs = [pd.Timestamp(asof) for asof in asof_dates]
+    rows_by_symbol = {
+        symbol: np.searchsorted(dates[start:end], cutoffs, side="right")
+        for symbol, start, end in symbols
+    }
+    metrics = panel[metric_columns].to_numpy()
+
+    results: dict[date, list[dict[str, Any]]] = {}
+    for date_idx, cutoff in enumerate(cutoffs):
+        evaluations: list[dict[str, Any]] = []
+        for symbol, start, _end in symbols:
+            count = int(rows_by_symbol[symbol][date_idx])
+            if count < min_required:
+                evaluations.append(_insufficient_history(symbol, count))
+                continue
+            row = start + count - 1
+            values = dict(zip(metric_columns, (float(value) for value in metrics[row])))
+            evaluations.append(
+                _evaluation_from_metrics(
+                    symbol,
+                    cfg,
+                    history_rows=count,
+                    **values,
+                )
+            )
+        results[cutoff.date()] = evaluations
+    return results
+
+
 def _select_candidates(
     evaluations: list[dict[str, Any]],
     cfg: StrategyConfig,
@@ -473,10 +641,7 @@ def run_strategy(
     universe_symbols = _resolve_universe(universe_profile)
     universe_set = set(universe_symbols)
     filtered = frame[frame["Ticker"].isin(universe_set)].copy()
-    evaluations: list[dict[str, Any]] = []
-    for symbol in sorted(filtered["Ticker"].unique()):
-        symbol_frame = filtered[filtered["Ticker"] == symbol]
-        evaluations.append(_evaluate_symbol(symbol, symbol_frame, asof, cfg))
+    evaluations = evaluate_panel(filtered, [asof], cfg)[asof]
 
     selected_candidates, evaluations = _select_candidates(evaluations, cfg)
     strategy_candidates = pd.DataFrame(selected_candidates)
@@ -48,6 +48,19 @@ def sample_repo(tmp_path: Path) -> Path:
             }
         },
         "build": {"git_sha": "abc123"},
+        "latency": {
+            "schema_version": 1,
+            "total_ms": 820.5,
+            "phases": {
+                "entry_eval": {"ms": 610.0, "calls": 1},
+                "order_submit": {"ms": 150.25, "calls": 2},
+            },
+            "api_calls": {
+                "broker.submit_order": {"count": 2, "ms": 148.0, "errors": 1},
+                "md.get_last_two_closed_10m": {"count": 3, "ms": 540.0, "errors": 0},
+            },
+            "slow_calls": [{"api": "md.get_last_two_closed_10m", "symbol": "aapl", "ms": 400.0}],
+        },
     }
     (tmp_path / "ledger" / "PORTFOLIO_DECISIONS" / "2026-02-10.jsonl").write_text(
         json.dumps(decision_record) + "\n", encoding="utf-8"
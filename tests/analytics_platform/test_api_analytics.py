@@ -40,6 +40,25 @@ def test_slippage_filter_strategy(analytics_settings) -> None:
     assert "TQQQ" not in symbols
 
 
+def test_cycle_latency_dashboard(analytics_settings) -> None:
+    client = _make_client(analytics_settings)
+
+    resp = client.get("/api/v1/execution/latency")
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data["summary"]["cycles"] == 1
+    assert data["summary"]["max_ms"] == pytest.approx(820.5)
+    assert [row["phase"] for row in data["by_phase"]] == ["entry_eval", "order_submit"]
+    apis = {row["api"]: row for row in data["by_api"]}
+    assert apis["broker.submit_order"]["errors"] == 1
+    assert apis["md.get_last_two_closed_10m"]["mean_ms"] == pytest.approx(180.0)
+    assert data["slow_calls"][0]["symbol"] == "AAPL"
+    assert [row["ny_date"] for row in data["trend"]] == ["2026-02-10"]
+
+    resp = client.get("/api/v1/execution/latency?start=2026-02-11")
+    assert resp.json()["data"]["by_phase"] == []
+
+
 def test_trade_analytics(analytics_settings) -> None:
     client = _make_client(analytics_settings)
 
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+
+def _make_client(analytics_settings):
+    pytest.importorskip("duckdb")
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from analytics_platform.backend.app import create_app
+    from analytics_platform.backend.readmodels.build_readmodels import build_readmodels
+
+    build_readmodels(analytics_settings)
+    return TestClient(create_app(settings=analytics_settings))
+
+
+def test_streamed_csv_matches_table_contents(analytics_settings) -> None:
+    client = _make_client(analytics_settings)
+    from analytics_platform.backend.api import queries
+    from analytics_platform.backend.db import connect_ro
+
+    resp = client.get("/api/v1/exports/alpaca_order_events.csv")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "text/csv; charset=utf-8"
+    assert 'filename="alpaca_order_events.csv"' in resp.headers["content-disposition"]
+
+    with connect_ro(analytics_settings.db_path) as conn:
+        expected = conn.execute("SELECT * FROM alpaca_order_events").fetchdf().to_csv(index=False)
+        # Batches smaller than the table still render one header and every row.
+        chunked = b"".join(
+            queries.iter_export(
+                conn,
+                dataset="alpaca_order_events",
+                fmt="csv",
+                start=None,
+                end=None,
+                batch_rows=1,
+            )
+        ).decode("utf-8")
+
+    assert resp.text == expected
+    assert chunked == expected
+    assert len(expected.strip().splitlines()) > 2
+
+    assert client.get("/api/v1/exports/nope.csv").status_code == 404
+    assert client.get("/api/v1/exports/nope.parquet").status_code == 404
+
+
+def test_parquet_and_arrow_exports_round_trip(analytics_settings) -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    client = _make_client(analytics_settings)
+    from analytics_platform.backend.db import connect_ro
+
+    with connect_ro(analytics_settings.db_path) as conn:
+        expected = conn.execute("SELECT * FROM alpaca_order_events").arrow()
+
+    parquet = client.get("/api/v1/exports/alpaca_order_events.parquet")
+    assert parquet.status_code == 200
+    assert parquet.headers["content-type"] == "application/vnd.apache.parquet"
+    assert pq.read_table(io.BytesIO(parquet.content)).equals(expected)
+
+    arrow = client.get("/api/v1/exports/alpaca_order_events.arrow")
+    assert arrow.status_code == 200
+    assert arrow.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    assert pa.ipc.open_stream(arrow.content).read_all().equals(expected)
+
+    limited = client.get("/api/v1/exports/alpaca_order_events.arrow", params={"limit": 1})
+    assert pa.ipc.open_stream(limited.content).read_all().num_rows == 1
+
+    empty = client.get("/api/v1/exports/alpaca_order_events.parquet", params={"start": "2099-01-01"})
+    table = pq.read_table(io.BytesIO(empty.content))
+    assert table.num_rows == 0
+    assert table.schema.names == expected.schema.names
+
+
+def test_export_errors_return_http_errors_and_close_connection(analytics_settings, monkeypatch) -> None:
+    duckdb = pytest.importorskip("duckdb")
+    client = _make_client(analytics_settings)
+    import contextlib
+
+    from analytics_platform.backend import app as app_module
+
+    # A read-model built before round_trips existed.
+    with duckdb.connect(str(analytics_settings.db_path)) as conn:
+        conn.execute("DROP TABLE IF EXISTS round_trips")
+
+    opened: list[str] = []
+    closed: list[str] = []
+    real_connect_ro = app_module.connect_ro
+
+    @contextlib.contextmanager
+    def _tracking_connect_ro(path):
+        with real_connect_ro(path) as conn:
+            opened.append(str(path))
+            try:
+                yield conn
+            finally:
+                closed.append(str(path))
+
+    monkeypatch.setattr(app_module, "connect_ro", _tracking_connect_ro)
+
+    resp = client.get("/api/v1/exports/round_trips.csv")
+    assert resp.status_code == 500
+    assert "round_trips" in resp.json()["detail"]
+    assert client.get("/api/v1/exports/nope.arrow").status_code == 404
+    assert client.get("/api/v1/exports/alpaca_order_events.csv").status_code == 200
+    assert len(opened) == 3
+    assert closed == opened
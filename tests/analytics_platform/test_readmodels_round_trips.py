@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+
+from analytics_platform.backend.readmodels.round_trips import build_round_trips
+
+
+def _fill(order_id, side, qty, price, date_ny, *, status="filled", stop=None, minute=0):
+    return {
+        "book_id": "ALPACA_PAPER",
+        "strategy_id": "S1_AVWAP_CORE",
+        "symbol": "AAPL",
+        "alpaca_order_id": order_id,
+        "side": side,
+        "status": status,
+        "filled_qty": qty,
+        "filled_avg_price": price,
+        "date_ny": date_ny,
+        "filled_at": f"{date_ny}T15:{minute:02d}:00+00:00",
+        "stop_loss": stop,
+    }
+
+
+def test_build_round_trips_fifo_matches_by_quantity() -> None:
+    rows = [
+        _fill("b1", "buy", 10, 10.0, "2026-03-02", stop=9.0),
+        _fill("b2", "buy", 5, 12.0, "2026-03-03"),
+        # Cumulative status events for one order: only the final fill counts.
+        _fill("s1", "sell", 6, 15.0, "2026-03-05", status="partially_filled"),
+        _fill("s1", "sell", 12, 15.0, "2026-03-05", minute=1),
+        _fill("s2", "sell", 3, 9.0, "2026-03-09"),
+        _fill("b3", "buy", 4, 11.0, "2026-03-10"),
+        _fill("s3", "sell", 1, 13.0, "2026-03-11"),
+        _fill("x1", "buy", 7, 10.0, "2026-03-02", status="canceled"),
+    ]
+
+    trips = build_round_trips(rows)
+
+    assert [t["entry_order_id"] for t in trips] == ["b1", "b2", "b3"]
+    first, second, third = trips
+    assert first["status"] == "closed"
+    assert first["exit_price"] == 15.0
+    assert first["pnl_per_share"] == 5.0
+    assert first["realized_pnl"] == 50.0
+    assert first["r_multiple"] == 5.0
+    assert first["holding_days"] == 3
+
+    assert second["status"] == "closed"
+    assert second["exit_price"] == pytest.approx((2 * 15.0 + 3 * 9.0) / 5)
+    assert second["exit_date_ny"] == "2026-03-09"
+    assert second["r_multiple"] is None
+
+    assert third["status"] == "open"
+    assert third["exit_qty"] == 1
+    assert third["realized_pnl"] == 2.0
+    assert third["pnl_per_share"] is None
+    assert third["holding_days"] is None
+
+
+def test_round_trips_table_and_performance_window(analytics_settings) -> None:
+    pytest.importorskip("duckdb")
+    from analytics_platform.backend.api import queries
+    from analytics_platform.backend.db import connect_ro
+    from analytics_platform.backend.readmodels.build_readmodels import build_readmodels
+
+    result = build_readmodels(analytics_settings)
+    assert result.row_counts["round_trips"] == 2
+
+    with connect_ro(analytics_settings.db_path) as conn:
+        trips = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT symbol, status, pnl_per_share, r_multiple FROM round_trips"
+            ).fetchall()
+        }
+        full = queries.get_strategy_performance(conn)["swing_metrics"]
+        before_exit = queries.get_strategy_performance(conn, end="2026-02-09")["swing_metrics"]
+        analytics = queries.get_trade_analytics(conn, None, None)
+
+    assert trips["QQQ"][0] == "open"
+    status, pnl, r_multiple = trips["TQQQ"]
+    assert status == "closed"
+    assert pnl == pytest.approx(2.15)
+    assert r_multiple == pytest.approx(2.15 / 2.10)
+
+    assert full["S2_LETF_ORB_AGGRO"]["closed_trade_count"] == 1
+    assert full["S2_LETF_ORB_AGGRO"]["gross_pnl"] == pytest.approx(2.15)
+    assert full["RAEC_401K_V2"]["open_trade_count"] == 1
+    assert "S2_LETF_ORB_AGGRO" not in before_exit
+
+    by_sid = {row["strategy_id"]: row for row in analytics["round_trips"]}
+    assert by_sid["S2_LETF_ORB_AGGRO"]["closed_count"] == 1
+    assert by_sid["S2_LETF_ORB_AGGRO"]["realized_pnl"] == pytest.approx(2.15 * 50)
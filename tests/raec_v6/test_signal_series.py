@@ -0,0 +1,106 @@
+"""Batched signal series forms match the per-date signal functions."""
+
+from __future__ import annotations
+
+import math
+from datetime import date, timedelta
+
+from data.prices import FixturePriceProvider
+from helpers import make_series
+from strategies.raec_v6.backtest_runner import _realized_vol_60d, build_signal_panel
+from strategies.raec_v6.signals.credit_spread import (
+    compute_credit_spread_signal,
+    compute_credit_spread_signal_series,
+)
+from strategies.raec_v6.signals.cross_asset_trend import (
+    REPRESENTATIVES,
+    compute_cross_asset_trend,
+    compute_cross_asset_trend_series,
+)
+from strategies.raec_v6.signals.regime_label import (
+    classify_from_spy_closes,
+    classify_series_from_spy,
+)
+from strategies.raec_v6.signals.vix_implied import (
+    compute_vix_implied,
+    compute_vix_implied_series,
+)
+from strategies.raec_v6.signals.vol_percentile import (
+    compute_vol_percentile,
+    compute_vol_percentile_series,
+)
+from strategies.raec_v6.signals.yield_curve import (
+    compute_yield_curve_signal,
+    compute_yield_curve_signal_series,
+)
+
+_START = date(2022, 1, 3)
+
+
+def _wavy(base: float, drift: float, amp: float, period: int, n: int) -> list[float]:
+    return [base * (1 + drift) ** i * (1 + amp * math.sin(i / period)) for i in range(n)]
+
+
+def _provider() -> FixturePriceProvider:
+    n = 700
+    series = {
+        sym: make_series(_START, _wavy(50 + 7 * k, 0.0004 * (k % 5 - 2), 0.08, 9 + k, n))
+        for k, sym in enumerate(sorted(set(REPRESENTATIVES.values())))
+    }
+    # Late listing, a gap in the calendar, and a non-positive print.
+    series["IBIT"] = series["IBIT"][400:]
+    series["TLT"] = [row for i, row in enumerate(series["TLT"]) if i % 17]
+    series["ZERO"] = make_series(_START, [0.0 if i == 350 else v for i, v in enumerate(_wavy(30, 0.0002, 0.1, 6, n))])
+    series["^VIX"] = make_series(_START + timedelta(days=100), _wavy(18, 0.0, 0.4, 5, 500))
+    return FixturePriceProvider(series)
+
+
+def _dates() -> list[date]:
+    return [_START + timedelta(days=i) for i in range(0, 720, 7)]
+
+
+def test_series_forms_match_per_date_signals() -> None:
+    provider = _provider()
+    dates = _dates()
+
+    trend = compute_cross_asset_trend_series(provider, dates)
+    vol_pct = compute_vol_percentile_series(provider, ["SPY", "tlt", "ZERO"], dates)
+    yc = compute_yield_curve_signal_series(provider, dates)
+    cs = compute_credit_spread_signal_series(provider, dates)
+    vix = compute_vix_implied_series(provider, dates)
+    regime = classify_series_from_spy(provider, dates)
+
+    spy = provider.get_daily_close_series("SPY")
+    for asof in dates:
+        assert trend[asof] == compute_cross_asset_trend(provider, asof)
+        assert vol_pct[asof] == compute_vol_percentile(provider, ["SPY", "tlt", "ZERO"], asof)
+        assert yc[asof] == compute_yield_curve_signal(provider, asof)
+        assert cs[asof] == compute_credit_spread_signal(provider, asof)
+        assert vix[asof] == compute_vix_implied(provider, asof)
+        assert regime[asof] == classify_from_spy_closes([c for d, c in spy if d <= asof])
+
+    # The fixture exercises both populated and missing outputs.
+    assert trend[dates[0]] == {} and "crypto" in trend[dates[-1]]
+    assert {"SPY", "TLT", "ZERO"} <= set(vol_pct[dates[-1]])
+    assert vix[dates[0]] is None and vix[dates[-1]] is not None
+    assert yc[dates[-1]] is not None and cs[dates[-1]] is not None
+
+
+def test_build_signal_panel_matches_per_date_state() -> None:
+    provider = _provider()
+    dates = _dates()[40:]
+
+    panel = build_signal_panel(provider, dates)
+
+    spy = provider.get_daily_close_series("SPY")
+    for asof in dates:
+        state = panel[asof]
+        closes = [c for d, c in spy if d <= asof]
+        assert state.asof_date == asof
+        assert (state.regime_label, state.regime_confidence) == classify_from_spy_closes(closes)
+        assert state.cross_asset_trend == compute_cross_asset_trend(provider, asof)
+        assert state.vol_percentile_252d == compute_vol_percentile(provider, ["SPY"], asof)
+        assert state.spy_realized_vol_60d == _realized_vol_60d(closes)
+        assert state.vix_implied == (compute_vix_implied(provider, asof) or 0.0)
+        assert state.yield_curve_signal == compute_yield_curve_signal(provider, asof)
+        assert state.credit_spread_signal == compute_credit_spread_signal(provider, asof)
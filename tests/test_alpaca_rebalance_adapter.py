@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any
 
 import pytest
+import requests
 
 from execution_v2.alpaca_rebalance_adapter import AlpacaRebalanceAdapter, RebalanceOrderResult
 
@@ -308,3 +309,208 @@ def test_execute_rebalance_skips_no_ref_price(tmp_path: Path) -> None:
 
     assert result.sent == 0
     assert result.skipped == 1
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"http {status_code}")
+        self.status_code = status_code
+
+
+class ConcurrentFakeTradingClient(FakeTradingClient):
+    """Records in-flight submits and serves sells as pending_new until polled.
+
+    ``transient`` fails a symbol's next N submits with a 503; ``submit_errors``
+    raises the queued exceptions before placing; ``lost_acks`` places the order
+    and then raises a timeout; ``lookup_errors`` fails lookups by client id.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_s: float = 0.02,
+        transient: dict[str, int] | None = None,
+        submit_errors: dict[str, list[Exception]] | None = None,
+        lost_acks: dict[str, int] | None = None,
+        lookup_errors: list[Exception] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        import threading
+
+        self._lock = threading.Lock()
+        self._latency_s = latency_s
+        self._transient = dict(transient or {})
+        self._submit_errors = {sym: list(errs) for sym, errs in (submit_errors or {}).items()}
+        self._lost_acks = dict(lost_acks or {})
+        self._lookup_errors = list(lookup_errors or [])
+        self._by_id: dict[str, FakeOrder] = {}
+        self._by_client_id: dict[str, FakeOrder] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_order_ids: dict[str, set[str]] = {}
+        self.polls: list[str] = []
+        self.log: list[str] = []
+
+    def submit_order(self, request: Any) -> FakeOrder:
+        import time as _time
+
+        symbol = str(request.symbol).upper()
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.client_order_ids.setdefault(symbol, set()).add(request.client_order_id)
+        try:
+            _time.sleep(self._latency_s)
+            with self._lock:
+                if self._transient.get(symbol, 0) > 0:
+                    self._transient[symbol] -= 1
+                    raise FakeAPIError(503)
+                if self._submit_errors.get(symbol):
+                    raise self._submit_errors[symbol].pop(0)
+                self._order_counter += 1
+                is_sell = "sell" in str(request.side).lower()
+                order = FakeOrder(
+                    id=f"order-{symbol}",
+                    side=str(request.side),
+                    status="pending_new" if is_sell else "accepted",
+                )
+                self._by_id[order.id] = order
+                self._by_client_id[request.client_order_id] = order
+                self.submitted_orders.append({"symbol": symbol, "qty": int(request.qty), "side": str(request.side)})
+                self.log.append(f"submit:{symbol}")
+                if self._lost_acks.get(symbol, 0) > 0:
+                    self._lost_acks[symbol] -= 1
+                    raise requests.exceptions.ReadTimeout("read timed out")
+                return order
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def get_order_by_id(self, order_id: str) -> FakeOrder:
+        self.polls.append(order_id)
+        self.log.append(f"poll:{order_id}")
+        order = self._by_id[order_id]
+        return FakeOrder(id=order.id, side=order.side, status="accepted")
+
+    def get_order_by_client_id(self, client_order_id: str) -> FakeOrder:
+        self.log.append(f"lookup:{client_order_id}")
+        if self._lookup_errors:
+            raise self._lookup_errors.pop(0)
+        order = self._by_client_id.get(client_order_id)
+        if order is None:
+            raise FakeAPIError(404)
+        return order
+
+
+def _intent(symbol: str, side: str, delta: float, price: float = 100.0) -> dict:
+    return {"symbol": symbol, "side": side, "delta_pct": delta, "ref_price": price,
+            "intent_id": f"id-{symbol}", "strategy_id": "V2"}
+
+
+def test_execute_rebalance_submits_each_phase_concurrently(tmp_path: Path) -> None:
+    client = ConcurrentFakeTradingClient(account=FakeAccount(equity="100000.00"))
+    sleeps: list[float] = []
+    adapter = AlpacaRebalanceAdapter(client, max_workers=3, sleep=sleeps.append)
+    intents = [
+        _intent("QQQ", "BUY", 5.0), _intent("VTI", "SELL", -5.0), _intent("IWM", "BUY", 5.0),
+        _intent("EFA", "SELL", -5.0), _intent("TLT", "BUY", 5.0), _intent("GLD", "SELL", -5.0),
+    ]
+
+    result = adapter.execute_rebalance(intents, ny_date="2026-02-18", repo_root=tmp_path)
+
+    assert result.sent == 6 and result.errors == []
+    assert 1 < client.max_in_flight <= 3
+    # Every sell is submitted and acknowledged before the first buy goes out.
+    first_buy = min(client.log.index(f"submit:{s}") for s in ("QQQ", "IWM", "TLT"))
+    assert all(client.log.index(f"poll:order-{s}") < first_buy for s in ("VTI", "EFA", "GLD"))
+    # Results and ledger events follow intent order within each phase.
+    assert [o["symbol"] for o in result.orders] == ["VTI", "EFA", "GLD", "QQQ", "IWM", "TLT"]
+    ledger = tmp_path / "ledger" / "ALPACA_PAPER" / "2026-02-18.jsonl"
+    assert [json.loads(line)["symbol"] for line in ledger.read_text().splitlines()] == [
+        "VTI", "EFA", "GLD", "QQQ", "IWM", "TLT",
+    ]
+
+
+def test_execute_rebalance_retries_transient_errors_with_same_client_order_id(tmp_path: Path) -> None:
+    client = ConcurrentFakeTradingClient(
+        account=FakeAccount(equity="100000.00"), latency_s=0.0, transient={"VTI": 2, "QQQ": 5},
+    )
+    sleeps: list[float] = []
+    adapter = AlpacaRebalanceAdapter(client, max_workers=2, retries=2, retry_backoff_s=0.1, sleep=sleeps.append)
+
+    result = adapter.execute_rebalance(
+        [_intent("VTI", "BUY", 5.0), _intent("QQQ", "BUY", 5.0)], ny_date="2026-02-18", repo_root=tmp_path,
+    )
+
+    assert [o["symbol"] for o in result.orders] == ["VTI"]
+    assert result.errors == ["QQQ: http 503"]
+    assert len(client.client_order_ids["VTI"]) == 1
+    assert sorted(sleeps) == [0.1, 0.1, 0.2, 0.2]
+
+
+def test_execute_rebalance_does_not_retry_rejections(tmp_path: Path) -> None:
+    client = FakeTradingClient(account=FakeAccount(equity="100000.00"), fail_symbols={"QQQ"})
+    sleeps: list[float] = []
+    adapter = AlpacaRebalanceAdapter(client, retries=3, sleep=sleeps.append)
+
+    result = adapter.execute_rebalance([_intent("QQQ", "BUY", 5.0)], ny_date="2026-02-18", repo_root=tmp_path)
+
+    assert result.sent == 0
+    assert result.errors == ["QQQ: order rejected for QQQ"]
+    assert sleeps == []
+
+
+def test_execute_rebalance_retries_requests_network_failures(tmp_path: Path) -> None:
+    client = ConcurrentFakeTradingClient(
+        account=FakeAccount(equity="100000.00"),
+        latency_s=0.0,
+        submit_errors={
+            "VTI": [requests.exceptions.ConnectionError("connection reset")],
+            "QQQ": [requests.exceptions.Timeout("timed out")],
+        },
+    )
+    sleeps: list[float] = []
+    adapter = AlpacaRebalanceAdapter(client, max_workers=1, retries=2, retry_backoff_s=0.1, sleep=sleeps.append)
+
+    result = adapter.execute_rebalance(
+        [_intent("VTI", "BUY", 5.0), _intent("QQQ", "BUY", 5.0)], ny_date="2026-02-18", repo_root=tmp_path,
+    )
+
+    assert result.errors == []
+    assert [o["symbol"] for o in result.orders] == ["VTI", "QQQ"]
+    assert sleeps == [0.1, 0.1]
+
+
+def test_execute_rebalance_keeps_placed_order_when_lookup_fails_transiently(tmp_path: Path) -> None:
+    client = ConcurrentFakeTradingClient(
+        account=FakeAccount(equity="100000.00"),
+        latency_s=0.0,
+        lost_acks={"VTI": 1},
+        lookup_errors=[requests.exceptions.ConnectionError("connection reset")],
+    )
+    adapter = AlpacaRebalanceAdapter(client, retries=3, retry_backoff_s=0.0)
+
+    result = adapter.execute_rebalance([_intent("VTI", "BUY", 5.0)], ny_date="2026-02-18", repo_root=tmp_path)
+
+    # The lookup is retried rather than resubmitting a duplicate client_order_id.
+    assert result.errors == []
+    assert [o["symbol"] for o in result.orders] == ["VTI"]
+    assert len(client.submitted_orders) == 1
+    assert [entry.split(":")[0] for entry in client.log] == ["submit", "lookup", "lookup"]
+
+
+def test_execute_rebalance_surfaces_non_retryable_lookup_failure(tmp_path: Path) -> None:
+    client = ConcurrentFakeTradingClient(
+        account=FakeAccount(equity="100000.00"),
+        latency_s=0.0,
+        lost_acks={"VTI": 1},
+        lookup_errors=[FakeAPIError(403)],
+    )
+    adapter = AlpacaRebalanceAdapter(client, retries=3, retry_backoff_s=0.0)
+
+    result = adapter.execute_rebalance([_intent("VTI", "BUY", 5.0)], ny_date="2026-02-18", repo_root=tmp_path)
+
+    assert len(client.submitted_orders) == 1
+    assert result.sent == 0
+    assert len(result.errors) == 1 and "order lookup failed" in result.errors[0]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from benchmarks import run_benchmarks, synthetic
+
+
+def test_synthetic_panel_is_deterministic_and_well_formed() -> None:
+    a = synthetic.make_ohlcv_panel(4, 0.5, seed=3)
+    b = synthetic.make_ohlcv_panel(4, 0.5, seed=3)
+    pd.testing.assert_frame_equal(a, b)
+    assert not a.equals(synthetic.make_ohlcv_panel(4, 0.5, seed=4))
+
+    assert a.groupby("Ticker").size().tolist() == [126] * 4
+    assert a["Date"].max() == pd.Timestamp(synthetic.DEFAULT_END)
+    assert (a["High"] >= a[["Open", "Close"]].max(axis=1)).all()
+    assert (a["Low"] <= a[["Open", "Close"]].min(axis=1)).all()
+    assert (a["Volume"] > 0).all()
+
+
+def test_suite_runs_at_tiny_scale_and_flags_regressions(tmp_path) -> None:
+    scale = run_benchmarks.Scale(tickers=12, years=0.5)
+    ctx = run_benchmarks.build_context(scale, tmp_path, sample=5, readmodel_days=5)
+    cases = ["build_candidate_row", "pick_best_anchor", "compute_setup_context", "_scan_as_of"]
+
+    results = run_benchmarks.run_suite(ctx, cases, repeat=1, isolate=False, log=None)
+
+    assert [r.name for r in results] == cases
+    assert [r.items for r in results] == [5, 5, 5, 12]
+    assert all(r.seconds > 0 and r.peak_rss_mb > 0 for r in results)
+
+    baseline = run_benchmarks.update_baseline({}, results, scale)
+    assert run_benchmarks.compare_to_baseline(results, baseline, scale) == []
+
+    slower = [
+        run_benchmarks.CaseResult(r.name, r.seconds * 2, r.items, r.unit, r.peak_rss_mb) for r in results
+    ]
+    regressions = run_benchmarks.compare_to_baseline(slower, baseline, scale, tolerance=0.5)
+    assert [(reg.case, reg.metric) for reg in regressions] == [(name, "seconds") for name in cases]
+    assert all(reg.ratio == pytest.approx(2.0) for reg in regressions)
+    other_scale = run_benchmarks.Scale(tickers=13, years=0.5)
+    assert run_benchmarks.compare_to_baseline(slower, baseline, other_scale) == []
@@ -6,7 +6,13 @@ import pandas as pd
 import numpy as np
 import pytest
 
-from analytics.correlation_matrix import compute_rolling_correlation, get_sector_exposure
+from analytics.correlation_matrix import (
+    ReturnsMatrix,
+    ReturnsMatrixCache,
+    close_panel,
+    compute_rolling_correlation,
+    get_sector_exposure,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -132,6 +138,56 @@ class TestComputeRollingCorrelation:
         assert abs(corr.loc["A", "C"]) < 0.5  # not highly correlated
 
 
+# ---------------------------------------------------------------------------
+# ReturnsMatrix / ReturnsMatrixCache
+# ---------------------------------------------------------------------------
+
+class TestReturnsMatrix:
+    def test_matches_compute_rolling_correlation_with_gaps(self):
+        rng = np.random.default_rng(7)
+        base = rng.normal(0, 0.01, 90)
+        df = _make_ohlcv({
+            "A": list(base),
+            "B": list(base * 0.5 + rng.normal(0, 0.01, 90)),
+            "C": list(rng.normal(0, 0.01, 90)),
+            "D": list(-base + rng.normal(0, 0.002, 90)),
+        })
+        # Holes in B and a late listing for D exercise pairwise-complete overlap.
+        df = df[~((df["Symbol"] == "B") & (df.index % 7 == 3))]
+        df = df[~((df["Symbol"] == "D") & (df["Date"] < pd.Timestamp("2024-02-20")))]
+        expected = compute_rolling_correlation(df, ["A", "B", "C", "D"], lookback_days=60)
+
+        matrix = ReturnsMatrix.from_prices(close_panel(df), 60)
+        for sym in ["A", "B", "C", "D"]:
+            others = [o for o in ["A", "B", "C", "D"] if o != sym]
+            got = matrix.correlations(sym, others)
+            for other in others:
+                assert got[other] == pytest.approx(expected.loc[sym, other], abs=1e-12)
+
+    def test_undefined_pairs_are_nan_and_unknown_symbols_skipped(self):
+        df = _make_ohlcv({"A": [0.01, -0.02, 0.015] * 10, "FLAT": [0.0] * 30})
+        matrix = ReturnsMatrix.from_prices(close_panel(df), 60)
+        got = matrix.correlations("A", ["FLAT", "ZZZ"])
+        assert list(got) == ["FLAT"]
+        assert np.isnan(got["FLAT"])
+        assert matrix.correlations("ZZZ", ["A"]) == {}
+
+    def test_cache_windows_by_as_of_and_ticker_history_layout(self):
+        returns = [0.01, -0.02, 0.015, -0.005, 0.03, -0.01] * 10
+        # B tracks A for 40 days, then mirrors it: only closes up to as_of count.
+        df = _make_ohlcv({"A": returns, "B": returns[:40] + [-r for r in returns[40:]]})
+        history = df.rename(columns={"Symbol": "Ticker"}).set_index(["Ticker", "Date"])
+        cache = ReturnsMatrixCache()
+
+        as_of = pd.Timestamp("2024-01-02") + pd.Timedelta(days=39)
+        first = cache.get(history, as_of=as_of, lookback_days=30)
+        assert cache.get(history, as_of=as_of, lookback_days=30) is first
+        assert first.correlations("A", ["B"])["B"] == pytest.approx(1.0)
+        later = cache.get(history, as_of=as_of + pd.Timedelta(days=20), lookback_days=30)
+        assert later is not first
+        assert later.correlations("A", ["B"])["B"] < 0.5
+
+
 # ---------------------------------------------------------------------------
 # get_sector_exposure
 # ---------------------------------------------------------------------------
@@ -6,7 +6,14 @@ import pandas as pd
 import numpy as np
 import pytest
 
-from execution_v2.correlation_sizing import correlation_penalty, check_sector_cap
+from analytics.correlation_matrix import ReturnsMatrix
+from execution_v2.correlation_sizing import (
+    DailyReturnsCache,
+    check_sector_cap,
+    correlation_penalty,
+    correlation_penalty_from_returns,
+)
+from execution_v2.pivots import DailyBar
 
 
 # ---------------------------------------------------------------------------
@@ -126,6 +133,78 @@ class TestCorrelationPenalty:
         assert result == pytest.approx(0.5)
 
 
+# ---------------------------------------------------------------------------
+# correlation_penalty_from_returns / DailyReturnsCache
+# ---------------------------------------------------------------------------
+
+def _daily_bars(returns: list[float], *, start: str = "2025-03-03", base: float = 50.0) -> list[DailyBar]:
+    """Daily bars stamped like Alpaca's (session date at 04:00/05:00 UTC), one per weekday."""
+    bars = []
+    price = base
+    for day, ret in zip(pd.bdate_range(start, periods=len(returns)), returns):
+        price *= 1.0 + ret
+        ts = day.tz_localize("America/New_York").tz_convert("UTC").timestamp()
+        bars.append(DailyBar(ts=ts, open=price, high=price, low=price, close=price))
+    return bars
+
+
+class _FakeMarketData:
+    def __init__(self, bars_by_symbol: dict[str, list[DailyBar]]) -> None:
+        self.bars_by_symbol = bars_by_symbol
+        self.calls: list[str] = []
+
+    def get_daily_bars(self, symbol: str) -> list[DailyBar]:
+        self.calls.append(symbol)
+        return self.bars_by_symbol.get(symbol, [])
+
+
+class TestCorrelationPenaltyFromReturns:
+    RETURNS = [0.01, -0.02, 0.015, -0.005, 0.03, -0.01, 0.02, -0.015, 0.01, 0.005] * 5
+
+    def _prices(self, series: dict[str, list[float]]) -> pd.DataFrame:
+        dates = pd.bdate_range("2025-01-02", periods=len(self.RETURNS))
+        return pd.DataFrame(
+            {sym: 100.0 * np.cumprod([1.0 + r for r in rets]) for sym, rets in series.items()},
+            index=dates,
+        )
+
+    def test_matches_correlation_penalty_on_the_same_matrix(self):
+        rng = np.random.default_rng(3)
+        noisy = list(np.asarray(self.RETURNS) + rng.normal(0, 0.01, len(self.RETURNS)))
+        prices = self._prices({"A": self.RETURNS, "B": [-r for r in self.RETURNS], "C": noisy})
+        matrix = ReturnsMatrix.from_prices(prices, 90)
+        expected = correlation_penalty("A", ["B", "C"], prices.pct_change().corr(), threshold=0.5)
+        assert expected > 0.0
+        assert correlation_penalty_from_returns("A", ["B", "C"], matrix, threshold=0.5) == pytest.approx(expected)
+
+    def test_undefined_correlations_are_skipped(self):
+        prices = self._prices({"A": self.RETURNS, "B": self.RETURNS, "FLAT": [0.0] * len(self.RETURNS)})
+        matrix = ReturnsMatrix.from_prices(prices, 90)
+        assert correlation_penalty_from_returns("A", ["B", "FLAT"], matrix) == pytest.approx(0.5)
+        assert correlation_penalty_from_returns("A", ["FLAT", "ZZZ"], matrix) == 0.0
+        assert correlation_penalty_from_returns("ZZZ", ["A"], matrix) == 0.0
+
+    def test_daily_cache_fetches_each_symbol_once_per_day(self):
+        md = _FakeMarketData({
+            "A": _daily_bars(self.RETURNS),
+            "B": _daily_bars(self.RETURNS, base=20.0),
+            "C": _daily_bars([-r for r in self.RETURNS]),
+        })
+        cache = DailyReturnsCache()
+        # The 2025-05-09 bar is today's forming session and is left out.
+        first = cache.matrix(md, ["A", "B"], ny_date="2025-05-09", lookback_days=60)
+        assert cache.matrix(md, ["b", "A"], ny_date="2025-05-09", lookback_days=60) is first
+        assert sorted(md.calls) == ["A", "B"]
+        assert first.correlations("A", ["B"])["B"] == pytest.approx(1.0)
+
+        grown = cache.matrix(md, ["A", "B", "C"], ny_date="2025-05-09", lookback_days=60)
+        assert sorted(md.calls) == ["A", "B", "C"]
+        assert correlation_penalty_from_returns("C", ["A", "B"], grown) == pytest.approx(0.5)
+
+        cache.matrix(md, ["A"], ny_date="2025-05-12", lookback_days=60)
+        assert md.calls[-1] == "A" and len(md.calls) == 4
+
+
 # ---------------------------------------------------------------------------
 # check_sector_cap
 # ---------------------------------------------------------------------------
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from execution_v2.bar_store import IntradayBarStore, bar_store_from_env
+from execution_v2.clocks import ET
+
+
+def _bars(day: datetime, count: int, *, close0: float = 10.0) -> list[dict]:
+    out = []
+    for i in range(count):
+        ts = (day.replace(hour=9, minute=30, tzinfo=ET) + timedelta(minutes=5 * i)).astimezone(timezone.utc)
+        px = close0 + 0.1 * i
+        out.append({"ts": ts, "open": px, "high": px + 0.5, "low": px - 0.5, "close": px, "volume": 100.0 + i})
+    return out
+
+
+def test_record_writes_closed_bars_partitioned_by_ny_date(tmp_path) -> None:
+    store = IntradayBarStore(tmp_path)
+    day1 = _bars(datetime(2025, 3, 7), 78)
+    day2 = _bars(datetime(2025, 3, 10), 6)  # across the DST switch
+    now = (datetime(2025, 3, 10, 9, 58, tzinfo=ET)).timestamp()
+
+    # 09:55 is still forming at 09:58; it is left for a later fetch.
+    assert store.record("aaa", day1 + day2, now=now) == 78 + 5
+    assert store.days() == ["2025-03-07", "2025-03-10"]
+    assert store.symbols("2025-03-10") == ["AAA"]
+    assert store.partition_path("AAA", "2025-03-10").exists()
+
+    # Same fetch again: nothing new to write.
+    assert store.record("AAA", day1 + day2, now=now) == 0
+    later = now + 300
+    assert store.record("AAA", day1 + day2, now=later) == 1
+
+    # A refetch that corrects the newest recorded bar replaces it.
+    corrected = [dict(bar) for bar in day1 + day2]
+    corrected[-1]["close"] = 99.0
+    assert store.record("AAA", corrected, now=later) == 1
+    assert store.record("AAA", corrected, now=later) == 0
+    assert store.read("AAA", corrected[-1]["ts"], corrected[-1]["ts"]).close[-1] == pytest.approx(99.0)
+
+    fresh = IntradayBarStore(tmp_path)
+    bars = fresh.read("AAA", datetime(2025, 3, 7, 15, 50, tzinfo=ET), datetime(2025, 3, 10, 9, 40, tzinfo=ET))
+    assert bars.ts.dtype == np.int64
+    assert [datetime.fromtimestamp(t, ET).strftime("%m-%d %H:%M") for t in bars.ts] == [
+        "03-07 15:50",
+        "03-07 15:55",
+        "03-10 09:30",
+        "03-10 09:35",
+        "03-10 09:40",
+    ]
+    assert bars.close[-1] == pytest.approx(10.2)
+
+
+def test_write_merges_and_later_bars_replace_earlier(tmp_path) -> None:
+    store = IntradayBarStore(tmp_path)
+    day = datetime(2025, 6, 2)
+    store.record("AAA", _bars(day, 4), now=datetime(2025, 6, 2, 16, 0, tzinfo=ET).timestamp())
+    corrected = IntradayBarStore(tmp_path)
+    corrected.record("AAA", _bars(day, 6, close0=20.0)[2:], now=datetime(2025, 6, 2, 16, 0, tzinfo=ET).timestamp())
+
+    bars = IntradayBarStore(tmp_path).read("AAA", day.replace(tzinfo=ET), day.replace(hour=23, tzinfo=ET))
+    assert len(bars) == 6
+    assert list(bars.close) == pytest.approx([10.0, 10.1, 20.2, 20.3, 20.4, 20.5])
+    frame = store.frame(day.replace(tzinfo=ET), day.replace(hour=23, tzinfo=ET))
+    assert list(frame.columns) == ["symbol", "ts", "open", "high", "low", "close", "volume"]
+    assert len(frame) == 6 and frame["ts"].dt.tz is not None
+
+
+def test_store_is_opt_in_and_fail_open(tmp_path, monkeypatch, capsys) -> None:
+    monkeypatch.delenv("EXECUTION_BAR_STORE_DIR", raising=False)
+    assert bar_store_from_env() is None
+    monkeypatch.setenv("EXECUTION_BAR_STORE_DIR", str(tmp_path / "bars"))
+    assert bar_store_from_env() is bar_store_from_env()
+
+    blocked = tmp_path / "blocked"
+    blocked.write_text("not a directory", encoding="utf-8")
+    store = IntradayBarStore(blocked)
+    assert store.record("AAA", _bars(datetime(2025, 6, 2), 2), now=datetime(2025, 6, 3, tzinfo=ET).timestamp()) == 0
+    assert "WARN: bar store write failed for AAA" in capsys.readouterr().out
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from execution_v2 import bar_stream
+from execution_v2.boh import boh_confirmed_option2
+from execution_v2.pivots import DailyBar
+
+SESSION_OPEN = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)  # 09:30 ET
+
+
+def _minute(symbol: str, minute: int, close: float, volume: float = 100.0) -> dict:
+    return {
+        "type": "bar",
+        "symbol": symbol,
+        "ts": SESSION_OPEN + timedelta(minutes=minute),
+        "open": close - 0.1,
+        "high": close + 0.2,
+        "low": close - 0.3,
+        "close": close,
+        "volume": volume,
+    }
+
+
+class _FakeRest:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def get_intraday_bars(self, symbol: str, minutes: int = 5, lookback_days: int = 3) -> list[dict]:
+        self.calls.append(("intraday", symbol, minutes))
+        prior = SESSION_OPEN - timedelta(days=1)
+        return [
+            {"ts": prior, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0},
+            # Partial bar overlapping the streamed session is dropped.
+            {"ts": SESSION_OPEN, "open": 9.0, "high": 9.0, "low": 9.0, "close": 9.0, "volume": 9.0},
+        ]
+
+    def get_last_two_closed_10m(self, symbol: str) -> list:
+        self.calls.append(("boh", symbol))
+        return []
+
+    def get_daily_bars(self, symbol: str, lookback_days: int | None = None) -> list[DailyBar]:
+        self.calls.append(("daily", symbol))
+        yesterday = SESSION_OPEN - timedelta(days=1)
+        return [
+            DailyBar(ts=(yesterday - timedelta(hours=9, minutes=30)).timestamp(), open=1, high=2, low=0.5, close=1.5),
+            DailyBar(ts=(SESSION_OPEN - timedelta(hours=9, minutes=30)).timestamp(), open=9, high=9, low=9, close=9),
+        ]
+
+    def get_session_volume_profile(self, symbol: str):
+        return "rest-profile"
+
+
+def test_aggregator_rolls_minutes_into_closed_frames() -> None:
+    aggregator = bar_stream.BarAggregator(frames_minutes=(5, 10))
+    feed = bar_stream.ReplayBarFeed(_minute("aaa", m, 100.0 + m) for m in range(10))
+    feed.replay(aggregator)
+
+    five = aggregator.closed_bars("AAA", 5)
+    ten = aggregator.closed_bars("AAA", 10)
+
+    assert [bar["ts"] for bar in five] == [SESSION_OPEN, SESSION_OPEN + timedelta(minutes=5)]
+    assert len(ten) == 1
+    # The bucket closes on its final minute bar, without waiting for the next one.
+    assert ten[0]["open"] == 99.9
+    assert ten[0]["close"] == 109.0
+    assert ten[0]["high"] == 109.2
+    assert ten[0]["low"] == 99.7
+    assert ten[0]["volume"] == 1000.0
+    assert aggregator.daily_bar("AAA", "2024-01-02").close == 109.0
+
+
+def test_aggregator_closes_quiet_buckets_after_grace_and_ignores_late_minutes() -> None:
+    aggregator = bar_stream.BarAggregator(frames_minutes=(10,), close_grace_sec=5.0)
+    bar_stream.ReplayBarFeed([_minute("AAA", 0, 10.0), _minute("AAA", 3, 11.0)]).replay(aggregator)
+    assert aggregator.closed_bars("AAA", 10) == []
+
+    end = (SESSION_OPEN + timedelta(minutes=10)).timestamp()
+    assert aggregator.advance(end + 4.0) == 0
+    assert aggregator.advance(end + 5.0) == 1
+    bar_stream.ReplayBarFeed([_minute("AAA", 4, 50.0)]).replay(aggregator)
+    bar_stream.ReplayBarFeed(
+        [{"type": "trade", "symbol": "AAA", "ts": SESSION_OPEN + timedelta(minutes=11), "price": 12.0}]
+    ).replay(aggregator)
+
+    bars = aggregator.closed_bars("AAA", 10)
+    assert len(bars) == 1
+    assert bars[0]["close"] == 11.0
+    assert aggregator.last_trade("AAA")[1] == 12.0
+
+
+def test_streaming_market_data_feeds_boh_and_splices_rest_history(monkeypatch) -> None:
+    monkeypatch.setattr(bar_stream.time, "time", lambda: (SESSION_OPEN + timedelta(minutes=21)).timestamp())
+    aggregator = bar_stream.BarAggregator()
+    feed = bar_stream.ReplayBarFeed(
+        [_minute("AAA", m, 99.0) for m in range(10)] + [_minute("AAA", m, 101.0) for m in range(10, 20)]
+    )
+    stream = bar_stream.BarStream(aggregator, feed)
+    rest = _FakeRest()
+    md = stream.market_data(rest)
+
+    assert md.get_last_two_closed_10m("BBB") == []
+    assert ("boh", "BBB") in rest.calls
+
+    stream.start()
+    bars = md.get_last_two_closed_10m("AAA")
+    assert [bar.close for bar in bars] == [99.0, 101.0]
+    assert boh_confirmed_option2(bars, 98.5).confirmed
+
+    intraday = md.get_intraday_bars("AAA", minutes=10, lookback_days=3)
+    assert [bar["close"] for bar in intraday] == [1.0, 99.0, 101.0]
+    seeded = rest.calls.count(("intraday", "AAA", 10))
+    md.get_intraday_bars("AAA", minutes=10, lookback_days=3)
+    md.get_last_two_closed_10m("AAA")
+    assert rest.calls.count(("intraday", "AAA", 10)) == seeded
+    assert md.get_session_volume_profile("AAA") == "rest-profile"
+    assert feed.subscribed == {"AAA", "BBB"}
+
+
+def test_streaming_daily_bars_replace_rest_partial_for_today(monkeypatch) -> None:
+    aggregator = bar_stream.BarAggregator()
+    stream = bar_stream.BarStream(aggregator, bar_stream.ReplayBarFeed([_minute("AAA", 0, 42.0)]))
+    stream.start()
+    monkeypatch.setattr(bar_stream.time, "time", lambda: (SESSION_OPEN + timedelta(minutes=5)).timestamp())
+
+    daily = stream.market_data(_FakeRest()).get_daily_bars("AAA", lookback_days=30)
+
+    assert [bar.close for bar in daily] == [1.5, 42.0]
+
+
+def test_mid_bucket_subscription_keeps_rest_bar_for_partial_bucket(monkeypatch) -> None:
+    class _Rest(_FakeRest):
+        def get_intraday_bars(self, symbol, minutes=5, lookback_days=3):
+            self.calls.append(("intraday", symbol, minutes))
+            return [
+                {"ts": SESSION_OPEN + timedelta(minutes=m), "open": 50.0 + m, "high": 60.0,
+                 "low": 40.0, "close": 55.0, "volume": 1000.0}
+                for m in (0, 10)
+            ]
+
+    # Subscribed at 09:43: the 09:40 bucket only sees 7 of its 10 minutes.
+    aggregator = bar_stream.BarAggregator(frames_minutes=(10,))
+    bar_stream.ReplayBarFeed([_minute("AAA", m, 113.0 + m) for m in range(13, 20)]).replay(aggregator)
+    stream = bar_stream.BarStream(aggregator, bar_stream.ReplayBarFeed([]))
+    rest = _Rest()
+    md = stream.market_data(rest)
+    monkeypatch.setattr(bar_stream.time, "time", lambda: (SESSION_OPEN + timedelta(minutes=20)).timestamp())
+
+    assert aggregator.closed_bars("AAA", 10) == []
+    md.get_last_two_closed_10m("AAA")
+    assert rest.calls == [("boh", "AAA")]
+
+    bar_stream.ReplayBarFeed([_minute("AAA", m, 120.0) for m in range(20, 30)]).replay(aggregator)
+    monkeypatch.setattr(bar_stream.time, "time", lambda: (SESSION_OPEN + timedelta(minutes=30)).timestamp())
+
+    bars = md.get_last_two_closed_10m("AAA")
+    assert [(bar.open, bar.volume) for bar in bars] == [(60.0, 1000.0), (119.9, 1000.0)]
+    intraday = md.get_intraday_bars("AAA", minutes=10)
+    assert [bar["ts"] for bar in intraday] == [SESSION_OPEN + timedelta(minutes=m) for m in (0, 10, 20)]
+
+    # Today's open and range so far come from REST; the close from the stream.
+    today = md.get_daily_bars("AAA")[-1]
+    assert (today.open, today.high, today.low, today.close) == (9, 132.2, 9, 120.0)
+
+
+def test_stale_or_dead_stream_falls_back_to_rest(monkeypatch, capsys) -> None:
+    feed = bar_stream.ReplayBarFeed([_minute("AAA", m, 100.0) for m in range(20)])
+    stream = bar_stream.BarStream(bar_stream.BarAggregator(), feed, stale_grace_sec=30.0)
+    stream.start()
+    rest = _FakeRest()
+    md = stream.market_data(rest)
+    now = {"ts": (SESSION_OPEN + timedelta(minutes=30, seconds=25)).timestamp()}
+    monkeypatch.setattr(bar_stream.time, "time", lambda: now["ts"])
+
+    # Newest 10m bar closed at 09:50; at 10:00:25 the 10:00 close is late but within grace.
+    assert len(md.get_last_two_closed_10m("AAA")) == 2
+    assert ("boh", "AAA") not in rest.calls
+
+    now["ts"] += 10.0
+    assert md.get_last_two_closed_10m("AAA") == []
+    assert ("boh", "AAA") in rest.calls
+    assert [bar["close"] for bar in md.get_intraday_bars("AAA", minutes=5)] == [1.0, 9.0]
+
+    now["ts"] -= 10.0
+    monkeypatch.setattr(feed, "is_alive", lambda: False)
+    calls = len(rest.calls)
+    md.get_last_two_closed_10m("AAA")
+    md.get_daily_bars("AAA")
+    assert rest.calls[calls:] == [("boh", "AAA"), ("daily", "AAA")]
+    assert capsys.readouterr().out.count("WARN: bar stream feed is not running") == 1
+
+
+def test_wait_for_bar_close_wakes_on_close() -> None:
+    aggregator = bar_stream.BarAggregator(frames_minutes=(5,))
+    stream = bar_stream.BarStream(aggregator, bar_stream.ReplayBarFeed([]), settle_sec=0.0)
+
+    assert stream.wait_for_bar_close(0.05) is False
+
+    timer = threading.Timer(
+        0.05, lambda: bar_stream.ReplayBarFeed([_minute("AAA", 4, 1.0)]).replay(aggregator)
+    )
+    timer.start()
+    try:
+        assert stream.wait_for_bar_close(5.0) is True
+    finally:
+        timer.cancel()
+    assert stream.wait_for_bar_close(0.05) is False
+
+
+def test_wrap_market_data_is_identity_without_active_stream(monkeypatch) -> None:
+    monkeypatch.delenv(bar_stream.ENV_MARKET_DATA_MODE, raising=False)
+    bar_stream.set_active_stream(None)
+    rest = _FakeRest()
+
+    assert bar_stream.start_from_env() is None
+    assert bar_stream.wrap_market_data(rest) is rest
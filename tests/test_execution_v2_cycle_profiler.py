@@ -0,0 +1,119 @@
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from execution_v2.cycle_profiler import CycleProfiler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBroker:
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+        self.base_url = "paper"
+
+    def get_clock(self):
+        self.clock.now += 0.05
+        return SimpleNamespace(is_open=True)
+
+    def get_open_position(self, symbol: str):
+        self.clock.now += 0.2 if symbol == "SLOW" else 0.01
+        if symbol == "GONE":
+            raise LookupError(symbol)
+        return SimpleNamespace(symbol=symbol)
+
+
+def test_phases_and_slow_call_samples() -> None:
+    clock = FakeClock()
+    profiler = CycleProfiler(slow_calls=2, clock=clock)
+    clock.now = 0.5
+    profiler.lap("prelude")
+    with profiler.phase("exits"):
+        clock.now += 0.25
+    with pytest.raises(RuntimeError):
+        with profiler.phase("exits"):
+            clock.now += 0.25
+            raise RuntimeError("boom")
+    profiler.add_time("sizing", 0.001)
+    for seconds in (0.1, 0.3, 0.2):
+        profiler.record_call("md.get_daily_bars", seconds, symbol=f"S{int(seconds * 10)}")
+
+    report = profiler.to_dict()
+    assert report["total_ms"] == 1000.0
+    assert report["phases"] == {
+        "prelude": {"ms": 500.0, "calls": 1},
+        "exits": {"ms": 500.0, "calls": 2},
+        "sizing": {"ms": 1.0, "calls": 1},
+    }
+    assert report["api_calls"] == {"md.get_daily_bars": {"count": 3, "ms": 600.0, "errors": 0}}
+    assert report["slow_calls"] == [
+        {"api": "md.get_daily_bars", "symbol": "S3", "ms": 300.0},
+        {"api": "md.get_daily_bars", "symbol": "S2", "ms": 200.0},
+    ]
+    json.dumps(report)
+
+
+def test_instrumented_client_counts_calls_errors_and_symbols() -> None:
+    clock = FakeClock()
+    profiler = CycleProfiler(slow_calls=1, clock=clock)
+    broker = profiler.instrument(FakeBroker(clock), "broker")
+    assert profiler.instrument(broker, "broker") is broker
+    assert profiler.instrument(None, "broker") is None
+
+    assert broker.base_url == "paper"
+    assert broker.get_clock().is_open
+    assert broker.get_open_position("AAA").symbol == "AAA"
+    broker.get_open_position(symbol="SLOW")
+    with pytest.raises(LookupError):
+        broker.get_open_position("GONE")
+
+    report = profiler.to_dict()
+    assert report["api_calls"]["broker.get_clock"] == {"count": 1, "ms": 50.0, "errors": 0}
+    assert report["api_calls"]["broker.get_open_position"]["count"] == 3
+    assert report["api_calls"]["broker.get_open_position"]["errors"] == 1
+    assert report["slow_calls"] == [{"api": "broker.get_open_position", "symbol": "SLOW", "ms": 200.0}]
+
+
+def test_run_once_writes_latency_into_decision_record(tmp_path, monkeypatch) -> None:
+    pytest.importorskip("pandas")
+    from execution_v2 import clocks, execution_main
+
+    candidates_path = tmp_path / "daily_candidates.csv"
+    candidates_path.write_text("Symbol,Entry_Level,Stop_Loss,Target_R2,Entry_DistPct,Price\n", encoding="utf-8")
+    cfg = SimpleNamespace(
+        base_dir=str(tmp_path),
+        candidates_csv=str(candidates_path),
+        entry_delay_min_sec=0,
+        entry_delay_max_sec=0,
+        db_path=str(tmp_path / "execution.sqlite"),
+        execution_mode="DRY_RUN",
+        dry_run=True,
+        poll_seconds=300,
+        ignore_market_hours=False,
+    )
+    now_et = datetime.now(timezone.utc).astimezone(clocks.ET)
+    monkeypatch.setenv("AVWAP_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(execution_main, "maybe_send_heartbeat", lambda **_: None)
+    monkeypatch.setattr(execution_main, "maybe_send_daily_summary", lambda **_: None)
+    monkeypatch.setattr(
+        execution_main,
+        "_market_open",
+        lambda *_a, **_kw: (False, now_et, "clock_snapshot", None),
+    )
+
+    execution_main.run_once(cfg)
+
+    record = json.loads((tmp_path / "state" / "portfolio_decision_latest.json").read_text())
+    latency = record["latency"]
+    assert latency["schema_version"] == 1
+    assert {"prelude", "store_init", "purge", "clients", "market_clock"} <= set(latency["phases"])
+    assert latency["total_ms"] >= sum(p["ms"] for p in latency["phases"].values())
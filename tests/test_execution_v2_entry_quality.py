@@ -342,3 +342,110 @@ def test_sizing_falls_back_to_csv_price_on_invalid_close(tmp_path, monkeypatch)
 
     assert created == 1
     assert captured["price"] == 100.0
+
+
+class PerSymbolMarketData:
+    def __init__(self, bar_sets: dict[str, list[list[Bar10m]]], daily_bars: list[dict]) -> None:
+        self._bar_sets = bar_sets
+        self._daily_bars = daily_bars
+        self.calls: list[str] = []
+        self._counts: dict[str, int] = {}
+
+    def get_last_two_closed_10m(self, symbol: str) -> list[Bar10m]:
+        self.calls.append(symbol)
+        idx = self._counts.get(symbol, 0)
+        self._counts[symbol] = idx + 1
+        sets = self._bar_sets[symbol]
+        return sets[min(idx, len(sets) - 1)]
+
+    def get_daily_bars(self, symbol: str) -> list[dict]:
+        return self._daily_bars
+
+
+def test_edge_window_rechecks_do_not_delay_other_candidates(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("MAX_RISK_PER_SHARE_DOLLARS", "100.0")
+    monkeypatch.setenv("STOP_BUFFER_DOLLARS", "0.0")
+    store = StateStore(str(tmp_path / "state.sqlite"))
+    candidates_path = tmp_path / "candidates.csv"
+    candidates_path.write_text(
+        "Symbol,Entry_Level,Stop_Loss,Target_R2,Entry_DistPct,Price\n"
+        "NEAR,100,95,110,1.0,100\n"
+        "LATE,100,95,110,1.0,100\n"
+        "MISS,100,95,110,1.0,100\n",
+        encoding="utf-8",
+    )
+    near = [
+        Bar10m(ts=1, open=99.5, high=100.1, low=99.0, close=99.7),
+        Bar10m(ts=2, open=99.7, high=100.0, low=99.4, close=99.9),
+    ]
+    confirmed = [
+        Bar10m(ts=5, open=100.1, high=100.5, low=100.0, close=100.3),
+        Bar10m(ts=6, open=100.2, high=100.4, low=100.1, close=100.2),
+    ]
+    md = PerSymbolMarketData(
+        {"NEAR": [near, near, confirmed], "LATE": [confirmed], "MISS": [[]]},
+        daily_bars=_daily_bars_for_entry(),
+    )
+    fake_clock = FakeClock()
+    edge_report = buy_loop.EdgeWindowReport()
+    created_intents: list = []
+
+    created = buy_loop.evaluate_and_create_entry_intents(
+        store,
+        md,
+        buy_loop.BuyLoopConfig(candidates_csv=str(candidates_path), eval_max_workers=2),
+        account_equity=100000,
+        created_intents=created_intents,
+        edge_window=buy_loop.EdgeWindowConfig(enabled=True, rechecks=3, delay_sec=5.0, proximity_pct=0.002),
+        edge_report=edge_report,
+        edge_clock=buy_loop.EdgeWindowClock(now=fake_clock.now, sleep=fake_clock.sleep),
+    )
+
+    assert created == 2
+    # Every initial check runs before the first recheck fires.
+    assert sorted(md.calls[:3]) == ["LATE", "MISS", "NEAR"]
+    assert md.calls[3:] == ["NEAR", "NEAR"]
+    assert fake_clock.now() == 10.0
+    # Merge follows candidate order, not completion order.
+    assert [intent.symbol for intent in created_intents] == ["NEAR", "LATE"]
+    assert edge_report.engaged_symbols == ["NEAR"]
+    assert edge_report.rechecks_attempted == 2
+    assert edge_report.confirmed_symbols == ["NEAR"]
+
+
+def _cand(symbol: str) -> buy_loop.Candidate:
+    return buy_loop.Candidate(
+        symbol=symbol,
+        strategy_id="S1",
+        direction="Long",
+        entry_level=100.0,
+        stop_loss=95.0,
+        target_r2=110.0,
+        target_r1=None,
+        dist_pct=1.0,
+        price=100.0,
+    )
+
+
+def test_probe_candidates_dedupes_and_stops_once_slots_are_filled() -> None:
+    confirmed = [
+        Bar10m(ts=5, open=100.1, high=100.5, low=100.0, close=100.3),
+        Bar10m(ts=6, open=100.2, high=100.4, low=100.1, close=100.2),
+    ]
+    md = PerSymbolMarketData({sym: [confirmed] for sym in "ABCD"}, daily_bars=[])
+    clock = FakeClock()
+    kwargs = dict(
+        md=md,
+        edge_window=buy_loop.EdgeWindowConfig(),
+        edge_clock=buy_loop.EdgeWindowClock(now=clock.now, sleep=clock.sleep),
+        rvol_min=0.0,
+        max_workers=1,
+    )
+
+    probes = buy_loop._probe_candidates([_cand(s) for s in "AABCD"], max_accepts=2, **kwargs)
+
+    assert md.calls == ["A", "B"]
+    assert sorted(probes) == ["A", "B"]
+    assert buy_loop._probe_candidates([_cand("C")], max_accepts=0, **kwargs) == {}
+    assert sorted(buy_loop._probe_candidates([_cand(s) for s in "CCD"], **kwargs)) == ["C", "D"]
+    assert md.calls == ["A", "B", "C", "D"]
@@ -35,8 +35,8 @@ class DummyStore:
     def pop_due_entry_intents(self, _now_ts):
         return list(self.entry_intents)
 
-    def get_position(self, _symbol):
-        return None
+    def list_positions_by_symbol(self):
+        return {}
 
     def get_entry_fill(self, *_args, **_kwargs):
         return None
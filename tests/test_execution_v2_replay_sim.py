@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from execution_v2 import execution_main
+from execution_v2.clocks import ET
+from execution_v2.replay_sim import (
+    ReplayClock,
+    ReplayMarketData,
+    ReplayTradingClient,
+    patched_time,
+    replay_day,
+)
+
+REPLAY_DAY = "2025-06-12"
+REPLAY_ENV = {
+    "S2_ALLOW_UNSLEEVED": "1",
+    "MAX_LIVE_NOTIONAL_PER_SYMBOL": "100000",
+    "MAX_LIVE_GROSS_NOTIONAL": "100000",
+}
+
+
+def _bars(day: str = REPLAY_DAY, history_days: int = 40, *, hold: bool = False) -> pd.DataFrame:
+    """History chopping around 48-49.5, then a replay day that breaks the 50 pivot and fades.
+
+    With ``hold`` the replay day holds above 50 instead, and the next session
+    slides from 50.4 to 46.6.
+    """
+    replay = date.fromisoformat(day)
+    last = replay + timedelta(days=1) if hold else replay
+    rows = []
+    for k, session in enumerate(pd.bdate_range(replay - timedelta(days=history_days), last)):
+        is_replay = session.date() >= replay
+        for i in range(78):
+            ts = datetime(session.year, session.month, session.day, 9, 30, tzinfo=ET) + timedelta(minutes=5 * i)
+            if not is_replay:
+                px = 48.0 + (k % 5) * 0.3 + 0.01 * (i % 7)
+            elif session.date() > replay:
+                px = 50.4 - 0.05 * i
+            elif i < 6:
+                px = 49.6 + 0.02 * i
+            elif hold:
+                px = 50.3 + 0.002 * (i - 6)
+            elif i < 40:
+                px = 50.3 + 0.01 * (i - 6)
+            else:
+                px = 50.6 - 0.06 * (i - 40)
+            rows.append(
+                {
+                    "symbol": "AAA",
+                    "ts": ts.astimezone(timezone.utc),
+                    "open": px - 0.02,
+                    "high": px + 0.05,
+                    "low": px - 0.05,
+                    "close": px,
+                    "volume": 2000.0 if is_replay else 1000.0,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def _at(hh: int, mm: int, ss: int = 0) -> float:
+    return datetime(2025, 6, 12, hh, mm, ss, tzinfo=ET).timestamp()
+
+
+def test_market_data_serves_only_closed_bars() -> None:
+    clock = ReplayClock(_at(10, 3))
+    md = ReplayMarketData(_bars(), clock)
+
+    last_two = md.get_last_two_closed_10m("AAA")
+    assert [datetime.fromtimestamp(b.ts, ET).strftime("%H:%M") for b in last_two] == ["09:40", "09:50"]
+    assert last_two[-1].close == pytest.approx(49.6 + 0.02 * 5)
+    assert last_two[-1].volume == 4000.0
+    intraday = md.get_intraday_bars("AAA", minutes=5, lookback_days=1)
+    assert intraday[-1]["ts"] == datetime(2025, 6, 12, 9, 55, tzinfo=ET)
+    daily = md.get_daily_bars("AAA")
+    assert datetime.fromtimestamp(daily[-1].ts, ET).date() == date(2025, 6, 11)
+    # The 10:00 bar is still forming, so rvol sees 6 bars today against 7 per history day.
+    profile = md.get_session_volume_profile("AAA")
+    assert profile.bar_count_today == 6
+    assert profile.rvol == pytest.approx(12000.0 / 7000.0, abs=1e-4)
+
+
+def test_broker_fills_marketable_limits_at_tape_and_stops_on_later_bars() -> None:
+    clock = ReplayClock(_at(10, 20, 2))
+    md = ReplayMarketData(_bars(), clock)
+    broker = ReplayTradingClient(md, clock, equity=10_000.0)
+
+    buy = broker.submit_order(
+        SimpleNamespace(symbol="AAA", qty=10, side="buy", type="limit", limit_price=51.0, time_in_force="day")
+    )
+    assert buy.status == "filled"
+    assert float(buy.filled_avg_price) == pytest.approx(50.3 + 0.01 * 3)  # 10:15 bar close
+    stop = broker.submit_order(
+        SimpleNamespace(symbol="AAA", qty=10, side="sell", type="stop", stop_price=49.9, time_in_force="gtc")
+    )
+    assert [o.id for o in broker.get_orders(SimpleNamespace(status="open", symbols=["AAA"]))] == [stop.id]
+
+    clock.advance_to(_at(14, 0, 2))
+    assert broker.process_bars(clock.now) == 1
+    assert stop.status == "filled"
+    # First bar with low <= 49.9 opens above the stop, so the fill is at the stop.
+    assert float(stop.filled_avg_price) == pytest.approx(49.9)
+    assert stop.filled_at == datetime(2025, 6, 12, 13, 50, tzinfo=ET)
+    assert not broker.get_all_positions()
+    assert broker.realized_pnl == pytest.approx((float(stop.filled_avg_price) - float(buy.filled_avg_price)) * 10)
+
+
+def test_patched_time_is_scoped_to_the_block() -> None:
+    clock = ReplayClock(_at(11, 0))
+    with patched_time(clock):
+        assert execution_main.time.time() == clock.now
+        execution_main.time.sleep(30)
+        assert execution_main.datetime.now(timezone.utc).timestamp() == _at(11, 0, 30)
+        assert isinstance(datetime.now(), execution_main.datetime)
+    assert execution_main.time is time
+    assert execution_main.datetime is datetime
+
+
+def test_replay_day_runs_entry_and_stop_exit_deterministically(tmp_path) -> None:
+    candidates = tmp_path / "candidates.csv"
+    candidates.write_text(
+        "Symbol,Entry_Level,Stop_Loss,Target_R2,Entry_DistPct,Price\nAAA,50.0,48.0,55.0,1.0,50.0\n",
+        encoding="utf-8",
+    )
+    bars = _bars()
+
+    first = replay_day(REPLAY_DAY, bars, candidates, tmp_path / "run1", env=REPLAY_ENV)
+    second = replay_day(REPLAY_DAY, bars, candidates, tmp_path / "run2", env=REPLAY_ENV)
+
+    assert first.cycles == 78
+    assert first.errors == []
+    assert [(f["side"], f["order_type"]) for f in first.fills] == [("buy", "limit"), ("sell", "stop")]
+    entry, exit_ = first.fills
+    assert entry["ts"] == "2025-06-12T14:20:02+00:00"
+    assert exit_["price"] < entry["price"]
+    assert first.open_positions == {}
+    assert first.realized_pnl == pytest.approx((exit_["price"] - entry["price"]) * entry["qty"], abs=0.01)
+    assert [(f["ts"], f["qty"], f["price"]) for f in second.fills] == [
+        (f["ts"], f["qty"], f["price"]) for f in first.fills
+    ]
+    assert (tmp_path / "run1" / "ledger" / "PORTFOLIO_DECISIONS" / f"{REPLAY_DAY}.jsonl").exists()
+
+
+def test_carry_over_manages_positions_on_the_next_day(tmp_path) -> None:
+    candidates = tmp_path / "candidates.csv"
+    candidates.write_text(
+        "Symbol,Entry_Level,Stop_Loss,Target_R2,Entry_DistPct,Price\nAAA,50.0,48.0,55.0,1.0,50.0\n",
+        encoding="utf-8",
+    )
+    bars = _bars(hold=True)
+    state = tmp_path / "state"
+
+    day1 = replay_day(
+        REPLAY_DAY, bars[bars["ts"] < pd.Timestamp("2025-06-13", tz="UTC")], candidates, tmp_path / "d1",
+        env=REPLAY_ENV, state_dir=state,
+    )
+    assert [f["side"] for f in day1.fills] == ["buy"]
+    assert list(day1.open_positions) == ["AAA"]
+    entry = day1.fills[0]
+
+    day2 = replay_day("2025-06-13", bars, candidates, tmp_path / "d2", env=REPLAY_ENV, state_dir=state, carry=day1.carry)
+    assert day2.errors == []
+    # The carried position is stopped out; nothing is re-bought.
+    assert [(f["side"], f["qty"]) for f in day2.fills] == [("sell", entry["qty"])]
+    assert day2.open_positions == {}
+    assert day2.realized_pnl == pytest.approx((day2.fills[0]["price"] - entry["price"]) * entry["qty"], abs=0.01)
+    assert (state / "execution_v2.sqlite").exists()
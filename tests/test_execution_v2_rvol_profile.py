@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from execution_v2.clocks import ET
+from execution_v2.rvol_profile import RvolMatrixCache, VolumeProfile
+
+
+def _session_bars(start_day: datetime, days: int, *, through: datetime) -> list[tuple[datetime, float]]:
+    """5-minute bars 09:30-15:55 ET on weekdays (crossing the March DST switch), up to ``through``."""
+    bars = []
+    for offset in range(days):
+        day = start_day + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        for i in range(78):
+            ts = datetime(day.year, day.month, day.day, 9, 30, tzinfo=ET) + timedelta(minutes=5 * i)
+            if ts > through:
+                break
+            bars.append((ts.astimezone(timezone.utc), float(1000 + 37 * ((offset * 78 + i) % 11))))
+    return bars
+
+
+def _reference_profile(bars, now_et: datetime) -> VolumeProfile | None:
+    """The per-bar loop MarketData.get_session_volume_profile used before the matrix cache."""
+    today_str = now_et.strftime("%Y-%m-%d")
+    cutoff_time = now_et.time()
+    daily_cumvol: dict[str, float] = {}
+    for ts, volume in bars:
+        bar_et = ts.astimezone(ET)
+        if bar_et.time() <= cutoff_time:
+            key = bar_et.strftime("%Y-%m-%d")
+            daily_cumvol[key] = daily_cumvol.get(key, 0.0) + volume
+    today_vol = daily_cumvol.pop(today_str, None)
+    if today_vol is None or not daily_cumvol:
+        return None
+    avg_vol = sum(daily_cumvol.values()) / len(daily_cumvol)
+    today_bars = sum(
+        1
+        for ts, _ in bars
+        if ts.astimezone(ET).strftime("%Y-%m-%d") == today_str and ts.astimezone(ET).time() <= cutoff_time
+    )
+    return VolumeProfile(
+        today_cumulative=today_vol,
+        avg_cumulative=round(avg_vol, 2),
+        rvol=round(today_vol / avg_vol, 4),
+        sample_days=len(daily_cumvol),
+        bar_count_today=today_bars,
+    )
+
+
+class FakeFeed:
+    def __init__(self, bars) -> None:
+        self.bars = bars
+        self.starts: list[datetime] = []
+
+    def __call__(self, symbol: str, start: datetime):
+        self.starts.append(start)
+        rows = [(ts, vol) for ts, vol in self.bars if ts >= start]
+        return (
+            [int(ts.timestamp()) * 1_000_000_000 for ts, _ in rows],
+            [vol for _, vol in rows],
+        )
+
+
+def test_matrix_profile_matches_per_bar_loop_across_the_day() -> None:
+    first_day = datetime(2025, 2, 24)
+    last_bar = datetime(2025, 3, 14, 15, 55, tzinfo=ET)
+    all_bars = _session_bars(first_day, 19, through=last_bar)
+    now = {"ts": 0.0}
+    feed = FakeFeed([])
+    cache = RvolMatrixCache(feed, clock=lambda: now["ts"])
+
+    for hh, mm, ss in ((9, 20, 0), (9, 30, 0), (9, 47, 12), (11, 5, 0), (15, 59, 59)):
+        now_et = datetime(2025, 3, 14, hh, mm, ss, tzinfo=ET)
+        now["ts"] = now_et.timestamp()
+        # The feed only has bars that have started by "now".
+        feed.bars = [(ts, vol) for ts, vol in all_bars if ts <= now_et]
+        visible = [(ts, vol) for ts, vol in feed.bars if ts >= now_et - timedelta(days=22)]
+        expected = _reference_profile(visible, now_et)
+        got = cache.profile("AAA", lookback_days=20)
+        if expected is None:
+            assert got is None
+        else:
+            assert got.sample_days == expected.sample_days
+            assert got.bar_count_today == expected.bar_count_today
+            assert got.today_cumulative == pytest.approx(expected.today_cumulative)
+            assert got.avg_cumulative == pytest.approx(expected.avg_cumulative, abs=0.01)
+            assert got.rvol == pytest.approx(expected.rvol, abs=1e-4)
+
+
+def test_history_is_fetched_once_per_day_and_today_incrementally() -> None:
+    all_bars = _session_bars(datetime(2025, 6, 2), 10, through=datetime(2025, 6, 11, 16, 0, tzinfo=ET))
+    feed = FakeFeed(all_bars)
+    now = {"ts": datetime(2025, 6, 11, 10, 2, tzinfo=ET).timestamp()}
+    cache = RvolMatrixCache(feed, clock=lambda: now["ts"])
+
+    feed.bars = [(ts, v) for ts, v in all_bars if ts.timestamp() <= now["ts"]]
+    first = cache.profile("AAA")
+    assert first is not None and first.bar_count_today == 7
+    assert cache.profile("AAA") == first  # same slot: no refetch
+    assert cache.fetches == 1
+
+    now["ts"] = datetime(2025, 6, 11, 10, 31, tzinfo=ET).timestamp()
+    feed.bars = [(ts, v) for ts, v in all_bars if ts.timestamp() <= now["ts"]]
+    later = cache.profile("AAA")
+    assert cache.fetches == 2
+    # The refresh starts at the last bar already held, not the lookback start.
+    assert feed.starts[-1] == datetime(2025, 6, 11, 10, 0, tzinfo=ET).astimezone(timezone.utc)
+    assert later.bar_count_today == 13
+    assert later.sample_days == first.sample_days
+
+    now["ts"] = datetime(2025, 6, 12, 10, 31, tzinfo=ET).timestamp()
+    cache.profile("AAA")
+    assert cache.fetches == 3
+    assert feed.starts[-1] == datetime(2025, 6, 12, 10, 31, tzinfo=ET).astimezone(timezone.utc) - timedelta(days=22)
@@ -0,0 +1,111 @@
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from execution_v2 import buy_loop, clocks, execution_main
+from execution_v2.session import ExecutionSession
+from execution_v2.state_store import StateStore
+
+HEADER = "Symbol,Entry_Level,Stop_Loss,Target_R2,Entry_DistPct,Price\n"
+
+
+def test_candidate_cache_reparses_only_when_the_file_changes(tmp_path) -> None:
+    path = tmp_path / "daily_candidates.csv"
+    path.write_text(HEADER + "AAA,10,9,12,0.5,10.1\nBAD,10,13,12,0.5,10.1\n", encoding="utf-8")
+    cache = buy_loop.CandidateCache(str(path))
+
+    telemetry = buy_loop.EntryRejectionTelemetry()
+    assert [c.symbol for c in cache.load(rejection_telemetry=telemetry)] == ["AAA"]
+    assert [c.symbol for c in cache.load()] == ["AAA"]
+    assert cache.loads == 1
+    assert telemetry.candidates_seen == 2
+    assert cache.load() == buy_loop.load_candidates(str(path))
+
+    path.write_text(HEADER + "AAA,10,9,12,0.5,10.1\nBBB,20,19,25,1.0,20.5\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert [c.symbol for c in cache.load()] == ["AAA", "BBB"]
+    assert cache.loads == 2
+
+    path.unlink()
+    assert cache.load() == []
+
+
+def test_run_once_reuses_session_store_and_candidate_snapshot(tmp_path, monkeypatch) -> None:
+    candidates_path = tmp_path / "daily_candidates.csv"
+    candidates_path.write_text(HEADER, encoding="utf-8")
+    cfg = SimpleNamespace(
+        base_dir=str(tmp_path),
+        candidates_csv=str(candidates_path),
+        entry_delay_min_sec=0,
+        entry_delay_max_sec=0,
+        db_path=str(tmp_path / "execution.sqlite"),
+        execution_mode="DRY_RUN",
+        dry_run=True,
+        poll_seconds=300,
+        ignore_market_hours=False,
+    )
+    opened: list[StateStore] = []
+    snapshots: list[str] = []
+
+    def _store(path: str) -> StateStore:
+        opened.append(StateStore(path))
+        return opened[-1]
+
+    real_snapshot = execution_main._snapshot_candidates_csv
+
+    def _snapshot(path: str) -> dict:
+        snapshots.append(path)
+        return real_snapshot(path)
+
+    now_et = datetime.now(timezone.utc).astimezone(clocks.ET)
+    monkeypatch.setenv("AVWAP_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(execution_main, "StateStore", _store)
+    monkeypatch.setattr(execution_main, "_snapshot_candidates_csv", _snapshot)
+    monkeypatch.setattr(execution_main, "maybe_send_heartbeat", lambda **_: None)
+    monkeypatch.setattr(execution_main, "maybe_send_daily_summary", lambda **_: None)
+    monkeypatch.setattr(
+        execution_main,
+        "_market_open",
+        lambda *_a, **_kw: (False, now_et, "clock_snapshot", None),
+    )
+
+    session = ExecutionSession.from_cfg(cfg)
+    execution_main.run_once(cfg, session)
+    execution_main.run_once(cfg, session)
+    assert len(opened) == 1
+    assert session.store is opened[0]
+    assert snapshots == [str(candidates_path)]
+    assert session.clients_ready and session.cycles == 2
+
+    session.reset_store()
+    execution_main.run_once(cfg, session)
+    assert len(opened) == 2
+
+    execution_main.run_once(cfg)  # no session: fresh store per cycle
+    assert len(opened) == 3
+    session.close()
+    assert session.store is None
+
+
+def test_failed_cycle_drops_store_and_clients(monkeypatch) -> None:
+    cfg = SimpleNamespace(candidates_csv="daily_candidates.csv", db_path=":memory:", run_once=True, project="TEST")
+    session = ExecutionSession.from_cfg(cfg)
+    session.store = StateStore(":memory:")
+    session.set_clients(object(), object())
+
+    def _fail(*_a, **_kw):
+        raise ConnectionError("session expired")
+
+    monkeypatch.setattr(execution_main, "run_once", _fail)
+    monkeypatch.setattr(execution_main, "slack_alert", lambda *_a, **_kw: None)
+    execution_main._run_loop(cfg, session, None)
+
+    assert session.store is None
+    assert not session.clients_ready
+    assert session.trading_client is None and session.market_data is None
@@ -35,6 +35,7 @@ def test_settle_gate_blocks_dry_run_entries(tmp_path, monkeypatch) -> None:
     candidates_path = tmp_path / "daily_candidates.csv"
     candidates_path.write_text("symbol\n", encoding="utf-8")
     monkeypatch.setenv("AVWAP_STATE_DIR", str(state_dir))
+    monkeypatch.setenv("AVWAP_REPO_ROOT", str(tmp_path))
     monkeypatch.setenv("MARKET_SETTLE_MINUTES", "5")
     monkeypatch.chdir(tmp_path)
 
@@ -84,6 +85,7 @@ def test_settle_gate_allows_exits_alpaca_paper(tmp_path, monkeypatch) -> None:
     candidates_path = tmp_path / "daily_candidates.csv"
     candidates_path.write_text("symbol\n", encoding="utf-8")
     monkeypatch.setenv("AVWAP_STATE_DIR", str(state_dir))
+    monkeypatch.setenv("AVWAP_REPO_ROOT", str(tmp_path))
     monkeypatch.setenv("MARKET_SETTLE_MINUTES", "5")
     monkeypatch.setenv("APCA_API_KEY_ID", "key")
     monkeypatch.setenv("APCA_API_SECRET_KEY", "secret")
@@ -24,3 +24,57 @@ def test_exit_armed_after_bar_or_delay():
         min_seconds=120,
         closed_10m_bars=closed_bars,
     ) is True
+
+
+def test_write_behind_store_coalesces_saves_until_flush(tmp_path, monkeypatch):
+    writes = []
+    real_write = state_machine.atomic_write_text
+    monkeypatch.setattr(
+        state_machine,
+        "atomic_write_text",
+        lambda path, payload: writes.append(path) or real_write(path, payload),
+    )
+    now = datetime.now(timezone.utc)
+    store = state_machine.SymbolExecutionStateStore("2026-03-02", state_dir=tmp_path, write_behind=True)
+    store.transition("aapl", "ENTERING", now_utc=now, entry_order_id="o1")
+    store.save()
+    store.transition("MSFT", "EXITING", now_utc=now, exit_order_id="o2")
+    store.save()
+    assert writes == []
+
+    store.flush()
+    store.flush()
+    assert len(writes) == 1
+
+    reloaded = state_machine.SymbolExecutionStateStore("2026-03-02", state_dir=tmp_path)
+    assert reloaded.get("AAPL").entry_order_ids == ["o1"]
+    assert reloaded.get("MSFT").state == "EXITING"
+
+
+def test_sqlite_store_upserts_dirty_symbols_and_adopts_json_state(tmp_path, monkeypatch):
+    from execution_v2.state_store import StateStore
+
+    now = datetime.now(timezone.utc)
+    legacy = state_machine.SymbolExecutionStateStore("2026-03-02", state_dir=tmp_path)
+    legacy.transition("AAPL", "OPEN", now_utc=now, entry_fill_ts_utc=now.isoformat())
+    legacy.save()
+
+    db = StateStore(str(tmp_path / "exec.sqlite"))
+    monkeypatch.setenv(state_machine.SYMBOL_STATE_PERSIST_ENV, "sqlite")
+    store = state_machine.symbol_state_store_from_env("2026-03-02", state_dir=tmp_path, db=db)
+    assert store.write_behind and store.db is db
+    assert store.get("AAPL").state == "OPEN"
+    store.transition("MSFT", "ENTERING", now_utc=now, entry_order_id="o1")
+    store.save()
+    assert db.load_symbol_execution_states("2026-03-02") == {}
+
+    store.flush()
+    rows = db.load_symbol_execution_states("2026-03-02")
+    assert set(rows) == {"AAPL", "MSFT"}
+    assert rows["MSFT"]["entry_order_ids"] == ["o1"]
+
+    store.transition("MSFT", "OPEN", now_utc=now)
+    store.flush()
+    fresh = state_machine.SymbolExecutionStateStore("2026-03-02", state_dir=tmp_path, db=db)
+    assert fresh.get("MSFT").state == "OPEN"
+    assert db.load_symbol_execution_states("2026-03-03") == {}
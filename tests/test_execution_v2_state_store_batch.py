@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+from execution_v2.config_types import EntryIntent, PositionState, StopMode
+from execution_v2.state_store import StateStore
+
+
+def _intent(symbol: str, scheduled_at: float = 100.0) -> EntryIntent:
+    return EntryIntent(
+        strategy_id="S1_AVWAP_CORE",
+        symbol=symbol,
+        pivot_level=10.0,
+        boh_confirmed_at=90.0,
+        scheduled_entry_at=scheduled_at,
+        size_shares=5,
+        stop_loss=9.0,
+        take_profit=12.0,
+        ref_price=10.1,
+        dist_pct=1.0,
+    )
+
+
+def _position(symbol: str) -> PositionState:
+    return PositionState(
+        strategy_id="S1_AVWAP_CORE",
+        symbol=symbol,
+        size_shares=10,
+        avg_price=10.0,
+        pivot_level=10.0,
+        r1_level=11.0,
+        r2_level=12.0,
+        stop_mode=StopMode.OPEN,
+        last_update_ts=1.0,
+        stop_price=9.0,
+        high_water=10.0,
+    )
+
+
+def test_batch_commits_once_and_rolls_back_on_error(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.sqlite"))
+    with store.batch():
+        store.put_entry_intent(_intent("AAA"))
+        with store.batch():
+            store.put_entry_intent(_intent("BBB"))
+        assert store.conn.in_transaction
+    assert not store.conn.in_transaction
+
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.put_entry_intent(_intent("CCC"))
+            with store.batch():
+                store.put_entry_intent(_intent("DDD"))
+            raise RuntimeError("boom")
+    assert not store.conn.in_transaction
+    assert sorted(store.get_entry_intents_for(["AAA", "BBB", "CCC", "DDD", "ZZZ"])) == ["AAA", "BBB"]
+
+
+def test_bulk_candidate_upsert_and_position_lookup(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.sqlite"))
+    store.upsert_candidate(symbol="AAA", first_seen_ts=1.0, expires_ts=50.0, pivot_level=9.5)
+    written = store.upsert_candidates_many(
+        [
+            {"symbol": "AAA", "first_seen_ts": 2.0, "expires_ts": 200.0, "pivot_level": None, "notes": "x"},
+            {"symbol": "BBB", "first_seen_ts": 2.0, "expires_ts": 200.0, "pivot_level": 20.0},
+        ]
+    )
+    assert written == 2
+    assert store.upsert_candidates_many([]) == 0
+    assert store.list_active_candidates(100.0) == ["AAA", "BBB"]
+    row = store.conn.execute("SELECT pivot_level, notes FROM candidates WHERE symbol='AAA'").fetchone()
+    assert (row["pivot_level"], row["notes"]) == (9.5, "x")
+
+    store.upsert_position(_position("AAA"))
+    store.upsert_position(_position("BBB"))
+    assert set(store.list_positions_by_symbol()) == {"AAA", "BBB"}
+    assert store.list_positions_by_symbol()["BBB"] == store.get_position("BBB")
+
+
+def test_pop_due_entry_intents_is_atomic(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.sqlite"))
+    store.put_entry_intent(_intent("AAA", scheduled_at=10.0))
+    store.put_entry_intent(_intent("BBB", scheduled_at=500.0))
+    due = store.pop_due_entry_intents(100.0)
+    assert [i.symbol for i in due] == ["AAA"]
+    assert list(store.get_entry_intents_for(["AAA", "BBB"])) == ["BBB"]
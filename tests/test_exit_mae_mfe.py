@@ -1,6 +1,8 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from analytics.exit_metrics import compute_mae_mfe
+import pytest
+
+from analytics.exit_metrics import bars_to_arrays, compute_exit_metrics, compute_mae_mfe, compute_mae_mfe_arrays
 
 
 def test_mae_mfe_calculation_long():
@@ -29,3 +31,71 @@ def test_mae_mfe_calculation_long():
 
     assert mae == -5.0
     assert mfe == 5.0
+
+
+def test_mae_mfe_arrays_match_bar_loop_for_short_and_unsorted_bars():
+    bars = [
+        {"ts": "2024-01-02T14:30:00Z", "high": 105.0, "low": 95.0},
+        {"ts": "2024-01-02T13:50:00Z", "high": 130.0, "low": 70.0},  # before entry
+        {"ts": 1704204600.0, "high": 101.0, "low": 97.0},  # 14:10
+        {"ts": "2024-01-02T14:40:00Z", "high": None, "low": 90.0},  # skipped
+    ]
+    ts, high, low = bars_to_arrays(bars)
+    assert list(ts) == sorted(ts)
+
+    mae, mfe = compute_mae_mfe_arrays(
+        entry_price=100.0,
+        ts=ts,
+        high=high,
+        low=low,
+        direction="short",
+        start_ts=datetime(2024, 1, 2, 14, 0, tzinfo=timezone.utc).timestamp(),
+    )
+    assert (mae, mfe) == (-5.0, 5.0)
+    assert compute_mae_mfe(
+        entry_price=100.0, bars=bars, direction="short", entry_ts_utc="2024-01-02T14:00:00+00:00"
+    ) == (mae, mfe)
+    assert compute_mae_mfe_arrays(entry_price=100.0, ts=ts, high=high, low=low, start_ts=ts[-1] + 1) == (None, None)
+
+
+def test_exit_metrics_read_windows_from_bar_store(tmp_path):
+    pytest.importorskip("pyarrow")
+    from analytics.schemas import ExitTrade
+    from execution_v2.bar_store import IntradayBarStore
+
+    store = IntradayBarStore(tmp_path)
+    start = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+    store.record(
+        "AAA",
+        [
+            {"ts": start + timedelta(minutes=5 * i), "open": 100.0, "high": 100.0 + i, "low": 100.0 - i, "close": 100.0, "volume": 1.0}
+            for i in range(10)
+        ],
+        now=(start + timedelta(hours=2)).timestamp(),
+    )
+    trade = ExitTrade(
+        trade_id="t1",
+        position_id=None,
+        symbol="AAA",
+        direction="long",
+        entry_ts_utc="2024-01-02T14:40:00+00:00",
+        exit_ts_utc="2024-01-02T14:55:00+00:00",
+        entry_date_ny="2024-01-02",
+        exit_date_ny="2024-01-02",
+        qty=10,
+        entry_price=100.0,
+        exit_price=99.0,
+        stop_price=98.0,
+        stop_basis="intraday",
+        reason="stop",
+        source="test",
+        strategy_id="S1",
+        sleeve_id="default",
+    )
+
+    metrics = compute_exit_metrics(trades=[trade], bar_store=store)
+    row = metrics["trades"][0]
+    # Bars at 14:40..14:55 are i = 2..5.
+    assert (row["mae"], row["mfe"]) == (-5.0, 5.0)
+    assert row["stop_efficiency"] == pytest.approx(-0.2)
+    assert compute_exit_metrics(trades=[trade])["trades"][0]["mae"] is None
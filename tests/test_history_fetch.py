@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import history_fetch
+import scan_engine
+
+START = datetime(2024, 1, 1)
+
+
+def _panel(tickers: list[str], periods: int = 30) -> pd.DataFrame:
+    dates = pd.bdate_range("2023-12-01", periods=periods)
+    frames = []
+    for idx, ticker in enumerate(tickers):
+        close = np.linspace(10.0 + idx, 20.0 + idx, periods)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Ticker": ticker,
+                    "Date": dates,
+                    "Open": close,
+                    "High": close + 1,
+                    "Low": close - 1,
+                    "Close": close,
+                    "Volume": 1_000.0 * (idx + 1),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _tickers(n: int) -> list[str]:
+    return [f"T{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(n)]
+
+
+def test_fetch_bars_runs_batches_concurrently_in_batch_order() -> None:
+    tickers = _tickers(14)
+    panel = _panel(tickers)
+    client = history_fetch.FakeStockBarsClient(panel, latency_s=0.02)
+    batches = history_fetch.make_batches("refresh", tickers, START, 2)
+    done = []
+
+    result = history_fetch.fetch_bars(
+        client,
+        batches,
+        parse=scan_engine.standardize_alpaca_to_yf,
+        max_workers=3,
+        on_batch_done=done.append,
+    )
+
+    assert result.failures == []
+    assert result.requests == len(batches) == 7
+    assert sorted(done, key=batches.index) == batches
+    assert 1 < client.max_in_flight <= 3
+    expected = panel[panel["Date"] >= pd.Timestamp(START)]
+    assert result.bars["Ticker"].tolist() == expected["Ticker"].tolist()
+    assert result.bars["Close"].tolist() == expected["Close"].tolist()
+
+
+def test_fetch_bars_retries_failed_batches_and_reports_permanent_failures() -> None:
+    tickers = _tickers(6)
+    panel = _panel(tickers)
+    batches = history_fetch.make_batches("backfill", tickers, START, 2)
+
+    flaky = history_fetch.FakeStockBarsClient(panel, fail_symbols=[tickers[2]], fail_times=1)
+    result = history_fetch.fetch_bars(
+        flaky, batches, parse=scan_engine.standardize_alpaca_to_yf, retries=1, retry_backoff_s=0
+    )
+    assert result.failures == []
+    assert result.requests == 4
+    assert [(t.batch, t.attempt, t.ok) for t in result.timings if not t.ok] == [(batches[1], 1, False)]
+    assert len(result.timings) == 4
+    assert set(result.bars["Ticker"]) == set(tickers)
+
+    broken = history_fetch.FakeStockBarsClient(panel, fail_symbols=[tickers[4]], fail_times=None)
+    result = history_fetch.fetch_bars(
+        broken, batches, parse=scan_engine.standardize_alpaca_to_yf, retries=2, retry_backoff_s=0
+    )
+    assert [(f.batch, f.attempts) for f in result.failures] == [(batches[2], 3)]
+    assert "simulated failure" in result.failures[0].error
+    assert set(result.bars["Ticker"]) == set(tickers[:4])
+
+
+def test_rate_limiter_waits_for_the_window_to_free_up() -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def _sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = history_fetch.RateLimiter(2, 60.0, clock=lambda: now[0], sleep=_sleep)
+    limiter.acquire()
+    now[0] = 10.0
+    limiter.acquire()
+    limiter.acquire()
+    assert sleeps == [50.0]
+    limiter.acquire()
+    assert sleeps == [50.0, 10.0]
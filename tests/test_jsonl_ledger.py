@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import utils.jsonl_ledger as jsonl_ledger
+
+
+def _key(data: dict) -> str | None:
+    return data.get("id")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index_cache():
+    jsonl_ledger.reset_index_cache()
+    yield
+    jsonl_ledger.reset_index_cache()
+
+
+def _ids(path) -> list[str]:
+    return [json.loads(line)["id"] for line in path.read_text().splitlines()]
+
+
+def test_append_records_dedupes_across_calls_and_within_batch(tmp_path) -> None:
+    path = tmp_path / "ledger" / "2024-01-02.jsonl"
+
+    first = jsonl_ledger.append_records(path, [{"id": "a"}, {"id": "b"}, {"id": "a"}], key_fn=_key)
+    second = jsonl_ledger.append_records(path, [{"id": "b"}, {"id": "c"}, {"x": 1}], key_fn=_key)
+
+    assert first == (2, 1)
+    assert second == (1, 2)
+    assert _ids(path) == ["a", "b", "c"]
+
+
+def test_append_records_fsync_is_opt_in_and_once_per_batch(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "ledger.jsonl"
+    calls: list[int] = []
+    monkeypatch.setattr(jsonl_ledger.os, "fsync", lambda fd: calls.append(fd))
+
+    jsonl_ledger.append_records(path, [{"id": str(i)} for i in range(5)], key_fn=_key)
+    assert calls == []
+
+    jsonl_ledger.append_records(path, [{"id": str(i)} for i in range(5, 10)], key_fn=_key, fsync=True)
+    assert len(calls) == 1
+    assert len(_ids(path)) == 10
+
+
+def test_index_cache_evicts_previous_days(tmp_path) -> None:
+    ledger_dir = tmp_path / "ledger"
+    for day in ("2024-01-02", "2024-01-03", "2024-01-04"):
+        jsonl_ledger.append_records(ledger_dir / f"{day}.jsonl", [{"id": day}], key_fn=_key)
+    other = tmp_path / "other" / "2024-01-02.jsonl"
+    jsonl_ledger.append_records(other, [{"id": "o"}], key_fn=_key)
+
+    cached = sorted(path for path, _ in jsonl_ledger._INDEXES)
+    assert cached == sorted(
+        [str((ledger_dir / "2024-01-04.jsonl").absolute()), str(other.absolute())]
+    )
+    # An evicted day is rebuilt from disk and still dedupes.
+    assert jsonl_ledger.append_records(ledger_dir / "2024-01-02.jsonl", [{"id": "2024-01-02"}], key_fn=_key) == (0, 1)
+
+
+def test_index_is_incremental_and_sees_external_appends(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "ledger.jsonl"
+    jsonl_ledger.append_records(path, [{"id": "a"}], key_fn=_key)
+    with path.open("a") as handle:
+        handle.write('{"id": "b"}\n')
+        handle.write("not json\n")
+        handle.write('{"id": "partial"')
+
+    parsed: list[str] = []
+    original = jsonl_ledger._parse_line
+
+    def _tracking_parse(raw, p):
+        parsed.append(raw.decode())
+        return original(raw, p)
+
+    monkeypatch.setattr(jsonl_ledger, "_parse_line", _tracking_parse)
+
+    assert jsonl_ledger.load_keys(path, _key) == {"a", "b"}
+    # Only the externally appended complete lines are parsed, not "a" again.
+    assert parsed == ['{"id": "b"}', "not json"]
+
+    with path.open("a") as handle:
+        handle.write("}\n")
+    assert jsonl_ledger.load_keys(path, _key) == {"a", "b", "partial"}
+
+
+def test_index_rebuilds_after_rewrite(tmp_path) -> None:
+    path = tmp_path / "ledger.jsonl"
+    jsonl_ledger.append_records(path, [{"id": "a"}, {"id": "b"}], key_fn=_key)
+
+    path.write_text('{"id": "z"}\n{"id": "y"}\n{"id": "x"}\n')
+    assert jsonl_ledger.load_keys(path, _key) == {"x", "y", "z"}
+
+    path.unlink()
+    assert jsonl_ledger.load_keys(path, _key) == set()
+    assert jsonl_ledger.append_records(path, [{"id": "a"}], key_fn=_key) == (1, 0)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "knowledge" / "scripts"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(f"kb_{name}", SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+kb_init = _load("kb_init")
+kb_migrate_add_normalized = _load("kb_migrate_add_normalized")
+kb_migrate_add_insights = _load("kb_migrate_add_insights")
+kb_migrate_add_fts = _load("kb_migrate_add_fts")
+query = _load("query")
+
+
+@pytest.fixture
+def kb_db(tmp_path) -> str:
+    with sqlite3.connect(":memory:") as probe:
+        try:
+            probe.execute("CREATE VIRTUAL TABLE t USING fts5(text)")
+        except sqlite3.OperationalError:
+            pytest.skip("SQLite built without FTS5")
+
+    db_path = str(tmp_path / "kb.sqlite")
+    kb_init.init_db(db_path)
+    kb_migrate_add_normalized.main(db_path)
+    kb_migrate_add_insights.main(db_path)
+    con = sqlite3.connect(db_path)
+    try:
+        con.executemany(
+            "INSERT INTO sources (source_id, source_type, url) VALUES (?, ?, ?)",
+            [("yt_a", "youtube", "https://example.com/a"), ("blog_b", "blog", "https://example.com/b")],
+        )
+        # Rows present before the migration are indexed by its 'rebuild'.
+        con.executemany(
+            "INSERT INTO raw_blocks (block_id, source_id, ordinal, text) VALUES (?, ?, ?, ?)",
+            [
+                ("a1", "yt_a", 1, "anchored vwap from the earnings gap"),
+                ("a2", "yt_a", 2, "volume profile and market structure"),
+                ("b1", "blog_b", 1, "vwap vwap vwap reclaim"),
+            ],
+        )
+        con.commit()
+    finally:
+        con.close()
+    return db_path
+
+
+def _ranked_ids(db_path: str, q: str, **filters) -> list[str]:
+    con = sqlite3.connect(db_path)
+    try:
+        rows = query.ranked_rows(
+            con,
+            "raw",
+            query.fts_query(q),
+            filters.get("source"),
+            filters.get("source_type"),
+            10,
+        )
+    finally:
+        con.close()
+    return [row[0] for row in rows]
+
+
+def test_fts_migration_ranks_by_bm25_and_is_rerunnable(kb_db) -> None:
+    kb_migrate_add_fts.main(kb_db)
+
+    assert _ranked_ids(kb_db, "vwap") == ["b1", "a1"]
+    assert _ranked_ids(kb_db, "vwap", source_type="youtube") == ["a1"]
+    # Porter stemming: "gaps" matches "gap".
+    assert _ranked_ids(kb_db, "gaps") == ["a1"]
+
+    # Triggers keep the index in sync with writes made after the migration.
+    con = sqlite3.connect(kb_db)
+    try:
+        con.execute(
+            "INSERT INTO raw_blocks (block_id, source_id, ordinal, text) VALUES ('a3', 'yt_a', 3, 'vwap')"
+        )
+        con.execute("UPDATE raw_blocks SET text = 'liquidity sweep' WHERE block_id = 'b1'")
+        con.commit()
+    finally:
+        con.close()
+    assert _ranked_ids(kb_db, "vwap") == ["a3", "a1"]
+    assert _ranked_ids(kb_db, "liquidity") == ["b1"]
+
+    # Running the migration again on an already migrated DB is a no-op apart
+    # from the rebuild: no duplicate index rows, same order.
+    kb_migrate_add_fts.main(kb_db)
+    assert _ranked_ids(kb_db, "vwap") == ["a3", "a1"]
+    con = sqlite3.connect(kb_db)
+    try:
+        con.execute(
+            "INSERT INTO raw_blocks (block_id, source_id, ordinal, text) VALUES ('a4', 'yt_a', 4, 'unrelated')"
+        )
+        con.commit()
+        triggers = con.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type='trigger' AND tbl_name='raw_blocks'"
+        ).fetchone()[0]
+        hits = con.execute(
+            "SELECT count(*) FROM raw_blocks_fts WHERE raw_blocks_fts MATCH 'unrelated'"
+        ).fetchone()[0]
+    finally:
+        con.close()
+    assert triggers == 3
+    assert hits == 1
+
+
+def test_ranked_query_requires_migration(kb_db) -> None:
+    with pytest.raises(SystemExit, match="kb_migrate_add_fts.py"):
+        _ranked_ids(kb_db, "vwap")
@@ -87,3 +87,44 @@ def test_fallback_used_when_symbol_absent(monkeypatch, tmp_path) -> None:
 
     assert fills[0]["price"] == pytest.approx(77.7)
     assert fills[0]["source"] == "latest_close_cache"
+
+
+def test_latest_close_cache_parses_history_once_per_file_version(monkeypatch, tmp_path) -> None:
+    pd = pytest.importorskip("pandas")
+    import os
+
+    import cache_store as cs
+
+    history_path = tmp_path / cs.HISTORY_PATH
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        [
+            {"Date": "2024-01-03", "Ticker": "aaa", "Close": 11.0, "Volume": 1.0},
+            {"Date": "2024-01-02", "Ticker": "AAA", "Close": 10.0, "Volume": 1.0},
+            {"Date": "2024-01-02", "Ticker": "BBB", "Close": 20.0, "Volume": 1.0},
+            {"Date": "2024-01-03", "Ticker": "BBB", "Close": float("nan"), "Volume": 1.0},
+        ]
+    ).to_parquet(history_path, index=False)
+
+    reads: list[object] = []
+    original_read = cs.pd.read_parquet
+
+    def _counting_read(*args, **kwargs):
+        reads.append(kwargs.get("columns"))
+        return original_read(*args, **kwargs)
+
+    monkeypatch.setattr(cs.pd, "read_parquet", _counting_read)
+
+    assert paper_sim.latest_close_price(tmp_path, "AAA") == pytest.approx(11.0)
+    assert paper_sim.latest_close_price(tmp_path, "BBB") is None
+    assert paper_sim.latest_close_price(tmp_path, "ZZZ") is None
+    assert reads == [["Ticker", "Date", "Close"]]
+
+    pd.DataFrame([{"Date": "2024-01-04", "Ticker": "AAA", "Close": 12.5}]).to_parquet(
+        history_path, index=False
+    )
+    stat = history_path.stat()
+    os.utime(history_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert paper_sim.latest_close_price(tmp_path, "AAA") == pytest.approx(12.5)
+    assert len(reads) == 2
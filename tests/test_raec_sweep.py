@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import replace
+from datetime import date, timedelta
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from data.prices import FixturePriceProvider
+from strategies import raec_401k_backtest, raec_sweep
+from strategies.raec_v6 import backtest_runner
+
+_START = date(2021, 1, 4)
+
+
+def _prices(target: str, n: int = 520) -> dict[str, list[tuple[date, float]]]:
+    out = {}
+    for k, sym in enumerate(raec_sweep.sweep_symbols(target)):
+        growth = 1.0004 + 0.0001 * (k % 5 - 2)
+        out[sym] = [
+            (
+                _START + timedelta(days=i),
+                20 + 5 * (k % 7) + (1 + 0.15 * math.sin(i / (5 + k % 11))) * growth**i,
+            )
+            for i in range(n)
+        ]
+    return out
+
+
+def test_v6_sweep_pool_matches_direct_runs_and_writes_comparison(tmp_path) -> None:
+    prices = _prices("v6")
+    start, end = date(2022, 3, 1), date(2022, 5, 1)
+    spec = {
+        "base_params": {"allocator.per_symbol_cap": 0.3},
+        "grid": {"top_k.V6_CROSS_ASSET_TREND": [2, 4], "overlay.floor_exposure": [0.1, 0.5]},
+    }
+
+    rows = raec_sweep.run_sweep(
+        target="v6",
+        start=start,
+        end=end,
+        spec=spec,
+        out_dir=tmp_path,
+        max_workers=2,
+        prices=prices,
+        progress=None,
+    )
+
+    assert [row["run_id"] for row in rows] == ["run_000", "run_001", "run_002", "run_003"]
+    direct = backtest_runner.run_backtest(
+        start=start,
+        end=end,
+        provider=FixturePriceProvider(prices),
+        top_k={"V6_CROSS_ASSET_TREND": 4},
+        allocator_params={"per_symbol_cap": 0.3},
+        overlay_params={"floor_exposure": 0.5},
+    )
+    row = next(
+        r for r in rows
+        if r["top_k.V6_CROSS_ASSET_TREND"] == 4 and r["overlay.floor_exposure"] == 0.5
+    )
+    assert row["total_return"] == direct["total_return"]
+    assert row["sharpe"] == direct["sharpe"]
+
+    table = pd.read_csv(tmp_path / "summary_table.csv")
+    assert len(table) == 4
+    assert {"run_id", "top_k.V6_CROSS_ASSET_TREND", "total_return"} <= set(table.columns)
+    leaderboard = json.loads((tmp_path / "leaderboard.json").read_text())
+    assert set(leaderboard) == set(raec_sweep.LEADERBOARD_METRICS)
+    best = max(rows, key=lambda r: (r["total_return"], r["run_id"]))
+    assert leaderboard["total_return"][0]["value"] == best["total_return"]
+
+
+def test_401k_sweep_applies_strategy_config_overrides() -> None:
+    prices = _prices("v3", n=420)
+    start, end = date(2022, 1, 3), date(2022, 2, 15)
+
+    rows = raec_sweep.run_sweep(
+        target="v3",
+        start=start,
+        end=end,
+        spec={"grid": {"risk_on_top_n": [1, 3]}},
+        max_workers=1,
+        prices=prices,
+        progress=None,
+    )
+
+    base = raec_sweep._401k_strategies()["v3"]
+    for row in rows:
+        strategy = type(base)(replace(base.config, risk_on_top_n=row["risk_on_top_n"]))
+        result = raec_401k_backtest.run_single_backtest(
+            strategy=strategy,
+            start_date=start.isoformat(),
+            end_date=end.isoformat(),
+            provider=FixturePriceProvider(prices),
+        )
+        expected = raec_401k_backtest.summarize_equity_curve(result.equity_curve, 100_000.0)
+        assert row["total_return"] == pytest.approx(expected["total_return"], abs=1e-12)
+        assert row["rebalance_count"] == result.rebalance_count
+
+
+def test_build_configs_rejects_unknown_parameters() -> None:
+    assert raec_sweep.build_configs("v6", {"grid": {"allocator.per_symbol_cap": [0.2, 0.3]}}) == [
+        {"allocator.per_symbol_cap": 0.2},
+        {"allocator.per_symbol_cap": 0.3},
+    ]
+    with pytest.raises(ValueError, match="allocator.bogus"):
+        raec_sweep.build_configs("v6", {"grid": {"allocator.bogus": [1]}})
+    with pytest.raises(ValueError, match="rebalance_threshold_pct"):
+        raec_sweep.build_configs("v6", {"grid": {"rebalance_threshold_pct": [2.0, 5.0]}})
+    with pytest.raises(ValueError, match="split.v9"):
+        raec_sweep.build_configs("coordinator", {"base_params": {"split.v9": 0.5}})
+    with pytest.raises(ValueError, match="Unknown sweep target"):
+        raec_sweep.build_configs("v7", {})
@@ -134,3 +134,51 @@ def test_compute_regime_features_short_history_with_env_lookbacks(
     assert result.feature_set.signals["trend"]["lookback_short"] == 5
     assert result.feature_set.signals["trend"]["lookback_long"] == 8
     assert result.feature_set.signals["breadth"]["lookback"] == 5
+
+
+def _make_ragged_history(days: int = 90) -> pd.DataFrame:
+    dates = pd.date_range("2025-01-02", periods=days, freq="B")
+    rows = []
+    symbols = ["SPY", "IWM"] + [f"SYM{i:02d}" for i in range(24)]
+    for idx, symbol in enumerate(symbols):
+        price = 50.0 + idx
+        listed = 0 if symbol in {"SPY", "IWM"} else (idx * 3) % 40
+        for offset, dt in enumerate(dates):
+            price *= 1.0 + (((offset * 7 + idx * 13) % 11) - 5) / 400.0
+            if offset < listed or (symbol != "SPY" and (offset + idx) % 17 == 0):
+                continue
+            rows.append({"Date": dt, "Ticker": symbol, "Close": price})
+    return pd.DataFrame(rows)
+
+
+def test_compute_regime_features_batch_matches_per_date(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv(regime_e1_features.ENV_VOL_LOOKBACK, "10")
+    monkeypatch.setenv(regime_e1_features.ENV_DRAWDOWN_LOOKBACK, "15")
+    monkeypatch.setenv(regime_e1_features.ENV_TREND_SHORT_LOOKBACK, "10")
+    monkeypatch.setenv(regime_e1_features.ENV_TREND_LONG_LOOKBACK, "30")
+    monkeypatch.setenv(regime_e1_features.ENV_BREADTH_LOOKBACK, "20")
+    monkeypatch.setenv(regime_e1_features.ENV_MIN_BREADTH_SYMBOLS, "10")
+    history = _make_ragged_history()
+    ny_dates = list(regime_e1_features.iter_ny_dates("2024-12-30", "2025-05-15"))
+
+    batch = regime_e1_features.compute_regime_features_batch(history, ny_dates)
+
+    assert list(batch) == ny_dates
+    reasons_seen: set[str] = set()
+    for ny_date in ny_dates:
+        expected = regime_e1_features.compute_regime_features(history, ny_date)
+        assert batch[ny_date] == expected, ny_date
+        reasons_seen.update(expected.reason_codes)
+    assert any(result.ok for result in batch.values())
+    assert {"no_history_for_date", "insufficient_trend_history"} <= reasons_seen
+
+
+def test_compute_regime_features_batch_invalid_columns() -> None:
+    history = pd.DataFrame({"when": ["2025-01-02"], "close": [1.0]})
+
+    batch = regime_e1_features.compute_regime_features_batch(history, ["2025-01-02"])
+
+    assert batch["2025-01-02"].reason_codes == ["invalid_history_columns"]
+    assert batch["2025-01-02"].inputs_snapshot == {"ny_date": "2025-01-02", "history_rows": 1}
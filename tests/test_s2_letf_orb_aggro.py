@@ -164,3 +164,28 @@ def test_run_strategy_respects_universe_profile(tmp_path: Path) -> None:
         if line.strip()
     ]
     assert {rec["symbol"] for rec in records} == {"TQQQ"}
+
+
+def test_evaluate_panel_matches_per_symbol_evaluation() -> None:
+    history = _build_history(
+        rows_per_symbol=240,
+        symbol_growth=[("TQQQ", 1.004), ("SOXL", 1.003), ("LABU", 0.999), ("NVDA", 1.002)],
+    )
+    # Ragged histories: a late listing and a few missing sessions.
+    history = history[~((history["Ticker"] == "NVDA") & (history.index % 240 < 120))]
+    history = history[~((history["Ticker"] == "SOXL") & (history.index % 13 == 0))]
+    history = history.sort_values(["Ticker", "Date"]).reset_index(drop=True)
+    cfg = s2_letf_orb_aggro.StrategyConfig(min_adv_usd=1_000_000.0)
+    asof_dates = [ts.date() for ts in history["Date"].drop_duplicates().sort_values().iloc[::15]]
+
+    panel = s2_letf_orb_aggro.evaluate_panel(history, asof_dates, cfg)
+
+    assert list(panel) == asof_dates
+    for asof in asof_dates:
+        expected = [
+            s2_letf_orb_aggro._evaluate_symbol(symbol, history[history["Ticker"] == symbol], asof, cfg)
+            for symbol in sorted(history["Ticker"].unique())
+        ]
+        assert panel[asof] == expected
+    assert any(item["eligible"] for item in panel[asof_dates[-1]])
+    assert panel[asof_dates[0]][0]["reason_codes"] == ["insufficient_history"]
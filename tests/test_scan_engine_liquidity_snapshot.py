@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import scan_engine
+from indicators import trend_strength_score
+
+FIXED_NOW = pd.Timestamp("2024-04-01")  # Monday
+
+
+class _FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FIXED_NOW
+
+
+def _history() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    frames = []
+    specs = {
+        "AAA": (300, 2_000_000.0),
+        "BBB": (300, 900_000.0),
+        "CCC": (300, 100_000.0),  # fails the share-volume floor
+        "DDD": (12, 5_000_000.0),  # too few bars
+        "EEE": (200, 3_000_000.0),
+        "BAD": (300, 5_000_000.0),  # excluded via bad tickers
+    }
+    for idx, (ticker, (n, volume)) in enumerate(specs.items()):
+        dates = pd.bdate_range(end=FIXED_NOW - pd.Timedelta(days=1), periods=n)
+        close = 40.0 * np.exp(np.cumsum(rng.normal(0.001 * (idx - 2), 0.015, n)))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Date": dates,
+                    "Ticker": ticker,
+                    "Open": close,
+                    "High": close * 1.01,
+                    "Low": close * 0.985,
+                    "Close": close,
+                    "Volume": np.full(n, volume),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _universe() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Ticker": ["AAA", "BBB", "CCC", "DDD", "EEE", "BAD"],
+            "Sector": ["Tech", "Energy", "Tech", "Energy", "Health", "Tech"],
+        }
+    )
+
+
+class _PanelClient:
+    def __init__(self, history: pd.DataFrame) -> None:
+        self.history = history
+        self.calls: list[list[str]] = []
+
+    def get_stock_bars(self, req) -> SimpleNamespace:
+        symbols = list(req.symbol_or_symbols)
+        self.calls.append(symbols)
+        sub = self.history[
+            self.history["Ticker"].isin(symbols) & (self.history["Date"] >= pd.Timestamp(req.start))
+        ]
+        return SimpleNamespace(
+            df=sub.rename(
+                columns={
+                    "Ticker": "symbol",
+                    "Date": "timestamp",
+                    "Open": "open",
+                    "High": "high",
+                    "Low": "low",
+                    "Close": "close",
+                    "Volume": "volume",
+                }
+            ).reset_index(drop=True)
+        )
+
+
+def test_history_snapshot_matches_network_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(scan_engine, "datetime", _FixedDatetime)
+    history = _history()
+    universe = _universe()
+
+    network = scan_engine.build_liquidity_snapshot(universe, _PanelClient(history), bad_tickers={"BAD"})
+    cached = scan_engine.liquidity_snapshot_from_history(universe, history, bad_tickers={"BAD"})
+
+    assert cached["Ticker"].tolist() == network["Ticker"].tolist() == ["EEE", "AAA", "BBB"]
+    assert cached["AvgDollarVol20"].tolist() == pytest.approx(network["AvgDollarVol20"].tolist())
+    assert cached["Sector"].tolist() == network["Sector"].tolist()
+    for ticker, score in zip(cached["Ticker"], cached["TrendScore"]):
+        sub = history[history["Ticker"] == ticker].set_index("Date")
+        assert score == pytest.approx(trend_strength_score(sub))
+
+
+def test_run_scan_builds_snapshot_from_refreshed_history(monkeypatch: pytest.MonkeyPatch) -> None:
+    history = _history()
+    client = _PanelClient(history)
+    scanned: list[str] = []
+
+    def _fake_build_candidate_row(df, ticker, sector, setup_rules, *, as_of_dt=None, direction="Long", sector_rs=None):
+        scanned.append(ticker)
+        return {"Symbol": ticker, "Sector": sector}
+
+    def _no_network_snapshot(*_args, **_kwargs):
+        raise AssertionError("network snapshot must not run in history mode")
+
+    monkeypatch.setattr(scan_engine, "datetime", _FixedDatetime)
+    monkeypatch.setattr(scan_engine, "StockHistoricalDataClient", lambda *args, **kwargs: client)
+    monkeypatch.setattr(scan_engine, "get_market_regime", lambda *_: True)
+    monkeypatch.setattr(scan_engine, "load_setup_rules", lambda: {})
+    monkeypatch.setattr(scan_engine, "build_liquidity_snapshot", _no_network_snapshot)
+    monkeypatch.setattr(scan_engine, "load_universe", _universe)
+    monkeypatch.setattr(scan_engine, "load_bad_tickers", lambda: {"BAD"})
+    monkeypatch.setattr(scan_engine, "is_near_earnings_cached", lambda *_: False)
+    monkeypatch.setattr(scan_engine, "build_candidate_row", _fake_build_candidate_row)
+    monkeypatch.setattr(scan_engine, "compute_sector_relative_strength", lambda *a, **kw: {})
+    monkeypatch.setattr(scan_engine.cs, "read_parquet", lambda *_: history.copy())
+    monkeypatch.setattr(scan_engine.cs, "write_parquet", lambda *_: None)
+
+    cfg = replace(scan_engine.default_cfg, LIQUIDITY_SNAPSHOT_SOURCE="history")
+    result = scan_engine.run_scan(cfg, as_of_dt=FIXED_NOW)
+
+    # Every valid universe ticker is refreshed once; the snapshot then narrows the scan.
+    refreshed = {sym for call in client.calls for sym in call}
+    assert {"AAA", "BBB", "CCC", "DDD", "EEE"} <= refreshed
+    assert "BAD" not in refreshed
+    assert scanned == ["EEE", "AAA", "BBB"]
+    assert dict(zip(result["Symbol"], result["Sector"])) == {
+        "EEE": "Health",
+        "AAA": "Tech",
+        "BBB": "Energy",
+    }
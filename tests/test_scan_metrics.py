@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import scan_engine
+import scan_metrics
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_report_aggregates_stages_gates_and_slowest_tickers(tmp_path) -> None:
+    clock = _Clock()
+    report = scan_metrics.ScanRunReport(slow_tickers=2, clock=clock)
+    for _ in range(2):
+        with report.stage("history_fetch"):
+            clock.now += 1.5
+    report.record_batch("refresh", 200, 0.75, attempt=1, ok=True)
+    report.record_batch("refresh", 200, 0.25, attempt=1, ok=False)
+    for ticker, seconds in [("AAA", 0.1), ("BBB", 0.4), ("CCC", 0.2), ("DDD", 0.3)]:
+        report.record_ticker(ticker, seconds)
+    report.gates.update({"quality_gates": 3, "candidate": 1})
+    clock.now += 1.0
+    report.finish("ok", counters={"history_refresh_errors": 1})
+
+    data = report.to_dict()
+    assert data["status"] == "ok"
+    assert data["info"]["duration_s"] == 4.0
+    assert data["stages"] == {"history_fetch": {"seconds": 3.0, "calls": 2}}
+    assert data["gates"] == {"candidate": 1, "quality_gates": 3}
+    assert data["counters"] == {"history_refresh_errors": 1}
+    assert data["slowest_tickers"] == [
+        {"ticker": "BBB", "seconds": 0.4},
+        {"ticker": "DDD", "seconds": 0.3},
+    ]
+    assert data["tickers"]["count"] == 4
+    assert data["tickers"]["max_s"] == 0.4
+
+    prom = report.to_prometheus()
+    assert "# TYPE avwap_scan_stage_seconds gauge" in prom
+    assert 'avwap_scan_stage_seconds{stage="history_fetch"} 3' in prom
+    assert 'avwap_scan_gate_total{gate="quality_gates"} 3' in prom
+    assert 'avwap_scan_history_batch_failures{kind="refresh"} 1' in prom
+    assert "avwap_scan_ticker_seconds_count 4" in prom
+
+    path = scan_metrics.report_path_for(tmp_path / "daily_candidates.csv")
+    assert path.name == "daily_candidates.report.json"
+    report.write_json(path)
+    assert json.loads(path.read_text())["stages"]["history_fetch"]["calls"] == 2
+
+
+def _history(tickers: list[str], dates: pd.DatetimeIndex) -> pd.DataFrame:
+    frames = []
+    for idx, ticker in enumerate(tickers):
+        n = len(dates) if ticker != "SHORT" else 30
+        close = np.linspace(100.0 + idx, 130.0 + idx, n)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Date": dates[-n:],
+                    "Ticker": ticker,
+                    "Open": close - 0.5,
+                    "High": close + 1.0,
+                    "Low": close - 1.0,
+                    "Close": close,
+                    "Volume": np.full(n, 1_000_000.0),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_run_scan_fills_the_run_report(monkeypatch: pytest.MonkeyPatch) -> None:
+    dates = pd.bdate_range("2024-01-02", periods=120)
+    tickers = ["AAA", "BBB", "ERN", "SHORT"]
+    history = _history(tickers, dates)
+
+    class _Client:
+        def get_stock_bars(self, req) -> SimpleNamespace:
+            return SimpleNamespace(df=pd.DataFrame())
+
+    monkeypatch.setattr(scan_engine, "StockHistoricalDataClient", lambda *a, **kw: _Client())
+    monkeypatch.setattr(scan_engine, "get_market_regime", lambda *_: True)
+    monkeypatch.setattr(
+        scan_engine,
+        "build_liquidity_snapshot",
+        lambda universe, client, **kw: pd.DataFrame({"Ticker": tickers, "Sector": "Tech"}),
+    )
+    monkeypatch.setattr(scan_engine, "load_universe", lambda: tickers)
+    monkeypatch.setattr(scan_engine, "load_bad_tickers", lambda: set())
+    monkeypatch.setattr(scan_engine, "is_near_earnings_cached", lambda t: t == "ERN")
+    monkeypatch.setattr(scan_engine, "compute_sector_relative_strength", lambda *a, **kw: {})
+    monkeypatch.setattr(scan_engine.cs, "read_parquet", lambda *_: history.copy())
+    monkeypatch.setattr(scan_engine.cs, "write_parquet", lambda *_: None)
+
+    report = scan_metrics.ScanRunReport()
+    scan_engine.run_scan(scan_engine.default_cfg, as_of_dt=dates[-1], report=report)
+    data = report.to_dict()
+
+    assert data["status"] == "ok"
+    for stage in (
+        "regime_check",
+        "universe_load",
+        "liquidity_snapshot",
+        "history_read",
+        "history_fetch",
+        "history_write",
+        "scan_loop",
+        "earnings_checks",
+        "candidate_rows",
+    ):
+        assert stage in data["stages"], stage
+    assert data["stages"]["earnings_checks"]["calls"] == 4
+    assert data["gates"]["near_earnings"] == 1
+    assert data["gates"]["insufficient_history"] == 1
+    assert sum(data["gates"].values()) == 4
+    assert {b["kind"] for b in data["history_batches"]} >= {"refresh"}
+    assert data["tickers"]["count"] == 2
+    assert {t["ticker"] for t in data["slowest_tickers"]} == {"AAA", "BBB"}
+
+
+def test_run_scan_report_marks_bearish_regime_skip(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(scan_engine, "StockHistoricalDataClient", lambda *a, **kw: object())
+    monkeypatch.setattr(scan_engine, "get_market_regime", lambda *_: False)
+    report = scan_metrics.ScanRunReport()
+    scan_engine.run_scan(scan_engine.default_cfg, report=report)
+    assert report.status == "skipped_bearish_regime"
+    assert set(report.stages) == {"regime_check"}
+
+
+def test_run_scan_main_reports_this_runs_counters_on_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    run_scan = pytest.importorskip("run_scan")
+    monkeypatch.setitem(scan_engine.PBT_DIAG, "history_fetch_error", 7)
+    monkeypatch.setitem(scan_engine.SCAN_GATE_DIAG, "no_anchor", 3)
+    monkeypatch.setitem(scan_engine.SCAN_GATE_DIAG, "candidate", scan_engine.SCAN_GATE_DIAG["candidate"])
+
+    def _boom(cfg, *, report):
+        scan_engine.PBT_DIAG["history_fetch_error"] += 2
+        scan_engine.SCAN_GATE_DIAG["no_anchor"] += 1
+        scan_engine.SCAN_GATE_DIAG["candidate"] += 4
+        raise RuntimeError("feed down")
+
+    written = []
+    monkeypatch.setattr(run_scan, "load_dotenv", lambda: None)
+    monkeypatch.setattr(run_scan.scan_engine, "run_scan", _boom)
+    monkeypatch.setattr(run_scan, "_write_scan_report", lambda report, path: written.append(report))
+    with pytest.raises(RuntimeError, match="feed down"):
+        run_scan.main()
+
+    (report,) = written
+    assert report.status == "error"
+    assert report.counters == {"history_fetch_error": 2}
+    assert dict(report.gates) == {"no_anchor": 1, "candidate": 4}
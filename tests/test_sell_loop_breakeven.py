@@ -69,7 +69,7 @@ class TestBreakevenOnR1:
         """When breakeven_on_r1=True (default), R1 trim moves stop to avg_price."""
         store = MagicMock()
         existing = _make_state(avg_price=100.0, pivot_level=98.0, stop_price=95.0)
-        store.get_position.return_value = existing
+        store.list_positions_by_symbol.return_value = {existing.symbol: existing}
 
         cfg = SellLoopConfig(breakeven_on_r1=True)
 
@@ -96,7 +96,7 @@ class TestBreakevenOnR1:
         """When breakeven_on_r1=False, R1 trim uses pivot_level for stop."""
         store = MagicMock()
         existing = _make_state(avg_price=100.0, pivot_level=98.0, stop_price=95.0)
-        store.get_position.return_value = existing
+        store.list_positions_by_symbol.return_value = {existing.symbol: existing}
 
         cfg = SellLoopConfig(breakeven_on_r1=False)
 
@@ -123,7 +123,7 @@ class TestBreakevenOnR1:
         store = MagicMock()
         # Start with stop already above avg_price (shouldn't decrease)
         existing = _make_state(avg_price=100.0, stop_price=101.0)
-        store.get_position.return_value = existing
+        store.list_positions_by_symbol.return_value = {existing.symbol: existing}
 
         cfg = SellLoopConfig(breakeven_on_r1=True)
 
@@ -164,3 +164,93 @@ def test_stop_selection_disabled_preserves_first_match(monkeypatch):
     )
 
     assert selected == 88.0
+
+
+class CountingTradingClient(FakeTradingClient):
+    def __init__(self, orders):
+        super().__init__(orders)
+        self.requests = []
+
+    def get_orders(self, filter=None):
+        self.requests.append(filter)
+        orders = [o for o in self.orders if o.status == "open"]
+        if filter is not None and getattr(filter, "symbols", None):
+            orders = [o for o in orders if o.symbol in filter.symbols]
+        if filter is not None and getattr(filter, "until", None) is not None:
+            orders = [o for o in orders if o.submitted_at < filter.until]
+        if filter is not None and getattr(filter, "limit", None):
+            orders = sorted(orders, key=lambda o: o.submitted_at, reverse=True)[: filter.limit]
+        return orders
+
+
+def _stop(order_id, symbol, stop_price, qty=10, minute=0):
+    return FakeOrder(
+        id=order_id,
+        symbol=symbol,
+        side="sell",
+        status="open",
+        order_type="stop",
+        qty=qty,
+        stop_price=stop_price,
+        submitted_at=datetime(2024, 1, 2, 15, minute, tzinfo=timezone.utc),
+    )
+
+
+def test_open_orders_snapshot_serves_reads_and_reconciles_from_one_request():
+    from execution_v2.exits import OpenOrdersSnapshot
+
+    client = CountingTradingClient(
+        [_stop("a", "AAA", 95.0), _stop("b", "BBB", 45.0, minute=1), _stop("c", "CCC", 20.0, minute=2)]
+    )
+    snapshot = OpenOrdersSnapshot(client)
+    for symbol, stop in (("AAA", 95.0), ("BBB", 45.0), ("CCC", 20.0)):
+        assert _read_existing_stop(client, symbol, desired_qty=10, open_orders=snapshot) == stop
+        state = reconcile_stop_order(
+            trading_client=client,
+            state=ExitPositionState(symbol=symbol, qty=10),
+            desired_qty=10,
+            desired_stop=stop,
+            open_orders=snapshot,
+        )
+        assert state.stop_order_id == symbol[0].lower()
+
+    assert len(client.requests) == 1
+    assert client.requests[0].symbols is None
+    assert snapshot.requests == 1
+    assert client.submit_calls == 0
+
+
+def test_open_orders_snapshot_refetches_only_symbols_this_cycle_changed():
+    from execution_v2.exits import OpenOrdersSnapshot
+
+    client = CountingTradingClient([_stop("a", "AAA", 90.0), _stop("b", "BBB", 45.0, minute=1)])
+    snapshot = OpenOrdersSnapshot(client)
+    reconcile_stop_order(
+        trading_client=client,
+        state=ExitPositionState(symbol="AAA", qty=10),
+        desired_qty=10,
+        desired_stop=93.0,
+        open_orders=snapshot,
+    )
+    assert client.cancel_calls == ["a"]
+    assert client.submit_calls == 1
+    assert [r.symbols for r in client.requests] == [None, ["AAA"]]
+
+    assert _read_existing_stop(client, "BBB", open_orders=snapshot) == 45.0
+    assert len(client.requests) == 2
+    _read_existing_stop(client, "AAA", open_orders=snapshot)
+    assert [r.symbols for r in client.requests] == [None, ["AAA"], ["AAA"]]
+
+
+def test_open_orders_snapshot_pages_past_the_request_limit(monkeypatch):
+    from execution_v2 import exits
+
+    monkeypatch.setattr(exits, "_OPEN_ORDERS_PAGE_LIMIT", 2)
+    orders = [_stop(f"o{i}", f"S{i}", 10.0 + i, minute=i) for i in range(5)]
+    client = CountingTradingClient(orders)
+    snapshot = exits.OpenOrdersSnapshot(client)
+
+    assert _read_existing_stop(client, "S0", open_orders=snapshot) == 10.0
+    assert _read_existing_stop(client, "S4", open_orders=snapshot) == 14.0
+    assert len(client.requests) == 3
+    assert snapshot.requests == 1
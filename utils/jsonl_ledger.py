@@ -0,0 +1,196 @@
+"""Append-only JSONL ledgers with a cached per-file dedupe index.
+
+Ledger writers dedupe by a record key (intent_id, regime_id, event signature)
+before appending.  Re-reading and JSON-parsing the whole day's file on every
+append makes each write O(records so far), which adds up on the execution
+polling loop.  This module keeps one in-memory key index per (path, key_fn):
+
+- built lazily on first use by scanning the file once,
+- refreshed incrementally by parsing only bytes appended since the last scan
+  (other processes may append to the same ledger),
+- rebuilt from scratch if the file was replaced, truncated or rewritten,
+- updated in place on our own appends.
+
+Ledgers are one file per day in a per-book directory, so opening an index
+for a path evicts the cached indexes of its sibling files (earlier days)
+under the same key function; the cache holds one index per ledger directory.
+
+Appends are batched: one ``write`` per call.  Pass ``fsync=True`` to also
+flush the batch to disk before returning.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable
+
+logger = logging.getLogger(__name__)
+
+KeyFn = Callable[[dict[str, Any]], Hashable | None]
+
+# Bytes before the indexed offset that must be unchanged for the cached index
+# to be trusted; catches in-place rewrites that happen to grow the file.
+_TAIL_CHECK_BYTES = 256
+
+
+@dataclass
+class _LedgerIndex:
+    keys: set[Hashable] = field(default_factory=set)
+    offset: int = 0
+    file_id: tuple[int, int] | None = None
+    tail: bytes = b""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def reset(self) -> None:
+        self.keys = set()
+        self.offset = 0
+        self.file_id = None
+        self.tail = b""
+
+
+_INDEXES: dict[tuple[str, KeyFn], _LedgerIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _index_for(path: Path, key_fn: KeyFn) -> _LedgerIndex:
+    cache_key = (str(Path(path).absolute()), key_fn)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(cache_key)
+        if index is None:
+            parent = str(Path(cache_key[0]).parent)
+            for other in [k for k in _INDEXES if k[1] is key_fn and str(Path(k[0]).parent) == parent]:
+                del _INDEXES[other]
+            index = _LedgerIndex()
+            _INDEXES[cache_key] = index
+        return index
+
+
+def reset_index_cache() -> None:
+    """Drop all cached indexes (tests, or after rewriting ledgers in place)."""
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
+
+
+def _parse_line(raw: bytes, path: Path) -> dict[str, Any] | None:
+    line = raw.strip()
+    if not line:
+        return None
+    try:
+        data = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        logger.warning("Skipping malformed JSON line in %s", path)
+        return None
+    if not isinstance(data, dict):
+        return None
+    return data
+
+
+def _add_keys(index: _LedgerIndex, chunk: bytes, key_fn: KeyFn, path: Path) -> None:
+    for raw in chunk.splitlines():
+        data = _parse_line(raw, path)
+        if data is None:
+            continue
+        key = key_fn(data)
+        if key:
+            index.keys.add(key)
+
+
+def _advance(index: _LedgerIndex, chunk: bytes) -> None:
+    index.offset += len(chunk)
+    index.tail = (index.tail + chunk)[-_TAIL_CHECK_BYTES:]
+
+
+def _refresh(index: _LedgerIndex, path: Path, key_fn: KeyFn) -> None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        index.reset()
+        return
+    file_id = (stat.st_dev, stat.st_ino)
+    with path.open("rb") as handle:
+        stale = index.file_id != file_id or stat.st_size < index.offset
+        if not stale and index.tail:
+            handle.seek(index.offset - len(index.tail))
+            stale = handle.read(len(index.tail)) != index.tail
+        if stale:
+            index.reset()
+            index.file_id = file_id
+        if stat.st_size == index.offset:
+            return
+        handle.seek(index.offset)
+        data = handle.read()
+    # Only consume complete lines; a partially written trailing record is
+    # picked up on the next refresh once its newline lands.
+    complete = data[: data.rfind(b"\n") + 1]
+    _add_keys(index, complete, key_fn, path)
+    _advance(index, complete)
+
+
+def load_keys(path: Path, key_fn: KeyFn) -> set[Hashable]:
+    """Return a copy of the dedupe keys currently recorded in ``path``."""
+    path = Path(path)
+    index = _index_for(path, key_fn)
+    with index.lock:
+        _refresh(index, path, key_fn)
+        return set(index.keys)
+
+
+def append_records(
+    path: Path,
+    records: Iterable[dict[str, Any]],
+    *,
+    key_fn: KeyFn,
+    dumps: Callable[[dict[str, Any]], str] = lambda record: json.dumps(record, sort_keys=True),
+    fsync: bool = False,
+) -> tuple[int, int]:
+    """Append records whose key is not already in the ledger.
+
+    Records without a key, or whose key is already present (on disk or
+    earlier in the same batch), are skipped.  Keys are derived from the
+    serialized line so the index matches what a fresh scan would produce.
+    ``fsync`` flushes the batch to disk before returning (off by default).
+    Returns ``(written, skipped)``.
+    """
+    path = Path(path)
+    index = _index_for(path, key_fn)
+    with index.lock:
+        _refresh(index, path, key_fn)
+        lines: list[str] = []
+        batch_keys: list[Hashable] = []
+        pending: set[Hashable] = set()
+        skipped = 0
+        for record in records:
+            line = dumps(record)
+            key = key_fn(json.loads(line))
+            if not key or key in index.keys or key in pending:
+                skipped += 1
+                continue
+            lines.append(line)
+            batch_keys.append(key)
+            pending.add(key)
+        if not lines:
+            return 0, skipped
+
+        payload = "".join(f"{line}\n" for line in lines).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_APPEND | os.O_CREAT | os.O_WRONLY, 0o644)
+        try:
+            os.write(fd, payload)
+            if fsync:
+                os.fsync(fd)
+            stat = os.fstat(fd)
+        finally:
+            os.close(fd)
+
+        index.keys.update(batch_keys)
+        file_id = (stat.st_dev, stat.st_ino)
+        if index.file_id in (None, file_id) and stat.st_size == index.offset + len(payload):
+            # Nobody else appended in between: our bytes are the new tail.
+            index.file_id = file_id
+            _advance(index, payload)
+        return len(lines), skipped